@@ -3,33 +3,60 @@ AkrediX - Flask App
 Şifre Hash + Taslak + Rapor Geçmişi + Şifremi Unuttum
 """
 from pathlib import Path
-from flask import Flask, request, send_file, Response, redirect, jsonify, make_response
+from flask import Flask, request, send_file, Response, redirect, jsonify, stream_with_context
+import gzip
 import json
-import urllib.parse
+import sqlite3
 import sys
-from uuid import uuid4
 from datetime import datetime
+from functools import lru_cache
 
 import web_server as ws
 import login as auth
+import artifact_cache
+import autosave as autosave_queue
+import bologna_sync
+import http_cache
+import http_client
+import page_context
+import pdf_jobs
+import report_tables
+import report_variants
+import response_middleware
+import result_store
+import sessions
+import static_assets
+from response_middleware import response_policy, ETAG_STRONG
 from sample_payload import build_sample_payload
 
 app = Flask(__name__)
+response_middleware.install(app)
 ASSETS_DIR = Path(__file__).parent / "assets"
-ACTIVE_TOKENS: set[str] = set()
 
 
 @app.route("/assets/<path:filename>")
 def serve_assets(filename):
     file_path = ASSETS_DIR / filename
     if file_path.exists() and file_path.is_file():
-        mime_types = {'.png': 'image/png', '.jpg': 'image/jpeg', '.svg': 'image/svg+xml', '.ico': 'image/x-icon'}
-        return send_file(str(file_path), mimetype=mime_types.get(file_path.suffix.lower(), 'application/octet-stream'))
+        mime_types = {'.png': 'image/png', '.jpg': 'image/jpeg', '.svg': 'image/svg+xml', '.ico': 'image/x-icon',
+                      **static_assets.MIME_TYPES}
+        mimetype = mime_types.get(file_path.suffix.lower(), 'application/octet-stream')
+        if not static_assets.is_fingerprinted(filename):
+            return send_file(str(file_path), mimetype=mimetype)
+
+        # İçerik hash'li paket: adı değişmeden içeriği değişmez -> süresiz önbellek
+        send_path, encoding = static_assets.negotiate(file_path, request.headers.get("Accept-Encoding"))
+        resp = send_file(str(send_path), mimetype=mimetype, etag=send_path.name, conditional=True)
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        resp.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+        return resp
     return Response("Not found", status=404)
 
 
 def _is_auth():
-    return request.cookies.get("auth") in ACTIVE_TOKENS
+    return sessions.current().authenticated
 
 
 def _redirect_login():
@@ -37,49 +64,40 @@ def _redirect_login():
 
 
 def _get_email() -> str:
-    raw = request.cookies.get("profile")
-    if raw:
-        try:
-            data = json.loads(urllib.parse.unquote(raw))
-            return data.get("email", "")
-        except:
-            pass
-    return ""
+    return sessions.current().email
+
+
+def _result_key() -> str:
+    """Sonuç deposu anahtarı - kullanıcı e-postası, yoksa oturum token'ı"""
+    identity = sessions.current()
+    if identity.email:
+        return f"user:{identity.email}"
+    return f"session:{identity.token}" if identity.token else ""
 
 
 def _get_user_info() -> dict:
-    raw = request.cookies.get("profile")
-    if not raw:
-        return {}
-    try:
-        data = json.loads(urllib.parse.unquote(raw))
-        return {
-            "full_name": data.get("full_name", data.get("instructor", "")),
-            "course_name": data.get("course_name", ""),
-            "program_name": data.get("program_name", ""),
-            "role": data.get("role", "ogretim_elemani"),
-        }
-    except:
+    data = sessions.current().profile
+    if not data:
         return {}
+    return {
+        "full_name": data.get("full_name", data.get("instructor", "")),
+        "course_name": data.get("course_name", ""),
+        "program_name": data.get("program_name", ""),
+        "role": data.get("role", "ogretim_elemani"),
+    }
 
 
 def _get_profile() -> dict:
-    raw = request.cookies.get("profile")
-    if not raw:
-        return {}
-    try:
-        data = json.loads(urllib.parse.unquote(raw))
-        result = {}
-        for k in ["course_code", "course_name", "program_name", "term"]:
-            if data.get(k):
-                result[k] = str(data[k])
-        if data.get("full_name"):
-            result["instructor"] = str(data["full_name"])
-        elif data.get("instructor"):
-            result["instructor"] = str(data["instructor"])
-        return result
-    except:
-        return {}
+    data = sessions.current().profile
+    result = {}
+    for k in ["course_code", "course_name", "program_name", "term"]:
+        if data.get(k):
+            result[k] = str(data[k])
+    if data.get("full_name"):
+        result["instructor"] = str(data["full_name"])
+    elif data.get("instructor"):
+        result["instructor"] = str(data["instructor"])
+    return result
 
 
 # ============ AUTH ROUTES ============
@@ -102,34 +120,20 @@ def login_view():
         err = "<div class='error'>Hatali e-posta veya sifre</div>"
         return Response(auth.render_login(err), status=401, mimetype="text/html")
     
-    token = uuid4().hex
-    ACTIVE_TOKENS.add(token)
+    # Profil ve rol her istekte users tablosundan okunur (sessions.current) - istemcide yalnızca token
+    token = sessions.create(email)
     resp = redirect("/", code=302)
-    resp.set_cookie("auth", token, httponly=True, path="/")
-    
-    profile = {
-        "email": email,
-        "full_name": user.get("full_name", ""),
-        "course_code": user.get("course_code", ""),
-        "course_name": user.get("course_name", ""),
-        "term": user.get("term", ""),
-        "program_name": user.get("program_name", ""),
-        "instructor": user.get("instructor", ""),
-        "role": user.get("role", "ogretim_elemani"),
-        "department_id": user.get("department_id", ""),
-    }
-    resp.set_cookie("profile", urllib.parse.quote(json.dumps(profile, ensure_ascii=False)), path="/")
+    resp.set_cookie(sessions.AUTH_COOKIE, token, httponly=True, path="/")
+    resp.delete_cookie(sessions.PROFILE_COOKIE, path="/")
     return resp
 
 
 @app.route("/logout", methods=["GET"])
 def logout_view():
-    token = request.cookies.get("auth")
-    if token:
-        ACTIVE_TOKENS.discard(token)
+    sessions.revoke(request.cookies.get(sessions.AUTH_COOKIE))
     resp = redirect("/login", code=302)
-    resp.delete_cookie("auth", path="/")
-    resp.delete_cookie("profile", path="/")
+    resp.delete_cookie(sessions.AUTH_COOKIE, path="/")
+    resp.delete_cookie(sessions.PROFILE_COOKIE, path="/")
     return resp
 
 
@@ -215,12 +219,9 @@ def signup_view():
             }
             auth.save_course_data(course_code, course_data_to_save, email)
         
-        token = uuid4().hex
-        ACTIVE_TOKENS.add(token)
+        token = sessions.create(email)
         resp = redirect("/", code=302)
-        resp.set_cookie("auth", token, httponly=True, path="/")
-        profile["email"] = email
-        resp.set_cookie("profile", urllib.parse.quote(json.dumps(profile, ensure_ascii=False)), path="/")
+        resp.set_cookie(sessions.AUTH_COOKIE, token, httponly=True, path="/")
         return resp
     except Exception as e:
         err = f"<div class='error'>Kayit hatasi: {str(e)}</div>"
@@ -368,23 +369,7 @@ def profile_save_course_data():
     auth.update_user_course(email, course_code, existing.get('course_name', ''))
     print(f"[profile/course-data] user tablosu güncellendi", file=sys.stderr)
     
-    # Cookie'yi güncelle - ana sayfanın doğru ders kodunu okuması için
-    course_name = existing.get('course_name', '')
-    profile_data = {
-        "email": email,
-        "full_name": user.get('full_name', ''),
-        "role": role,
-        "course_code": course_code,
-        "course_name": course_name,
-        "program_name": user.get('program_name', ''),
-        "term": user.get('term', ''),
-        "instructor": user.get('instructor', ''),
-    }
-    
-    resp = make_response(redirect(f"/profile?course={course_code}&saved=1"))
-    resp.set_cookie("profile", urllib.parse.quote(json.dumps(profile_data)), 
-                  max_age=86400*30, httponly=False, samesite='Lax')
-    return resp
+    return redirect(f"/profile?course={course_code}&saved=1")
 
 
 @app.route("/api/course-data/<course_code>", methods=["GET"])
@@ -472,28 +457,8 @@ def api_switch_course():
         auth.update_user_course(email, new_course_code, course_name)
         print(f"[api/switch-course] user tablosu güncellendi", file=sys.stderr)
         
-        # Yeni profile cookie oluştur
-        user = auth.fetch_user(email)
-        print(f"[api/switch-course] Güncel user.course_code: {user.get('course_code') if user else 'None'}", file=sys.stderr)
-        
-        if user:
-            profile_data = {
-                "email": email,
-                "full_name": user.get('full_name', ''),
-                "role": user.get('role', ''),
-                "course_code": new_course_code,
-                "course_name": course_name,
-                "program_name": user.get('program_name', ''),
-                "term": user.get('term', ''),
-                "instructor": user.get('instructor', ''),
-            }
-            
-            resp = make_response(jsonify({"success": True, "course_code": new_course_code, "course_name": course_name}))
-            resp.set_cookie("profile", urllib.parse.quote(json.dumps(profile_data)), 
-                          max_age=86400*30, httponly=False, samesite='Lax')
-            return resp
-        
-        return jsonify({"success": True, "course_code": new_course_code})
+        # Sonraki istekler aktif dersi users tablosundan okur (sessions.current)
+        return jsonify({"success": True, "course_code": new_course_code, "course_name": course_name})
     except Exception as e:
         print(f"[api/switch-course] HATA: {e}", file=sys.stderr)
         import traceback
@@ -516,8 +481,8 @@ def api_fetch_bologna(course_code):
     if not bologna_link:
         return jsonify({"success": False, "error": "Bologna linki tanımlanmamış"})
     
-    # Bologna'dan veri çek
-    result = auth.fetch_bologna_data(bologna_link)
+    # Bologna'dan veri çek (elle yenileme: önbellekteki sayfa doğrulanır)
+    result = auth.fetch_bologna_data(bologna_link, max_age=0)
     result['success'] = bool(result.get('doc_text') or result.get('curriculum_text'))
     
     return jsonify(result)
@@ -535,7 +500,7 @@ def api_fetch_bologna_signup(course_code):
     if not bologna_link:
         return jsonify({"success": False, "error": "Bu ders için Bologna linki tanımlanmamış"})
     
-    # Bologna'dan veri çek
+    # Bologna'dan veri çek (kimliksiz istek: önbellek TTL'i içinde Bologna'ya istek atılmaz)
     result = auth.fetch_bologna_data(bologna_link)
     result['success'] = bool(result.get('doc_text') or result.get('curriculum_text'))
     
@@ -545,15 +510,8 @@ def api_fetch_bologna_signup(course_code):
 # ============ ADMIN PANELİ ============
 
 def _get_user_role() -> str:
-    """Cookie'den kullanıcı rolünü al"""
-    raw = request.cookies.get("profile")
-    if raw:
-        try:
-            data = json.loads(urllib.parse.unquote(raw))
-            return data.get("role", "ogretim_elemani")
-        except:
-            pass
-    return "ogretim_elemani"
+    """Kullanıcı rolü - oturumun e-postasıyla users tablosundan (profile çerezi okunmaz)"""
+    return sessions.current().profile.get("role", "ogretim_elemani")
 
 def _is_admin() -> bool:
     return _get_user_role() == "admin"
@@ -727,12 +685,12 @@ def admin_fetch_pea_poc(dept_id):
     
     # PEA çek
     if pea_url:
-        result = auth.fetch_pea_from_bologna(pea_url)
+        result = auth.fetch_pea_from_bologna(pea_url, max_age=0)
         pea_text = result.get('pea_text', '')
     
     # PÖÇ çek
     if poc_url:
-        result = auth.fetch_poc_from_bologna(poc_url)
+        result = auth.fetch_poc_from_bologna(poc_url, max_age=0)
         poc_text = result.get('poc_text', '')
     
     return jsonify({
@@ -742,6 +700,64 @@ def admin_fetch_pea_poc(dept_id):
     })
 
 
+@app.route("/admin/bologna-sync/<dept_id>", methods=["POST"])
+def admin_bologna_sync(dept_id):
+    """Bölümün tüm derslerinin DÖÇ/müfredatını Bologna'dan arka planda yenile"""
+    if not _is_auth() or not _can_manage_users():
+        return jsonify({"error": "Yetkisiz"}), 403
+    
+    # Bölüm başkanı yalnızca kendi bölümünü; admin/dekan her bölümü (bkz. /api/bologna-changes)
+    if _get_user_role() not in ["admin", "dekan"]:
+        user = auth.fetch_user(_get_email()) or {}
+        if dept_id != (user.get("department_id") or ""):
+            return jsonify({"error": "Yetkisiz"}), 403
+    
+    if not auth.get_department(dept_id):
+        return jsonify({"success": False, "error": "Bölüm bulunamadı"}), 404
+    
+    job_id = bologna_sync.start(dept_id, _get_email())
+    return jsonify({"success": True, "job_id": job_id}), 202
+
+
+@app.route("/admin/bologna-sync/status/<job_id>", methods=["GET"])
+def admin_bologna_sync_status(job_id):
+    """Bologna senkronizasyon işinin ilerlemesi (queued / running / done / failed)"""
+    if not _is_auth() or not _can_manage_users():
+        return jsonify({"error": "Yetkisiz"}), 403
+    
+    job = bologna_sync.status(job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(job)
+
+
+@app.route("/api/bologna-changes", methods=["GET"])
+def api_bologna_changes():
+    """Bölümde Bologna'dan değişen derslerin özeti (bölüm başkanı kendi bölümü, admin/dekan ?department_id=)"""
+    if not _is_auth() or not _can_manage_users():
+        return jsonify({"error": "Yetkisiz"}), 403
+    
+    user = auth.fetch_user(_get_email()) or {}
+    dept_id = user.get("department_id") or ""
+    if _get_user_role() in ["admin", "dekan"]:
+        dept_id = request.args.get("department_id", dept_id)
+    if not dept_id:
+        return jsonify({"error": "Bölüm belirtilmemiş"}), 400
+    
+    days = max(1, min(request.args.get("days", 30, type=int), 365))
+    courses = bologna_sync.changes(dept_id, days=days)
+    return jsonify({"department_id": dept_id, "days": days, "total": len(courses), "courses": courses})
+
+
+@app.route("/admin/http-metrics", methods=["GET"])
+def admin_http_metrics():
+    """Dış HTTP çağrıları: sunucu başına gecikme/hata/devre kesici durumu (bu worker) ve yanıt önbelleği"""
+    if not _is_auth() or not _is_admin():
+        return jsonify({"error": "Yetkisiz"}), 403
+    
+    return jsonify({"hosts": http_client.metrics(), "cache": http_cache.stats()})
+
+
 @app.route("/admin/delete-department", methods=["POST"])
 def admin_delete_department():
     """Bölümü sil"""
@@ -1014,7 +1030,7 @@ def admin_fetch_courses_from_bologna():
         return jsonify({"error": "Bölüm ID ve URL zorunlu"}), 400
     
     email = _get_email()
-    result = auth.fetch_courses_from_bologna(url, dept_id, email)
+    result = auth.fetch_courses_from_bologna(url, dept_id, email, max_age=0)
     
     return jsonify(result)
 
@@ -1178,58 +1194,23 @@ def delete_draft(draft_id):
 
 @app.route("/api/autosave", methods=["POST"])
 def autosave():
-    import sys
-    
     if not _is_auth():
         return jsonify({"error": "Unauthorized"}), 401
     
     email = _get_email()
-    data = request.get_json()
-    
-    print(f"[autosave] email: {email}", file=sys.stderr, flush=True)
-    
-    if not data:
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
         return jsonify({"error": "No data"}), 400
     
-    # user_curriculum tablosuna kaydet - böylece sayfa yenilendiğinde veriler korunur
-    curriculum_data = {
-        "doc_tyc_map_text": data.get("doc_tyc_map_text", ""),
-        "poc_tyc_map_text": data.get("poc_tyc_map_text", ""),
-        "pea_stark_map_text": data.get("pea_stark_map_text", ""),
-        "poc_pea_map_text": data.get("poc_pea_map_text", ""),
-        "doc_poc_weights_text": data.get("doc_poc_weights_text", ""),
-        "curriculum_doc_map_text": data.get("curriculum_doc_map_text", ""),
-        "doc_stark_map_text": data.get("doc_stark_map_text", ""),
-        "doc_pea_map_text": data.get("doc_pea_map_text", ""),
-        "curriculum_tyc_map_text": data.get("curriculum_tyc_map_text", ""),
-        "curriculum_stark_map_text": data.get("curriculum_stark_map_text", ""),
-        "curriculum_poc_map_text": data.get("curriculum_poc_map_text", ""),
-        "curriculum_pea_map_text": data.get("curriculum_pea_map_text", ""),
-        "components_text": data.get("assessments_text", ""),
-        "grading_text": data.get("grading_text", ""),
-        "question_map_text": data.get("question_map_text", ""),
-        "thresholds_met": data.get("thresholds_met", "70"),
-        "thresholds_partial": data.get("thresholds_partial", "50"),
-    }
-    
-    # Boş olmayan alanları kaydet
-    has_data = any(v for v in curriculum_data.values() if v and str(v).strip())
-    
-    if has_data:
-        auth.save_user_curriculum(email, curriculum_data)
-        print(f"[autosave] user_curriculum kaydedildi", file=sys.stderr, flush=True)
-    
-    # Taslak olarak da kaydet (eski davranış)
-    form_data = json.dumps(data, ensure_ascii=False)
-    drafts = auth.get_drafts(email)
-    auto_draft = next((d for d in drafts if d["name"] == "Otomatik Kayit"), None)
-    
-    if auto_draft:
-        auth.update_draft(auto_draft["id"], form_data)
-        return jsonify({"success": True, "id": auto_draft["id"], "updated": True})
-    else:
-        draft_id = auth.save_draft(email, "Otomatik Kayit", form_data)
-        return jsonify({"success": True, "id": draft_id, "created": True})
+    # İstemci yalnızca değişen alanları gönderir ({"changes": {...}}); eski istemciler tüm formu.
+    # Eşzamanlı istekler tek transaction'da yazılır; başarı ancak commit sonrası döner (autosave.py).
+    # 503'te değişiklikler kuyrukta kalmaz - istemci kaydedilmemiş sayıp yeniden gönderir
+    changes = data.get("changes") if isinstance(data.get("changes"), dict) else data
+    try:
+        written = autosave_queue.submit(email, changes)
+    except sqlite3.Error:
+        return jsonify({"error": "Kaydedilemedi"}), 503
+    return jsonify({"success": True, "fields": written})
 
 
 # ============ RAPOR GEÇMİŞİ ============
@@ -1245,6 +1226,7 @@ def get_reports():
 
 
 @app.route("/api/reports/<int:report_id>", methods=["GET"])
+@response_policy(etag=ETAG_STRONG, cache_control="private, no-cache")
 def get_report(report_id):
     if not _is_auth():
         return jsonify({"error": "Unauthorized"}), 401
@@ -1266,9 +1248,49 @@ def delete_report(report_id):
         return jsonify({"error": "Unauthorized"}), 401
     
     auth.delete_report(report_id)
+    # Disk önbelleği worker'lar arasında ortak; _history_result sürece özel, diğer worker'lar report_exists ile eler
+    report_variants.discard_report(report_id)
+    _history_result.cache_clear()
     return jsonify({"success": True})
 
 
+@lru_cache(maxsize=8)
+def _history_result(report_id: int) -> dict:
+    """Kayıtlı raporun sonucu - tablo sayfaları kaydırıldıkça JSON'u tekrar tekrar çözmemek için"""
+    report = auth.get_report(report_id)
+    return json.loads(report.get("result", "{}")) if report else {}
+
+
+@app.route("/api/report-table/<table>", methods=["GET"])
+def get_report_table(table):
+    """Büyük rapor tablolarının sayfalı, sıralı/süzülmüş verisi (virtual_table.js)"""
+    if not _is_auth():
+        return jsonify({"error": "Unauthorized"}), 401
+    if table not in report_tables.TABLES:
+        return jsonify({"error": "Not found"}), 404
+
+    report_id = request.args.get("report_id", type=int)
+    if report_id:
+        result = _history_result(report_id) if auth.report_exists(report_id) else None
+    else:
+        result = result_store.STORE.get(_result_key()).get("last_result")
+    if not result:
+        return jsonify({"error": "Rapor bulunamadı"}), 404
+
+    return jsonify(report_tables.query(
+        result, table,
+        sort=request.args.get("sort"),
+        order=request.args.get("order", "asc"),
+        grades=[g for g in request.args.get("grade", "").split(",") if g],
+        status=request.args.get("status"),
+        min_pct=request.args.get("min_pct", type=float),
+        max_pct=request.args.get("max_pct", type=float),
+        search=request.args.get("q", "").strip() or None,
+        page=request.args.get("page", 1, type=int),
+        per_page=request.args.get("per_page", report_tables.DEFAULT_PER_PAGE, type=int),
+    ))
+
+
 @app.route("/api/student-report/<student_id>", methods=["GET"])
 def get_student_report(student_id):
     """Öğrenciye özel bireysel rapor API'si"""
@@ -1276,12 +1298,13 @@ def get_student_report(student_id):
         return jsonify({"error": "Oturum açmanız gerekiyor"}), 401
     
     # Son hesaplama sonucunu al
-    result = ws.STATE.get("last_result")
+    entry = result_store.STORE.get(_result_key())
+    result = entry.get("last_result")
     if not result:
         return jsonify({"error": "Önce hesaplama yapın"})
     
     try:
-        html = generate_student_report_html(student_id, result)
+        html = report_variants.materialize(result, entry.get("result_hash"), "student", student_id=student_id)
         return jsonify({"html": html})
     except Exception as e:
         import traceback
@@ -1767,99 +1790,113 @@ def generate_student_report_html(student_id: str, result: dict) -> str:
     return html
 
 
+report_variants.register("student", lambda result, student_id: generate_student_report_html(student_id, result))
+
+
 # ============ RAPOR GEÇMİŞİ GÖRÜNTÜLEME ============
 
+def _send_history_html(path: Path):
+    """Önbellekteki gzip'li rapor sayfasını gönder; gzip kabul etmeyen istemciye açarak"""
+    if response_middleware.accepts(request.headers.get("Accept-Encoding"), "gzip"):
+        response = send_file(str(path), mimetype="text/html", etag=path.name.split(".")[0], conditional=True)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(gzip.decompress(path.read_bytes()), mimetype="text/html")
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _history_page(report_id: int, name: str, **params):
+    """Kayıtlı rapor sayfası: önbellekte varsa diskten, yoksa üretip akışla gönder (ve sakla)"""
+    cached = report_variants.cached_history_html(report_id, name, **params)
+    if cached:
+        return _send_history_html(cached)
+    return _html_response(report_variants.stream_history(_history_result(report_id), report_id, name, **params))
+
+
 @app.route("/report-history/<int:report_id>", methods=["GET"])
+@response_policy(etag=ETAG_STRONG, cache_control="private, no-cache")
 def view_report_history(report_id):
     """Kayıtlı raporu görüntüle"""
     if not _is_auth():
         return _redirect_login()
     
-    report = auth.get_report(report_id)
-    if not report:
+    if not auth.report_exists(report_id):
         return Response("<h1>Rapor bulunamadı</h1><p><a href='/'>Ana sayfaya dön</a></p>", status=404, mimetype="text/html")
     
     try:
-        result = json.loads(report.get("result", "{}"))
         # V2 raporu göster (daha kapsamlı)
-        html = ws.render_v2_report(result, show_toolbar=True, report_id=report_id)
-        return Response(html, mimetype="text/html")
+        return _history_page(report_id, "html_v2", show_toolbar=True,
+                             virtual_tables=request.args.get("full") != "1")
     except Exception as e:
         return Response(f"<h1>Rapor Hatası</h1><p>{e}</p><p><a href='/'>Ana sayfaya dön</a></p>", status=500, mimetype="text/html")
 
 
 @app.route("/report-history/<int:report_id>/standard", methods=["GET"])
+@response_policy(etag=ETAG_STRONG, cache_control="private, no-cache")
 def view_report_standard(report_id):
     """Kayıtlı raporun standart versiyonunu görüntüle"""
     if not _is_auth():
         return _redirect_login()
     
-    report = auth.get_report(report_id)
-    if not report:
+    if not auth.report_exists(report_id):
         return Response("<h1>Rapor bulunamadı</h1>", status=404, mimetype="text/html")
     
     try:
-        result = json.loads(report.get("result", "{}"))
-        html = ws.render_tables(result, standalone=True, report_id=report_id)
-        return Response(html, mimetype="text/html")
+        return _history_page(report_id, "html_standalone",
+                             virtual_tables=request.args.get("full") != "1")
     except Exception as e:
         return Response(f"<h1>Rapor Hatası</h1><p>{e}</p>", status=500, mimetype="text/html")
 
 
-@app.route("/report-history/<int:report_id>/pdf", methods=["GET"])
-def download_report_pdf(report_id):
-    """Kayıtlı raporun PDF'ini indir"""
+def _send_artifact(path: Path, download_name: str):
+    """Önbellekteki PDF'i ETag/Last-Modified ile gönder (If-None-Match -> 304)"""
+    return send_file(str(path), mimetype="application/pdf", as_attachment=True,
+                     download_name=download_name, etag=path.stem, conditional=True,
+                     last_modified=datetime.fromtimestamp(path.stat().st_mtime))
+
+
+def _report_pdf(report_id: int, variant: str, download_name: str):
+    """Kayıtlı raporun PDF'ini artifact önbelleğinden ver; yoksa bir kez üret"""
     if not _is_auth():
         return _redirect_login()
     
+    if not auth.report_exists(report_id):
+        return Response("Rapor bulunamadı", status=404)
+    
+    key = report_variants.report_pdf_key(report_id, variant)
+    group = report_variants.report_group(report_id)
+    cached = artifact_cache.lookup(key, group=group)
+    if cached:
+        return _send_artifact(cached, download_name)
+    
     report = auth.get_report(report_id)
     if not report:
         return Response("Rapor bulunamadı", status=404)
     
     try:
         result = json.loads(report.get("result", "{}"))
-        html = ws.render_tables(result, standalone=True)
-        
-        # Geçici PDF oluştur
-        pdf_path = Path(__file__).parent / f"temp_report_{report_id}.pdf"
-        ws.export_pdf_from_html(html, pdf_path) or ws.legacy_pdf(result, str(pdf_path))
-        
-        if pdf_path.exists():
-            response = send_file(str(pdf_path), mimetype="application/pdf", as_attachment=True, 
-                               download_name=f"rapor_{report_id}.pdf")
-            return response
-        else:
-            return Response("PDF oluşturulamadı", status=500)
+        # Yedek (legacy) PDF'e düşülürse üreten renderer'ın anahtarıyla saklanır; sonraki istek yeniden dener
+        pdf_path = artifact_cache.get_or_create(key, lambda tmp: ws.export_report_pdf(result, tmp, variant), group=group,
+                                                rekey=lambda renderer: report_variants.report_pdf_key(report_id, variant, renderer),
+                                                place=report_variants.report_guard(report_id))
+        if pdf_path:
+            return _send_artifact(pdf_path, download_name)
+        return Response("PDF oluşturulamadı", status=500)
     except Exception as e:
         return Response(f"Hata: {e}", status=500)
 
 
+@app.route("/report-history/<int:report_id>/pdf", methods=["GET"])
+def download_report_pdf(report_id):
+    """Kayıtlı raporun PDF'ini indir"""
+    return _report_pdf(report_id, "main", f"rapor_{report_id}.pdf")
+
+
 @app.route("/report-history/<int:report_id>/pdf-v2", methods=["GET"])
 def download_report_pdf_v2(report_id):
     """Kayıtlı raporun V2 PDF'ini indir"""
-    if not _is_auth():
-        return _redirect_login()
-    
-    report = auth.get_report(report_id)
-    if not report:
-        return Response("Rapor bulunamadı", status=404)
-    
-    try:
-        result = json.loads(report.get("result", "{}"))
-        html = ws.render_v2_report(result)
-        
-        # Geçici PDF oluştur
-        pdf_path = Path(__file__).parent / f"temp_report_v2_{report_id}.pdf"
-        ws.export_pdf_from_html(html, pdf_path) or ws.legacy_pdf(result, str(pdf_path))
-        
-        if pdf_path.exists():
-            response = send_file(str(pdf_path), mimetype="application/pdf", as_attachment=True, 
-                               download_name=f"rapor_v2_{report_id}.pdf")
-            return response
-        else:
-            return Response("PDF oluşturulamadı", status=500)
-    except Exception as e:
-        return Response(f"Hata: {e}", status=500)
+    return _report_pdf(report_id, "v2", f"rapor_v2_{report_id}.pdf")
 
 
 @app.route("/load-report/<int:report_id>", methods=["GET"])
@@ -1872,17 +1909,30 @@ def load_report(report_id):
     if not report:
         return redirect("/", code=302)
     
-    # Payload'ı STATE'e yükle
-    payload = json.loads(report.get("payload", "{}"))
+    # Payload'ı kullanıcının sonuç deposuna yükle
     result = json.loads(report.get("result", "{}"))
     
-    ws.STATE["last_result"] = result
-    ws.STATE["last_payload_text"] = report.get("payload", "{}")
-    ws.STATE["loaded_report_id"] = report_id
+    _replace_result(result, report.get("payload", "{}"), loaded_report_id=report_id)
     
     return redirect("/", code=302)
 
 
+def _replace_result(result: dict, payload_text: str, loaded_report_id: int = None) -> str:
+    """Kullanıcının son sonucunu değiştir; eski sonucun bellekteki varyantlarını bırak"""
+    key = _result_key()
+    old_hash = result_store.STORE.get(key).get("result_hash")
+    result_hash = artifact_cache.result_hash(result)
+    if old_hash != result_hash:
+        report_variants.forget(old_hash)
+    result_store.STORE.put(key, {
+        "last_result": result,
+        "result_hash": result_hash,
+        "last_payload_text": payload_text,
+        "loaded_report_id": loaded_report_id,
+    })
+    return result_hash
+
+
 # ============ ANA SAYFA VE HESAPLAMA ============
 
 @app.route("/", methods=["GET"])
@@ -1901,12 +1951,13 @@ def index():
     email = _get_email()
     print(f"[index] email: {email}", file=sys.stderr, flush=True)
     
-    user = None
+    # Sayfanın tüm kullanıcı verileri tek bağlantı / tek transaction'da
+    ctx = page_context.load(email, page_context.INDEX_SECTIONS)
+    user = ctx["user"]
     course_code = ""
     course_name = ""
     
     if email:
-        user = auth.fetch_user(email)
         print(f"[index] user bulundu: {bool(user)}", file=sys.stderr, flush=True)
         
         if user:
@@ -1917,7 +1968,7 @@ def index():
             
             # 1. ÖNCE: Ders bazlı ÇIKTI verilerini yükle (course_data tablosundan - profilde düzenlenen)
             if course_code:
-                course_data = auth.get_course_data(course_code)
+                course_data = ctx["course_data"]
                 print(f"[index] course_data bulundu: {bool(course_data)}", file=sys.stderr, flush=True)
                 
                 if course_data:
@@ -1941,7 +1992,7 @@ def index():
                         course_name = course_data['course_name']
             
             # 2. SONRA: Kullanıcının EŞLEŞTİRME ve SORU verilerini yükle (user_curriculum tablosundan)
-            curriculum_data = auth.get_user_curriculum(email)
+            curriculum_data = ctx["curriculum"]
             if curriculum_data:
                 print(f"[index] user_curriculum bulundu", file=sys.stderr, flush=True)
                 
@@ -2000,11 +2051,11 @@ def index():
     user_info = _get_user_info()
     
     # Taslak ve rapor geçmişi
-    drafts = auth.get_drafts(email) if email else []
-    reports = auth.get_report_history(email) if email else []
+    drafts = ctx["drafts"]
+    reports = ctx["reports"]
     
     # Kullanıcının yetkili olduğu dersler
-    user_courses = auth.get_user_courses(email) if email else []
+    user_courses = ctx["user_courses"]
     if email and user:
         main_course = user.get('course_code', '') or ''
         if main_course:
@@ -2019,6 +2070,30 @@ def index():
     return Response(body, mimetype="text/html")
 
 
+def _compute_result(payload: dict) -> dict:
+    """Payload'ı hesapla; rapor şablonlarının beklediği girdi alanlarını sonuca ekle"""
+    result = ws.compute(payload)
+    result["curriculum"] = payload.get("curriculum", [])
+    result["tyc"] = payload.get("tyc", [])
+    result["stark"] = payload.get("stark", [])
+    result["doc_tyc_map"] = payload.get("doc_tyc_map", {})
+    result["poc_tyc_map"] = payload.get("poc_tyc_map", {})
+    result["pea_stark_map"] = payload.get("pea_stark_map", {})
+    result["doc_poc_weights"] = payload.get("doc_poc_weights", {})
+    result["poc_pea_map"] = payload.get("poc_pea_map", {})
+    result["input_questions"] = payload.get("questions", [])
+    result["input_students"] = payload.get("students", [])
+    result["input_assessments"] = payload.get("assessments", [])
+    result["scores"] = payload.get("scores", {})
+    result["grading"] = payload.get("grading", {"A": 90, "B": 80, "C": 70, "D": 60, "F": 0})
+    result["coverage"] = ws.compute_coverage(payload.get("questions", []))
+    result["question_outcomes"] = ws.compute_question_outcomes(payload.get("questions", []), payload.get("scores", {}))
+    result["course"] = payload.get("course", {})
+    result["students_data"] = ws.compute_student_results(payload.get("questions", []), payload.get("scores", {}), payload.get("students", []), payload.get("assessments", []))
+    result["weekly_coverage"] = ws.compute_weekly_coverage(payload.get("questions", []))
+    return result
+
+
 @app.route("/compute", methods=["POST"])
 def compute():
     if not _is_auth():
@@ -2028,9 +2103,10 @@ def compute():
     email = _get_email()
     values = {k: request.form.get(k, "") for k in ws.FORM_KEYS}
     
-    drafts = auth.get_drafts(email) if email else []
-    reports = auth.get_report_history(email) if email else []
-    user_courses = auth.get_user_courses(email) if email else []
+    ctx = page_context.load(email, page_context.COMPUTE_SECTIONS)
+    drafts = ctx["drafts"]
+    reports = ctx["reports"]
+    user_courses = ctx["user_courses"]
     
     try:
         payload, defaults = ws.build_payload_from_form(values)
@@ -2038,40 +2114,22 @@ def compute():
         body = ws.build_page(ws.ensure_form_defaults(values), None, f"Hata: {e}", user_info=user_info, drafts=drafts, reports=reports, user_courses=user_courses)
         return Response(body, status=400, mimetype="text/html")
     
+    # Bölüm ve ders bilgilerini al
+    report_dept_id = values.get("department_id") or user_info.get("department_id", "")
+    report_course_code = values.get("course_code") or user_info.get("course_code", "")
+    
     try:
-        result = ws.compute(payload)
-        out_pdf = Path(__file__).parent / "web_report.pdf"
-        out_pdf_v2 = Path(__file__).parent / "web_report_v2.pdf"
-        
-        html_main = ws.render_tables(result, standalone=True)
-        html_v2 = ws.render_v2_report(result)
-        
-        ws.export_pdf_from_html(html_main, out_pdf) or ws.legacy_pdf(result, str(out_pdf))
-        ws.export_pdf_from_html(html_v2, out_pdf_v2) or ws.legacy_pdf(result, str(out_pdf_v2))
-        
-        result["curriculum"] = payload.get("curriculum", [])
-        result["tyc"] = payload.get("tyc", [])
-        result["stark"] = payload.get("stark", [])
-        result["doc_tyc_map"] = payload.get("doc_tyc_map", {})
-        result["poc_tyc_map"] = payload.get("poc_tyc_map", {})
-        result["pea_stark_map"] = payload.get("pea_stark_map", {})
-        result["doc_poc_weights"] = payload.get("doc_poc_weights", {})
-        result["poc_pea_map"] = payload.get("poc_pea_map", {})
-        result["input_questions"] = payload.get("questions", [])
-        result["input_students"] = payload.get("students", [])
-        result["input_assessments"] = payload.get("assessments", [])
-        result["scores"] = payload.get("scores", {})
-        result["grading"] = payload.get("grading", {"A": 90, "B": 80, "C": 70, "D": 60, "F": 0})
-        result["coverage"] = ws.compute_coverage(payload.get("questions", []))
-        result["question_outcomes"] = ws.compute_question_outcomes(payload.get("questions", []), payload.get("scores", {}))
-        result["course"] = payload.get("course", {})
-        result["students_data"] = ws.compute_student_results(payload.get("questions", []), payload.get("scores", {}), payload.get("students", []), payload.get("assessments", []))
-        result["weekly_coverage"] = ws.compute_weekly_coverage(payload.get("questions", []))
+        # Aynı kullanıcı/ders için aynı veriyle kaydedilmiş rapor varsa sonucu (ve rapor/PDF
+        # önbelleklerini) yeniden kullan; yeni satır yerine yalnızca sayacı artar
+        payload_hash = artifact_cache.artifact_key("payload", artifact_cache.result_hash(payload), ws.REPORT_TEMPLATE_VERSION)
+        existing = auth.find_report(email, report_course_code, payload_hash) if email else None
+        if existing:
+            result = json.loads(existing["result"])
+        else:
+            result = _compute_result(payload)
         
-        ws.STATE["last_result"] = result
-        ws.STATE["last_payload_text"] = json.dumps(payload, ensure_ascii=False, indent=2)
-        ws.STATE["last_pdf_path"] = str(out_pdf)
-        ws.STATE["last_v2_pdf_path"] = str(out_pdf_v2)
+        # Rapor varyantları (tam sayfa, V2, PDF'ler) ilk istendiklerinde üretilir
+        result_hash = _replace_result(result, json.dumps(payload, ensure_ascii=False, indent=2))
         
         # Rapor geçmişine kaydet
         if email:
@@ -2079,11 +2137,11 @@ def compute():
             user_name = user_info.get("full_name", "").strip() or email.split("@")[0]
             title = f"{datetime.now().strftime('%d.%m.%Y %H:%M')} - {user_name}"
             
-            # Bölüm ve ders bilgilerini al
-            report_dept_id = values.get("department_id") or user_info.get("department_id", "")
-            report_course_code = values.get("course_code") or user_info.get("course_code", "")
-            
-            auth.save_report(email, title, json.dumps(payload, ensure_ascii=False), json.dumps(result, ensure_ascii=False), overall_pct, report_dept_id, report_course_code)
+            if existing:
+                auth.touch_report(existing["id"], title)
+            else:
+                auth.save_report(email, title, json.dumps(payload, ensure_ascii=False), json.dumps(result, ensure_ascii=False),
+                                 overall_pct, report_dept_id, report_course_code, payload_hash=payload_hash)
             reports = auth.get_report_history(email)
             
             # Kullanıcının eşleştirme ve soru verilerini kaydet (sonraki girişlerde otomatik yüklenecek)
@@ -2120,39 +2178,104 @@ def compute():
         return Response(body, status=500, mimetype="text/html")
     
     # Hesaplama sonucu gösterirken DEFAULTS kullan (values değil!) - payload'dan oluşturulmuş veriler
-    return Response(ws.build_page(defaults, ws.render_tables(result), user_info=user_info, drafts=drafts, reports=reports, user_courses=user_courses), mimetype="text/html")
+    result_html = report_variants.materialize(result, result_hash, "html")
+    return Response(ws.build_page(defaults, result_html, user_info=user_info, drafts=drafts, reports=reports, user_courses=user_courses), mimetype="text/html")
+
+
+def _send_variant_pdf(kind: str, download_name: str, missing_msg: str):
+    """Son sonucun PDF varyantını gönder: üretildiyse hemen, değilse işi kuyruğa alıp bekle"""
+    key = _result_key()
+    entry = result_store.STORE.get(key)
+    result = entry.get("last_result")
+    if not result:
+        return Response(missing_msg, status=404)
+    result_hash = entry.get("result_hash") or artifact_cache.result_hash(result)
+    
+    cached = report_variants.cached_pdf(result_hash, kind)
+    if cached:
+        return _send_artifact(cached, download_name)
+    
+    # Yoksa, dosyası silinmişse ya da önceki deneme başarısızsa yeni iş; sahipsiz iş beklerken devralınır
+    job = pdf_jobs.wait(pdf_jobs.ensure(key, kind, result, result_hash), result=result)
+    if not job:
+        return Response(missing_msg, status=404)
+    if job["status"] == pdf_jobs.STATUS_FAILED:
+        # Kalıcı değil: sonraki istek yeni bir iş açar
+        return Response(f"PDF oluşturulamadı: {job.get('error') or ''}", status=503, headers={"Retry-After": "5"})
+    if job["status"] != pdf_jobs.STATUS_DONE:
+        return Response("PDF hazırlanıyor, lütfen biraz sonra tekrar deneyin", status=503, headers={"Retry-After": "5"})
+    return _send_artifact(Path(job["pdf_path"]), download_name)
 
 
 @app.route("/download.pdf", methods=["GET"])
 def download_pdf():
     if not _is_auth():
         return _redirect_login()
-    pdf_path = ws.STATE.get("last_pdf_path")
-    if not pdf_path or not Path(pdf_path).exists():
-        return Response("PDF yok", status=404)
-    return send_file(pdf_path, mimetype="application/pdf", as_attachment=True, download_name="akreditasyon_raporu.pdf")
+    return _send_variant_pdf("main", "akreditasyon_raporu.pdf", "PDF yok")
 
 
 @app.route("/download-v2.pdf", methods=["GET"])
 def download_pdf_v2():
     if not _is_auth():
         return _redirect_login()
-    pdf_path = ws.STATE.get("last_v2_pdf_path")
-    if not pdf_path or not Path(pdf_path).exists():
-        return Response("V2 PDF yok", status=404)
-    return send_file(pdf_path, mimetype="application/pdf", as_attachment=True, download_name="akreditasyon_raporu_v2.pdf")
+    return _send_variant_pdf("v2", "akreditasyon_raporu_v2.pdf", "V2 PDF yok")
+
+
+@app.route("/download-legacy.pdf", methods=["GET"])
+def download_pdf_legacy():
+    """ReportLab ile üretilen klasik PDF"""
+    if not _is_auth():
+        return _redirect_login()
+    return _send_variant_pdf("legacy", "akreditasyon_raporu_klasik.pdf", "PDF yok")
+
+
+@app.route("/api/pdf-jobs/<job_id>", methods=["GET"])
+def api_pdf_job_status(job_id):
+    """PDF işinin durumunu sorgula (queued / running / done / failed)"""
+    if not _is_auth():
+        return jsonify({"error": "Unauthorized"}), 401
+    job = pdf_jobs.status(job_id)
+    if not job or job.get("owner_key") != _result_key():
+        return jsonify({"error": "Not found"}), 404
+    return jsonify({
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "finished_at": job.get("finished_at"),
+    })
+
+
+def _html_response(body) -> Response:
+    """Hazır HTML'i tek parça, rapor üretecini bölüm bölüm (akışla) gönder.
+    İlk bölüm burada üretilir; erken hatalar çağıranın hata sayfasına düşer."""
+    if isinstance(body, str):
+        return Response(body, mimetype="text/html")
+    first = next(body, "")
+
+    def chunks():
+        yield first
+        try:
+            yield from body
+        except Exception as e:
+            # Başlıklar gitti, 500 dönülemez - hatayı sayfanın sonuna yaz
+            print(f"[stream] Rapor akışı yarıda kesildi: {e}", file=sys.stderr, flush=True)
+            yield f"<p style='color:#ef4444;'>Rapor Hatasi: {ws.esc(str(e))}</p>"
+    return Response(stream_with_context(chunks()), mimetype="text/html")
 
 
 @app.route("/report-v2", methods=["GET"])
 def report_v2():
     if not _is_auth():
         return _redirect_login()
-    result = ws.STATE.get("last_result")
+    entry = result_store.STORE.get(_result_key())
+    result = entry.get("last_result")
     if not result:
         return Response("<h1>Henuz hesaplama yapilmadi</h1><p><a href='/'>Ana sayfaya don</a></p>", status=404, mimetype="text/html")
     try:
-        html = ws.render_v2_report(result)
-        return Response(html, mimetype="text/html")
+        return _html_response(report_variants.stream(result, entry.get("result_hash"), "html_v2",
+                                                     virtual_tables=request.args.get("full") != "1"))
     except Exception as e:
         return Response(f"<h1>V2 Rapor Hatasi</h1><p>{e}</p><p><a href='/'>Ana sayfaya don</a></p>", status=500, mimetype="text/html")
 
@@ -2162,12 +2285,13 @@ def report_standalone():
     """Son hesaplanan standart raporu standalone sayfada göster"""
     if not _is_auth():
         return _redirect_login()
-    result = ws.STATE.get("last_result")
+    entry = result_store.STORE.get(_result_key())
+    result = entry.get("last_result")
     if not result:
         return Response("<h1>Henuz hesaplama yapilmadi</h1><p><a href='/'>Ana sayfaya don</a></p>", status=404, mimetype="text/html")
     try:
-        html = ws.render_tables(result, standalone=True)
-        return Response(html, mimetype="text/html")
+        return _html_response(report_variants.stream(result, entry.get("result_hash"), "html_standalone",
+                                                     virtual_tables=request.args.get("full") != "1"))
     except Exception as e:
         return Response(f"<h1>Rapor Hatasi</h1><p>{e}</p><p><a href='/'>Ana sayfaya don</a></p>", status=500, mimetype="text/html")
 
@@ -2306,6 +2430,8 @@ def test_ai():
 
 # Uygulama başlarken DB'yi hazırla
 auth.init_db()
+# Bologna verilerinin zamanlanmış yenilenmesi (AKREDIX_BOLOGNA_RESYNC_INTERVAL=0 kapatır)
+bologna_sync.start_scheduler()
 
 if __name__ == "__main__":
     print("AkrediX Sistemi")
@@ -0,0 +1,182 @@
+"""
+AkrediX - Rapor Artifact Önbelleği
+Üretilmiş PDF'lerin içerik adresli (content-addressed) disk önbelleği
+
+Anahtar: (rapor id'si veya sonuç hash'i, üretici/renderer, şablon sürümü).
+Aynı anahtar için ikinci istek yeniden render yerine dosya okumasıdır.
+Dizin toplam boyutu AKREDIX_ARTIFACT_MAX_BYTES'ı aşınca en eski erişilen
+dosyalar silinir. Bir kayda bağlı dosyalar (ör. kayıtlı raporun sayfaları ve
+PDF'leri) group ile ayrı bir alt dizine yazılır; kayıt silinince discard(group)
+hepsini birlikte kaldırır.
+Boyut taraması her yazımda değil, EVICT_EVERY_BYTES kadar yazıldıktan ya da
+EVICT_INTERVAL geçtikten sonra yapılır; çöken worker'ların bıraktığı geçici
+dosyalar (.<anahtar>...tmp) TMP_MAX_AGE'den eskiyse taramada silinir.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+ARTIFACT_DIR = Path(os.environ.get("AKREDIX_ARTIFACT_DIR", str(Path(__file__).parent / "artifacts")))
+ARTIFACT_MAX_BYTES = int(os.environ.get("AKREDIX_ARTIFACT_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# Boyut taraması sıklığı: bu kadar bayt yazıldıktan ya da bu kadar saniye geçtikten sonra
+EVICT_EVERY_BYTES = int(os.environ.get("AKREDIX_ARTIFACT_EVICT_EVERY_BYTES", str(ARTIFACT_MAX_BYTES // 20)))
+EVICT_INTERVAL = float(os.environ.get("AKREDIX_ARTIFACT_EVICT_INTERVAL", "300"))
+# Bu süreden eski geçici dosyalar yarım kalmış üretimdir (saniye)
+TMP_MAX_AGE = float(os.environ.get("AKREDIX_ARTIFACT_TMP_MAX_AGE", "3600"))
+# Anahtar kilitleri sabit sayıda şeride dağıtılır - anahtar başına kilit birikmez
+LOCK_STRIPES = 64
+
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+_evict_guard = threading.Lock()
+_written_since_evict = 0
+_last_evict = 0.0
+
+
+def result_hash(result: dict) -> str:
+    """Sonuç sözlüğünün kanonik hash'i (aynı veri -> aynı hash)"""
+    canonical = json.dumps(result, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def artifact_key(*parts) -> str:
+    """Anahtar parçalarından içerik adresi üret"""
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+def artifact_path(key: str, suffix: str = ".pdf", group: str = None) -> Path:
+    # İlk iki karakterle alt dizin - tek dizinde binlerce dosya olmasın; gruplu dosyalar grubun dizininde
+    return ARTIFACT_DIR / (group or key[:2]) / f"{key}{suffix}"
+
+
+def _key_lock(key: str) -> threading.Lock:
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def lookup(key: str, suffix: str = ".pdf", group: str = None):
+    """Önbellekte varsa dosya yolunu döndür (erişim zamanını günceller), yoksa None"""
+    path = artifact_path(key, suffix, group)
+    if path.exists():
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+    return None
+
+
+def get_or_create(key: str, producer, suffix: str = ".pdf", group: str = None, rekey=None, place=None):
+    """Anahtarın dosyasını getir; yoksa producer(tmp_path) ile üret.
+
+    producer geçici yola yazar; dosya ancak başarıyla oluşursa yerine taşınır,
+    böylece yarım yazılmış bir PDF başka bir worker'a servis edilmez.
+    rekey verilirse dosya rekey(producer'ın dönüşü) anahtarıyla saklanır - ör. yedek
+    renderer'ın çıktısı istenen renderer'ın anahtarını doldurmaz, sonraki istek yeniden dener.
+    place verilirse dosya place(taşı) ile yerine konur; place taşımadan False dönerse
+    (ör. kayıt bu arada silindi) dosya saklanmaz ve None döner.
+    """
+    path = lookup(key, suffix, group)
+    if path:
+        return path
+
+    with _key_lock(key):
+        path = lookup(key, suffix, group)
+        if path:
+            return path
+        path = artifact_path(key, suffix, group)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp{suffix}")
+        try:
+            produced = producer(tmp_path)
+            if not tmp_path.exists() or tmp_path.stat().st_size == 0:
+                return None
+            if rekey is not None:
+                path = artifact_path(rekey(produced), suffix, group)
+                path.parent.mkdir(parents=True, exist_ok=True)
+            if place is None:
+                os.replace(tmp_path, path)
+            elif not place(lambda: _place(tmp_path, path)):
+                return None
+        finally:
+            for leftover in (tmp_path, tmp_path.with_suffix(".html")):
+                try:
+                    leftover.unlink()
+                except OSError:
+                    pass
+
+    _maybe_evict(path)
+    return path
+
+
+def _place(tmp_path: Path, path: Path):
+    # discard() grubun dizinini bu arada silmiş olabilir
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+def discard(group: str):
+    """Gruba ait tüm dosyaları sil (kayıt silindi)"""
+    try:
+        shutil.rmtree(ARTIFACT_DIR / group)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"[artifact_cache] {group} silinemedi: {e}", file=sys.stderr, flush=True)
+
+
+def _maybe_evict(path: Path):
+    """Yeni dosyanın boyutunu say; eşik ya da süre dolduysa evict()"""
+    global _written_since_evict, _last_evict
+    try:
+        size = path.stat().st_size
+    except OSError:
+        size = 0
+    now = time.monotonic()
+    with _evict_guard:
+        _written_since_evict += size
+        if _written_since_evict < EVICT_EVERY_BYTES and now - _last_evict < EVICT_INTERVAL:
+            return
+        _written_since_evict = 0
+        _last_evict = now
+    evict()
+
+
+def evict(max_bytes: int = None):
+    """Toplam boyut sınırı aşıldıysa en eski erişilen dosyaları sil; eski geçici dosyaları temizle"""
+    max_bytes = ARTIFACT_MAX_BYTES if max_bytes is None else max_bytes
+    if not ARTIFACT_DIR.exists():
+        return
+    files = []
+    total = 0
+    now = time.time()
+    for f in ARTIFACT_DIR.glob("*/*"):
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        if f.name.startswith("."):
+            # Yarım kalmış üretim: süren bir üretimin dosyasına dokunma
+            if ".tmp" in f.name and now - st.st_mtime > TMP_MAX_AGE:
+                try:
+                    f.unlink()
+                except OSError:
+                    pass
+            continue
+        files.append((st.st_atime, st.st_mtime, st.st_size, f))
+        total += st.st_size
+    if total <= max_bytes:
+        return
+    files.sort(key=lambda x: max(x[0], x[1]))
+    for _, _, size, f in files:
+        if total <= max_bytes:
+            break
+        try:
+            f.unlink()
+            total -= size
+        except OSError as e:
+            print(f"[artifact_cache] silinemedi {f}: {e}", file=sys.stderr, flush=True)
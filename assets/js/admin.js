@@ -0,0 +1,513 @@
+function showPanel(panelId) {
+  document.querySelectorAll('.content-panel').forEach(p => p.classList.remove('active'));
+  document.querySelectorAll('.nav-item').forEach(n => n.classList.remove('active'));
+  document.getElementById('panel-' + panelId).classList.add('active');
+  event.target.classList.add('active');
+}
+
+function updateRole(email, newRole) {
+  fetch('/admin/role', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+    body: 'email=' + encodeURIComponent(email) + '&role=' + encodeURIComponent(newRole)
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Rol güncellendi!', 'success');
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function deleteUser(email) {
+  if (confirm('Bu kullanıcıyı silmek istediğinizden emin misiniz?\n' + email)) {
+    fetch('/admin/delete-user', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+      body: 'email=' + encodeURIComponent(email)
+    }).then(r => r.json()).then(data => {
+      if (data.success) location.reload();
+      else alert('Hata: ' + data.error);
+    });
+  }
+}
+
+// ============ DERS ATAMA FONKSİYONLARI ============
+let currentUserEmail = '';
+
+function openUserCoursesModal(email, fullName) {
+  currentUserEmail = email;
+  document.getElementById('userCoursesModalTitle').textContent = fullName || email;
+  document.getElementById('userCoursesModal').style.display = 'flex';
+  loadUserCourses(email);
+}
+
+function closeUserCoursesModal() {
+  document.getElementById('userCoursesModal').style.display = 'none';
+  currentUserEmail = '';
+}
+
+function loadUserCourses(email) {
+  const container = document.getElementById('userCoursesList');
+  container.innerHTML = '<p style="color:#64748b;">Yükleniyor...</p>';
+
+  fetch('/api/user-courses/' + encodeURIComponent(email))
+    .then(r => r.json())
+    .then(data => {
+      if (data.error) {
+        container.innerHTML = '<p style="color:#dc2626;">Hata: ' + data.error + '</p>';
+        return;
+      }
+
+      if (!data.courses || data.courses.length === 0) {
+        container.innerHTML = '<p style="color:#64748b;">Henüz ders atanmamış.</p>';
+        return;
+      }
+
+      let html = '<table style="width:100%;font-size:0.85rem;"><thead><tr><th>Kod</th><th>Ders Adı</th><th>İşlem</th></tr></thead><tbody>';
+      data.courses.forEach(c => {
+        html += '<tr><td><strong>' + c.course_code + '</strong></td><td>' + (c.course_name || '-') + '</td>';
+        html += '<td><button onclick="removeCourseFromUser(\'' + c.course_code + '\')" style="background:#dc2626;color:white;border:none;padding:0.25rem 0.5rem;border-radius:4px;cursor:pointer;font-size:0.75rem;">Kaldır</button></td></tr>';
+      });
+      html += '</tbody></table>';
+      container.innerHTML = html;
+    })
+    .catch(err => {
+      container.innerHTML = '<p style="color:#dc2626;">Hata: ' + err.message + '</p>';
+    });
+}
+
+function assignCourseToUser() {
+  const courseCode = document.getElementById('assignCourseSelect').value;
+  if (!courseCode || !currentUserEmail) {
+    alert('Lütfen bir ders seçin');
+    return;
+  }
+
+  fetch('/api/assign-course', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ email: currentUserEmail, course_code: courseCode })
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Ders atandı!', 'success');
+      loadUserCourses(currentUserEmail);
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function removeCourseFromUser(courseCode) {
+  if (!confirm('Bu dersi kullanıcıdan kaldırmak istiyor musunuz?')) return;
+
+  fetch('/api/remove-course', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ email: currentUserEmail, course_code: courseCode })
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Ders kaldırıldı!', 'success');
+      loadUserCourses(currentUserEmail);
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function filterUsers(query) {
+  const rows = document.querySelectorAll('#usersTable tbody tr');
+  query = query.toLowerCase();
+  rows.forEach(row => {
+    const text = row.textContent.toLowerCase();
+    row.style.display = text.includes(query) ? '' : 'none';
+  });
+}
+
+function addNewUser(e) {
+  e.preventDefault();
+  const form = e.target;
+  const data = new FormData(form);
+
+  fetch('/admin/add-user', {
+    method: 'POST',
+    body: data
+  }).then(r => r.json()).then(result => {
+    if (result.success) {
+      showNotification('Kullanıcı eklendi!', 'success');
+      setTimeout(() => location.reload(), 1000);
+    } else {
+      showNotification('Hata: ' + result.error, 'error');
+    }
+  });
+}
+
+function updateCourseLink(courseCode, link) {
+  fetch('/admin/update-link', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+    body: 'course_code=' + encodeURIComponent(courseCode) + '&bologna_link=' + encodeURIComponent(link)
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Link güncellendi!', 'success');
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function editCourseData(courseCode) {
+  window.location.href = '/profile?course=' + courseCode;
+}
+
+function addDepartment(e) {
+  e.preventDefault();
+  const form = e.target;
+  const data = new FormData(form);
+
+  fetch('/admin/add-department', {
+    method: 'POST',
+    body: data
+  }).then(r => r.json()).then(result => {
+    if (result.success) {
+      showNotification('Bölüm eklendi!', 'success');
+      setTimeout(() => location.reload(), 1000);
+    } else {
+      showNotification('Hata: ' + result.error, 'error');
+    }
+  });
+}
+
+function fetchPeaPocFromBologna(deptId) {
+  showNotification('Bologna\'dan veriler çekiliyor...', 'info');
+
+  fetch('/admin/fetch-pea-poc/' + deptId)
+    .then(r => r.json())
+    .then(data => {
+      if (data.success) {
+        // Bu bölüme ait textarea'ları bul
+        const card = document.getElementById('dept-card-' + deptId);
+        if (card) {
+          const peaTextarea = card.querySelector('[name="peas_text"]');
+          const pocTextarea = card.querySelector('[name="pocs_text"]');
+          if (peaTextarea && data.pea_text) peaTextarea.value = data.pea_text;
+          if (pocTextarea && data.poc_text) pocTextarea.value = data.poc_text;
+        }
+        showNotification('PEA ve PÖÇ Bologna\'dan yüklendi!', 'success');
+      } else {
+        showNotification('Hata: ' + (data.error || 'Veri çekilemedi'), 'error');
+      }
+    });
+}
+
+function showNotification(message, type) {
+  const div = document.createElement('div');
+  div.className = 'alert alert-' + type;
+  div.style.cssText = 'position:fixed;top:1rem;right:1rem;z-index:9999;min-width:300px;';
+  div.textContent = message;
+  document.body.appendChild(div);
+  setTimeout(() => div.remove(), 3000);
+}
+
+function deleteDepartment(deptId, deptName) {
+  if (!confirm('Bu bölümü silmek istediğinizden emin misiniz?\n\nBölüm: ' + deptName + '\n\nBu işlem geri alınamaz!')) {
+    return;
+  }
+
+  fetch('/admin/delete-department', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+    body: 'dept_id=' + encodeURIComponent(deptId)
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Bölüm silindi!', 'success');
+      document.getElementById('dept-card-' + deptId).remove();
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function editDepartment(deptId) {
+  const editForm = document.getElementById('edit-form-' + deptId);
+  if (editForm) {
+    editForm.style.display = editForm.style.display === 'none' ? 'block' : 'none';
+  }
+}
+
+function cancelDepartmentEdit(deptId) {
+  const editForm = document.getElementById('edit-form-' + deptId);
+  if (editForm) {
+    editForm.style.display = 'none';
+  }
+}
+
+function saveDepartmentEdit(deptId) {
+  const name = document.getElementById('edit-name-' + deptId).value;
+  const faculty = document.getElementById('edit-faculty-' + deptId).value;
+  const coursesUrl = document.getElementById('edit-courses-url-' + deptId).value;
+  const peaUrl = document.getElementById('edit-pea-url-' + deptId).value;
+  const pocUrl = document.getElementById('edit-poc-url-' + deptId).value;
+
+  const formData = new FormData();
+  formData.append('dept_id', deptId);
+  formData.append('name', name);
+  formData.append('faculty', faculty);
+  formData.append('bologna_courses_url', coursesUrl);
+  formData.append('bologna_pea_url', peaUrl);
+  formData.append('bologna_poc_url', pocUrl);
+
+  fetch('/admin/update-department', {
+    method: 'POST',
+    body: formData
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Bölüm güncellendi!', 'success');
+      setTimeout(() => location.reload(), 1000);
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+// ===== DERS YÖNETİMİ FONKSİYONLARI =====
+
+function toggleCourseForm(deptId) {
+  const form = document.getElementById('course-form-' + deptId);
+  if (form) {
+    form.style.display = form.style.display === 'none' ? 'block' : 'none';
+  }
+}
+
+function addCourse(deptId) {
+  const code = document.getElementById('new-course-code-' + deptId).value.trim();
+  const name = document.getElementById('new-course-name-' + deptId).value.trim();
+  const semester = document.getElementById('new-course-semester-' + deptId).value;
+  const akts = document.getElementById('new-course-akts-' + deptId).value;
+  const link = document.getElementById('new-course-link-' + deptId).value.trim();
+
+  if (!code || !name) {
+    showNotification('Ders kodu ve adı zorunlu!', 'error');
+    return;
+  }
+
+  const formData = new FormData();
+  formData.append('dept_id', deptId);
+  formData.append('course_code', code);
+  formData.append('course_name', name);
+  formData.append('semester', semester);
+  formData.append('akts', akts);
+  formData.append('course_type', 'Z');
+  formData.append('bologna_link', link);
+
+  fetch('/admin/add-course', {
+    method: 'POST',
+    body: formData
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Ders eklendi!', 'success');
+      toggleCourseForm(deptId);
+      loadDepartmentCourses(deptId);
+      refreshCourseOptionsInModal();  // Modal'daki ders listesini güncelle
+      // Formu temizle
+      document.getElementById('new-course-code-' + deptId).value = '';
+      document.getElementById('new-course-name-' + deptId).value = '';
+      document.getElementById('new-course-link-' + deptId).value = '';
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+function loadDepartmentCourses(deptId) {
+  const container = document.getElementById('courses-list-' + deptId);
+  if (!container) return;
+
+  container.innerHTML = '<p style="padding:1rem; color:#64748b; text-align:center;">Yükleniyor...</p>';
+
+  fetch('/api/department-courses/' + deptId)
+    .then(r => r.json())
+    .then(data => {
+      if (data.error) {
+        container.innerHTML = '<p style="padding:1rem; color:#dc2626;">Hata: ' + data.error + '</p>';
+        return;
+      }
+
+      const courses = data.courses || {};
+      const total = data.total || 0;
+
+      if (total === 0) {
+        container.innerHTML = '<p style="padding:1rem; color:#64748b; text-align:center;">Henüz ders eklenmemiş.</p>';
+        return;
+      }
+
+      let html = '<table style="width:100%; border-collapse:collapse; font-size:0.85rem;">';
+      html += '<thead><tr style="background:#e2e8f0;"><th style="padding:0.5rem; text-align:left;">YY</th><th style="padding:0.5rem; text-align:left;">Kod</th><th style="padding:0.5rem; text-align:left;">Ders Adı</th><th style="padding:0.5rem; text-align:center;">AKTS</th><th style="padding:0.5rem; text-align:left;">Bologna Link</th><th style="padding:0.5rem; text-align:center;">İşlem</th></tr></thead>';
+      html += '<tbody>';
+
+      // Yarıyıla göre sırala
+      const semesters = Object.keys(courses).sort((a, b) => parseInt(a) - parseInt(b));
+      for (const sem of semesters) {
+        const semCourses = courses[sem];
+        for (const c of semCourses) {
+          const safeCode = c.code.replace(/'/g, "\\'");
+          html += '<tr style="border-bottom:1px solid #e2e8f0;" id="course-row-' + c.code + '">';
+          html += '<td style="padding:0.4rem; width:40px;">' + sem + '</td>';
+          html += '<td style="padding:0.4rem; font-weight:600; width:80px;">' + c.code + '</td>';
+          html += '<td style="padding:0.4rem;"><input type="text" id="course-name-' + c.code + '" value="' + (c.name || '').replace(/"/g, '&quot;') + '" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.8rem;"></td>';
+          html += '<td style="padding:0.4rem; width:60px;"><input type="number" id="course-akts-' + c.code + '" value="' + (c.akts || 5) + '" min="1" max="30" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.8rem; text-align:center;"></td>';
+          html += '<td style="padding:0.4rem;"><input type="url" id="course-link-' + c.code + '" value="' + (c.bologna_link || '').replace(/"/g, '&quot;') + '" placeholder="Bologna URL" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.75rem;"></td>';
+          html += '<td style="padding:0.4rem; text-align:center; width:80px; white-space:nowrap;">';
+          html += '<button onclick="saveCourseUpdate(\'' + safeCode + '\', \'' + deptId + '\')" class="btn-icon" title="Kaydet" style="color:#059669; border:none; background:none; cursor:pointer; font-size:1rem;">💾</button>';
+          html += '<button onclick="deleteCourseFromDept(\'' + safeCode + '\', \'' + deptId + '\')" class="btn-icon" title="Sil" style="color:#dc2626; border:none; background:none; cursor:pointer; font-size:1rem;">🗑️</button>';
+          html += '</td>';
+          html += '</tr>';
+        }
+      }
+
+      html += '</tbody></table>';
+      html += '<p style="padding:0.5rem; font-size:0.75rem; color:#64748b; text-align:right;">Toplam: ' + total + ' ders</p>';
+
+      container.innerHTML = html;
+    })
+    .catch(err => {
+      container.innerHTML = '<p style="padding:1rem; color:#dc2626;">Bağlantı hatası</p>';
+    });
+}
+
+function saveCourseUpdate(courseCode, deptId) {
+  const name = document.getElementById('course-name-' + courseCode)?.value || '';
+  const akts = document.getElementById('course-akts-' + courseCode)?.value || '5';
+  const link = document.getElementById('course-link-' + courseCode)?.value || '';
+
+  if (!name.trim()) {
+    showNotification('Ders adı boş olamaz!', 'error');
+    return;
+  }
+
+  const formData = new FormData();
+  formData.append('course_code', courseCode);
+  formData.append('course_name', name.trim());
+  formData.append('akts', akts);
+  formData.append('bologna_link', link.trim());
+
+  fetch('/admin/update-course', {
+    method: 'POST',
+    body: formData
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Ders güncellendi!', 'success');
+      // Satırı yeşil yap kısa süreliğine
+      const row = document.getElementById('course-row-' + courseCode);
+      if (row) {
+        row.style.backgroundColor = '#dcfce7';
+        setTimeout(() => { row.style.backgroundColor = ''; }, 1500);
+      }
+    } else {
+      showNotification('Hata: ' + (data.error || 'Güncelleme başarısız'), 'error');
+    }
+  }).catch(() => {
+    showNotification('Bağlantı hatası!', 'error');
+  });
+}
+
+function fetchCoursesFromBologna(deptId, url) {
+  if (!url) {
+    showNotification('Bologna ders listesi URL\'si tanımlı değil!', 'error');
+    return;
+  }
+
+  if (!confirm('Bologna\'dan ders listesi çekilecek. Bu işlem mevcut dersleri etkilemez, sadece yeni dersler ekler. Devam?')) {
+    return;
+  }
+
+  showNotification('Bologna\'dan dersler çekiliyor...', 'info');
+
+  const formData = new FormData();
+  formData.append('dept_id', deptId);
+  formData.append('url', url);
+
+  fetch('/admin/fetch-courses-from-bologna', {
+    method: 'POST',
+    body: formData
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      if (data.total === 0) {
+        // Debug bilgisini göster
+        let debugMsg = 'Hiç ders bulunamadı.';
+        if (data.debug) {
+          debugMsg += '\n\nDebug: ' + data.debug.tables_found + ' tablo, ' + data.debug.rows_checked + ' satır kontrol edildi.';
+          debugMsg += '\nHTML boyutu: ' + data.debug.html_length + ' karakter';
+        }
+        showNotification(debugMsg, 'warning');
+      } else {
+        showNotification('Toplam ' + data.total + ' ders bulundu, ' + data.added + ' yeni ders eklendi!', 'success');
+        loadDepartmentCourses(deptId);
+      }
+    } else {
+      let errorMsg = data.error || 'Dersler çekilemedi';
+      if (data.traceback) {
+        console.error('Bologna fetch error:', data.traceback);
+      }
+      showNotification('Hata: ' + errorMsg, 'error');
+    }
+  }).catch(err => {
+    console.error('Bologna fetch connection error:', err);
+    showNotification('Bağlantı hatası! Konsolu kontrol edin.', 'error');
+  });
+}
+
+function deleteCourseFromDept(courseCode, deptId) {
+  if (!confirm('Bu dersi silmek istediğinizden emin misiniz?\n\nDers Kodu: ' + courseCode)) {
+    return;
+  }
+
+  const formData = new FormData();
+  formData.append('course_code', courseCode);
+
+  fetch('/admin/delete-course', {
+    method: 'POST',
+    body: formData
+  }).then(r => r.json()).then(data => {
+    if (data.success) {
+      showNotification('Ders silindi!', 'success');
+      loadDepartmentCourses(deptId);
+      refreshCourseOptionsInModal();  // Modal'daki ders listesini güncelle
+    } else {
+      showNotification('Hata: ' + data.error, 'error');
+    }
+  });
+}
+
+// Modal'daki ders seçeneklerini API'den güncelle
+function refreshCourseOptionsInModal() {
+  const select = document.getElementById('assignCourseSelect');
+  if (!select) return;
+
+  fetch('/api/all-courses')
+    .then(r => r.json())
+    .then(data => {
+      select.innerHTML = '<option value="">Ders seçin...</option>';
+      const courses = data.courses || {};
+
+      // Bölümlere göre grupla
+      Object.keys(courses).sort().forEach(deptId => {
+        const deptCourses = courses[deptId];
+        if (deptCourses && deptCourses.length > 0) {
+          const optgroup = document.createElement('optgroup');
+          optgroup.label = '📚 ' + (data.dept_names[deptId] || deptId);
+
+          deptCourses.forEach(c => {
+            const opt = document.createElement('option');
+            opt.value = c.code;
+            const semStr = c.semester ? ' [' + c.semester + '. YY]' : '';
+            opt.textContent = c.code + semStr + ' - ' + c.name;
+            optgroup.appendChild(opt);
+          });
+
+          select.appendChild(optgroup);
+        }
+      });
+    })
+    .catch(() => {});
+}
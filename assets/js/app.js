@@ -0,0 +1,1700 @@
+// Newline karakteri için sabit (Python escape sorunlarını önler)
+const NL = String.fromCharCode(10);
+
+function openHelpModal() {
+  document.getElementById('helpModal').style.display = 'block';
+  document.body.style.overflow = 'hidden';
+}
+function closeHelpModal() {
+  document.getElementById('helpModal').style.display = 'none';
+  document.body.style.overflow = 'auto';
+}
+document.getElementById('helpModal').addEventListener('click', function(e) {
+  if (e.target === this) closeHelpModal();
+});
+
+// Ölçme bileşenleri checkbox işleme
+const COMP_CONFIG = [
+  { id: 'vize', code: 'C1', name: 'Vize' },
+  { id: 'final', code: 'C2', name: 'Final' },
+  { id: 'odev', code: 'C3', name: 'Ödev' },
+  { id: 'proje', code: 'C4', name: 'Proje' },
+  { id: 'quiz', code: 'C5', name: 'Quiz' },
+  { id: 'lab', code: 'C6', name: 'Lab' },
+  { id: 'sunum', code: 'C7', name: 'Sunum' },
+  { id: 'katilim', code: 'C8', name: 'Katılım' }
+];
+
+function updateAssessments() {
+  const lines = [];
+  let totalWeight = 0;
+  
+  COMP_CONFIG.forEach(comp => {
+    const checkbox = document.getElementById('comp_' + comp.id);
+    const weightInput = document.getElementById('comp_' + comp.id + '_w');
+    
+    if (checkbox && checkbox.checked) {
+      let weight = parseFloat(weightInput?.value) || 0;
+      totalWeight += weight;
+      lines.push(comp.code + ' | ' + comp.name + ' | ' + weight);
+      
+      // Checkbox card styling
+      checkbox.closest('.checkbox-card').style.borderColor = '#667eea';
+      checkbox.closest('.checkbox-card').style.background = 'rgba(102, 126, 234, 0.1)';
+    } else if (checkbox) {
+      checkbox.closest('.checkbox-card').style.borderColor = 'transparent';
+      checkbox.closest('.checkbox-card').style.background = 'var(--bg)';
+    }
+  });
+  
+  // Textarea'yı güncelle
+  const textarea = document.querySelector('[name="assessments_text"]');
+  if (textarea && lines.length > 0) {
+    textarea.value = lines.join(NL);
+  }
+  
+  // Ağırlık uyarısı
+  const warning = document.getElementById('assessmentWeightWarning');
+  const totalSpan = document.getElementById('weightTotal');
+  if (warning && totalSpan) {
+    totalSpan.textContent = totalWeight.toFixed(2);
+    if (lines.length > 0 && Math.abs(totalWeight - 1.0) > 0.01) {
+      warning.style.display = 'block';
+    } else {
+      warning.style.display = 'none';
+    }
+  }
+}
+
+// Sayfa yüklendiğinde mevcut değerleri checkbox'lara yükle
+function loadAssessmentsToCheckboxes() {
+  const textarea = document.querySelector('[name="assessments_text"]');
+  if (!textarea || !textarea.value.trim()) return;
+  
+  const lines = textarea.value.trim().split(NL);
+  lines.forEach(line => {
+    const parts = line.split('|').map(p => p.trim());
+    if (parts.length < 3) return;
+    
+    const name = parts[1].toLowerCase();
+    const weight = parseFloat(parts[2]) || 0;
+    
+    COMP_CONFIG.forEach(comp => {
+      if (name.includes(comp.name.toLowerCase()) || name.includes(comp.id)) {
+        const checkbox = document.getElementById('comp_' + comp.id);
+        const weightInput = document.getElementById('comp_' + comp.id + '_w');
+        if (checkbox) checkbox.checked = true;
+        if (weightInput) weightInput.value = weight;
+      }
+    });
+  });
+  
+  updateAssessments();
+}
+
+// Sayfa yüklendiğinde çalıştır
+document.addEventListener('DOMContentLoaded', loadAssessmentsToCheckboxes);
+setTimeout(loadAssessmentsToCheckboxes, 100);
+
+// Tab switching
+document.querySelectorAll('.tab').forEach(tab => {
+  tab.addEventListener('click', () => {
+    const group = tab.closest('.box').querySelector('.tabs');
+    group.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+    tab.classList.add('active');
+    const contents = tab.closest('.box').querySelectorAll('.tab-content');
+    contents.forEach(c => c.classList.remove('active'));
+    document.getElementById(tab.dataset.tab).classList.add('active');
+    if (tab.dataset.tab === 'tab-questions') rebuildAllQuestions();
+    if (tab.dataset.tab === 'tab-mappings') rebuildMappingTables();
+  });
+});
+document.querySelectorAll('.collapsible').forEach(el => {
+  el.addEventListener('click', () => el.classList.toggle('collapsed'));
+});
+
+// Parse helpers - hem | hem - destekler
+function parseItems(text) {
+  if (!text || !text.trim()) return [];
+  return text.trim().split(NL).map((line, index) => {
+    line = line.trim();
+    if (!line || line.length < 2) return null;
+    
+    // Önce | ile dene
+    let parts;
+    if (line.includes('|')) {
+      parts = line.split('|');
+    } else if (line.includes(' - ')) {
+      parts = line.split(' - ');
+    } else {
+      // Hafta formatını dene: "1.Hafta: ..." veya "Hafta 1: ..."
+      const weekMatch = line.match(/^(\d+)\.?\s*[Hh]afta\s*[:\-]?\s*(.+)$/);
+      if (weekMatch) {
+        return { id: 'H' + weekMatch[1], desc: weekMatch[2].trim() };
+      }
+      const weekMatch2 = line.match(/^[Hh]afta\s*(\d+)\s*[:\-]?\s*(.+)$/);
+      if (weekMatch2) {
+        return { id: 'H' + weekMatch2[1], desc: weekMatch2[2].trim() };
+      }
+      // ID formatını dene: "DÖÇ1 açıklama" veya "PÖÇ1 açıklama"
+      const idMatch = line.match(/^([A-ZÖÜÇŞĞİa-zöüçşğı]+\d+)\s*[:\-\.]*\s*(.*)$/);
+      if (idMatch) {
+        return { id: idMatch[1].toUpperCase(), desc: idMatch[2].trim() || idMatch[1] };
+      }
+      // Hiçbiri eşleşmedi - tüm satırı ID olarak kullan
+      parts = [line, ''];
+    }
+    const id = parts[0]?.trim();
+    const desc = parts[1]?.trim() || '';
+    return id ? { id, desc } : null;
+  }).filter(Boolean);
+}
+function parseComponents(text) {
+  if (!text || !text.trim()) return [];
+  return text.trim().split(NL).map(line => {
+    // Önce | ile dene, yoksa - ile böl
+    let parts;
+    if (line.includes('|')) {
+      parts = line.split('|');
+    } else {
+      parts = line.split(' - ');
+      if (parts.length < 2) parts = line.split('-');
+    }
+    const id = parts[0]?.trim();
+    const name = parts[1]?.trim() || '';
+    return id ? { id, desc: name } : null;
+  }).filter(Boolean);
+}
+const BLOOM_LEVELS = [
+  { id: 'Bilgi', desc: 'Hatırlama' },
+  { id: 'Kavrama', desc: 'Anlama' },
+  { id: 'Uygulama', desc: 'Uygulama' },
+  { id: 'Analiz', desc: 'Çözümleme' },
+  { id: 'Sentez', desc: 'Birleştirme' },
+  { id: 'Değerlendirme', desc: 'Yargılama' }
+];
+
+function getBloomLevels() {
+  const bloomText = document.querySelector('[name="bloom_text"]')?.value || '';
+  if (!bloomText.trim()) return BLOOM_LEVELS;
+  return parseItems(bloomText);
+}
+
+let questionsData = [];
+
+function createCheckboxes(items, type, selectedValues = []) {
+  if (!items || items.length === 0) return '<div class="no-items-msg">Önce verileri girin</div>';
+  return items.map(item => {
+    const isSelected = selectedValues.includes(item.id);
+    return `<div class="cb-item ${type}-type ${isSelected ? 'selected' : ''}" data-value="${item.id}" data-type="${type}" title="${item.desc || item.id}">
+      <span class="cb-box">${isSelected ? '✓' : ''}</span><span>${item.id}</span>
+    </div>`;
+  }).join('');
+}
+
+function createCheckboxGroup(title, items, type, color, selectedValues = []) {
+  return `<div class="checkbox-group">
+    <div class="checkbox-group-title"><span class="cdot" style="background:${color}"></span>${title}</div>
+    <div class="checkbox-list" data-type="${type}">${createCheckboxes(items, type, selectedValues)}</div>
+  </div>`;
+}
+
+function createQuestionCard(index, data = {}) {
+  const num = index + 1;
+  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
+  const comps = parseComponents(document.querySelector('[name="assessments_text"]')?.value || '');
+  const blooms = getBloomLevels();
+  const curricula = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
+  
+  // Tablo formatında checkbox'lar oluştur
+  function createTableCheckboxes(items, type, color, selected = []) {
+    if (!items.length) return '<span class="text-muted" style="font-size:0.75rem;">Veri yok</span>';
+    return items.map(item => {
+      const isSelected = selected.includes(item.id);
+      return `<label class="table-cb ${isSelected ? 'selected' : ''}" style="--cb-color:${color};">
+        <input type="checkbox" ${isSelected ? 'checked' : ''} data-type="${type}" data-value="${item.id}" onchange="handleCheckboxChange(this, ${index})">
+        <span>${item.id}</span>
+      </label>`;
+    }).join('');
+  }
+  
+  return `<div class="question-card" data-index="${index}">
+    <div class="question-header" onclick="toggleQuestion(${index})">
+      <div class="question-title"><span class="num">${num}</span><span>Soru ${num}</span><span class="q-preview text-muted" style="font-weight:normal;font-size:0.75rem;"></span></div>
+      <div class="question-actions">
+        <button type="button" class="btn btn-sm btn-secondary" onclick="event.stopPropagation();duplicateQuestion(${index})">📋</button>
+        <button type="button" class="btn btn-sm btn-danger" onclick="event.stopPropagation();removeQuestion(${index})">✕</button>
+      </div>
+    </div>
+    <div class="question-body">
+      <div class="question-row">
+        <div><label style="margin-top:0">Soru ID</label><input type="text" class="q-id" value="${data.id || 'S' + num}" onchange="updateQuestionData(${index})"></div>
+        <div><label style="margin-top:0">Max Puan</label><input type="number" class="q-points" value="${data.points || '10'}" min="1" onchange="updateQuestionData(${index})"></div>
+      </div>
+      <div class="question-row" style="grid-template-columns:1fr;">
+        <div><label style="margin-top:0;font-size:0.95rem;">Metin (Opsiyonel)</label><textarea class="q-text" rows="2" style="width:100%;padding:0.7rem;font-size:0.9rem;line-height:1.4;" onchange="updateQuestionData(${index})" placeholder="Soru metni...">${data.text || ''}</textarea></div>
+      </div>
+      
+      <div class="question-mapping-table" style="margin-top:1rem;">
+        <table style="width:100%; border-collapse:collapse; font-size:0.8rem;">
+          <thead>
+            <tr style="background:var(--bg);">
+              <th style="padding:0.5rem; text-align:left; border:1px solid var(--border); width:120px;">Eşleştirme</th>
+              <th style="padding:0.5rem; text-align:left; border:1px solid var(--border);">Seçenekler</th>
+            </tr>
+          </thead>
+          <tbody>
+            <tr>
+              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#06b6d4;">📝 Ölçme Türü</td>
+              <td style="padding:0.5rem; border:1px solid var(--border);">
+                <div class="table-cb-row">${createTableCheckboxes(comps, 'comp', '#06b6d4', data.comp || [])}</div>
+              </td>
+            </tr>
+            <tr>
+              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#3b82f6;">📘 DÖÇ</td>
+              <td style="padding:0.5rem; border:1px solid var(--border);">
+                <div class="table-cb-row">${createTableCheckboxes(docs, 'doc', '#3b82f6', data.doc || [])}</div>
+              </td>
+            </tr>
+            <tr>
+              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#14b8a6;">📚 Müfredat</td>
+              <td style="padding:0.5rem; border:1px solid var(--border);">
+                <div class="table-cb-row">${createTableCheckboxes(curricula, 'curriculum', '#14b8a6', data.curriculum || [])}</div>
+              </td>
+            </tr>
+            <tr>
+              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#f59e0b;">🧠 Bloom</td>
+              <td style="padding:0.5rem; border:1px solid var(--border);">
+                <div class="table-cb-row">${createTableCheckboxes(blooms, 'bloom', '#f59e0b', data.bloom || [])}</div>
+              </td>
+            </tr>
+          </tbody>
+        </table>
+      </div>
+    </div>
+  </div>`;
+}
+
+function toggleTableCb(label, index) {
+  // Artık kullanılmıyor - handleCheckboxChange kullanılıyor
+}
+
+function handleCheckboxChange(checkbox, index) {
+  const label = checkbox.closest('.table-cb');
+  if (label) {
+    if (checkbox.checked) {
+      label.classList.add('selected');
+    } else {
+      label.classList.remove('selected');
+    }
+  }
+  updateQuestionData(index);
+}
+
+// Checkbox click handler - event delegation
+document.addEventListener('click', function(e) {
+  const cbItem = e.target.closest('.cb-item');
+  if (cbItem) {
+    e.preventDefault();
+    e.stopPropagation();
+    cbItem.classList.toggle('selected');
+    cbItem.querySelector('.cb-box').textContent = cbItem.classList.contains('selected') ? '✓' : '';
+    const questionCard = cbItem.closest('.question-card');
+    if (questionCard) updateQuestionData(parseInt(questionCard.dataset.index));
+    const mappingCard = cbItem.closest('.mapping-card');
+    if (mappingCard) collectAllMappings();
+  }
+});
+
+function getSelectedValues(container, type) {
+  const values = [];
+  // Hem eski hem yeni format için
+  container.querySelectorAll(`.cb-item.${type}-type.selected`).forEach(item => values.push(item.dataset.value));
+  // Tablo formatı için
+  container.querySelectorAll(`input[data-type="${type}"]:checked`).forEach(input => values.push(input.dataset.value));
+  return [...new Set(values)]; // Tekrarları kaldır
+}
+
+function updateQuestionData(index) {
+  const card = document.querySelector(`.question-card[data-index="${index}"]`);
+  if (!card) return;
+  questionsData[index] = {
+    id: card.querySelector('.q-id')?.value || 'S' + (index + 1),
+    points: card.querySelector('.q-points')?.value || '10',
+    text: card.querySelector('.q-text')?.value || '',
+    comp: getSelectedValues(card, 'comp'),
+    doc: getSelectedValues(card, 'doc'),
+    poc: getSelectedValues(card, 'poc'),
+    pea: getSelectedValues(card, 'pea'),
+    bloom: getSelectedValues(card, 'bloom'),
+    tyc: getSelectedValues(card, 'tyc'),
+    stark: getSelectedValues(card, 'stark'),
+    curriculum: getSelectedValues(card, 'curriculum')
+  };
+  updateQuestionPreview(index);
+  collectAllQuestions();
+}
+
+function updateQuestionPreview(index) {
+  const card = document.querySelector(`.question-card[data-index="${index}"]`);
+  if (!card) return;
+  const data = questionsData[index] || {};
+  const parts = [];
+  if (data.doc?.length) parts.push(data.doc.join(','));
+  if (data.bloom?.length) parts.push(data.bloom.join(','));
+  card.querySelector('.q-preview').textContent = parts.length ? `(${parts.join(' • ')})` : '';
+}
+
+function addQuestion(data = {}) {
+  const index = questionsData.length;
+  questionsData.push({
+    id: data.id || 'S' + (index + 1), points: data.points || '10', text: data.text || '',
+    comp: data.comp || [], doc: data.doc || [], poc: data.poc || [], pea: data.pea || [],
+    bloom: data.bloom || [], tyc: data.tyc || [], stark: data.stark || [], curriculum: data.curriculum || []
+  });
+  rebuildAllQuestions();
+  collectAllQuestions();
+}
+
+function removeQuestion(index) {
+  if (!confirm('Bu soruyu silmek istediğinizden emin misiniz?')) return;
+  questionsData.splice(index, 1);
+  questionsData.forEach((q, i) => { if (q.id.match(/^S\d+$/)) q.id = 'S' + (i + 1); });
+  rebuildAllQuestions();
+  collectAllQuestions();
+}
+
+function duplicateQuestion(index) {
+  const original = questionsData[index];
+  if (!original) return;
+  const newData = JSON.parse(JSON.stringify(original));
+  newData.id = 'S' + (questionsData.length + 1);
+  questionsData.push(newData);
+  rebuildAllQuestions();
+  collectAllQuestions();
+}
+
+function toggleQuestion(index) {
+  const card = document.querySelector(`.question-card[data-index="${index}"]`);
+  if (card) card.classList.toggle('collapsed');
+}
+
+function rebuildAllQuestions() {
+  const container = document.getElementById('questions-container');
+  if (!container) return;
+  container.innerHTML = questionsData.map((data, index) => createQuestionCard(index, data)).join('');
+  const summary = document.getElementById('questions-summary');
+  if (summary) summary.querySelector('.count').textContent = questionsData.length;
+  questionsData.forEach((_, i) => updateQuestionPreview(i));
+}
+
+// ============ YENİ TABLO BAZLI EŞLEŞTİRMELER ============
+
+function buildDocMappingTable() {
+  const container = document.getElementById('doc-mapping-table');
+  if (!container) return;
+  
+  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
+  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
+  
+  if (!docs.length) {
+    container.innerHTML = '<p class="helper">Önce Çıktılar sekmesinden DÖÇ verilerini girin.</p>';
+    return;
+  }
+  
+  // Mevcut eşleştirmeleri yükle
+  const docTycMap = parseMapText(document.querySelector('[name="doc_tyc_map_text"]')?.value || '');
+  const docStarkMap = parseMapText(document.querySelector('[name="doc_stark_map_text"]')?.value || '');
+  const docPocMap = parseMapText(document.querySelector('[name="doc_poc_weights_text"]')?.value || '');
+  const docPeaMap = parseMapText(document.querySelector('[name="doc_pea_map_text"]')?.value || '');
+  
+  let html = '<table class="mapping-table"><thead><tr>';
+  html += '<th class="row-header">DÖÇ</th>';
+  
+  // TYÇ başlıkları
+  if (tycs.length) {
+    html += `<th colspan="${tycs.length}" style="background:#2563eb;">TYÇ</th>`;
+  }
+  // STAR-K başlıkları
+  if (starks.length) {
+    html += `<th colspan="${starks.length}" style="background:#7c2d12;">STAR-K</th>`;
+  }
+  // PÖÇ başlıkları
+  if (pocs.length) {
+    html += `<th colspan="${pocs.length}" style="background:#065f46;">PÖÇ</th>`;
+  }
+  // PEA başlıkları
+  if (peas.length) {
+    html += `<th colspan="${peas.length}" style="background:#7c3aed;">PEA</th>`;
+  }
+  html += '</tr><tr><th></th>';
+  
+  // Alt başlıklar
+  tycs.forEach(t => { html += `<th style="background:#3b82f6; font-size:0.7rem;">${t.id}</th>`; });
+  starks.forEach(s => { html += `<th style="background:#9c4221; font-size:0.7rem;">${s.id}</th>`; });
+  pocs.forEach(p => { html += `<th style="background:#047857; font-size:0.7rem;">${p.id}</th>`; });
+  peas.forEach(p => { html += `<th style="background:#8b5cf6; font-size:0.7rem;">${p.id}</th>`; });
+  html += '</tr></thead><tbody>';
+  
+  // Her DÖÇ için satır
+  docs.forEach(doc => {
+    html += `<tr><td class="row-label" title="${doc.text || ''}">${doc.id}</td>`;
+    
+    // TYÇ checkboxları
+    tycs.forEach(t => {
+      const checked = (docTycMap[doc.id] || []).includes(t.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${t.id}', 'tyc', this.checked)"></td>`;
+    });
+    
+    // STAR-K checkboxları
+    starks.forEach(s => {
+      const checked = (docStarkMap[doc.id] || []).includes(s.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${s.id}', 'stark', this.checked)"></td>`;
+    });
+    
+    // PÖÇ checkboxları
+    pocs.forEach(p => {
+      const checked = (docPocMap[doc.id] || []).includes(p.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${p.id}', 'poc', this.checked)"></td>`;
+    });
+    
+    // PEA checkboxları
+    peas.forEach(p => {
+      const checked = (docPeaMap[doc.id] || []).includes(p.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${p.id}', 'pea', this.checked)"></td>`;
+    });
+    
+    html += '</tr>';
+  });
+  
+  html += '</tbody></table>';
+  container.innerHTML = html;
+}
+
+function buildCurriculumMappingTable() {
+  const container = document.getElementById('curriculum-mapping-table');
+  if (!container) return;
+  
+  const curriculum = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
+  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
+  
+  if (!curriculum.length) {
+    container.innerHTML = '<p class="helper">Önce Çıktılar sekmesinden Müfredat verilerini girin.</p>';
+    return;
+  }
+  
+  // Mevcut eşleştirmeleri yükle
+  const currTycMap = parseMapText(document.querySelector('[name="curriculum_tyc_map_text"]')?.value || '');
+  const currStarkMap = parseMapText(document.querySelector('[name="curriculum_stark_map_text"]')?.value || '');
+  const currPocMap = parseMapText(document.querySelector('[name="curriculum_poc_map_text"]')?.value || '');
+  const currPeaMap = parseMapText(document.querySelector('[name="curriculum_pea_map_text"]')?.value || '');
+  
+  let html = '<table class="mapping-table"><thead><tr>';
+  html += '<th class="row-header">Müfredat</th>';
+  
+  if (tycs.length) html += `<th colspan="${tycs.length}" style="background:#2563eb;">TYÇ</th>`;
+  if (starks.length) html += `<th colspan="${starks.length}" style="background:#7c2d12;">STAR-K</th>`;
+  if (pocs.length) html += `<th colspan="${pocs.length}" style="background:#065f46;">PÖÇ</th>`;
+  if (peas.length) html += `<th colspan="${peas.length}" style="background:#7c3aed;">PEA</th>`;
+  
+  html += '</tr><tr><th></th>';
+  tycs.forEach(t => { html += `<th style="background:#3b82f6; font-size:0.7rem;">${t.id}</th>`; });
+  starks.forEach(s => { html += `<th style="background:#9c4221; font-size:0.7rem;">${s.id}</th>`; });
+  pocs.forEach(p => { html += `<th style="background:#047857; font-size:0.7rem;">${p.id}</th>`; });
+  peas.forEach(p => { html += `<th style="background:#8b5cf6; font-size:0.7rem;">${p.id}</th>`; });
+  html += '</tr></thead><tbody>';
+  
+  curriculum.forEach(curr => {
+    html += `<tr><td class="row-label" title="${curr.text || ''}">${curr.id}</td>`;
+    
+    tycs.forEach(t => {
+      const checked = (currTycMap[curr.id] || []).includes(t.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${t.id}', 'tyc', this.checked)"></td>`;
+    });
+    starks.forEach(s => {
+      const checked = (currStarkMap[curr.id] || []).includes(s.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${s.id}', 'stark', this.checked)"></td>`;
+    });
+    pocs.forEach(p => {
+      const checked = (currPocMap[curr.id] || []).includes(p.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${p.id}', 'poc', this.checked)"></td>`;
+    });
+    peas.forEach(p => {
+      const checked = (currPeaMap[curr.id] || []).includes(p.id) ? 'checked' : '';
+      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${p.id}', 'pea', this.checked)"></td>`;
+    });
+    
+    html += '</tr>';
+  });
+  
+  html += '</tbody></table>';
+  container.innerHTML = html;
+}
+
+function updateDocMapping(docId, targetId, targetType, isChecked) {
+  const fieldName = targetType === 'tyc' ? 'doc_tyc_map_text' : 
+                    targetType === 'stark' ? 'doc_stark_map_text' :
+                    targetType === 'poc' ? 'doc_poc_weights_text' : 'doc_pea_map_text';
+  updateMappingField(fieldName, docId, targetId, isChecked);
+}
+
+function updateCurriculumMapping(currId, targetId, targetType, isChecked) {
+  const fieldName = targetType === 'tyc' ? 'curriculum_tyc_map_text' : 
+                    targetType === 'stark' ? 'curriculum_stark_map_text' :
+                    targetType === 'poc' ? 'curriculum_poc_map_text' : 'curriculum_pea_map_text';
+  updateMappingField(fieldName, currId, targetId, isChecked);
+}
+
+function updateMappingField(fieldName, sourceId, targetId, isChecked) {
+  const field = document.querySelector(`[name="${fieldName}"]`);
+  if (!field) return;
+  
+  const map = parseMapText(field.value);
+  if (!map[sourceId]) map[sourceId] = [];
+  
+  if (isChecked) {
+    if (!map[sourceId].includes(targetId)) map[sourceId].push(targetId);
+  } else {
+    map[sourceId] = map[sourceId].filter(v => v !== targetId);
+  }
+  
+  // Map'i text'e çevir - gerçek newline kullan
+  const lines = Object.entries(map)
+    .filter(([k, v]) => v.length > 0)
+    .map(([k, v]) => `${k} | ${v.join(', ')}`);
+  field.value = lines.join(NL);
+  
+  // Otomatik kayıt tetikle
+  if (typeof triggerAutoSave === 'function') triggerAutoSave();
+}
+
+function rebuildMappingTables() {
+  buildDocMappingTable();
+  buildCurriculumMappingTable();
+  rebuildAllMappings(); // Eski sistemle uyumluluk
+}
+
+// ============ ESKİ SİSTEM ============
+
+function collectAllQuestions() {
+  const lines = [];
+  questionsData.forEach(q => {
+    // Soru ID varsa kaydet (DÖÇ zorunlu değil)
+    if (q.id) {
+      lines.push([
+        q.id, 
+        '', 
+        (q.comp||[]).join(','), 
+        (q.doc||[]).join(','), 
+        (q.poc||[]).join(','), 
+        (q.pea||[]).join(','), 
+        (q.bloom||[]).join(','), 
+        q.points || '10', 
+        q.text || '', 
+        (q.tyc||[]).join(','), 
+        (q.stark||[]).join(','), 
+        (q.curriculum||[]).join(',')
+      ].join(' | '));
+    }
+  });
+  const hidden = document.querySelector('[name="question_map_text"]');
+  if (hidden) {
+    hidden.value = lines.join(NL);
+    // Otomatik kayıt tetikle
+    debounceAutoSave();
+  }
+}
+
+// Mappings
+function createMappingCard(title, sourceItems, targetItems, sourceType, targetType, existingMap = {}) {
+  if (!sourceItems?.length) return `<div class="mapping-card"><h4>${title}</h4><div class="no-items-msg">Önce kaynak verileri girin</div></div>`;
+  if (!targetItems?.length) return `<div class="mapping-card"><h4>${title}</h4><div class="no-items-msg">Önce hedef verileri girin</div></div>`;
+  const rows = sourceItems.map(source => {
+    const selected = existingMap[source.id] || [];
+    const checkboxes = targetItems.map(target => {
+      const isSelected = selected.includes(target.id);
+      return `<div class="cb-item ${targetType}-type ${isSelected ? 'selected' : ''}" data-value="${target.id}" data-source="${source.id}" data-map-type="${sourceType}-${targetType}">
+        <span class="cb-box">${isSelected ? '✓' : ''}</span><span>${target.id}</span>
+      </div>`;
+    }).join('');
+    return `<div class="mapping-row"><div class="mapping-source">${source.id}</div><div class="mapping-targets">${checkboxes}</div></div>`;
+  }).join('');
+  return `<div class="mapping-card" data-source-type="${sourceType}" data-target-type="${targetType}"><h4>${title}</h4>${rows}</div>`;
+}
+
+function parseMapText(text) {
+  const map = {};
+  if (!text) return map;
+  // Hem \n hem de gerçek newline karakterini destekle
+  text.trim().split(NL).forEach(line => {
+    const parts = line.split('|');
+    if (parts.length >= 2) {
+      const key = parts[0].trim();
+      const values = parts[1].split(',').map(v => v.trim().split(':')[0]).filter(Boolean);
+      if (key && values.length) map[key] = values;
+    }
+  });
+  return map;
+}
+
+function rebuildAllMappings() {
+  const container = document.getElementById('mappings-container');
+  if (!container) return;
+  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
+  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
+  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+  const docTycMap = parseMapText(document.querySelector('[name="doc_tyc_map_text"]')?.value || '');
+  const pocTycMap = parseMapText(document.querySelector('[name="poc_tyc_map_text"]')?.value || '');
+  const peaStarkMap = parseMapText(document.querySelector('[name="pea_stark_map_text"]')?.value || '');
+  const docPocMap = parseMapText(document.querySelector('[name="doc_poc_weights_text"]')?.value || '');
+  const pocPeaMap = parseMapText(document.querySelector('[name="poc_pea_map_text"]')?.value || '');
+  container.innerHTML = `
+    ${createMappingCard('🔗 DÖÇ → TYÇ', docs, tycs, 'doc', 'tyc', docTycMap)}
+    ${createMappingCard('🔗 PÖÇ → TYÇ', pocs, tycs, 'poc', 'tyc', pocTycMap)}
+    ${createMappingCard('🔗 PEA → STAR-K', peas, starks, 'pea', 'stark', peaStarkMap)}
+    ${createMappingCard('🔗 DÖÇ → PÖÇ', docs, pocs, 'doc', 'poc', docPocMap)}
+    ${createMappingCard('🔗 PÖÇ → PEA', pocs, peas, 'poc', 'pea', pocPeaMap)}
+  `;
+  
+  // Müfredat-DÖÇ eşleştirmesi
+  const currDocContainer = document.getElementById('curriculum-doc-container');
+  if (currDocContainer) {
+    const curriculum = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
+    const currDocMap = parseMapText(document.querySelector('[name="curriculum_doc_map_text"]')?.value || '');
+    currDocContainer.innerHTML = createMappingCard('📚 Müfredat → DÖÇ', curriculum, docs, 'curriculum', 'doc', currDocMap);
+  }
+}
+
+function collectAllMappings() {
+  collectMapping('doc', 'tyc', 'doc_tyc_map_text');
+  collectMapping('doc', 'stark', 'doc_stark_map_text');
+  collectMapping('doc', 'pea', 'doc_pea_map_text');
+  collectMapping('poc', 'tyc', 'poc_tyc_map_text');
+  collectMapping('pea', 'stark', 'pea_stark_map_text');
+  collectMappingWithWeight('doc', 'poc', 'doc_poc_weights_text');
+  collectMapping('poc', 'pea', 'poc_pea_map_text');
+  collectCurriculumDocMapping();
+}
+
+function collectCurriculumDocMapping() {
+  const map = {};
+  const field = document.querySelector('[name="curriculum_doc_map_text"]');
+  
+  // Önce mevcut textarea değerlerini koru
+  if (field && field.value) {
+    field.value.trim().split(NL).forEach(line => {
+      const parts = line.split('|');
+      if (parts.length >= 2) {
+        const key = parts[0].trim();
+        const values = parts[1].split(',').map(v => v.trim()).filter(Boolean);
+        if (key && values.length) map[key] = values;
+      }
+    });
+  }
+  
+  // DOM'daki seçili checkbox'ları topla
+  const domMap = {};
+  document.querySelectorAll('.cb-item[data-map-type="curriculum-doc"].selected').forEach(item => {
+    const source = item.dataset.source;
+    if (!domMap[source]) domMap[source] = [];
+    domMap[source].push(item.dataset.value);
+  });
+  
+  // Görünen source'ları bul
+  const visibleSources = new Set();
+  document.querySelectorAll('.cb-item[data-map-type="curriculum-doc"]').forEach(item => {
+    visibleSources.add(item.dataset.source);
+  });
+  
+  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
+  visibleSources.forEach(source => {
+    map[source] = domMap[source] || [];
+  });
+  
+  // Boş olmayan satırları yaz
+  const lines = Object.entries(map)
+    .filter(([key, values]) => values.length > 0)
+    .map(([key, values]) => `${key} | ${values.join(', ')}`);
+  if (field) field.value = lines.join(NL);
+}
+
+function collectMapping(sourceType, targetType, fieldName) {
+  const map = {};
+  
+  // Önce mevcut textarea değerlerini koru (DOM'da olmayan eşleştirmeler için)
+  const field = document.querySelector(`[name="${fieldName}"]`);
+  if (field && field.value) {
+    field.value.trim().split(NL).forEach(line => {
+      const parts = line.split('|');
+      if (parts.length >= 2) {
+        const key = parts[0].trim();
+        const values = parts[1].split(',').map(v => v.trim().split(':')[0]).filter(Boolean);
+        if (key && values.length) map[key] = values;
+      }
+    });
+  }
+  
+  // YENİ TABLO SİSTEMİ: #doc-mapping-table içindeki checkbox'ları topla
+  const docMappingTable = document.querySelector('#doc-mapping-table table');
+  if (docMappingTable && sourceType === 'doc') {
+    // Tablo varsa, tablodaki checkbox'lardan değerleri al
+    const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
+    let targetItems = [];
+    let targetStartIdx = 0;
+    
+    if (targetType === 'tyc') {
+      targetItems = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+      targetStartIdx = 0;
+    } else if (targetType === 'stark') {
+      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+      targetItems = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+      targetStartIdx = tycs.length;
+    } else if (targetType === 'poc') {
+      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+      const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+      targetItems = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+      targetStartIdx = tycs.length + starks.length;
+    } else if (targetType === 'pea') {
+      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+      const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+      const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+      targetItems = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
+      targetStartIdx = tycs.length + starks.length + pocs.length;
+    }
+    
+    // Her satırı (DÖÇ) kontrol et
+    const rows = docMappingTable.querySelectorAll('tbody tr');
+    rows.forEach((row, rowIdx) => {
+      if (rowIdx >= docs.length) return;
+      const docId = docs[rowIdx].id;
+      const cells = row.querySelectorAll('td');
+      const selectedTargets = [];
+      
+      // İlgili hedef sütunlarındaki checkbox'ları kontrol et
+      for (let i = 0; i < targetItems.length; i++) {
+        const cellIdx = 1 + targetStartIdx + i; // +1 for row label
+        if (cellIdx < cells.length) {
+          const checkbox = cells[cellIdx].querySelector('input[type="checkbox"]');
+          if (checkbox && checkbox.checked) {
+            selectedTargets.push(targetItems[i].id);
+          }
+        }
+      }
+      
+      if (selectedTargets.length > 0) {
+        map[docId] = selectedTargets;
+      } else {
+        delete map[docId]; // Hiç seçili değilse kaldır
+      }
+    });
+    
+    // Sonucu yaz
+    const lines = Object.entries(map)
+      .filter(([key, values]) => values.length > 0)
+      .map(([key, values]) => `${key} | ${values.join(', ')}`);
+    if (field) field.value = lines.join(NL);
+    return; // Yeni tablo sistemini kullandık, eski sisteme geçme
+  }
+  
+  // ESKİ SİSTEM: .cb-item öğelerini kullan
+  const domMap = {};
+  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"].selected`).forEach(item => {
+    const source = item.dataset.source;
+    if (!domMap[source]) domMap[source] = [];
+    domMap[source].push(item.dataset.value);
+  });
+  
+  // DOM'da görünen source'lar için DOM değerlerini kullan
+  const visibleSources = new Set();
+  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"]`).forEach(item => {
+    visibleSources.add(item.dataset.source);
+  });
+  
+  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
+  visibleSources.forEach(source => {
+    map[source] = domMap[source] || [];
+  });
+  
+  // Boş olmayan satırları yaz
+  const lines = Object.entries(map)
+    .filter(([key, values]) => values.length > 0)
+    .map(([key, values]) => `${key} | ${values.join(', ')}`);
+  if (field) field.value = lines.join(NL);
+}
+
+function collectMappingWithWeight(sourceType, targetType, fieldName) {
+  const map = {};
+  
+  // Önce mevcut textarea değerlerini koru
+  const field = document.querySelector(`[name="${fieldName}"]`);
+  if (field && field.value) {
+    field.value.trim().split(NL).forEach(line => {
+      const parts = line.split('|');
+      if (parts.length >= 2) {
+        const key = parts[0].trim();
+        const values = parts[1].split(',').map(v => v.trim()).filter(Boolean);
+        if (key && values.length) map[key] = values;
+      }
+    });
+  }
+  
+  // YENİ TABLO SİSTEMİ: #doc-mapping-table içindeki checkbox'ları topla (doc-poc için)
+  const docMappingTable = document.querySelector('#doc-mapping-table table');
+  if (docMappingTable && sourceType === 'doc' && targetType === 'poc') {
+    const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
+    const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
+    const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
+    const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
+    const targetStartIdx = tycs.length + starks.length;
+    
+    // Her satırı (DÖÇ) kontrol et
+    const rows = docMappingTable.querySelectorAll('tbody tr');
+    rows.forEach((row, rowIdx) => {
+      if (rowIdx >= docs.length) return;
+      const docId = docs[rowIdx].id;
+      const cells = row.querySelectorAll('td');
+      const selectedTargets = [];
+      
+      // PÖÇ sütunlarındaki checkbox'ları kontrol et
+      for (let i = 0; i < pocs.length; i++) {
+        const cellIdx = 1 + targetStartIdx + i; // +1 for row label
+        if (cellIdx < cells.length) {
+          const checkbox = cells[cellIdx].querySelector('input[type="checkbox"]');
+          if (checkbox && checkbox.checked) {
+            selectedTargets.push(pocs[i].id + ':1'); // Varsayılan ağırlık 1
+          }
+        }
+      }
+      
+      if (selectedTargets.length > 0) {
+        map[docId] = selectedTargets;
+      } else {
+        delete map[docId];
+      }
+    });
+    
+    // Sonucu yaz
+    const lines = Object.entries(map)
+      .filter(([key, values]) => values.length > 0)
+      .map(([key, values]) => `${key} | ${values.join(', ')}`);
+    if (field) field.value = lines.join(NL);
+    return;
+  }
+  
+  // ESKİ SİSTEM
+  const domMap = {};
+  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"].selected`).forEach(item => {
+    const source = item.dataset.source;
+    if (!domMap[source]) domMap[source] = [];
+    domMap[source].push(item.dataset.value + ':1');
+  });
+  
+  // Görünen source'ları bul
+  const visibleSources = new Set();
+  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"]`).forEach(item => {
+    visibleSources.add(item.dataset.source);
+  });
+  
+  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
+  visibleSources.forEach(source => {
+    map[source] = domMap[source] || [];
+  });
+  
+  // Boş olmayan satırları yaz
+  const lines = Object.entries(map)
+    .filter(([key, values]) => values.length > 0)
+    .map(([key, values]) => `${key} | ${values.join(', ')}`);
+  if (field) field.value = lines.join(NL);
+}
+
+function loadSampleData() {
+  if (!confirm('Örnek veri yüklenecek. Mevcut veriler silinecek. Devam?')) return;
+  document.querySelector('[name="course_code"]').value = 'BM203';
+  document.querySelector('[name="course_name"]').value = 'Veri Yapıları ve Algoritmalar';
+  document.querySelector('[name="program_name"]').value = 'Bilgisayar Mühendisliği';
+  document.querySelector('[name="term"]').value = '2024-2025 Güz';
+  document.querySelector('[name="instructor"]').value = 'Dr. Öğr. Üyesi Ahmet Yılmaz';
+  document.querySelector('[name="curriculum_text"]').value = 'MUC1 - Temel veri yapılarını açıklar\nMUC2 - Algoritma karmaşıklığını analiz eder\nMUC3 - Problem çözme yeteneği geliştirir';
+  document.querySelector('[name="tyc_text"]').value = 'TYC1 - Bilgi, Kuramsal ve uygulamalı bilgi\nTYC2 - Beceri, Bilişsel ve uygulamalı\nTYC3 - Yetkinlik, Bağımsız çalışabilme';
+  document.querySelector('[name="stark_text"]').value = 'ST1 - Yazılım geliştirme yetkinliği\nST2 - Analitik düşünme becerisi';
+  document.querySelector('[name="docs_text"]').value = 'DÖÇ1 - Stack ve Queue yapılarını uygular\nDÖÇ2 - Ağaç yapılarını analiz eder\nDÖÇ3 - Sıralama algoritmalarını karşılaştırır\nDÖÇ4 - Graf algoritmalarını uygular';
+  document.querySelector('[name="pocs_text"]').value = 'PÖÇ1 - Mühendislik problemlerini çözer\nPÖÇ2 - Algoritma tasarlama becerisi\nPÖÇ3 - Analitik düşünme yetkinliği';
+  document.querySelector('[name="peas_text"]').value = 'PEA1 - Yazılım sektöründe etkin mezunlar\nPEA2 - Araştırma yapabilen mezunlar';
+  document.querySelector('[name="assessments_text"]').value = 'C1 | Vize | 0.4\nC2 | Final | 0.6';
+  document.querySelector('[name="bloom_text"]').value = 'Bilgi - Hatırlama düzeyi\nKavrama - Anlama düzeyi\nUygulama - Uygulama düzeyi\nAnaliz - Çözümleme düzeyi\nSentez - Birleştirme düzeyi\nDeğerlendirme - Yargılama düzeyi';
+  document.querySelector('[name="curriculum_doc_map_text"]').value = 'MUC1 | DÖÇ1, DÖÇ2\nMUC2 | DÖÇ2, DÖÇ3\nMUC3 | DÖÇ3, DÖÇ4';
+  // TÜM EŞLEMELERİ DOLDUR
+  document.querySelector('[name="doc_tyc_map_text"]').value = 'DÖÇ1 | TYC1, TYC2\nDÖÇ2 | TYC2\nDÖÇ3 | TYC2, TYC3\nDÖÇ4 | TYC3';
+  document.querySelector('[name="poc_tyc_map_text"]').value = 'PÖÇ1 | TYC1\nPÖÇ2 | TYC2\nPÖÇ3 | TYC2, TYC3';
+  document.querySelector('[name="pea_stark_map_text"]').value = 'PEA1 | ST1\nPEA2 | ST1, ST2';
+  document.querySelector('[name="doc_poc_weights_text"]').value = 'DÖÇ1 | PÖÇ1:2, PÖÇ2:1\nDÖÇ2 | PÖÇ1:1, PÖÇ2:3\nDÖÇ3 | PÖÇ2:2, PÖÇ3:2\nDÖÇ4 | PÖÇ1:1, PÖÇ2:1, PÖÇ3:2';
+  document.querySelector('[name="poc_pea_map_text"]').value = 'PÖÇ1 | PEA1\nPÖÇ2 | PEA1, PEA2\nPÖÇ3 | PEA2';
+  
+  let students = '';
+  for (let i = 1; i <= 25; i++) students += `OGR${String(i).padStart(2,'0')} - Öğrenci ${i}\n`;
+  document.querySelector('[name="students_text"]').value = students.trim();
+  
+  // Örnek sorular - questionsData'ya ekle
+  questionsData = [
+    { id: 'S1', points: '10', text: 'Stack nedir?', comp: ['C1'], doc: ['DÖÇ1'], poc: ['PÖÇ1'], pea: ['PEA1'], bloom: ['Bilgi'], tyc: ['TYC1'], stark: ['ST1'], curriculum: ['MUC1'] },
+    { id: 'S2', points: '15', text: 'Queue ve Stack farkı', comp: ['C1'], doc: ['DÖÇ1','DÖÇ2'], poc: ['PÖÇ1','PÖÇ2'], pea: ['PEA1'], bloom: ['Kavrama'], tyc: ['TYC1','TYC2'], stark: ['ST1'], curriculum: ['MUC1','MUC2'] },
+    { id: 'S3', points: '20', text: 'Binary tree oluştur', comp: ['C1'], doc: ['DÖÇ2'], poc: ['PÖÇ2'], pea: ['PEA1'], bloom: ['Uygulama'], tyc: ['TYC2'], stark: ['ST1','ST2'], curriculum: ['MUC2'] },
+    { id: 'S4', points: '15', text: 'QuickSort karmaşıklığı', comp: ['C1'], doc: ['DÖÇ3'], poc: ['PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Analiz'], tyc: ['TYC2','TYC3'], stark: ['ST2'], curriculum: ['MUC2'] },
+    { id: 'S5', points: '10', text: 'Stack uygulamaları', comp: ['C2'], doc: ['DÖÇ1','DÖÇ2'], poc: ['PÖÇ1'], pea: ['PEA1'], bloom: ['Bilgi'], tyc: ['TYC1'], stark: ['ST1'], curriculum: ['MUC1','MUC3'] },
+    { id: 'S6', points: '15', text: 'Heap yapısı', comp: ['C2'], doc: ['DÖÇ2','DÖÇ3'], poc: ['PÖÇ2'], pea: ['PEA1'], bloom: ['Kavrama'], tyc: ['TYC1','TYC2'], stark: ['ST1'], curriculum: ['MUC2','MUC3'] },
+    { id: 'S7', points: '25', text: 'MergeSort implement et', comp: ['C2'], doc: ['DÖÇ3'], poc: ['PÖÇ2','PÖÇ3'], pea: ['PEA2'], bloom: ['Uygulama'], tyc: ['TYC2','TYC3'], stark: ['ST1','ST2'], curriculum: ['MUC2','MUC3'] },
+    { id: 'S8', points: '20', text: 'Graf traversal', comp: ['C2'], doc: ['DÖÇ4'], poc: ['PÖÇ1','PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Analiz'], tyc: ['TYC3'], stark: ['ST2'], curriculum: ['MUC3'] },
+    { id: 'S9', points: '20', text: 'Algoritma tasarla', comp: ['C2'], doc: ['DÖÇ3','DÖÇ4'], poc: ['PÖÇ3'], pea: ['PEA2'], bloom: ['Sentez'], tyc: ['TYC3'], stark: ['ST2'], curriculum: ['MUC2','MUC3'] },
+    { id: 'S10', points: '25', text: 'Karşılaştırmalı analiz', comp: ['C2'], doc: ['DÖÇ1','DÖÇ2','DÖÇ3','DÖÇ4'], poc: ['PÖÇ1','PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Değerlendirme'], tyc: ['TYC1','TYC2','TYC3'], stark: ['ST1','ST2'], curriculum: ['MUC1','MUC2','MUC3'] }
+  ];
+  rebuildAllQuestions();
+  collectAllQuestions();
+  
+  let scores = '';
+  const maxScores = [10, 15, 20, 15, 10, 15, 25, 20, 20, 25];
+  for (let i = 1; i <= 25; i++) {
+    const sid = `OGR${String(i).padStart(2,'0')}`;
+    for (let q = 1; q <= 10; q++) {
+      const max = maxScores[q-1];
+      const score = Math.round(max * (0.4 + Math.random() * 0.55));
+      scores += `${sid}, S${q}, ${score}\n`;
+    }
+  }
+  document.querySelector('[name="scores_text"]').value = scores.trim();
+}
+function clearAllData() {
+  if (!confirm('Tüm veriler silinecek (eşleştirmeler, sorular, öğrenciler dahil). Emin misiniz?')) return;
+  
+  // Tüm text input ve textarea'ları temizle
+  document.querySelectorAll('input[type="text"], textarea').forEach(el => el.value = '');
+  
+  // Hidden alanları da temizle
+  const hiddenFields = [
+    'doc_tyc_map_text', 'poc_tyc_map_text', 'pea_stark_map_text',
+    'doc_poc_weights_text', 'poc_pea_map_text', 'curriculum_doc_map_text',
+    'doc_stark_map_text', 'doc_pea_map_text',
+    'curriculum_tyc_map_text', 'curriculum_stark_map_text',
+    'curriculum_poc_map_text', 'curriculum_pea_map_text',
+    'question_map_text', 'scores_text', 'students_text'
+  ];
+  hiddenFields.forEach(name => {
+    const field = document.querySelector(`[name="${name}"]`);
+    if (field) field.value = '';
+  });
+  
+  // Soru verilerini temizle
+  questionsData = [];
+  rebuildAllQuestions();
+  
+  // Eşleştirme tablolarını yeniden oluştur (boş olarak)
+  setTimeout(() => {
+    rebuildMappingTables();
+    rebuildAllMappings();
+  }, 100);
+  
+  // Varsayılan Bloom değerlerini koru
+  const bloomField = document.querySelector('[name="bloom_text"]');
+  if (bloomField && !bloomField.value) {
+    bloomField.value = 'Bilgi\nKavrama\nUygulama\nAnaliz\nSentez\nDeğerlendirme';
+  }
+  
+  // Varsayılan eşik değerlerini koru
+  const metField = document.querySelector('[name="thresholds_met"]');
+  const partialField = document.querySelector('[name="thresholds_partial"]');
+  if (metField && !metField.value) metField.value = '70';
+  if (partialField && !partialField.value) partialField.value = '50';
+  
+  alert('Tüm veriler temizlendi.');
+}
+
+async function loadExcelGrades() {
+  try {
+    const res = await fetch('/load-grades');
+    const data = await res.json();
+    if (data.error) { alert(data.error); return; }
+    if (data.students_text) document.querySelector('[name="students_text"]').value = data.students_text;
+    if (data.scores_text) document.querySelector('[name="scores_text"]').value = data.scores_text;
+  } catch (e) {
+    alert('Excel okunamadı: ' + e);
+  }
+}
+
+// ============ LOADING SPINNER ============
+function showLoading(text = 'Hesaplanıyor...') {
+  const overlay = document.getElementById('loadingOverlay');
+  overlay.querySelector('.loading-text').textContent = text;
+  overlay.classList.add('active');
+}
+
+function hideLoading() {
+  document.getElementById('loadingOverlay').classList.remove('active');
+}
+
+// Form submit'te loading göster
+document.getElementById('mainForm')?.addEventListener('submit', function(e) {
+  // Hidden textarea'ları güncelle
+  collectAllQuestions();
+  collectAllMappings();
+  
+  // Validation
+  if (!validateForm()) {
+    e.preventDefault();
+    return;
+  }
+  showLoading('Rapor hesaplanıyor...');
+});
+
+// ============ FORM VALIDATION ============
+function validateForm() {
+  let isValid = true;
+  const errors = [];
+  
+  // Program adı kontrolü
+  const programName = document.querySelector('[name="program_name"]');
+  if (programName && !programName.value.trim()) {
+    showFieldError(programName, 'Program adı zorunludur');
+    isValid = false;
+  } else if (programName) {
+    clearFieldError(programName);
+  }
+  
+  // Ölçme bileşenleri kontrolü
+  const assessments = document.querySelector('[name="assessments_text"]');
+  if (assessments && !assessments.value.trim()) {
+    showFieldError(assessments, 'En az bir ölçme bileşeni gerekli');
+    isValid = false;
+  } else if (assessments) {
+    clearFieldError(assessments);
+  }
+  
+  // DÖÇ kontrolü
+  const docs = document.querySelector('[name="docs_text"]');
+  if (docs && !docs.value.trim()) {
+    showFieldError(docs, 'En az bir DÖÇ tanımlanmalı');
+    isValid = false;
+  } else if (docs) {
+    clearFieldError(docs);
+  }
+  
+  if (!isValid) {
+    const firstError = document.querySelector('.input-error');
+    if (firstError) firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+  }
+  
+  return isValid;
+}
+
+function showFieldError(field, message) {
+  field.classList.add('input-error');
+  let errorEl = field.nextElementSibling;
+  if (!errorEl || !errorEl.classList.contains('field-error')) {
+    errorEl = document.createElement('div');
+    errorEl.className = 'field-error';
+    field.parentNode.insertBefore(errorEl, field.nextSibling);
+  }
+  errorEl.textContent = message;
+  errorEl.classList.add('show');
+}
+
+function clearFieldError(field) {
+  field.classList.remove('input-error');
+  const errorEl = field.nextElementSibling;
+  if (errorEl && errorEl.classList.contains('field-error')) {
+    errorEl.classList.remove('show');
+  }
+}
+
+// ============ AUTO-SAVE ============
+// Sunucuya yalnızca son başarılı kayıttan beri değişen alanlar gönderilir;
+// sayfa yüklendikten sonraki ilk kayıt tüm formu içerir.
+let autoSaveTimer = null;
+let lastSavedFields = {};
+
+function initAutoSave() {
+  const form = document.getElementById('mainForm');
+  if (!form) return;
+  
+  const inputs = form.querySelectorAll('input, textarea, select');
+  inputs.forEach(input => {
+    input.addEventListener('change', debounceAutoSave);
+    input.addEventListener('input', debounceAutoSave);
+  });
+  // Sayfadan çıkarken bekleyen değişiklikleri hemen yazdır
+  window.addEventListener('pagehide', flushAutoSave);
+  
+  updateAutoSaveStatus('idle');
+}
+
+function debounceAutoSave() {
+  if (autoSaveTimer) clearTimeout(autoSaveTimer);
+  updateAutoSaveStatus('pending');
+  autoSaveTimer = setTimeout(performAutoSave, 3000);
+}
+
+function collectAutoSaveChanges() {
+  const form = document.getElementById('mainForm');
+  if (!form) return null;
+  
+  const formData = new FormData(form);
+  const fields = {};
+  formData.forEach((value, key) => { fields[key] = value; });
+  
+  const changes = {};
+  Object.keys(fields).forEach(key => {
+    if (lastSavedFields[key] !== fields[key]) changes[key] = fields[key];
+  });
+  return { fields, changes };
+}
+
+async function performAutoSave() {
+  autoSaveTimer = null;
+  const collected = collectAutoSaveChanges();
+  if (!collected || Object.keys(collected.changes).length === 0) {
+    updateAutoSaveStatus('idle');
+    return;
+  }
+  
+  updateAutoSaveStatus('saving');
+  
+  try {
+    const res = await fetch('/api/autosave', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ changes: collected.changes })
+    });
+    
+    if (res.ok) {
+      Object.assign(lastSavedFields, collected.changes);
+      updateAutoSaveStatus('saved');
+    } else {
+      updateAutoSaveStatus('error');
+    }
+  } catch (e) {
+    updateAutoSaveStatus('error');
+  }
+}
+
+function flushAutoSave() {
+  if (!autoSaveTimer) return;
+  clearTimeout(autoSaveTimer);
+  autoSaveTimer = null;
+  const collected = collectAutoSaveChanges();
+  if (!collected || Object.keys(collected.changes).length === 0) return;
+  const body = new Blob([JSON.stringify({ changes: collected.changes })], { type: 'application/json' });
+  navigator.sendBeacon('/api/autosave', body);
+}
+
+function updateAutoSaveStatus(status) {
+  const indicator = document.getElementById('autosaveIndicator');
+  if (!indicator) return;
+  
+  const dot = indicator.querySelector('.autosave-dot');
+  const text = indicator.querySelector('.autosave-text');
+  
+  dot.className = 'autosave-dot';
+  
+  switch(status) {
+    case 'saving':
+      dot.classList.add('saving');
+      text.textContent = 'Kaydediliyor...';
+      break;
+    case 'saved':
+      dot.classList.add('saved');
+      text.textContent = 'Kaydedildi';
+      setTimeout(() => updateAutoSaveStatus('idle'), 3000);
+      break;
+    case 'error':
+      dot.classList.add('error');
+      text.textContent = 'Kayıt hatası';
+      break;
+    default:
+      text.textContent = 'Otomatik kayıt aktif';
+  }
+}
+
+// ============ TASLAK YÖNETİMİ ============
+function openSaveDraftModal() {
+  document.getElementById('saveDraftModal').classList.add('active');
+  document.getElementById('draftName').focus();
+}
+
+function closeSaveDraftModal() {
+  document.getElementById('saveDraftModal').classList.remove('active');
+}
+
+async function confirmSaveDraft() {
+  const name = document.getElementById('draftName').value.trim() || 
+               'Taslak ' + new Date().toLocaleDateString('tr-TR');
+  
+  // Önce tüm verileri topla
+  collectAllMappings();
+  collectAllQuestions();
+  
+  const form = document.getElementById('mainForm');
+  const formData = new FormData(form);
+  const data = {};
+  formData.forEach((value, key) => { data[key] = value; });
+  
+  showLoading('Taslak kaydediliyor...');
+  
+  try {
+    const res = await fetch('/api/drafts', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ name, data })
+    });
+    
+    if (res.ok) {
+      closeSaveDraftModal();
+      location.reload();
+    } else {
+      alert('Taslak kaydedilemedi');
+    }
+  } catch (e) {
+    alert('Hata: ' + e);
+  } finally {
+    hideLoading();
+  }
+}
+
+async function loadDraft(id) {
+  showLoading('Taslak yükleniyor...');
+  try {
+    const res = await fetch('/api/drafts/' + id);
+    const result = await res.json();
+    
+    if (result.data) {
+      Object.entries(result.data).forEach(([key, value]) => {
+        const field = document.querySelector('[name="' + key + '"]');
+        if (field) field.value = value;
+      });
+      // Soruları yeniden yükle
+      loadQuestionsFromText();
+      // Eşlemeleri yeniden oluştur
+      rebuildAllMappings();
+    }
+    hideLoading();
+  } catch (e) {
+    alert('Taslak yüklenemedi: ' + e);
+    hideLoading();
+  }
+}
+
+async function deleteDraft(id) {
+  if (!confirm('Bu taslağı silmek istediğinize emin misiniz?')) return;
+  
+  try {
+    const res = await fetch('/api/drafts/' + id, { method: 'DELETE' });
+    if (res.ok) {
+      // Sidebar'dan öğeyi kaldır
+      const item = document.querySelector(`.sidebar-item[data-type="draft"][data-id="${id}"]`);
+      if (item) item.remove();
+    } else {
+      alert('Silme işlemi başarısız');
+    }
+  } catch (e) {
+    alert('Silinemedi: ' + e);
+  }
+}
+
+// ============ RAPOR GEÇMİŞİ ============
+async function deleteReportConfirm(id) {
+  if (!confirm('Bu raporu silmek istediğinize emin misiniz?')) return;
+  
+  try {
+    const res = await fetch('/api/reports/' + id, { method: 'DELETE' });
+    if (res.ok) {
+      // Sidebar'dan öğeyi kaldır
+      const item = document.querySelector(`.sidebar-item[data-type="report"][data-id="${id}"]`);
+      if (item) item.remove();
+    } else {
+      alert('Silme işlemi başarısız');
+    }
+  } catch (e) {
+    alert('Silinemedi: ' + e);
+  }
+}
+
+// ============ SIDEBAR TOGGLE ============
+function toggleSidebar(header) {
+  header.classList.toggle('collapsed');
+  const body = header.nextElementSibling;
+  if (body) body.classList.toggle('collapsed');
+}
+
+// ============ INIT ============
+document.addEventListener('DOMContentLoaded', function() {
+  initAutoSave();
+  loadQuestionsFromText();
+  // Eşleşmeleri de yükle (biraz gecikmeyle, DOM hazır olsun)
+  setTimeout(() => {
+    rebuildAllMappings();
+    rebuildMappingTables(); // Yeni tablo bazlı eşleştirmeleri de yükle
+  }, 100);
+});
+
+// Sayfa yüklendiğinde question_map_text'ten soruları yükle
+function loadQuestionsFromText() {
+  const hidden = document.querySelector('[name="question_map_text"]');
+  if (!hidden || !hidden.value.trim()) return;
+  
+  const lines = hidden.value.trim().split(NL).filter(ln => ln.trim());
+  questionsData = [];
+  
+  lines.forEach(line => {
+    const parts = line.split('|').map(p => p.trim());
+    if (parts.length >= 8) {
+      questionsData.push({
+        id: parts[0] || '',
+        week: parts[1] || '',
+        comp: parts[2] ? parts[2].split(',').map(s => s.trim()).filter(s => s) : [],
+        doc: parts[3] ? parts[3].split(',').map(s => s.trim()).filter(s => s) : [],
+        poc: parts[4] ? parts[4].split(',').map(s => s.trim()).filter(s => s) : [],
+        pea: parts[5] ? parts[5].split(',').map(s => s.trim()).filter(s => s) : [],
+        bloom: parts[6] ? parts[6].split(',').map(s => s.trim()).filter(s => s) : [],
+        points: parts[7] || '10',
+        text: parts[8] || '',
+        tyc: parts[9] ? parts[9].split(',').map(s => s.trim()).filter(s => s) : [],
+        stark: parts[10] ? parts[10].split(',').map(s => s.trim()).filter(s => s) : [],
+        curriculum: parts[11] ? parts[11].split(',').map(s => s.trim()).filter(s => s) : []
+      });
+    }
+  });
+  
+  if (questionsData.length > 0) {
+    rebuildAllQuestions();
+  }
+}
+
+// ============ EXCEL IMPORT FONKSİYONLARI ============
+function importStudentsFromExcel(input) {
+  const file = input.files[0];
+  if (!file) return;
+  
+  showLoading('Excel dosyası okunuyor...');
+  
+  const reader = new FileReader();
+  reader.onload = function(e) {
+    try {
+      const data = new Uint8Array(e.target.result);
+      const workbook = XLSX.read(data, { type: 'array' });
+      
+      // Öğrenci listesi sayfasını bul - ismine göre veya ilk sayfa
+      let sheetName = workbook.SheetNames[0];
+      for (const name of workbook.SheetNames) {
+        const lower = name.toLowerCase();
+        if (lower.includes('öğrenci') || lower.includes('ogrenci') || lower.includes('liste') || lower.includes('student')) {
+          sheetName = name;
+          break;
+        }
+      }
+      console.log('Öğrenci listesi sayfası:', sheetName);
+      
+      const sheet = workbook.Sheets[sheetName];
+      const rows = XLSX.utils.sheet_to_json(sheet, { header: 1 });
+      
+      // Boş satırları atla, başlık satırını bul
+      let headerRowIdx = -1;
+      let idCol = 0, adCol = -1, soyadCol = -1, durumCol = -1;
+      
+      for (let i = 0; i < rows.length; i++) {
+        const row = rows[i];
+        if (!row || row.length < 2) continue;
+        
+        // Başlık satırını bul
+        const cells = row.map(c => String(c || '').toLowerCase().trim());
+        
+        for (let j = 0; j < cells.length; j++) {
+          const c = cells[j];
+          if (c.includes('numara') || c === 'no' || c === 'id' || c.includes('öğrenci no')) {
+            idCol = j;
+            headerRowIdx = i;
+          }
+          if (c === 'ad' || c === 'isim' || c === 'name') adCol = j;
+          if (c === 'soyad' || c === 'soyadı' || c === 'surname') soyadCol = j;
+          if (c.includes('durum') || c === 'status') durumCol = j;
+        }
+        
+        if (headerRowIdx >= 0) break;
+      }
+      
+      // Başlık bulunamadıysa ilk satırı başlık say
+      if (headerRowIdx < 0) {
+        headerRowIdx = 0;
+        const firstRow = rows[0] || [];
+        if (firstRow.length >= 2) {
+          adCol = 1;
+        }
+      }
+      
+      const lines = [];
+      const startRow = headerRowIdx + 1;
+      
+      for (let i = startRow; i < rows.length; i++) {
+        const row = rows[i];
+        if (!row || !row[idCol]) continue;
+        
+        const studentId = String(row[idCol]).trim();
+        if (!studentId) continue;
+        
+        // Ad ve Soyad birleştir
+        let name = '';
+        if (adCol >= 0 && soyadCol >= 0) {
+          const ad = String(row[adCol] || '').trim();
+          const soyad = String(row[soyadCol] || '').trim();
+          name = (ad + ' ' + soyad).trim();
+        } else if (adCol >= 0) {
+          name = String(row[adCol] || '').trim();
+        } else {
+          name = String(row[idCol + 1] || '').trim();
+        }
+        
+        // Durum kontrolü
+        let status = '';
+        if (durumCol >= 0) {
+          status = String(row[durumCol] || '').trim().toUpperCase();
+        }
+        
+        if (studentId && name) {
+          if (status === 'GR' || status === 'DZ' || status === 'GİRMEDİ') {
+            lines.push(studentId + ' - ' + name + ' - GR');
+          } else {
+            lines.push(studentId + ' - ' + name);
+          }
+        }
+      }
+      
+      if (lines.length > 0) {
+        document.querySelector('[name="students_text"]').value = lines.join(NL);
+        const grCount = lines.filter(l => l.includes(' - GR')).length;
+        let msg = '✅ ' + lines.length + ' öğrenci başarıyla yüklendi!';
+        if (grCount > 0) msg += '\n(' + grCount + ' öğrenci derse girmemiş olarak işaretlendi)';
+        alert(msg);
+      } else {
+        alert('⚠️ Excel dosyasında geçerli öğrenci verisi bulunamadı.');
+      }
+    } catch (err) {
+      alert('❌ Excel okuma hatası: ' + err.message);
+    } finally {
+      hideLoading();
+      input.value = '';
+    }
+  };
+  reader.readAsArrayBuffer(file);
+}
+
+function importScoresFromExcel(input) {
+  const file = input.files[0];
+  if (!file) return;
+  
+  showLoading('Not dosyası okunuyor...');
+  
+  const reader = new FileReader();
+  reader.onload = function(e) {
+    try {
+      const data = new Uint8Array(e.target.result);
+      const workbook = XLSX.read(data, { type: 'array' });
+      
+      // Notlar sayfasını bul - ismine göre veya ikinci sayfa (yoksa ilk)
+      let sheetName = workbook.SheetNames.length > 1 ? workbook.SheetNames[1] : workbook.SheetNames[0];
+      for (const name of workbook.SheetNames) {
+        const lower = name.toLowerCase();
+        if (lower.includes('not') || lower.includes('puan') || lower.includes('score') || lower.includes('grade')) {
+          sheetName = name;
+          break;
+        }
+      }
+      console.log('Notlar sayfası:', sheetName);
+      
+      const sheet = workbook.Sheets[sheetName];
+      const rows = XLSX.utils.sheet_to_json(sheet, { header: 1 });
+      
+      // Boş satırları atla, başlık satırını bul
+      let headerRowIdx = 0;
+      for (let i = 0; i < rows.length; i++) {
+        const row = rows[i];
+        if (row && row.length > 2) {
+          headerRowIdx = i;
+          break;
+        }
+      }
+      
+      if (headerRowIdx >= rows.length - 1) {
+        alert('⚠️ Excel dosyasında yeterli veri yok.');
+        hideLoading();
+        return;
+      }
+      
+      const headers = rows[headerRowIdx];
+      const questionCols = []; // {colIdx, qid}
+      
+      // Atlanacak kelimeler
+      const skipWords = ['numara', 'no', 'id', 'ad', 'soyad', 'isim', 'durum', 'status', 'name', 'öğrenci', 'toplam', 'total', 'ortalama', 'average', 'sum'];
+      
+      for (let i = 0; i < headers.length; i++) {
+        const hVal = headers[i];
+        if (hVal === null || hVal === undefined) continue;
+        
+        const hStr = String(hVal).trim().toLowerCase();
+        
+        // Atlanacak kelimeleri kontrol et
+        if (skipWords.some(w => hStr.includes(w))) continue;
+        
+        // Sayısal değer mi kontrol et (number tipi veya sayıya çevrilebilir string)
+        if (typeof hVal === 'number') {
+          // Number tipinde - S prefix ekle
+          questionCols.push({ colIdx: i, qid: 'S' + Math.floor(hVal) });
+        } else {
+          const hTrim = String(hVal).trim();
+          // Sadece rakamlardan oluşuyor mu?
+          if (/^[0-9]+$/.test(hTrim)) {
+            questionCols.push({ colIdx: i, qid: 'S' + parseInt(hTrim) });
+          } else if (/^[0-9]+\.[0-9]+$/.test(hTrim)) {
+            questionCols.push({ colIdx: i, qid: 'S' + Math.floor(parseFloat(hTrim)) });
+          } else if (/^[SsQq][0-9]+$/.test(hTrim)) {
+            questionCols.push({ colIdx: i, qid: hTrim.toUpperCase() });
+          }
+        }
+      }
+      
+      if (questionCols.length === 0) {
+        alert('⚠️ Başlık satırında soru sütunu bulunamadı.');
+        hideLoading();
+        return;
+      }
+      
+      // Öğrenci ID sütununu bul
+      let studentIdCol = 0;
+      for (let i = 0; i < headers.length; i++) {
+        const h = String(headers[i] || '').toLowerCase();
+        if (h.includes('numara') || h.includes('no') || h === 'id' || h.includes('öğrenci')) {
+          studentIdCol = i;
+          break;
+        }
+      }
+      
+      const lines = [];
+      for (let i = headerRowIdx + 1; i < rows.length; i++) {
+        const row = rows[i];
+        if (!row || !row[studentIdCol]) continue;
+        
+        const studentId = String(row[studentIdCol]).trim();
+        if (!studentId) continue;
+        
+        for (const qc of questionCols) {
+          const score = row[qc.colIdx];
+          if (score === undefined || score === null || score === '') continue;
+          
+          const scoreStr = String(score).trim().toUpperCase();
+          if (scoreStr === '-' || scoreStr === 'GR' || scoreStr === 'DZ' || scoreStr === 'NAN') continue;
+          
+          const numScore = parseFloat(score);
+          if (!isNaN(numScore)) {
+            lines.push(studentId + ', ' + qc.qid + ', ' + numScore);
+          }
+        }
+      }
+      
+      if (lines.length > 0) {
+        document.querySelector('[name="scores_text"]').value = lines.join(NL);
+        const uniqueStudents = new Set(lines.map(l => l.split(',')[0].trim())).size;
+        alert('✅ ' + uniqueStudents + ' öğrenci için ' + lines.length + ' not yüklendi!\n\nSorular: ' + questionCols.map(q => q.qid).join(', '));
+      } else {
+        alert('⚠️ Excel dosyasında geçerli not verisi bulunamadı.');
+      }
+    } catch (err) {
+      alert('❌ Excel okuma hatası: ' + err.message);
+    } finally {
+      hideLoading();
+      input.value = '';
+    }
+  };
+  reader.readAsArrayBuffer(file);
+}
+
+// ============ ÖĞRENCİ RAPORU ============
+function openStudentReportModal(studentId, studentName) {
+  const modal = document.getElementById('studentReportModal');
+  if (modal) {
+    document.getElementById('studentReportTitle').textContent = studentName + ' - Bireysel Rapor';
+    document.getElementById('studentReportContent').innerHTML = '<div style="text-align:center;padding:2rem;"><div class="spinner"></div><p>Rapor yükleniyor...</p></div>';
+    modal.classList.add('active');
+    
+    fetch('/api/student-report/' + encodeURIComponent(studentId), {
+      credentials: 'same-origin'
+    })
+      .then(res => {
+        if (!res.ok) {
+          throw new Error('HTTP ' + res.status);
+        }
+        return res.text();
+      })
+      .then(text => {
+        try {
+          const data = JSON.parse(text);
+          if (data.error) {
+            document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger"><strong>Hata:</strong> ' + data.error + (data.detail ? '<pre style="font-size:0.7rem;margin-top:1rem;white-space:pre-wrap;">' + data.detail + '</pre>' : '') + '</div>';
+          } else {
+            document.getElementById('studentReportContent').innerHTML = data.html;
+          }
+        } catch(parseErr) {
+          document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger"><strong>JSON Parse Hatası:</strong><pre style="font-size:0.7rem;">' + text.substring(0, 500) + '</pre></div>';
+        }
+      })
+      .catch(e => {
+        document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger">Rapor yüklenemedi: ' + e.message + '</div>';
+      });
+  }
+}
+
+function closeStudentReportModal() {
+  const modal = document.getElementById('studentReportModal');
+  if (modal) modal.classList.remove('active');
+}
+
+// ============ DERS DEĞİŞTİRME FONKSİYONU ============
+
+function switchCourse(courseCode) {
+  if (!courseCode) return;
+  
+  console.log('[switchCourse] Ders değiştiriliyor:', courseCode);
+  
+  // Önce sunucuya bildir (user tablosunu güncelle), sonra sayfayı yenile
+  fetch('/api/switch-course', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ course_code: courseCode })
+  })
+  .then(res => {
+    console.log('[switchCourse] API response status:', res.status);
+    return res.json();
+  })
+  .then(data => {
+    console.log('[switchCourse] API response:', data);
+    if (data.success) {
+      console.log('[switchCourse] Başarılı, sayfa yenileniyor...');
+      window.location.reload();
+    } else {
+      console.error('[switchCourse] API hatası:', data.error);
+      alert('Ders değiştirme hatası: ' + (data.error || 'Bilinmeyen hata'));
+      window.location.reload();
+    }
+  })
+  .catch(err => {
+    console.error('[switchCourse] Fetch hatası:', err);
+    window.location.reload();
+  });
+}
+
+// ============ EXCEL IMPORT FONKSİYONLARI ============
+
+
+
@@ -0,0 +1,266 @@
+// Dersler ve PEA/PÖÇ artık API'den dinamik çekiliyor
+const COURSES = {};  // Geriye uyumluluk için boş
+const PEA_DATA = '';
+const POC_DATA = '';
+
+let currentStep = 1;
+const password = document.getElementById('password');
+const strengthBar = document.getElementById('strengthBar');
+const strengthText = document.getElementById('strengthText');
+const passwordConfirm = document.getElementById('passwordConfirm');
+const confirmError = document.getElementById('confirmError');
+
+// Şifre güvenlik göstergesi
+password.addEventListener('input', function() {
+  const val = this.value;
+  let strength = 0;
+  let text = '';
+
+  if (val.length >= 6) strength++;
+  if (val.length >= 10) strength++;
+  if (val.match(/[A-Z]/)) strength++;
+  if (val.match(/[0-9]/)) strength++;
+  if (val.match(/[^A-Za-z0-9]/)) strength++;
+
+  strengthBar.className = 'password-strength-bar';
+  strengthText.className = 'strength-text';
+
+  if (val.length === 0) {
+    text = '';
+  } else if (strength <= 2) {
+    strengthBar.classList.add('strength-weak');
+    strengthText.classList.add('weak');
+    text = '⚠️ Zayıf şifre';
+  } else if (strength <= 3) {
+    strengthBar.classList.add('strength-medium');
+    strengthText.classList.add('medium');
+    text = '⚡ Orta güçlükte';
+  } else {
+    strengthBar.classList.add('strength-strong');
+    strengthText.classList.add('strong');
+    text = '✓ Güçlü şifre';
+  }
+  strengthText.textContent = text;
+});
+
+// Şifre eşleşme kontrolü
+passwordConfirm.addEventListener('input', function() {
+  if (this.value && this.value !== password.value) {
+    confirmError.textContent = 'Şifreler eşleşmiyor';
+    confirmError.style.color = '#ef4444';
+  } else if (this.value && this.value === password.value) {
+    confirmError.textContent = '✓ Şifreler eşleşiyor';
+    confirmError.style.color = '#10b981';
+  } else {
+    confirmError.textContent = '';
+  }
+});
+
+function showStep(step) {
+  document.querySelectorAll('.step-content').forEach(el => el.classList.remove('active'));
+  document.querySelectorAll('.step').forEach(el => {
+    el.classList.remove('active', 'done');
+    if (parseInt(el.dataset.step) < step) el.classList.add('done');
+    if (parseInt(el.dataset.step) === step) el.classList.add('active');
+  });
+  document.querySelector(`.step-content[data-step="${step}"]`).classList.add('active');
+  currentStep = step;
+}
+
+function nextStep(step) {
+  // Adım 1 validasyonu
+  if (currentStep === 1) {
+    const fullName = document.getElementById('fullName');
+    const email = document.getElementById('email');
+
+    if (fullName.value.trim().length < 3) {
+      alert('Ad soyad en az 3 karakter olmalı');
+      fullName.focus();
+      return;
+    }
+    if (!email.value.includes('@')) {
+      alert('Geçerli bir e-posta girin');
+      email.focus();
+      return;
+    }
+    if (password.value.length < 6) {
+      alert('Şifre en az 6 karakter olmalı');
+      password.focus();
+      return;
+    }
+    if (password.value !== passwordConfirm.value) {
+      alert('Şifreler eşleşmiyor');
+      passwordConfirm.focus();
+      return;
+    }
+  }
+  // Adım 2 validasyonu
+  if (currentStep === 2) {
+    const courseSelect = document.getElementById('courseSelect');
+    if (!courseSelect.value) {
+      alert('Lütfen bir ders seçin');
+      return;
+    }
+  }
+  showStep(step);
+}
+
+function prevStep(step) {
+  showStep(step);
+}
+
+function updateCourses() {
+  const semester = document.getElementById('semesterSelect').value;
+  const deptId = document.getElementById('departmentSelect').value;
+  const courseSelect = document.getElementById('courseSelect');
+
+  courseSelect.innerHTML = '<option value="">Yükleniyor...</option>';
+
+  // Bölüme göre dersleri API'den çek
+  fetch('/api/department-courses/' + deptId + '/' + semester)
+    .then(r => r.json())
+    .then(data => {
+      const courses = data.courses || [];
+      if (courses.length === 0) {
+        courseSelect.innerHTML = '<option value="">-- Bu yarıyılda ders yok --</option>';
+      } else {
+        courseSelect.innerHTML = '<option value="">-- Ders Seçin --</option>';
+        courses.forEach(c => {
+          const opt = document.createElement('option');
+          opt.value = c.code;
+          opt.textContent = c.code + ' - ' + c.name + ' (' + c.akts + ' AKTS, ' + c.type + ')';
+          opt.dataset.name = c.name;
+          courseSelect.appendChild(opt);
+        });
+      }
+    })
+    .catch((err) => {
+      console.error('Ders listesi yüklenemedi:', err);
+      courseSelect.innerHTML = '<option value="">-- Dersler yüklenemedi --</option>';
+    });
+
+  updateTermInput();
+}
+
+function updateFaculty() {
+  const deptSelect = document.getElementById('departmentSelect');
+  const selected = deptSelect.options[deptSelect.selectedIndex];
+  const faculty = selected ? selected.dataset.faculty || '' : '';
+  document.getElementById('facultyInput').value = faculty;
+  document.getElementById('programName').value = selected ? selected.textContent : '';
+
+  // PEA/PÖÇ verilerini de bölüme göre yükle
+  loadPeaPocForDepartment(selected ? selected.value : '');
+
+  updateCourses();
+}
+
+function loadPeaPocForDepartment(deptId) {
+  if (!deptId) return;
+
+  fetch('/api/department-pea-poc/' + deptId)
+    .then(r => r.json())
+    .then(data => {
+      if (data.pea_text) {
+        document.getElementById('peasText').value = data.pea_text;
+      }
+      if (data.poc_text) {
+        document.getElementById('pocsText').value = data.poc_text;
+      }
+    })
+    .catch(() => {});
+}
+
+function updateCourseName() {
+  const courseSelect = document.getElementById('courseSelect');
+  const selected = courseSelect.options[courseSelect.selectedIndex];
+  document.getElementById('courseNameHidden').value = selected ? selected.dataset.name || '' : '';
+}
+
+function updateTermInput() {
+  const year = document.getElementById('academicYear').value;
+  const sem = document.getElementById('semesterSelect').value;
+  const semType = parseInt(sem) % 2 === 1 ? 'Güz' : 'Bahar';
+  document.getElementById('termInput').value = year + ' ' + semType + ' (' + sem + '. Yarıyıl)';
+}
+
+function loadFromBologna() {
+  const deptId = document.getElementById('departmentSelect').value;
+  const statusEl = document.getElementById('bolognaStatus');
+
+  if (!deptId) {
+    alert('Lütfen önce bölüm seçin!');
+    return;
+  }
+
+  statusEl.textContent = '⏳ PEA/PÖÇ yükleniyor...';
+  statusEl.style.display = 'block';
+  statusEl.style.background = '#fef3c7';
+  statusEl.style.color = '#92400e';
+
+  fetch('/api/department-pea-poc/' + deptId)
+    .then(r => r.json())
+    .then(data => {
+      if (data.pea_text || data.poc_text) {
+        if (data.pea_text) document.getElementById('peasText').value = data.pea_text;
+        if (data.poc_text) document.getElementById('pocsText').value = data.poc_text;
+        statusEl.textContent = '✅ PEA ve PÖÇ yüklendi!';
+        statusEl.style.background = '#dcfce7';
+        statusEl.style.color = '#166534';
+      } else {
+        statusEl.textContent = '⚠️ PEA/PÖÇ verisi bulunamadı. Admin panelinden ekleyin.';
+        statusEl.style.background = '#fef2f2';
+        statusEl.style.color = '#dc2626';
+      }
+    })
+    .catch(() => {
+      statusEl.textContent = '❌ Bağlantı hatası';
+      statusEl.style.background = '#fef2f2';
+      statusEl.style.color = '#dc2626';
+    });
+}
+
+function fetchDocFromBologna() {
+  const courseCode = document.getElementById('courseSelect').value;
+  if (!courseCode) {
+    alert('Lütfen önce bir ders seçin!');
+    return;
+  }
+
+  const statusEl = document.getElementById('bolognaStatus');
+  statusEl.textContent = '⏳ Bologna\'dan veriler çekiliyor...';
+  statusEl.style.display = 'block';
+  statusEl.style.background = '#fef3c7';
+  statusEl.style.color = '#92400e';
+
+  fetch('/api/fetch-bologna-signup/' + courseCode)
+    .then(r => r.json())
+    .then(data => {
+      if (data.success) {
+        if (data.doc_text) {
+          document.getElementById('docsText').value = data.doc_text;
+        }
+        if (data.curriculum_text) {
+          document.getElementById('curriculumText').value = data.curriculum_text;
+        }
+        statusEl.textContent = '✅ DÖÇ ve Müfredat Bologna\'dan yüklendi!';
+        statusEl.style.background = '#dcfce7';
+        statusEl.style.color = '#166534';
+      } else {
+        statusEl.textContent = '⚠️ ' + (data.error || 'Veri çekilemedi. Manuel giriş yapın.');
+        statusEl.style.background = '#fef2f2';
+        statusEl.style.color = '#dc2626';
+      }
+    })
+    .catch(err => {
+      statusEl.textContent = '❌ Bağlantı hatası. Manuel giriş yapın.';
+      statusEl.style.background = '#fef2f2';
+      statusEl.style.color = '#dc2626';
+    });
+}
+
+// Sayfa yüklendiğinde
+document.addEventListener('DOMContentLoaded', function() {
+  updateCourses();
+  updateTermInput();
+});
@@ -0,0 +1,249 @@
+// Sanal kaydırmalı rapor tabloları
+// Sunucu büyük tabloları satır satır gömmek yerine <div class="vt" data-vt-...> bırakır;
+// satırlar /api/report-table/<tablo> üzerinden sayfa sayfa çekilir ve
+// yalnızca görünen kısım DOM'a yazılır. Sıralama/süzme sunucuda yapılır.
+(function () {
+  const PER_PAGE = 100;
+  const OVERSCAN = 10;
+
+  function esc(v) {
+    return String(v == null ? '' : v)
+      .replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+      .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+  }
+  function pct(v) { return v == null ? '-' : '%' + Number(v).toFixed(1); }
+  function num(v) { return v == null ? '-' : Number(v).toFixed(1); }
+
+  function gradeClass(grade) {
+    if (['AA', 'BA', 'BB', 'CB', 'CC'].indexOf(grade) >= 0) return ['row-success', 'badge-success'];
+    if (['DC', 'DD'].indexOf(grade) >= 0) return ['row-warning', 'badge-warning'];
+    return ['row-danger', 'badge-danger'];
+  }
+  function pctClass(p, thresholds) {
+    p = p || 0;
+    if (p >= thresholds.met) return 'row-success';
+    if (p >= thresholds.partially) return 'row-warning';
+    return 'row-danger';
+  }
+
+  const VIEWS = {
+    'students': {
+      table: 'students',
+      headers: ['#', 'Öğrenci No', 'Ad Soyad', 'Başarı %', 'Harf', 'Durum', 'Bireysel Rapor'],
+      sorts: [['rank', 'Sıra'], ['pct', 'Başarı %'], ['grade', 'Harf'], ['name', 'Ad Soyad'], ['id', 'Öğrenci No']],
+      studentFilters: true,
+      row: function (r) {
+        if (r.is_absent) {
+          return "<tr class='row-muted' style='opacity:0.6;'><td>" + r.rank + '</td><td><strong>' + esc(r.id) +
+            '</strong></td><td>' + esc(r.name) + "</td><td>-</td><td><span class='badge' style='background:#6b7280;color:white;'>GR</span></td>" +
+            "<td><span class='badge' style='background:#6b7280;color:white;'>Girmedi</span></td><td style='text-align:center;'>-</td></tr>";
+        }
+        const cls = gradeClass(r.grade);
+        const letterBadge = ['AA', 'BA', 'BB'].indexOf(r.grade) >= 0 ? 'success' : (['CB', 'CC', 'DC', 'DD'].indexOf(r.grade) >= 0 ? 'warning' : 'danger');
+        let detail = '-';
+        if (typeof window.openStudentReportModal === 'function') {
+          detail = "<button type='button' class='btn btn-sm vt-detail' data-id='" + esc(r.id) + "' data-name='" + esc(r.name) +
+            "' style='background:#667eea;color:white;padding:0.4rem 0.8rem;font-size:0.75rem;border:none;border-radius:6px;cursor:pointer;'>📊 Detay</button>";
+        }
+        return "<tr class='" + cls[0] + "'><td>" + r.rank + '</td><td><strong>' + esc(r.id) + '</strong></td><td>' + esc(r.name) +
+          '</td><td><strong>' + pct(r.pct) + "</strong></td><td><span class='badge badge-" + letterBadge + "'>" + esc(r.grade) +
+          "</span></td><td><span class='badge " + cls[1] + "'>" + esc(r.status) + "</span></td><td style='text-align:center;'>" + detail + '</td></tr>';
+      }
+    },
+    'questions-map': {
+      table: 'questions',
+      headers: ['Soru', 'Hafta', 'Bileşen', 'DÖÇ', 'PÖÇ', 'PEA', 'Bloom', 'TYÇ', 'STAR-K', 'Müfredat', 'Puan'],
+      sorts: [['id', 'Soru'], ['week', 'Hafta'], ['max_points', 'Puan']],
+      row: function (r) {
+        return '<tr><td><strong>' + esc(r.id) + '</strong></td><td>' + esc(r.week) + '</td><td>' + esc(r.component_id) + '</td><td>' +
+          esc(r.docs) + '</td><td>' + esc(r.pocs) + '</td><td>' + esc(r.peas) + '</td><td>' + esc(r.bloom) + '</td><td>' +
+          esc(r.tyc) + '</td><td>' + esc(r.stark) + '</td><td>' + esc(r.curriculum) + '</td><td>' + esc(r.max_points) + '</td></tr>';
+      }
+    },
+    'questions-outcomes': {
+      table: 'questions',
+      headers: ['Soru', 'Doğru %', 'Yanlış %', 'Ortalama', 'Max', 'DÖÇ', 'Bloom'],
+      sorts: [['id', 'Soru'], ['correct_pct', 'Doğru %'], ['avg_score', 'Ortalama']],
+      row: function (r, thresholds) {
+        return "<tr class='" + pctClass(r.correct_pct, thresholds) + "'><td><strong>" + esc(r.id) + '</strong></td><td>' + pct(r.correct_pct) +
+          '</td><td>' + pct(r.incorrect_pct) + '</td><td>' + num(r.avg_score) + '</td><td>' + Number(r.max_points || 0).toFixed(0) +
+          '</td><td>' + esc(r.docs) + '</td><td>' + esc(r.bloom) + '</td></tr>';
+      }
+    }
+  };
+
+  function injectStyle() {
+    if (document.getElementById('vt-style')) return;
+    const style = document.createElement('style');
+    style.id = 'vt-style';
+    style.textContent =
+      '.vt-toolbar{display:flex;flex-wrap:wrap;gap:0.5rem;align-items:center;margin-bottom:0.5rem;font-size:0.8rem;}' +
+      '.vt-toolbar select,.vt-toolbar input{padding:0.3rem 0.5rem;border:1px solid #cbd5e1;border-radius:6px;font-size:0.8rem;}' +
+      '.vt-info{color:#64748b;margin-left:auto;}' +
+      '.vt-scroll{max-height:70vh;overflow-y:auto;}' +
+      '.vt-scroll thead th{position:sticky;top:0;z-index:1;}' +
+      '.vt-pending td{color:#94a3b8;}';
+    document.head.appendChild(style);
+  }
+
+  function VirtualTable(el) {
+    this.el = el;
+    this.view = VIEWS[el.dataset.vtView];
+    this.source = el.dataset.vtSource;
+    this.thresholds = {
+      met: parseFloat(el.dataset.vtMet || '70'),
+      partially: parseFloat(el.dataset.vtPartially || '50')
+    };
+    this.params = { sort: '', order: 'asc', grade: '', status: el.dataset.vtStatus || '', q: '' };
+    this.total = parseInt(el.dataset.vtTotal || '0', 10);
+    this.pages = {};
+    this.loading = {};
+    this.generation = 0;
+    this.rowHeight = 40;
+    this.build();
+    this.reset();
+  }
+
+  VirtualTable.prototype.build = function () {
+    const self = this;
+    const v = this.view;
+    let toolbar = "<div class='vt-toolbar no-print'><select data-vt='sort'>" +
+      v.sorts.map(function (s) { return "<option value='" + s[0] + "'>" + s[1] + '</option>'; }).join('') +
+      "</select><select data-vt='order'><option value='asc'>Artan</option><option value='desc'>Azalan</option></select>";
+    if (v.studentFilters) {
+      toolbar += "<select data-vt='grade'><option value=''>Tüm notlar</option>" +
+        ['AA', 'BA', 'BB', 'CB', 'CC', 'DC', 'DD', 'FD', 'FF', 'GR'].map(function (g) { return "<option value='" + g + "'>" + g + '</option>'; }).join('') +
+        "</select><select data-vt='status'><option value=''>Tümü</option><option value='attending'>Sınava girenler</option><option value='absent'>Girmeyenler (GR)</option></select>";
+    }
+    toolbar += "<input type='search' data-vt='q' placeholder='Ara...'>";
+    if (this.el.dataset.vtFullUrl) {
+      toolbar += "<a href='" + esc(this.el.dataset.vtFullUrl) + "' target='_blank'>Tam tablo / yazdır</a>";
+    }
+    toolbar += "<span class='vt-info'></span></div>";
+    this.el.innerHTML = toolbar + "<div class='vt-scroll'><table><thead><tr>" +
+      v.headers.map(function (h) { return '<th>' + h + '</th>'; }).join('') + '</tr></thead><tbody></tbody></table></div>';
+
+    this.scroller = this.el.querySelector('.vt-scroll');
+    this.tbody = this.el.querySelector('tbody');
+    this.info = this.el.querySelector('.vt-info');
+    const status = this.el.querySelector("[data-vt='status']");
+    if (status) status.value = this.params.status;
+
+    let searchTimer = null;
+    this.el.querySelectorAll('[data-vt]').forEach(function (input) {
+      const handler = function () {
+        self.params[input.dataset.vt] = input.value;
+        self.reset();
+      };
+      if (input.dataset.vt === 'q') {
+        input.addEventListener('input', function () {
+          clearTimeout(searchTimer);
+          searchTimer = setTimeout(handler, 300);
+        });
+      } else {
+        input.addEventListener('change', handler);
+      }
+    });
+
+    let ticking = false;
+    this.scroller.addEventListener('scroll', function () {
+      if (ticking) return;
+      ticking = true;
+      requestAnimationFrame(function () { ticking = false; self.render(); });
+    });
+    this.tbody.addEventListener('click', function (e) {
+      const btn = e.target.closest('.vt-detail');
+      if (btn) window.openStudentReportModal(btn.dataset.id, btn.dataset.name);
+    });
+  };
+
+  VirtualTable.prototype.reset = function () {
+    this.generation += 1;
+    this.pages = {};
+    this.loading = {};
+    this.scroller.scrollTop = 0;
+    this.load(1);
+  };
+
+  VirtualTable.prototype.load = function (page) {
+    if (this.pages[page] || this.loading[page]) return;
+    const self = this;
+    const generation = this.generation;
+    this.loading[page] = true;
+    const qs = new URLSearchParams({ page: page, per_page: PER_PAGE, sort: this.params.sort, order: this.params.order });
+    if (this.params.grade) qs.set('grade', this.params.grade);
+    if (this.params.status) qs.set('status', this.params.status);
+    if (this.params.q) qs.set('q', this.params.q);
+    const url = this.source + (this.source.indexOf('?') >= 0 ? '&' : '?') + qs.toString();
+    fetch(url, { credentials: 'same-origin' })
+      .then(function (res) { return res.json(); })
+      .then(function (data) {
+        if (generation !== self.generation) return;
+        delete self.loading[page];
+        if (data.error) {
+          self.info.textContent = 'Hata: ' + data.error;
+          return;
+        }
+        self.total = data.total;
+        self.pages[page] = data.rows;
+        self.render();
+      })
+      .catch(function () {
+        if (generation !== self.generation) return;
+        delete self.loading[page];
+        self.info.textContent = 'Tablo yüklenemedi';
+      });
+  };
+
+  VirtualTable.prototype.render = function () {
+    const total = this.total;
+    const viewport = this.scroller.clientHeight || 600;
+    const first = Math.max(0, Math.floor(this.scroller.scrollTop / this.rowHeight) - OVERSCAN);
+    const last = Math.min(total, first + Math.ceil(viewport / this.rowHeight) + OVERSCAN * 2);
+    const cols = this.view.headers.length;
+    const html = [];
+    if (first > 0) html.push("<tr style='height:" + (first * this.rowHeight) + "px'><td colspan='" + cols + "' style='padding:0;border:0;'></td></tr>");
+    for (let i = first; i < last; i++) {
+      const page = Math.floor(i / PER_PAGE) + 1;
+      const rows = this.pages[page];
+      if (rows && rows[i % PER_PAGE]) {
+        html.push(this.view.row(rows[i % PER_PAGE], this.thresholds));
+      } else {
+        html.push("<tr class='vt-pending'><td colspan='" + cols + "'>…</td></tr>");
+        this.load(page);
+      }
+    }
+    if (last < total) html.push("<tr style='height:" + ((total - last) * this.rowHeight) + "px'><td colspan='" + cols + "' style='padding:0;border:0;'></td></tr>");
+    this.tbody.innerHTML = html.join('');
+
+    // Gerçek satır yüksekliğini bir kez ölç (spacer'lar tahmini yükseklikle hesaplanır)
+    const sample = this.tbody.querySelector('tr:not(.vt-pending):not([style*="height"])');
+    if (sample && !this.measured) {
+      this.measured = true;
+      const h = sample.getBoundingClientRect().height;
+      if (h > 0 && Math.abs(h - this.rowHeight) > 1) {
+        this.rowHeight = h;
+        this.render();
+        return;
+      }
+    }
+    this.info.textContent = total ? (first + 1) + '–' + last + ' / ' + total + ' satır' : 'Kayıt yok';
+  };
+
+  function init(root) {
+    const tables = (root || document).querySelectorAll('.vt[data-vt-source]:not([data-vt-ready])');
+    if (!tables.length) return;
+    injectStyle();
+    tables.forEach(function (el) {
+      el.setAttribute('data-vt-ready', '1');
+      if (VIEWS[el.dataset.vtView]) new VirtualTable(el);
+    });
+  }
+
+  window.initVirtualTables = init;
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', function () { init(); });
+  } else {
+    init();
+  }
+})();
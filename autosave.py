@@ -0,0 +1,154 @@
+"""
+AkrediX - Otomatik Kayıt
+/api/autosave değişikliklerinin alan bazında, birleştirilerek yazılması
+
+Her otomatik kayıt isteği save_user_curriculum ile 26 sütunluk bir
+oku-değiştir-yaz (SELECT + INSERT OR REPLACE), ardından "Otomatik Kayit"
+taslağını bulmak için get_drafts ve tüm form JSON'unun yeniden yazılmasını
+yapıyordu; yoğun saatlerde her tuş vuruşu dizisi SQLite yazma kilidi için
+yarışıyordu. Artık:
+  - İstemci yalnızca son kayıttan beri değişen alanları gönderir
+  - user_curriculum'da yalnızca değişen sütunlar güncellenir, taslak
+    (drafts.slot = AUTOSAVE_SLOT) anahtarla bulunur ve alan bazında birleştirilir
+  - Grup commit: istek değişikliğini kuyruğa koyar, FLUSH_WINDOW kadar diğer
+    isteklerin gelmesini bekler; yazma kilidini alan istek o ana kadar biriken
+    tüm kullanıcıların değişikliklerini (aynı alana gelen son değer kazanır)
+    tek transaction'da yazar, bekleyen diğer istekler ayrıca yazmaz
+submit() ancak değişiklik SQLite'a commit edildikten sonra döner; kuyruk
+yalnızca istekler beklerken birleştirme içindir, verinin tek kopyası değildir.
+Yazma başarısız olursa toplu yazımdaki değişiklikler kuyruktan atılır ve her
+bekleyen istek hatayı alır - istemci değişiklikleri kaydedilmemiş sayar ve
+sonraki kayıtta yeniden gönderir, arkadan yazılıp çift kayıt oluşmaz.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+import blob_store
+import db
+import outcome_store
+
+# drafts.slot (migrations.py, 11. geçiş) - kullanıcı başına tek otomatik kayıt taslağı
+AUTOSAVE_SLOT = "autosave"
+AUTOSAVE_DRAFT_NAME = "Otomatik Kayit"
+
+# Form alanı -> user_curriculum sütunu (sayfa yenilendiğinde eşleştirmeler korunur)
+CURRICULUM_COLUMNS = {
+    "doc_tyc_map_text": "doc_tyc_map_text",
+    "poc_tyc_map_text": "poc_tyc_map_text",
+    "pea_stark_map_text": "pea_stark_map_text",
+    "poc_pea_map_text": "poc_pea_map_text",
+    "doc_poc_weights_text": "doc_poc_weights_text",
+    "curriculum_doc_map_text": "curriculum_doc_map_text",
+    "doc_stark_map_text": "doc_stark_map_text",
+    "doc_pea_map_text": "doc_pea_map_text",
+    "curriculum_tyc_map_text": "curriculum_tyc_map_text",
+    "curriculum_stark_map_text": "curriculum_stark_map_text",
+    "curriculum_poc_map_text": "curriculum_poc_map_text",
+    "curriculum_pea_map_text": "curriculum_pea_map_text",
+    "assessments_text": "components_text",
+    "grading_text": "grading_text",
+    "question_map_text": "question_map_text",
+    "thresholds_met": "thresholds_met",
+    "thresholds_partial": "thresholds_partial",
+}
+
+# İsteğin diğer isteklerle birleşmek için beklediği süre (saniye) - 0: yalnızca yazım sürerken gelenler birleşir
+FLUSH_WINDOW = float(os.environ.get("AKREDIX_AUTOSAVE_WINDOW", "0.05"))
+
+_pending = {}  # e-posta -> {form alanı: değer} - henüz yazılmamış, sahibi istekler bekliyor
+_waiters = []  # _pending'deki değişikliklerin sahibi isteklerin Future'ları
+_lock = threading.Lock()
+_flush_lock = threading.Lock()  # tek yazar: aynı kullanıcının eski değişikliği yenisinin üzerine yazılmasın
+
+
+def submit(email: str, changes: dict) -> int:
+    """Değişen form alanlarını yaz; commit edildikten sonra alan sayısını döndür.
+    Yazılamazsa sqlite3.Error yükselir (değişiklikler kuyruktan atılmıştır, kaydedilmedi)."""
+    changes = {str(k): "" if v is None else str(v) for k, v in changes.items()}
+    if not email or not changes:
+        return 0
+    done = Future()
+    with _lock:
+        _pending.setdefault(email, {}).update(changes)
+        _waiters.append(done)
+    if FLUSH_WINDOW > 0:
+        time.sleep(FLUSH_WINDOW)
+    with _flush_lock:
+        # Kilidi bekleyen sürede başka bir istek bizimkini de yazmış olabilir
+        if not done.done():
+            _flush()
+    done.result()
+    return len(changes)
+
+
+def _take():
+    with _lock:
+        batch = dict(_pending)
+        waiters = list(_waiters)
+        _pending.clear()
+        _waiters.clear()
+        return batch, waiters
+
+
+def _write_user(conn, email: str, changes: dict, now: str) -> dict:
+    """Bir kullanıcının değişikliklerini yaz; user_curriculum'da güncellenen sütunları döndür"""
+    # Boş değer mevcut eşleştirmeyi silmez (save_user_curriculum ile aynı kural)
+    columns = {CURRICULUM_COLUMNS[f]: v for f, v in changes.items() if f in CURRICULUM_COLUMNS and v.strip()}
+    if columns:
+        conn.execute("""INSERT OR IGNORE INTO user_curriculum (user_email, thresholds_met, thresholds_partial, updated_at)
+            VALUES (?, '70', '50', ?)""", (email, now))
+        assignments = ", ".join(f"{column}=?" for column in columns)
+        conn.execute(f"UPDATE user_curriculum SET {assignments}, updated_at=? WHERE user_email=?",
+                     (*columns.values(), now, email))
+
+    row = conn.execute("SELECT id, data FROM drafts WHERE user_email=? AND slot=?", (email, AUTOSAVE_SLOT)).fetchone()
+    if row:
+        try:
+            data = json.loads(blob_store.unpack(row[1]) or "{}")
+        except ValueError:
+            data = {}
+        data.update(changes)
+        conn.execute("UPDATE drafts SET data=?, updated_at=? WHERE id=?",
+                     (blob_store.pack(json.dumps(data, ensure_ascii=False)), now, row[0]))
+    else:
+        conn.execute("INSERT INTO drafts (user_email, name, data, updated_at, slot) VALUES (?,?,?,?,?)",
+                     (email, AUTOSAVE_DRAFT_NAME, blob_store.pack(json.dumps(changes, ensure_ascii=False)), now, AUTOSAVE_SLOT))
+    return columns
+
+
+def _flush():
+    """Bekleyen tüm değişiklikleri tek transaction'da yaz (_flush_lock altında çağrılır)"""
+    batch, waiters = _take()
+    now = datetime.now().isoformat()
+    synced = {}
+    try:
+        conn = db.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for email, changes in batch.items():
+                synced[email] = _write_user(conn, email, changes, now)
+            conn.commit()
+        finally:  # commit edilmediyse close() geri alır
+            conn.close()
+    except Exception as e:
+        # Değişiklikler kuyruğa geri konmaz: sahibi istekler hata döndürür, istemci yeniden gönderir
+        print(f"[autosave] {len(batch)} kullanıcı yazılamadı: {e}", file=sys.stderr, flush=True)
+        for waiter in waiters:
+            waiter.set_exception(e)
+        return
+    for waiter in waiters:
+        waiter.set_result(None)
+    for email, columns in synced.items():
+        if columns:
+            outcome_store.sync(outcome_store.SCOPE_USER, email, columns)
+
+
+def pending_count() -> int:
+    with _lock:
+        return len(_pending)
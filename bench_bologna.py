@@ -0,0 +1,212 @@
+"""
+AkrediX - Bologna Ayrıştırma Ölçümü
+Ders sayfalarında eski ayrıştırıcı (bologna_extract'ten önceki login.py
+parse_bologna_course: html.parser ile tüm belge, tablo başına find_previous)
+ile bologna_extract.course_outcomes'un karşılaştırması: sayfa/sn, MB/sn ve
+iki yolun aynı DÖÇ/müfredatı üretip üretmediği.
+
+    python bench_bologna.py                      # tests/fixtures/bologna sayfaları
+    python bench_bologna.py --pages dizin/       # başka kayıtlı .html sayfaları
+    python bench_bologna.py --from-cache         # http_cache'teki sayfalar
+
+Önbellekteki gerçek sayfalar fixture olarak dışa aktarılabilir:
+
+    python bench_bologna.py --save tests/fixtures/bologna/
+"""
+import argparse
+import hashlib
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+import bologna_extract
+
+FIXTURES = Path(__file__).parent / "tests" / "fixtures" / "bologna"
+
+
+def baseline_course_outcomes(html: str) -> dict:
+    """bologna_extract'ten önceki login.parse_bologna_course ayrıştırıcısı (değiştirilmeden)"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    doc_text = ""
+    curriculum_text = ""
+
+    # ============ DÖÇ - lblDersinOgrenmeCiktilari ID'li başlığın altındaki tablo ============
+    doc_header = soup.find(id='lblDersinOgrenmeCiktilari')
+    if doc_header:
+        # Başlıktan sonraki tabloyu bul
+        doc_table = doc_header.find_next('table')
+        if doc_table:
+            doc_items = []
+            rows = doc_table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    num_cell = cells[0].get_text(strip=True)
+                    desc_cell = cells[1].get_text(strip=True)
+
+                    # Header satırını atla
+                    if num_cell.lower() in ['no', 'sıra', '#', '']:
+                        continue
+                    if 'öğrenme' in desc_cell.lower() or 'çıktı' in desc_cell.lower():
+                        continue
+
+                    if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
+                        doc_items.append(f"DÖÇ{num_cell} | {desc_cell}")
+                    elif desc_cell and len(desc_cell) > 15 and not num_cell.isdigit():
+                        doc_items.append(f"DÖÇ{len(doc_items)+1} | {desc_cell}")
+
+            if doc_items:
+                doc_text = "\n".join(doc_items[:15])
+
+    # ============ MÜFREDAT - lblDersKonulari_h ID'li başlığın altındaki tablo ============
+    curr_header = soup.find(id='lblDersKonulari_h')
+    if curr_header:
+        # Başlıktan sonraki tabloyu bul
+        curr_table = curr_header.find_next('table')
+        if curr_table:
+            curr_items = []
+            rows = curr_table.find_all('tr')
+            for row in rows:
+                cells = row.find_all(['td', 'th'])
+                if len(cells) >= 2:
+                    week_cell = cells[0].get_text(strip=True)
+                    topic_cell = cells[1].get_text(strip=True)
+
+                    # Header satırını atla
+                    if week_cell.lower() in ['hafta', 'week', 'no', '#', '']:
+                        continue
+                    if 'konu' in topic_cell.lower() or 'ders içeriği' in topic_cell.lower():
+                        continue
+
+                    if topic_cell and len(topic_cell) > 2:
+                        if week_cell.isdigit():
+                            curr_items.append(f"H{week_cell} | {topic_cell}")
+                        else:
+                            curr_items.append(f"H{len(curr_items)+1} | {topic_cell}")
+
+            if curr_items:
+                curriculum_text = "\n".join(curr_items[:16])
+
+    # ============ FALLBACK - ID bulunamazsa genel arama ============
+    if not doc_text:
+        # Tüm tabloları tara, "Öğrenme Çıktıları" içeren başlığı ara
+        for table in soup.find_all('table'):
+            prev_text = ""
+            prev_el = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'div', 'label'])
+            if prev_el:
+                prev_text = prev_el.get_text().lower()
+
+            if 'öğrenme' in prev_text and 'çıktı' in prev_text:
+                doc_items = []
+                rows = table.find_all('tr')
+                for row in rows[1:]:  # İlk satır header
+                    cells = row.find_all(['td', 'th'])
+                    if len(cells) >= 2:
+                        num_cell = cells[0].get_text(strip=True)
+                        desc_cell = cells[1].get_text(strip=True)
+                        if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
+                            doc_items.append(f"DÖÇ{num_cell} | {desc_cell}")
+                if doc_items:
+                    doc_text = "\n".join(doc_items[:15])
+                    break
+
+    if not curriculum_text:
+        # Tüm tabloları tara, "Ders Konuları" içeren başlığı ara
+        for table in soup.find_all('table'):
+            prev_text = ""
+            prev_el = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'div', 'label'])
+            if prev_el:
+                prev_text = prev_el.get_text().lower()
+
+            if 'ders konu' in prev_text or 'hafta' in prev_text:
+                curr_items = []
+                rows = table.find_all('tr')
+                for row in rows[1:]:  # İlk satır header
+                    cells = row.find_all(['td', 'th'])
+                    if len(cells) >= 2:
+                        week_cell = cells[0].get_text(strip=True)
+                        topic_cell = cells[1].get_text(strip=True)
+                        if week_cell.isdigit() and topic_cell and len(topic_cell) > 2:
+                            curr_items.append(f"H{week_cell} | {topic_cell}")
+                if curr_items:
+                    curriculum_text = "\n".join(curr_items[:16])
+                    break
+
+    return {
+        "doc_text": doc_text,
+        "curriculum_text": curriculum_text,
+        "success": bool(doc_text or curriculum_text)
+    }
+
+
+def _cache_pages() -> dict:
+    import db
+    conn = db.connect()
+    try:
+        rows = conn.execute("SELECT url, body FROM http_cache").fetchall()
+    finally:
+        conn.close()
+    return {url: zlib.decompress(body).decode("utf-8") for url, body in rows}
+
+
+def load_pages(args) -> dict:
+    if args.from_cache:
+        return _cache_pages()
+    return {p.name: p.read_text(encoding="utf-8") for p in sorted(Path(args.pages).glob("*.html"))}
+
+
+def run(name: str, parse, pages: dict, repeat: int) -> dict:
+    outputs = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for key, html in pages.items():
+            outputs[key] = parse(html)
+    elapsed = time.perf_counter() - start
+    count = len(pages) * repeat
+    size = sum(len(html.encode("utf-8")) for html in pages.values()) * repeat
+    return {"name": name, "elapsed": elapsed, "pages_per_sec": count / elapsed if elapsed else 0.0,
+            "mb_per_sec": size / elapsed / 1e6 if elapsed else 0.0, "outputs": outputs}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pages", default=str(FIXTURES), help="kayıtlı .html ders sayfalarının dizini")
+    ap.add_argument("--from-cache", action="store_true", help="auth.db http_cache'teki sayfaları kullan")
+    ap.add_argument("--repeat", type=int, default=5, help="her sayfanın kaç kez ayrıştırılacağı")
+    ap.add_argument("--save", help="http_cache'teki sayfaları bu dizine .html olarak yaz ve çık")
+    args = ap.parse_args()
+
+    if args.save:
+        out = Path(args.save)
+        out.mkdir(parents=True, exist_ok=True)
+        pages = _cache_pages()
+        for url, html in pages.items():
+            (out / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html").write_text(html, encoding="utf-8")
+        print(f"{len(pages)} sayfa -> {out}")
+        return
+
+    pages = load_pages(args)
+    if not pages:
+        sys.exit("Ayrıştırılacak sayfa yok")
+
+    results = [run("eski", baseline_course_outcomes, pages, args.repeat),
+               run("yeni", bologna_extract.course_outcomes, pages, args.repeat)]
+    mismatched = [key for key in pages if results[0]["outputs"][key] != results[1]["outputs"][key]]
+
+    print(f"{len(pages)} sayfa x {args.repeat}, ayrıştırıcı: {bologna_extract.PARSER}")
+    for r in results:
+        print(f"  {r['name']:<6} {r['pages_per_sec']:>8.1f} sayfa/sn  {r['mb_per_sec']:6.2f} MB/sn  {r['elapsed']:6.2f} sn")
+    if results[0]["pages_per_sec"]:
+        print(f"  hızlanma: {results[1]['pages_per_sec'] / results[0]['pages_per_sec']:.1f}x")
+    if mismatched:
+        print(f"  FARKLI ÇIKTI: {len(mismatched)} sayfa (ör. {mismatched[0]})")
+        sys.exit(1)
+    print("  çıktılar aynı")
+
+
+if __name__ == "__main__":
+    main()
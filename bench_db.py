@@ -0,0 +1,140 @@
+"""
+AkrediX - Veritabanı Eşzamanlılık Ölçümü
+Bağlantı başına-işlem (eski login.py düzeni) ile db.connect() (havuz + WAL)
+karşılaştırması: karışık okuma/yazma trafiğinde saniyedeki işlem ve kilit hataları.
+
+    python bench_db.py --threads 8 --ops 2000 --write-ratio 0.2
+
+Ölçüm geçici bir dizindeki ayrı veritabanlarında yapılır; auth.db'ye dokunulmaz.
+
+    python bench_db.py --plans
+
+login.HOT_QUERIES'in auth.db şemasındaki sorgu planlarını gösterir; indekssiz
+tam tarama ya da geçici sıralama yapan sorgu varsa 1 ile çıkar. Aynı denetim
+geçici bir veritabanında testlerde de çalışır (tests/test_query_plans.py).
+"""
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import db
+
+USERS = 200
+
+
+def _seed(path: Path):
+    conn = sqlite3.connect(str(path))
+    conn.execute("""CREATE TABLE drafts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        name TEXT,
+        payload TEXT,
+        updated_at TEXT
+    )""")
+    payload = "x" * 4000  # Ortalama bir form taslağı boyutu
+    conn.executemany("INSERT INTO drafts (user_email, name, payload, updated_at) VALUES (?,?,?,datetime('now'))",
+                     [(f"user{i % USERS}@example.edu", f"taslak {i}", payload) for i in range(USERS * 5)])
+    conn.commit()
+    conn.close()
+
+
+def _baseline_connect(path: Path):
+    # Eski düzen: her işlem için yeni bağlantı, varsayılan günlük modu ve zaman aşımı
+    return sqlite3.connect(str(path))
+
+
+def _pooled_connect(path: Path):
+    return db.connect(path)
+
+
+def _worker(connect, path: Path, ops: int, write_ratio: float, seed: int, stats: dict, lock: threading.Lock):
+    rnd = random.Random(seed)
+    done = errors = 0
+    for _ in range(ops):
+        email = f"user{rnd.randrange(USERS)}@example.edu"
+        try:
+            conn = connect(path)
+            try:
+                if rnd.random() < write_ratio:
+                    conn.execute("UPDATE drafts SET payload=?, updated_at=datetime('now') WHERE user_email=? AND id=(SELECT MAX(id) FROM drafts WHERE user_email=?)",
+                                 ("y" * 4000, email, email))
+                    conn.commit()
+                else:
+                    conn.execute("SELECT id, name, updated_at FROM drafts WHERE user_email=? ORDER BY updated_at DESC LIMIT 20",
+                                 (email,)).fetchall()
+            finally:
+                conn.close()
+            done += 1
+        except sqlite3.OperationalError:
+            errors += 1  # "database is locked"
+    with lock:
+        stats["done"] += done
+        stats["errors"] += errors
+
+
+def run(name: str, connect, path: Path, threads: int, ops: int, write_ratio: float) -> dict:
+    stats = {"done": 0, "errors": 0}
+    lock = threading.Lock()
+    workers = [threading.Thread(target=_worker, args=(connect, path, ops, write_ratio, i, stats, lock))
+               for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    stats.update(name=name, elapsed=elapsed, ops_per_sec=stats["done"] / elapsed if elapsed else 0.0)
+    return stats
+
+
+def check_plans() -> bool:
+    """Sıcak sorguların planlarını yazdır; hepsi indeks kullanıyorsa True"""
+    import login  # import sırasında şema geçişleri (migrations.INDEXES dahil)
+
+    ok = True
+    conn = db.connect()
+    try:
+        for sql, params in login.HOT_QUERIES:
+            plan = db.query_plan(conn, sql, params)
+            problems = db.plan_problems(plan)
+            ok = ok and not problems
+            print(("SORUN " if problems else "OK    ") + sql)
+            for detail in plan:
+                print(f"        {detail}")
+    finally:
+        conn.close()
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=8, help="eşzamanlı thread sayısı")
+    ap.add_argument("--ops", type=int, default=2000, help="thread başına işlem sayısı")
+    ap.add_argument("--write-ratio", type=float, default=0.2, help="yazma işlemlerinin oranı (0-1)")
+    ap.add_argument("--plans", action="store_true", help="yük ölçümü yerine sıcak sorguların planlarını denetle")
+    args = ap.parse_args()
+
+    if args.plans:
+        sys.exit(0 if check_plans() else 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = []
+        for name, connect in (("baseline", _baseline_connect), ("pooled+wal", _pooled_connect)):
+            path = Path(tmp) / f"{name.replace('+', '_')}.db"
+            _seed(path)
+            results.append(run(name, connect, path, args.threads, args.ops, args.write_ratio))
+
+    print(f"{args.threads} thread x {args.ops} işlem, yazma oranı {args.write_ratio:.0%}")
+    for r in results:
+        print(f"  {r['name']:<12} {r['ops_per_sec']:>10.0f} işlem/sn  {r['elapsed']:6.2f} sn  kilit hatası: {r['errors']}")
+    if results[0]["ops_per_sec"]:
+        print(f"  hızlanma: {results[1]['ops_per_sec'] / results[0]['ops_per_sec']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
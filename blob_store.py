@@ -0,0 +1,208 @@
+"""
+AkrediX - Sıkıştırılmış Kayıt Biçimi
+report_history.payload/result ve drafts.data için başlıklı, sıkıştırılmış blob
+
+save_report payload'ı ve sonucu düz JSON metni olarak saklıyordu; /compute
+sonucun içine payload'ın büyük bölümünü (input_questions, input_students,
+scores, doc_poc_weights...) kopyaladığı için her rapor verisini iki kez
+yazıyordu. Otomatik kayıt da her seferinde tüm form JSON'unu yazıyordu.
+Bu modül:
+  - Metni bir biçim başlığıyla sıkıştırır: MAGIC + sürüm + codec + bayraklar
+    (codec: zstandard yüklüyse zstd, değilse zlib; BLOB_CODEC ile seçilir)
+  - Sonuçta payload'la birebir aynı olan üst düzey alanları {"$payload": alan}
+    başvurusuyla değiştirir (PAYLOAD_FIELDS); okurken payload'dan geri koyar
+  - Başlığı olmayan değerleri (eski düz metin satırlar) olduğu gibi döndürür
+get_report/get_draft çözülmüş metni döndürür; çağıranlar değişmez.
+
+Eski satırları yeni biçime dönüştürmek için:
+
+    python blob_store.py            # report_history ve drafts
+    python blob_store.py --vacuum   # ardından dosyayı küçült
+"""
+import json
+import os
+import sys
+import zlib
+
+import db
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+MAGIC = b"AKB"
+FORMAT_VERSION = 1
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {"zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+FLAG_PAYLOAD_REFS = 1  # sonuçtaki payload kopyaları başvuruyla değiştirildi
+HEADER_SIZE = len(MAGIC) + 3
+
+BLOB_CODEC = os.environ.get("AKREDIX_BLOB_CODEC", "zstd" if HAS_ZSTD else "zlib")
+BLOB_LEVEL = int(os.environ.get("AKREDIX_BLOB_LEVEL", "6"))
+
+# /compute'un sonuca kopyaladığı payload alanları: sonuç anahtarı -> payload anahtarı
+PAYLOAD_FIELDS = (
+    ("curriculum", "curriculum"),
+    ("tyc", "tyc"),
+    ("stark", "stark"),
+    ("doc_tyc_map", "doc_tyc_map"),
+    ("poc_tyc_map", "poc_tyc_map"),
+    ("pea_stark_map", "pea_stark_map"),
+    ("doc_poc_weights", "doc_poc_weights"),
+    ("poc_pea_map", "poc_pea_map"),
+    ("input_questions", "questions"),
+    ("input_students", "students"),
+    ("input_assessments", "assessments"),
+    ("scores", "scores"),
+    ("grading", "grading"),
+    ("course", "course"),
+)
+REF_KEY = "$payload"
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=BLOB_LEVEL).compress(data)
+    return zlib.compress(data, BLOB_LEVEL)
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZSTD:
+        if not HAS_ZSTD:
+            raise RuntimeError("zstd ile sıkıştırılmış kayıt: zstandard modülü yüklü değil")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Bilinmeyen blob codec'i: {codec}")
+
+
+def is_packed(value) -> bool:
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:len(MAGIC)]) == MAGIC
+
+
+def pack(text: str, flags: int = 0) -> bytes:
+    codec = CODECS.get(BLOB_CODEC, CODEC_ZLIB)
+    if codec == CODEC_ZSTD and not HAS_ZSTD:
+        codec = CODEC_ZLIB
+    header = MAGIC + bytes((FORMAT_VERSION, codec, flags))
+    return header + _compress(text.encode("utf-8"), codec)
+
+
+def _unpack(value):
+    """(metin, bayraklar) - başlıksız değerler eski düz metindir"""
+    if value is None:
+        return None, 0
+    if not is_packed(value):
+        return (value.decode("utf-8") if isinstance(value, (bytes, bytearray, memoryview)) else value), 0
+    value = bytes(value)
+    version, codec, flags = value[len(MAGIC):HEADER_SIZE]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen blob sürümü: {version}")
+    return _decompress(value[HEADER_SIZE:], codec).decode("utf-8"), flags
+
+
+def unpack(value) -> str:
+    """pack() çıktısını ya da eski düz metni çöz"""
+    return _unpack(value)[0]
+
+
+# ============ RAPOR SONUCU ============
+
+def _dumps(obj) -> str:
+    # app.py /compute ile aynı ayarlar: yeniden kurulan metin birebir aynı olur
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def pack_result(result_text: str, payload_text: str) -> bytes:
+    """Sonucu, payload'dan kopyalanmış alanları başvuruya çevirerek sıkıştır"""
+    try:
+        result = json.loads(result_text)
+        payload = json.loads(payload_text)
+    except (TypeError, ValueError):
+        return pack(result_text)
+    if not isinstance(result, dict) or not isinstance(payload, dict):
+        return pack(result_text)
+
+    stripped = dict(result)
+    refs = 0
+    for result_key, payload_key in PAYLOAD_FIELDS:
+        if result_key in stripped and payload_key in payload and stripped[result_key] == payload[payload_key]:
+            stripped[result_key] = {REF_KEY: payload_key}
+            refs += 1
+    if not refs:
+        return pack(result_text)
+    stripped_text = _dumps(stripped)
+    # Başka ayarlarla üretilmiş metin birebir geri kurulamıyorsa başvuru kullanma
+    if _join(stripped_text, payload) != result_text:
+        return pack(result_text)
+    return pack(stripped_text, FLAG_PAYLOAD_REFS)
+
+
+def _join(stripped_text: str, payload: dict) -> str:
+    result = json.loads(stripped_text)
+    for key, value in result.items():
+        if isinstance(value, dict) and len(value) == 1 and REF_KEY in value:
+            result[key] = payload.get(value[REF_KEY])
+    return _dumps(result)
+
+
+def unpack_result(value, payload_text: str) -> str:
+    """pack_result() çıktısını (ya da eski düz metni) özgün sonuç metnine çöz"""
+    text, flags = _unpack(value)
+    if not flags & FLAG_PAYLOAD_REFS:
+        return text
+    return _join(text, json.loads(payload_text))
+
+
+# ============ ESKİ SATIRLARIN DÖNÜŞTÜRÜLMESİ ============
+
+def convert(batch: int = 200) -> dict:
+    """Düz metin report_history/drafts satırlarını yeni biçime çevir"""
+    counts = {"reports": 0, "drafts": 0, "bytes_before": 0, "bytes_after": 0}
+    conn = db.connect()
+    try:
+        for table, columns in (("report_history", "payload, result"), ("drafts", "data")):
+            last_id = 0
+            while True:
+                rows = conn.execute(f"SELECT id, {columns} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                                    (last_id, batch)).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                updates = []
+                for row in rows:
+                    if any(is_packed(v) for v in row[1:]):
+                        continue
+                    counts["bytes_before"] += sum(len((v or "").encode("utf-8")) for v in row[1:])
+                    if table == "report_history":
+                        payload, result = row[1] or "{}", row[2] or "{}"
+                        packed = (pack(payload), pack_result(result, payload))
+                    else:
+                        packed = (pack(row[1] or "{}"),)
+                    counts["bytes_after"] += sum(len(v) for v in packed)
+                    updates.append((*packed, row[0]))
+                if updates:
+                    assignments = "payload=?, result=?" if table == "report_history" else "data=?"
+                    conn.executemany(f"UPDATE {table} SET {assignments} WHERE id=?", updates)
+                    conn.commit()
+                    counts["reports" if table == "report_history" else "drafts"] += len(updates)
+    finally:
+        conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    import login  # noqa: F401 - init_db: geçişleri uygula
+    stats = convert()
+    print(f"{stats['reports']} rapor, {stats['drafts']} taslak dönüştürüldü: "
+          f"{stats['bytes_before'] / 1e6:.2f} MB -> {stats['bytes_after'] / 1e6:.2f} MB")
+    if "--vacuum" in sys.argv:
+        conn = db.connect()
+        try:
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        print("VACUUM tamamlandı")
@@ -0,0 +1,286 @@
+"""
+AkrediX - Bologna HTML Ayrıştırıcı
+Bologna sayfalarından DÖÇ, müfredat, ders listesi ve PEA/PÖÇ'ün hedefli çıkarımı
+
+login.py'deki ayrıştırıcılar her sayfa için saf Python html.parser ile tüm
+belge ağacını kuruyordu; yedek yolda her tablo için find_previous çağrılıyor,
+ders listesinde her hücrede re.match desenleri derleniyor ve döngü içinde
+import re yapılıyordu. Burada:
+  - Ders sayfasında yalnızca lblDersinOgrenmeCiktilari / lblDersKonulari_h
+    kimliklerinden sonraki ilk tablonun HTML parçası ayrıştırılır; tam ağaç
+    yalnızca kimlikler bulunamazsa (yedek yol) kurulur
+  - Yedek yol başlık-tablo eşleşmesini tek doğrusal geçişte bulur
+  - Liste sayfalarında SoupStrainer ile yalnızca tablolar (gerekirse linkler)
+    ağaca alınır
+  - Desenler modül yüklenirken bir kez derlenir
+lxml kuruluysa parça ayrıştırmada o kullanılır, yoksa html.parser.
+
+Ölçüm (eski ayrıştırıcıya karşı, tests/fixtures/bologna): python bench_bologna.py
+"""
+import re
+
+try:
+    from bs4 import BeautifulSoup, SoupStrainer
+    HAS_BS4 = True
+except ImportError:
+    HAS_BS4 = False
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+DOC_ID = "lblDersinOgrenmeCiktilari"
+CURRICULUM_ID = "lblDersKonulari_h"
+DOC_LIMIT = 15
+CURRICULUM_LIMIT = 16
+
+# Yedek yolda tablo başlığı sayılan etiketler
+HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'div', 'label']
+
+_ID_PATTERNS = {
+    element_id: re.compile(r'\bid\s*=\s*["\']?' + element_id + r'(?![\w-])')
+    for element_id in (DOC_ID, CURRICULUM_ID)
+}
+_TABLE_TAG = re.compile(r'<(/?)table\b[^>]*>', re.IGNORECASE)
+_NUMERIC_CODE = re.compile(r'^\d{6,8}$')
+_ALPHA_CODE = re.compile(r'^[A-ZİĞÜŞÖÇ]{2,4}\d{3,4}$', re.IGNORECASE)
+_LINK_CODE = re.compile(r'curCourse=(\d{6,8})')
+
+_TABLES_ONLY = SoupStrainer('table') if HAS_BS4 else None
+_LINKS_ONLY = SoupStrainer('a', href=True) if HAS_BS4 else None
+
+
+def _table_after(html: str, element_id: str):
+    """Kimlikli öğeden sonraki ilk <table>...</table> parçası (iç içe tablolar dahil)"""
+    match = _ID_PATTERNS[element_id].search(html)
+    if not match:
+        return None
+    depth = 0
+    start = None
+    for tag in _TABLE_TAG.finditer(html, match.end()):
+        if start is None:
+            if tag.group(1):
+                continue
+            start = tag.start()
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return html[start:tag.end()]
+    return html[start:] if start is not None else None
+
+
+def _cell_pairs(table):
+    """Tablonun en az iki hücreli satırlarının ilk iki hücre metni"""
+    for row in table.find_all('tr'):
+        cells = row.find_all(['td', 'th'])
+        if len(cells) >= 2:
+            yield cells[0].get_text(strip=True), cells[1].get_text(strip=True)
+
+
+def _doc_items(table) -> list:
+    items = []
+    for num_cell, desc_cell in _cell_pairs(table):
+        # Header satırını atla
+        if num_cell.lower() in ['no', 'sıra', '#', '']:
+            continue
+        if 'öğrenme' in desc_cell.lower() or 'çıktı' in desc_cell.lower():
+            continue
+
+        if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
+            items.append(f"DÖÇ{num_cell} | {desc_cell}")
+        elif desc_cell and len(desc_cell) > 15 and not num_cell.isdigit():
+            items.append(f"DÖÇ{len(items)+1} | {desc_cell}")
+    return items
+
+
+def _curriculum_items(table) -> list:
+    items = []
+    for week_cell, topic_cell in _cell_pairs(table):
+        # Header satırını atla
+        if week_cell.lower() in ['hafta', 'week', 'no', '#', '']:
+            continue
+        if 'konu' in topic_cell.lower() or 'ders içeriği' in topic_cell.lower():
+            continue
+
+        if topic_cell and len(topic_cell) > 2:
+            if week_cell.isdigit():
+                items.append(f"H{week_cell} | {topic_cell}")
+            else:
+                items.append(f"H{len(items)+1} | {topic_cell}")
+    return items
+
+
+def _headed_tables(soup) -> list:
+    """(tablo, önceki başlık öğesi) çiftleri - her tablo için find_previous
+    çağırmak yerine belge sırasında tek geçiş"""
+    pairs = []
+    previous = None
+    for el in soup.find_all(HEADING_TAGS + ['table']):
+        if el.name == 'table':
+            pairs.append((el, previous))
+        else:
+            previous = el
+    return pairs
+
+
+def _fallback(soup, need_doc: bool, need_curriculum: bool):
+    """Kimlikler yoksa: başlığı "öğrenme çıktı" / "ders konu" içeren tabloyu ara"""
+    doc_text = curriculum_text = ""
+    pairs = _headed_tables(soup)
+    headings = {}  # id(öğe) -> küçük harfli metin (aynı başlık birkaç tabloda)
+
+    def heading_text(el) -> str:
+        if el is None:
+            return ""
+        key = id(el)
+        if key not in headings:
+            headings[key] = el.get_text().lower()
+        return headings[key]
+
+    if need_doc:
+        for table, prev_el in pairs:
+            prev_text = heading_text(prev_el)
+            if 'öğrenme' in prev_text and 'çıktı' in prev_text:
+                doc_items = []
+                for row in table.find_all('tr')[1:]:  # İlk satır header
+                    cells = row.find_all(['td', 'th'])
+                    if len(cells) >= 2:
+                        num_cell = cells[0].get_text(strip=True)
+                        desc_cell = cells[1].get_text(strip=True)
+                        if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
+                            doc_items.append(f"DÖÇ{num_cell} | {desc_cell}")
+                if doc_items:
+                    doc_text = "\n".join(doc_items[:DOC_LIMIT])
+                    break
+
+    if need_curriculum:
+        for table, prev_el in pairs:
+            prev_text = heading_text(prev_el)
+            if 'ders konu' in prev_text or 'hafta' in prev_text:
+                curr_items = []
+                for row in table.find_all('tr')[1:]:  # İlk satır header
+                    cells = row.find_all(['td', 'th'])
+                    if len(cells) >= 2:
+                        week_cell = cells[0].get_text(strip=True)
+                        topic_cell = cells[1].get_text(strip=True)
+                        if week_cell.isdigit() and topic_cell and len(topic_cell) > 2:
+                            curr_items.append(f"H{week_cell} | {topic_cell}")
+                if curr_items:
+                    curriculum_text = "\n".join(curr_items[:CURRICULUM_LIMIT])
+                    break
+
+    return doc_text, curriculum_text
+
+
+def course_outcomes(html: str) -> dict:
+    """Ders sayfasından {"doc_text", "curriculum_text", "success"} (eski login.py sonucu ile aynı anahtarlar)."""
+    doc_text = curriculum_text = ""
+
+    doc_table = _table_after(html, DOC_ID)
+    curr_table = _table_after(html, CURRICULUM_ID)
+    doc_items = _doc_items(BeautifulSoup(doc_table, PARSER)) if doc_table else []
+    curr_items = _curriculum_items(BeautifulSoup(curr_table, PARSER)) if curr_table else []
+
+    if doc_items:
+        doc_text = "\n".join(doc_items[:DOC_LIMIT])
+    if curr_items:
+        curriculum_text = "\n".join(curr_items[:CURRICULUM_LIMIT])
+
+    # ============ FALLBACK - ID bulunamazsa genel arama ============
+    if not doc_text or not curriculum_text:
+        fallback_doc, fallback_curr = _fallback(BeautifulSoup(html, PARSER), not doc_text, not curriculum_text)
+        doc_text = doc_text or fallback_doc
+        curriculum_text = curriculum_text or fallback_curr
+
+    return {"doc_text": doc_text, "curriculum_text": curriculum_text, "success": bool(doc_text or curriculum_text)}
+
+
+def _semester_from_code(code_text: str) -> int:
+    # MKÜ ders kodlarında 5. hane yarıyıl
+    if len(code_text) >= 6 and code_text[0].isdigit() and code_text[4].isdigit():
+        sem_digit = int(code_text[4])
+        return sem_digit if 1 <= sem_digit <= 8 else 1
+    return 1
+
+
+def course_list(html: str):
+    """Program ders listesi sayfasından (dersler, debug_info).
+    Ders: {"code", "name", "akts", "type", "semester"}"""
+    courses = []
+    seen = set()
+    debug_info = {"tables_found": 0, "rows_checked": 0, "html_length": len(html)}
+
+    # Yöntem 1: Standart tablo yapısı
+    tables = BeautifulSoup(html, PARSER, parse_only=_TABLES_ONLY).find_all('table')
+    debug_info["tables_found"] = len(tables)
+    for table in tables:
+        for row in table.find_all('tr'):
+            debug_info["rows_checked"] += 1
+            cells = row.find_all(['td', 'th'])
+            if len(cells) < 2:
+                continue
+
+            cell_texts = [c.get_text(strip=True) for c in cells]
+            code_text = None
+            name_text = None
+            for i, text in enumerate(cell_texts):
+                # Ders kodu kontrolü (7 haneli sayı veya ABC123 formatı)
+                if _NUMERIC_CODE.match(text) or _ALPHA_CODE.match(text):
+                    code_text = text
+                    # Sonraki hücre muhtemelen ders adı
+                    if i + 1 < len(cell_texts) and len(cell_texts[i + 1]) > 3:
+                        name_text = cell_texts[i + 1]
+                    break
+
+            # Ders adı bulunamadıysa, en uzun metni al
+            if code_text and not name_text:
+                longest = max(cell_texts, key=len)
+                if longest != code_text and len(longest) > 5:
+                    name_text = longest
+
+            if not (code_text and name_text) or code_text in seen:
+                continue
+
+            akts = next((int(t) for t in cell_texts if t.isdigit() and 1 <= int(t) <= 30), 5)
+            course_type = "Z"
+            for text in cell_texts:
+                text_upper = text.upper()
+                if text_upper in ['Z', 'S', 'ZORUNLU', 'SEÇMELİ', 'COMPULSORY', 'ELECTIVE']:
+                    course_type = 'Z' if text_upper in ['Z', 'ZORUNLU', 'COMPULSORY'] else 'S'
+                    break
+
+            seen.add(code_text)
+            courses.append({
+                'code': code_text,
+                'name': name_text,
+                'akts': akts,
+                'type': course_type,
+                'semester': _semester_from_code(code_text),
+            })
+
+    # Yöntem 2: Link içindeki ders kodlarını ara (tabloda değilse)
+    if not courses:
+        for link in BeautifulSoup(html, PARSER, parse_only=_LINKS_ONLY).find_all('a', href=True):
+            text = link.get_text(strip=True)
+            code_match = _LINK_CODE.search(link.get('href', ''))
+            if code_match and text and len(text) > 5 and code_match.group(1) not in seen:
+                seen.add(code_match.group(1))
+                courses.append({'code': code_match.group(1), 'name': text, 'akts': 5, 'type': 'Z', 'semester': 1})
+
+    return courses, debug_info
+
+
+def table_outcomes(html: str, prefix: str, skip_words: tuple, limit: int) -> str:
+    """PEA/PÖÇ sayfası: tablolardaki 20 karakterden uzun hücreler, numaralı satırlar olarak"""
+    items = []
+    for table in BeautifulSoup(html, PARSER, parse_only=_TABLES_ONLY).find_all('table'):
+        for row in table.find_all('tr'):
+            for cell in row.find_all(['td', 'th']):
+                text = cell.get_text(strip=True)
+                if text and len(text) > 20:
+                    # Skip headers
+                    if any(skip in text.lower() for skip in skip_words):
+                        continue
+                    items.append(f"{prefix}{len(items)+1}. {text}")
+    return "\n".join(items[:limit])
@@ -0,0 +1,412 @@
+"""
+AkrediX - Bologna Bölüm Senkronizasyonu
+Bir bölümün tüm derslerinin DÖÇ ve müfredatının Bologna'dan eşzamanlı yenilenmesi
+
+Bölüm verisini yenilemek /api/fetch-bologna/<ders> uç noktasını ders başına,
+sırayla çağırmak demekti: her istek 15 sn'ye kadar bekleyen tek bir
+requests.get, 70 ders dakikalar sürüyordu. start() bölümü bir iş olarak
+arka plana alır:
+  - Sayfalar sınırlı bir thread havuzunda eşzamanlı indirilir; aynı sunucuya
+    aynı anda en fazla PER_HOST_LIMIT istek gider
+  - İnen sayfalar ayrı bir süreç havuzunda ayrıştırılır (BeautifulSoup CPU'ya
+    bağlı, GIL altında thread'lerle hızlanmaz); indirme sürerken ayrıştırma başlar
+  - Tüm course_data güncellemeleri tek transaction'da yazılır
+İş durumu SQLite'ta tutulur (bologna_sync_jobs), ilerleme her worker'dan
+status() ile okunur.
+
+Değişiklik tespiti: çıkarılan doc_text/curriculum_text'in hash'i, dersin bir
+önceki senkronizasyondaki hash'iyle (bologna_sources) karşılaştırılır; yalnızca
+Bologna'da değişen alanlar yazılır ve farkları course_data_changes'e kaydedilir.
+Bologna değişmedikçe elle yapılan düzeltmelerin üzerine yazılmaz; ilk
+senkronizasyonda yalnızca boş alanlar doldurulur.
+
+Zamanlayıcı (start_scheduler): son RESYNC_INTERVAL içinde işi olmayan
+bölümleri yeniler - kullanıcı isteklerinde canlı Bologna çağrısı gerekmez.
+Sayfalar SCHEDULER_MAX_AGE ile çekilir: önbellekteki sayfa beklenerek koşullu
+istekle doğrulanır (değişmeyen 304 döner), bayat gövde ayrıştırılmaz. Thread her worker'da açılır ama yalnızca SCHEDULER_LOCK dosya
+kilidini alan worker çalıştırır; o worker ölünce kilit serbest kalır ve
+sonraki kontrolde başka bir worker devralır. Alt süreçlerde (ayrıştırma
+havuzu) zamanlayıcı açılmaz. changes() bölüm başkanlarına değişen
+derslerin özetini verir.
+"""
+import difflib
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows - tek süreçli geliştirme sunucusu
+    HAS_FCNTL = False
+
+import db
+import login
+import outcome_store
+import ref_cache
+
+# Aynı anda indirilecek sayfa sayısı ve sunucu başına eşzamanlı istek sınırı
+FETCH_WORKERS = int(os.environ.get("AKREDIX_BOLOGNA_FETCH_WORKERS", "16"))
+PER_HOST_LIMIT = int(os.environ.get("AKREDIX_BOLOGNA_PER_HOST", "6"))
+FETCH_TIMEOUT = float(os.environ.get("AKREDIX_BOLOGNA_TIMEOUT", "15"))
+# Ayrıştırma süreç sayısı - 0: indiren thread'de ayrıştır (süreç açılmaz)
+PARSE_WORKERS = int(os.environ.get("AKREDIX_BOLOGNA_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Bu süreden uzun "running" kalan iş (worker'ı ölmüş) yeni işi engellemez (saniye)
+STALE_AFTER = float(os.environ.get("AKREDIX_BOLOGNA_SYNC_STALE", "900"))
+# Zamanlanmış yenileme aralığı (saniye) - varsayılan 7 gün, 0: zamanlayıcı kapalı
+RESYNC_INTERVAL = float(os.environ.get("AKREDIX_BOLOGNA_RESYNC_INTERVAL", str(7 * 86400)))
+# Zamanlayıcının bölümleri kontrol etme sıklığı (saniye)
+SCHEDULER_TICK = float(os.environ.get("AKREDIX_BOLOGNA_SCHEDULER_TICK", "600"))
+# Zamanlanmış işte sayfaların önbellekte kalabileceği süre (saniye) - RESYNC_INTERVAL'dan
+# kısa olmalı; http_cache TTL'i (ve bayat gövdeyi dönüp arka planda yenileme) kullanılmaz
+SCHEDULER_MAX_AGE = float(os.environ.get("AKREDIX_BOLOGNA_SCHEDULER_MAX_AGE", "0"))
+# Zamanlayıcıyı çalıştıran worker'ı seçen dosya kilidi
+SCHEDULER_LOCK = f"{db.DB_PATH}.scheduler.lock"
+# Değişiklik geçmişi ve bitmiş işlerin saklanma süresi (gün)
+HISTORY_KEEP_DAYS = int(os.environ.get("AKREDIX_COURSE_CHANGES_KEEP_DAYS", "365"))
+
+SCHEDULER_USER = "zamanlayici"
+TRACKED_FIELDS = (("doc_text", "doc_hash"), ("curriculum_text", "curriculum_hash"))
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Bölüm işleri sırayla çalışır; eşzamanlılık iş içindeki havuzlarda
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bologna-sync")
+_host_limits = {}  # host -> BoundedSemaphore
+_host_lock = threading.Lock()
+_scheduler = None
+_leader_lock = None  # zamanlayıcı kilidi dosyası (bu süreç seçildiyse)
+
+
+def _connect():
+    # bologna_sync_jobs tablosu: migrations.py (5. geçiş)
+    conn = db.connect()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    host = urlsplit(url).netloc.lower()
+    with _host_lock:
+        sem = _host_limits.get(host)
+        if sem is None:
+            sem = _host_limits[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+        return sem
+
+
+def _fetch(url: str, max_age) -> str:
+    with _host_limit(url):
+        # max_age=0 (elle yenileme): önbellekteki sayfa koşullu istekle doğrulanır (değişmeyen 304 döner)
+        return login.fetch_bologna_html(url, timeout=FETCH_TIMEOUT, max_age=max_age)
+
+
+def _parse_pool():
+    if PARSE_WORKERS <= 0:
+        return None
+    # spawn: istek thread'leri çalışan bir süreçte fork güvenli değil
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _submit_parse(pool, html: str) -> Future:
+    if pool is not None:
+        try:
+            return pool.submit(login.parse_bologna_course, html)
+        except BrokenProcessPool:
+            pass
+    future = Future()
+    future.set_result(login.parse_bologna_course(html))
+    return future
+
+
+def _update(job_id: str, **fields):
+    if fields.get("status") in (STATUS_DONE, STATUS_FAILED):
+        fields["finished_at"] = datetime.now().isoformat()
+    columns = ", ".join(f"{name}=?" for name in fields)
+    conn = _connect()
+    try:
+        conn.execute(f"UPDATE bologna_sync_jobs SET {columns} WHERE job_id=?", (*fields.values(), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _diff(old: str, new: str) -> str:
+    return "\n".join(difflib.unified_diff((old or "").splitlines(), new.splitlines(),
+                                          "önceki", "bologna", lineterm="", n=0))
+
+
+def _write(job_id: str, results: dict, updated_by: str) -> int:
+    """Ayrıştırılan verilerden Bologna'da değişenleri tek transaction'da yaz,
+    farkları kaydet; değişen ders sayısını döndür. Boş gelen alan eskisini silmez."""
+    if not results:
+        return 0
+    now = datetime.now().isoformat()
+    changed = {}  # ders kodu -> yazılan alanlar
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for code, data in results.items():
+            row = conn.execute("""SELECT cd.department_id, cd.doc_text, cd.curriculum_text, bs.doc_hash, bs.curriculum_hash
+                FROM course_data cd LEFT JOIN bologna_sources bs ON bs.course_code = cd.course_code
+                WHERE cd.course_code=?""", (code,)).fetchone()
+            if not row:
+                continue
+            updates = {}
+            hashes = {}
+            for field, hash_column in TRACKED_FIELDS:
+                new = data.get(field) or ""
+                if not new:
+                    hashes[hash_column] = row[hash_column]
+                    continue
+                new_hash = hashes[hash_column] = _hash(new)
+                # İlk senkronizasyonda önceki hash yok: yalnızca boş alan doldurulur, dolu alan
+                # (elle girilmiş olabilir) korunur; hash kaydedilir, sonraki değişiklik yazılır
+                if row[hash_column] is None and (row[field] or "").strip():
+                    continue
+                if new_hash == row[hash_column]:
+                    continue
+                updates[field] = new
+                conn.execute("""INSERT INTO course_data_changes
+                    (course_code, department_id, field, old_hash, new_hash, diff, job_id, changed_at)
+                    VALUES (?,?,?,?,?,?,?,?)""",
+                    (code, row["department_id"], field, _hash(row[field]), new_hash,
+                     _diff(row[field], new), job_id, now))
+
+            conn.execute("""INSERT INTO bologna_sources (course_code, doc_hash, curriculum_hash, synced_at)
+                VALUES (?,?,?,?)
+                ON CONFLICT(course_code) DO UPDATE SET doc_hash=excluded.doc_hash,
+                    curriculum_hash=excluded.curriculum_hash, synced_at=excluded.synced_at""",
+                (code, hashes["doc_hash"], hashes["curriculum_hash"], now))
+            if updates:
+                columns = ", ".join(f"{field}=?" for field in updates)
+                conn.execute(f"UPDATE course_data SET {columns}, updated_at=CURRENT_TIMESTAMP, updated_by=? WHERE course_code=?",
+                             (*updates.values(), updated_by, code))
+                changed[code] = updates
+        conn.commit()
+    finally:
+        conn.close()
+    if changed:
+        ref_cache.invalidate(ref_cache.COURSES)
+    for code, updates in changed.items():
+        outcome_store.sync(outcome_store.SCOPE_COURSE, code, updates)
+    return len(changed)
+
+
+def _run(job_id: str, department_id: str, updated_by: str, max_age):
+    """Arka plan thread'inde çalışır: indir, ayrıştır, yaz"""
+    courses = [c for c in login.get_department_courses(department_id) if (c.get("bologna_link") or "").strip()]
+    counts = {"fetched": 0, "parsed": 0, "failed": 0}
+    errors = {}
+    results = {}
+    _update(job_id, status=STATUS_RUNNING, total=len(courses))
+
+    def fail(code: str, message: str):
+        errors[code] = message
+        counts["failed"] += 1
+        _update(job_id, errors=json.dumps(errors, ensure_ascii=False), **counts)
+
+    started = time.perf_counter()
+    try:
+        if not login.HAS_SCRAPING:
+            raise RuntimeError("Scraping modülü yüklü değil")
+        parse_pool = _parse_pool() if courses else None
+        try:
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="bologna-fetch") as fetch_pool:
+                fetches = {fetch_pool.submit(_fetch, c["bologna_link"].strip(), max_age): c["course_code"] for c in courses}
+                parses = {}
+                for future in as_completed(fetches):
+                    code = fetches[future]
+                    try:
+                        html = future.result()
+                    except Exception as e:
+                        fail(code, str(e))
+                        continue
+                    counts["fetched"] += 1
+                    parses[_submit_parse(parse_pool, html)] = (code, html)
+                    _update(job_id, **counts)
+
+            for future in as_completed(parses):
+                code, html = parses[future]
+                try:
+                    data = future.result()
+                except BrokenProcessPool:
+                    data = login.parse_bologna_course(html)
+                if data.get("error") or not (data.get("doc_text") or data.get("curriculum_text")):
+                    fail(code, data.get("error") or "Sayfada DÖÇ/müfredat bulunamadı")
+                    continue
+                counts["parsed"] += 1
+                results[code] = data
+                _update(job_id, **counts)
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown(wait=False, cancel_futures=True)
+
+        updated = _write(job_id, results, updated_by)
+        _update(job_id, status=STATUS_DONE, updated=updated)
+        print(f"[bologna_sync] {department_id}: {len(courses)} ders, {updated} değişti, "
+              f"{counts['failed']} hata, {time.perf_counter() - started:.1f} sn", file=sys.stderr, flush=True)
+    except Exception as e:
+        print(f"[bologna_sync] {job_id} ({department_id}) hatası: {e}", file=sys.stderr, flush=True)
+        _update(job_id, status=STATUS_FAILED, errors=json.dumps({**errors, "": str(e)}, ensure_ascii=False))
+
+
+def _active(conn, department_id: str) -> dict:
+    """Bölümün kuyruktaki ya da çalışan (ölü sayılmayan) işi"""
+    row = conn.execute("""SELECT * FROM bologna_sync_jobs
+        WHERE department_id=? AND status IN (?, ?)
+        ORDER BY created_at DESC LIMIT 1""",
+        (department_id, STATUS_QUEUED, STATUS_RUNNING)).fetchone()
+    if not row:
+        return {}
+    age = (datetime.now() - datetime.fromisoformat(row["created_at"])).total_seconds()
+    return dict(row) if age < STALE_AFTER else {}
+
+
+def start(department_id: str, started_by: str, max_age: float = 0) -> str:
+    """Bölüm senkronizasyonunu başlat ve job_id döndür.
+    Bölüm için zaten süren bir iş varsa yenisi açılmaz, onun job_id'si döner.
+    max_age http_cache'e geçer: 0 her sayfayı doğrular, None önbellek TTL'ini kullanır."""
+    conn = _connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        active = _active(conn, department_id)
+        if active:
+            conn.commit()
+            return active["job_id"]
+        job_id = uuid4().hex
+        conn.execute("""INSERT INTO bologna_sync_jobs (job_id, department_id, started_by, status, created_at)
+            VALUES (?,?,?,?,?)""",
+            (job_id, department_id, started_by, STATUS_QUEUED, datetime.now().isoformat()))
+        conn.commit()
+    finally:
+        conn.close()
+
+    _executor.submit(_run, job_id, department_id, started_by, max_age)
+    return job_id
+
+
+def status(job_id: str) -> dict:
+    """İş durumunu getir (herhangi bir worker'dan) - errors: {ders kodu: hata}"""
+    if not job_id:
+        return {}
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM bologna_sync_jobs WHERE job_id=?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return {}
+    job = dict(row)
+    job["errors"] = json.loads(job["errors"]) if job["errors"] else {}
+    return job
+
+
+def changes(department_id: str, days: int = 30) -> list:
+    """Bölümde son `days` günde Bologna'dan değişen dersler (yeniden eskiye).
+    Ders: {"course_code", "course_name", "fields", "changed_at", "diffs": {alan: fark}}"""
+    since = (datetime.now() - timedelta(days=days)).isoformat()
+    conn = _connect()
+    try:
+        rows = conn.execute("""SELECT ch.course_code, cd.course_name, ch.field, ch.diff, ch.changed_at
+            FROM course_data_changes ch LEFT JOIN course_data cd ON cd.course_code = ch.course_code
+            WHERE ch.department_id=? AND ch.changed_at >= ?
+            ORDER BY ch.changed_at DESC, ch.id DESC""", (department_id, since)).fetchall()
+    finally:
+        conn.close()
+
+    courses = {}
+    for row in rows:
+        course = courses.setdefault(row["course_code"], {
+            "course_code": row["course_code"],
+            "course_name": row["course_name"] or "",
+            "fields": [],
+            "changed_at": row["changed_at"],
+            "diffs": {},
+        })
+        if row["field"] not in course["diffs"]:  # alan başına en son fark
+            course["fields"].append(row["field"])
+            course["diffs"][row["field"]] = row["diff"]
+    return list(courses.values())
+
+
+def _due_departments() -> list:
+    """Bologna linkli dersi olan ve son RESYNC_INTERVAL içinde işi açılmamış bölümler"""
+    since = (datetime.now() - timedelta(seconds=RESYNC_INTERVAL)).isoformat()
+    conn = _connect()
+    try:
+        rows = conn.execute("""SELECT DISTINCT cd.department_id FROM course_data cd
+            WHERE cd.department_id IS NOT NULL AND COALESCE(cd.bologna_link, '') != ''
+              AND NOT EXISTS (SELECT 1 FROM bologna_sync_jobs j
+                              WHERE j.department_id = cd.department_id AND j.created_at >= ?)""",
+            (since,)).fetchall()
+    finally:
+        conn.close()
+    return [row[0] for row in rows]
+
+
+def _prune():
+    cutoff = (datetime.now() - timedelta(days=HISTORY_KEEP_DAYS)).isoformat()
+    conn = _connect()
+    try:
+        conn.execute("DELETE FROM course_data_changes WHERE changed_at < ?", (cutoff,))
+        conn.execute("DELETE FROM bologna_sync_jobs WHERE created_at < ? AND status IN (?, ?)",
+                     (cutoff, STATUS_DONE, STATUS_FAILED))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _is_leader() -> bool:
+    """Bu süreç zamanlayıcı kilidini tutuyor mu (tutmuyorsa almayı dene, beklemeden)"""
+    global _leader_lock
+    if not HAS_FCNTL or _leader_lock is not None:
+        return True
+    fh = open(SCHEDULER_LOCK, "a")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return False
+    _leader_lock = fh  # süreç boyunca açık kalır; süreç ölünce kilit serbest
+    return True
+
+
+def _scheduler_loop():
+    # Worker'lar aynı anda açılır - kontrolleri dağıt
+    time.sleep(random.uniform(0, min(SCHEDULER_TICK, 60)))
+    while True:
+        try:
+            if _is_leader():
+                for department_id in _due_departments():
+                    start(department_id, SCHEDULER_USER, max_age=SCHEDULER_MAX_AGE)
+                _prune()
+        except Exception as e:
+            print(f"[bologna_sync] zamanlayıcı hatası: {e}", file=sys.stderr, flush=True)
+        time.sleep(SCHEDULER_TICK)
+
+
+def start_scheduler():
+    """Zamanlanmış yenileme thread'ini başlat (worker başına bir kez; çalıştıran tek worker _is_leader ile seçilir)"""
+    global _scheduler
+    if RESYNC_INTERVAL <= 0 or _scheduler is not None or multiprocessing.parent_process() is not None:
+        return
+    _scheduler = threading.Thread(target=_scheduler_loop, name="bologna-resync", daemon=True)
+    _scheduler.start()
@@ -0,0 +1,126 @@
+"""
+AkrediX - Veritabanı Erişim Katmanı
+auth.db için thread başına havuzlanmış, ayarlı SQLite bağlantıları
+
+login.py'deki her fonksiyon tek bir deyim için yeni bağlantı açıp kapatıyordu;
+WAL yoktu, kilit beklemesi yalnızca delete_user'da vardı. Eşzamanlı taslak
+kayıtları ve rapor kayıtlarında yazanlar okuyanları bloke ediyor,
+"database is locked" hataları alınıyordu.
+
+connect() sqlite3.connect'in yerine geçer:
+  - Bağlantılar thread başına havuzlanır; close() bağlantıyı kapatmaz, havuza
+    bırakır (açık transaction geri alınır, row_factory sıfırlanır)
+  - WAL günlük modu: okuyanlar yazanı, yazan okuyanları beklemez
+  - synchronous=NORMAL (WAL'da güvenli), büyük sayfa önbelleği, mmap
+  - busy_timeout: kilitte hemen hata yerine bekle
+  - Deyim önbelleği: havuzdaki bağlantı sorguları bir kez derler
+
+Ölçüm: python bench_db.py
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+DB_PATH = Path(os.environ.get("AKREDIX_DB_PATH") or Path(__file__).with_name("auth.db"))
+
+# Kilit bekleme süresi (saniye) - sqlite3 bunu busy_timeout olarak uygular
+BUSY_TIMEOUT = float(os.environ.get("AKREDIX_DB_BUSY_TIMEOUT", "30"))
+JOURNAL_MODE = os.environ.get("AKREDIX_DB_JOURNAL_MODE", "WAL")
+SYNCHRONOUS = os.environ.get("AKREDIX_DB_SYNCHRONOUS", "NORMAL")
+# Sayfa önbelleği (KiB, bağlantı başına) ve bellek eşlemeli G/Ç boyutu (bayt)
+CACHE_SIZE_KB = int(os.environ.get("AKREDIX_DB_CACHE_KB", "16384"))
+MMAP_SIZE = int(os.environ.get("AKREDIX_DB_MMAP_BYTES", str(128 * 1024 * 1024)))
+CACHED_STATEMENTS = int(os.environ.get("AKREDIX_DB_CACHED_STATEMENTS", "256"))
+# Thread başına boşta tutulacak bağlantı sayısı (iç içe çağrılar ayrı bağlantı alır)
+POOL_IDLE_PER_THREAD = int(os.environ.get("AKREDIX_DB_POOL_IDLE", "4"))
+
+_local = threading.local()
+
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS)
+    conn.execute(f"PRAGMA journal_mode={JOURNAL_MODE}")
+    conn.execute(f"PRAGMA synchronous={SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def _idle(path: str) -> list:
+    pools = getattr(_local, "pools", None)
+    if pools is None:
+        pools = _local.pools = {}
+    return pools.setdefault(path, [])
+
+
+def _release(path: str, conn: sqlite3.Connection):
+    try:
+        if conn.in_transaction:
+            conn.rollback()  # close() öncesi commit edilmeyen değişiklik kaybolurdu - aynısı
+        conn.row_factory = None
+    except sqlite3.Error:
+        conn.close()
+        return
+    idle = _idle(path)
+    if len(idle) < POOL_IDLE_PER_THREAD:
+        idle.append(conn)
+    else:
+        conn.close()
+
+
+class PooledConnection:
+    """sqlite3.Connection vekili - close() bağlantıyı thread'in havuzuna bırakır"""
+
+    __slots__ = ("_conn", "_path")
+
+    def __init__(self, conn: sqlite3.Connection, path: str):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_path", path)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is not None:
+            object.__setattr__(self, "_conn", None)
+            _release(self._path, conn)
+
+
+def connect(path=DB_PATH) -> PooledConnection:
+    """Havuzdan (yoksa yeni) bağlantı al - kullanım sqlite3.connect ile aynı"""
+    path = str(path)
+    idle = _idle(path)
+    conn = idle.pop() if idle else _open(path)
+    return PooledConnection(conn, path)
+
+
+def query_plan(conn, sql: str, params=()) -> list:
+    """EXPLAIN QUERY PLAN satırları (detay metinleri)"""
+    return [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+
+
+def plan_problems(plan: list) -> list:
+    """Planda indekssiz tam tablo taraması ya da geçici sıralama varsa o satırlar"""
+    problems = []
+    for detail in plan:
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            problems.append(detail)
+        elif "TEMP B-TREE" in detail:
+            problems.append(detail)
+    return problems
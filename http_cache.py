@@ -0,0 +1,204 @@
+"""
+AkrediX - HTTP Yanıt Önbelleği
+Bologna sayfaları için URL anahtarlı, kalıcı ve koşullu doğrulanan önbellek
+
+Kayıt (/api/fetch-bologna-signup, kimlik doğrulamasız) ve profil akışları her
+seferinde obs.mku.edu.tr'ye canlı istek atıyordu; oysa Bologna sayfaları yılda
+bir değişir. get_text() önce auth.db'deki http_cache tablosuna bakar:
+  - Taze kayıt (son doğrulamadan bu yana < HTTP_CACHE_TTL): istek atılmaz
+  - Bayat ama HTTP_CACHE_STALE penceresinde: eski gövde hemen döner, arka
+    planda koşullu istekle (If-None-Match / If-Modified-Since) yenilenir
+  - Yok ya da çok eski: koşullu istek beklenir; 304 gövdeyi yeniden indirmez
+  - Ağ hatasında elde bayat kayıt varsa o döner
+Oturum açmış kullanıcının elle başlattığı çekmeler max_age=0 verir: sayfa
+her seferinde koşullu istekle doğrulanır (değişmediyse 304, gövde yeniden
+inmez). Diğer çağıranlar (ör. kimliksiz kayıt ekranı) TTL'i kullanır; anonim
+trafik Bologna'ya istek olarak yansımaz.
+Aynı URL'ye eşzamanlı ıskalar tek bir istekte birleşir; gövdeler zlib ile
+sıkıştırılır, toplam boyut HTTP_CACHE_MAX_MB'ı aşınca en uzun süredir
+kullanılmayanlar silinir. Hata yanıtları (4xx/5xx) önbelleğe girmez.
+"""
+import os
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import db
+import http_client
+
+# Doğrulanmış kaydın istek atılmadan kullanılacağı süre (saniye) - varsayılan 7 gün
+HTTP_CACHE_TTL = float(os.environ.get("AKREDIX_HTTP_CACHE_TTL", str(7 * 86400)))
+# TTL'den sonra bayat kaydın hemen verilip arka planda yenileneceği ek süre - varsayılan 180 gün
+HTTP_CACHE_STALE = float(os.environ.get("AKREDIX_HTTP_CACHE_STALE", str(180 * 86400)))
+HTTP_CACHE_MAX_MB = float(os.environ.get("AKREDIX_HTTP_CACHE_MAX_MB", "64"))
+# Okumada accessed_at en fazla bu sıklıkla yazılır (saniye) - her isabet yazma olmasın
+TOUCH_INTERVAL = 300
+
+_revalidator = ThreadPoolExecutor(max_workers=2, thread_name_prefix="http-cache")
+_inflight = {}  # url -> [Lock, bekleyen sayısı] (aynı URL'ye tek istek; iş bitince silinir)
+_inflight_lock = threading.Lock()
+_revalidating = set()  # arka planda yenilenen URL'ler
+
+
+class HTTPError(Exception):
+    """Önbelleğe alınmayan (2xx/304 dışı) yanıt"""
+
+
+def _connect():
+    # http_cache tablosu: migrations.py (6. geçiş)
+    return db.connect()
+
+
+def _load(url: str):
+    conn = _connect()
+    try:
+        return conn.execute("SELECT body, etag, last_modified, validated_at, accessed_at FROM http_cache WHERE url=?",
+                            (url,)).fetchone()
+    finally:
+        conn.close()
+
+
+def _touch(url: str, now: float):
+    conn = _connect()
+    try:
+        conn.execute("UPDATE http_cache SET accessed_at=? WHERE url=?", (now, url))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _store(url: str, text: str, etag: str, last_modified: str):
+    body = zlib.compress(text.encode("utf-8"), 6)
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("""INSERT INTO http_cache (url, body, size, etag, last_modified, stored_at, validated_at, accessed_at)
+            VALUES (?,?,?,?,?,?,?,?)
+            ON CONFLICT(url) DO UPDATE SET body=excluded.body, size=excluded.size, etag=excluded.etag,
+                last_modified=excluded.last_modified, stored_at=excluded.stored_at,
+                validated_at=excluded.validated_at, accessed_at=excluded.accessed_at""",
+            (url, body, len(body), etag, last_modified, now, now, now))
+        _evict(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _evict(conn):
+    """Toplam boyut sınırı aşıldıysa en uzun süredir kullanılmayanları sil"""
+    limit = int(HTTP_CACHE_MAX_MB * 1024 * 1024)
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+    if total <= limit:
+        return
+    for url, size in conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at").fetchall():
+        conn.execute("DELETE FROM http_cache WHERE url=?", (url,))
+        total -= size
+        if total <= limit:
+            break
+
+
+def _revalidate(url: str, row, headers: dict, timeout: float) -> str:
+    """Koşullu istek at, önbelleği güncelle ve güncel gövdeyi döndür"""
+    request_headers = dict(headers or {})
+    if row is not None:
+        if row[1]:
+            request_headers["If-None-Match"] = row[1]
+        if row[2]:
+            request_headers["If-Modified-Since"] = row[2]
+
+    response = http_client.get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and row is not None:
+        now = time.time()
+        conn = _connect()
+        try:
+            conn.execute("UPDATE http_cache SET validated_at=?, accessed_at=? WHERE url=?", (now, now, url))
+            conn.commit()
+        finally:
+            conn.close()
+        return zlib.decompress(row[0]).decode("utf-8")
+    if response.status_code >= 400:
+        raise HTTPError(f"{url}: HTTP {response.status_code}")
+
+    response.encoding = 'utf-8'  # Bologna sayfaları başlıkta charset bildirmiyor
+    text = response.text
+    _store(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return text
+
+
+@contextmanager
+def _url_lock(url: str):
+    """URL başına kilit; son kullanan çıkınca kayıt silinir (sözlük sınırsız büyümesin)"""
+    with _inflight_lock:
+        entry = _inflight.get(url)
+        if entry is None:
+            entry = _inflight[url] = [threading.Lock(), 0]
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _inflight_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _inflight[url]
+
+
+def _background_revalidate(url: str, headers: dict, timeout: float):
+    try:
+        with _url_lock(url):
+            _revalidate(url, _load(url), headers, timeout)
+    except Exception as e:
+        print(f"[http_cache] {url} arka plan yenileme hatası: {e}", file=sys.stderr, flush=True)
+    finally:
+        with _inflight_lock:
+            _revalidating.discard(url)
+
+
+def get_text(url: str, headers: dict = None, timeout: float = 15, max_age: float = None) -> str:
+    """URL'nin gövdesini önbellekten ya da ağdan getir (UTF-8 metin).
+
+    max_age: bu çağrı için TTL (saniye); 0 her seferinde koşullu doğrulama
+    yaptırır (304 gövdeyi yeniden indirmez). Hata yanıtında HTTPError.
+    """
+    ttl = HTTP_CACHE_TTL if max_age is None else max_age
+    now = time.time()
+    row = _load(url)
+    if row is not None:
+        age = now - row[3]
+        if age < ttl:
+            if now - row[4] > TOUCH_INTERVAL:
+                _touch(url, now)
+            return zlib.decompress(row[0]).decode("utf-8")
+        if max_age is None and age < ttl + HTTP_CACHE_STALE:
+            with _inflight_lock:
+                schedule = url not in _revalidating
+                _revalidating.add(url)
+            if schedule:
+                _revalidator.submit(_background_revalidate, url, headers, timeout)
+            return zlib.decompress(row[0]).decode("utf-8")
+
+    with _url_lock(url):
+        # Kilidi beklerken başka bir thread doğrulamış olabilir
+        fresh = _load(url)
+        if fresh is not None and fresh[3] >= now:
+            return zlib.decompress(fresh[0]).decode("utf-8")
+        try:
+            return _revalidate(url, fresh, headers, timeout)
+        except Exception:
+            if fresh is None:
+                raise
+            print(f"[http_cache] {url} doğrulanamadı, bayat kayıt kullanılıyor", file=sys.stderr, flush=True)
+            return zlib.decompress(fresh[0]).decode("utf-8")
+
+
+def stats() -> dict:
+    """Önbellek özeti: kayıt sayısı ve sıkıştırılmış toplam boyut"""
+    conn = _connect()
+    try:
+        count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache").fetchone()
+    finally:
+        conn.close()
+    return {"entries": count, "bytes": size}
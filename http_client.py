@@ -0,0 +1,230 @@
+"""
+AkrediX - Dış HTTP İstemcisi
+Bologna ve Claude API çağrıları için ortak oturum, tekrar deneme ve devre kesici
+
+Her Bologna isteği requests.get ile yeni bir TCP/TLS bağlantısı açıyordu;
+generate_ai_suggestions her seferinde 60 sn zaman aşımlı bir urlopen açıp SSL
+hatasında sertifika doğrulamasız tekrar deniyordu. Karşı taraf yavaşladığında
+gunicorn worker'ları bekleyen isteklerle doluyordu. Bu modül:
+  - Tek bir requests.Session ile sunucu başına keep-alive bağlantı havuzu tutar
+  - Bağlantı hatası, zaman aşımı ve 429/502/503/504'te sınırlı sayıda, rastgele
+    (jitter) bekleyişli üstel geri çekilmeyle tekrar dener; idempotent olmayan
+    isteklerde (POST) yalnızca isteğin işlenmediği kesin olan durumlarda
+  - Sunucu başına devre kesici: art arda BREAKER_THRESHOLD hatadan sonra
+    BREAKER_COOLDOWN saniye boyunca istek atmadan CircuitOpenError fırlatır,
+    süre dolunca tek bir deneme isteğine izin verir (yarı açık)
+  - Sunucu başına gecikme ve hata ölçümleri tutar (metrics())
+Devre kesici ve ölçümler worker sürecine özeldir.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+# Sunucu başına havuzda tutulacak bağlantı sayısı
+HTTP_POOL_SIZE = int(os.environ.get("AKREDIX_HTTP_POOL_SIZE", "16"))
+# Bağlantı kurma zaman aşımı (saniye) - okuma zaman aşımı çağrı başına verilir
+HTTP_CONNECT_TIMEOUT = float(os.environ.get("AKREDIX_HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_RETRIES = int(os.environ.get("AKREDIX_HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.environ.get("AKREDIX_HTTP_BACKOFF", "0.25"))
+HTTP_BACKOFF_MAX = float(os.environ.get("AKREDIX_HTTP_BACKOFF_MAX", "4"))
+BREAKER_THRESHOLD = int(os.environ.get("AKREDIX_HTTP_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("AKREDIX_HTTP_BREAKER_COOLDOWN", "30"))
+
+RETRY_STATUSES = {429, 502, 503, 504}
+# İsteğin sunucuda işlenmediği kesin olan durumlar - POST da tekrar denenebilir
+UNPROCESSED_STATUSES = {429, 503}
+LATENCY_WINDOW = 200
+
+_session = None
+_session_lock = threading.Lock()
+_hosts = {}  # host -> _HostState
+_hosts_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Sunucunun devre kesicisi açık - istek atılmadı"""
+
+
+class _HostState:
+    """Sunucu başına devre kesici durumu ve ölçümler (lock ile korunur)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = 0  # art arda
+        self.opened_at = None
+        self.probing = False
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def admit(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= BREAKER_COOLDOWN and not self.probing:
+                self.probing = True  # yarı açık: tek deneme isteği
+                return True
+            self.rejected += 1
+            return False
+
+    def release_probe(self):
+        """Deneme isteği sonuç kaydedilmeden bitti (beklenmeyen istisna): sonraki istek yeniden denesin"""
+        with self.lock:
+            self.probing = False
+
+    def record(self, latency: float, ok: bool):
+        with self.lock:
+            self.requests += 1
+            self.latencies.append(latency)
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                self.probing = False
+                return
+            self.errors += 1
+            self.failures += 1
+            if self.probing or self.failures >= BREAKER_THRESHOLD:
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _state(host: str) -> _HostState:
+    with _hosts_lock:
+        state = _hosts.get(host)
+        if state is None:
+            state = _hosts[host] = _HostState()
+        return state
+
+
+def session():
+    """Paylaşılan requests.Session (ilk çağrıda kurulur)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                _session = s
+    return _session
+
+
+def _backoff(attempt: int, response=None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit() and int(retry_after) <= HTTP_BACKOFF_MAX:
+        return float(retry_after)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF * (2 ** attempt)))
+
+
+def request(method: str, url: str, timeout: float = 15, retries: int = None, idempotent: bool = None, **kwargs):
+    """Havuzlanmış oturumla istek at; requests.Response döndürür.
+
+    timeout okuma zaman aşımıdır (bağlantı en fazla HTTP_CONNECT_TIMEOUT).
+    Tekrar denemeler tükenirse son istisna ya da son yanıt döner; devre açıksa
+    CircuitOpenError fırlatılır.
+    """
+    if not HAS_REQUESTS:
+        raise RuntimeError("requests modülü yüklü değil")
+    if retries is None:
+        retries = HTTP_RETRIES
+    if idempotent is None:
+        idempotent = method.upper() in ("GET", "HEAD", "OPTIONS")
+    host = _host(url)
+    state = _state(host)
+    timeouts = (min(HTTP_CONNECT_TIMEOUT, timeout), timeout)
+
+    attempt = 0
+    while True:
+        if not state.admit():
+            raise CircuitOpenError(f"{host}: art arda hatalar nedeniyle istekler {BREAKER_COOLDOWN:.0f} sn durduruldu")
+        started = time.perf_counter()
+        try:
+            response = session().request(method, url, timeout=timeouts, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            state.record(time.perf_counter() - started, ok=False)
+            # Bağlantı zaman aşımında istek gitmemiştir; diğer hatalar yalnızca idempotent isteklerde tekrarlanır
+            if attempt >= retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                raise
+            print(f"[http_client] {host} {type(e).__name__}, tekrar deneniyor ({attempt + 1}/{retries})",
+                  file=sys.stderr, flush=True)
+            delay = _backoff(attempt)
+        except requests.RequestException:
+            state.record(time.perf_counter() - started, ok=False)
+            raise
+        except BaseException:
+            # requests dışı istisna (hook hatası, KeyboardInterrupt...): yarı açık deneme kilitli kalmasın
+            state.release_probe()
+            raise
+        else:
+            failed = response.status_code >= 500
+            state.record(time.perf_counter() - started, ok=not failed)
+            retryable = response.status_code in (RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES)
+            if not retryable or attempt >= retries:
+                return response
+            delay = _backoff(attempt, response)
+            response.close()
+        with state.lock:
+            state.retries += 1
+        attempt += 1
+        time.sleep(delay)
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def metrics() -> dict:
+    """Sunucu başına ölçümler: istek/hata/tekrar sayısı, son LATENCY_WINDOW
+    isteğin gecikme yüzdelikleri (ms) ve devre kesici durumu"""
+    with _hosts_lock:
+        hosts = dict(_hosts)
+    out = {}
+    for host, state in hosts.items():
+        with state.lock:
+            latencies = list(state.latencies)
+            if state.opened_at is None:
+                breaker = "closed"
+            elif state.probing or time.monotonic() - state.opened_at >= BREAKER_COOLDOWN:
+                breaker = "half-open"
+            else:
+                breaker = "open"
+            out[host] = {
+                "requests": state.requests,
+                "errors": state.errors,
+                "retries": state.retries,
+                "rejected": state.rejected,
+                "breaker": breaker,
+                "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+                "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+                "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+            }
+    return out
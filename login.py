@@ -6,149 +6,56 @@ import sqlite3
 import hashlib
 import secrets
 import json
-import re
-from pathlib import Path
 from datetime import datetime, timedelta
+import blob_store
+import bologna_extract
+import db
+import http_cache
+import http_client
+import migrations
+import outcome_store
+import ref_cache
+import static_assets
 
-# Web scraping için
-try:
-    import requests
-    from bs4 import BeautifulSoup
-    HAS_SCRAPING = True
-except ImportError:
-    HAS_SCRAPING = False
+# Web scraping için: istekler http_cache/http_client, ayrıştırma bologna_extract üzerinden
+HAS_SCRAPING = http_client.HAS_REQUESTS and bologna_extract.HAS_BS4
 
-DB_PATH = Path(__file__).with_name("auth.db")
 
 
 # ============ BOLOGNA WEB SCRAPING ============
 
-def fetch_bologna_data(bologna_url: str) -> dict:
-    """Bologna sayfasından DÖÇ ve Müfredat verilerini çek - MKÜ Bologna yapısına özel"""
+BOLOGNA_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+
+def fetch_bologna_html(bologna_url: str, timeout: float = 15, max_age: float = None) -> str:
+    """Bologna ders sayfasının HTML'i, http_cache üzerinden (ağ hatasında istisna fırlatır)"""
+    return http_cache.get_text(bologna_url, headers=BOLOGNA_HEADERS, timeout=timeout, max_age=max_age)
+
+
+def fetch_bologna_data(bologna_url: str, max_age: float = None) -> dict:
+    """Bologna sayfasından DÖÇ ve Müfredat verilerini çek - MKÜ Bologna yapısına özel.
+    max_age=None önbellek TTL'ini kullanır (TTL içinde istek atılmaz); oturum açmış
+    kullanıcının elle yenilemesi max_age=0 verir: sayfa koşullu istekle doğrulanır"""
     if not HAS_SCRAPING or not bologna_url:
         return {"doc_text": "", "curriculum_text": "", "error": "Scraping modülü yüklü değil veya URL boş"}
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-        }
-        response = requests.get(bologna_url, headers=headers, timeout=15)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        doc_text = ""
-        curriculum_text = ""
-        
-        # ============ DÖÇ - lblDersinOgrenmeCiktilari ID'li başlığın altındaki tablo ============
-        doc_header = soup.find(id='lblDersinOgrenmeCiktilari')
-        if doc_header:
-            # Başlıktan sonraki tabloyu bul
-            doc_table = doc_header.find_next('table')
-            if doc_table:
-                doc_items = []
-                rows = doc_table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        num_cell = cells[0].get_text(strip=True)
-                        desc_cell = cells[1].get_text(strip=True)
-                        
-                        # Header satırını atla
-                        if num_cell.lower() in ['no', 'sıra', '#', '']:
-                            continue
-                        if 'öğrenme' in desc_cell.lower() or 'çıktı' in desc_cell.lower():
-                            continue
-                        
-                        if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
-                            doc_items.append(f"DÖÇ{num_cell} | {desc_cell}")
-                        elif desc_cell and len(desc_cell) > 15 and not num_cell.isdigit():
-                            doc_items.append(f"DÖÇ{len(doc_items)+1} | {desc_cell}")
-                
-                if doc_items:
-                    doc_text = "\n".join(doc_items[:15])
-        
-        # ============ MÜFREDAT - lblDersKonulari_h ID'li başlığın altındaki tablo ============
-        curr_header = soup.find(id='lblDersKonulari_h')
-        if curr_header:
-            # Başlıktan sonraki tabloyu bul
-            curr_table = curr_header.find_next('table')
-            if curr_table:
-                curr_items = []
-                rows = curr_table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        week_cell = cells[0].get_text(strip=True)
-                        topic_cell = cells[1].get_text(strip=True)
-                        
-                        # Header satırını atla
-                        if week_cell.lower() in ['hafta', 'week', 'no', '#', '']:
-                            continue
-                        if 'konu' in topic_cell.lower() or 'ders içeriği' in topic_cell.lower():
-                            continue
-                        
-                        if topic_cell and len(topic_cell) > 2:
-                            if week_cell.isdigit():
-                                curr_items.append(f"H{week_cell} | {topic_cell}")
-                            else:
-                                curr_items.append(f"H{len(curr_items)+1} | {topic_cell}")
-                
-                if curr_items:
-                    curriculum_text = "\n".join(curr_items[:16])
-        
-        # ============ FALLBACK - ID bulunamazsa genel arama ============
-        if not doc_text:
-            # Tüm tabloları tara, "Öğrenme Çıktıları" içeren başlığı ara
-            for table in soup.find_all('table'):
-                prev_text = ""
-                prev_el = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'div', 'label'])
-                if prev_el:
-                    prev_text = prev_el.get_text().lower()
-                
-                if 'öğrenme' in prev_text and 'çıktı' in prev_text:
-                    doc_items = []
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:  # İlk satır header
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            num_cell = cells[0].get_text(strip=True)
-                            desc_cell = cells[1].get_text(strip=True)
-                            if num_cell.isdigit() and desc_cell and len(desc_cell) > 5:
-                                doc_items.append(f"DÖÇ{num_cell} | {desc_cell}")
-                    if doc_items:
-                        doc_text = "\n".join(doc_items[:15])
-                        break
-        
-        if not curriculum_text:
-            # Tüm tabloları tara, "Ders Konuları" içeren başlığı ara
-            for table in soup.find_all('table'):
-                prev_text = ""
-                prev_el = table.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'span', 'div', 'label'])
-                if prev_el:
-                    prev_text = prev_el.get_text().lower()
-                
-                if 'ders konu' in prev_text or 'hafta' in prev_text:
-                    curr_items = []
-                    rows = table.find_all('tr')
-                    for row in rows[1:]:  # İlk satır header
-                        cells = row.find_all(['td', 'th'])
-                        if len(cells) >= 2:
-                            week_cell = cells[0].get_text(strip=True)
-                            topic_cell = cells[1].get_text(strip=True)
-                            if week_cell.isdigit() and topic_cell and len(topic_cell) > 2:
-                                curr_items.append(f"H{week_cell} | {topic_cell}")
-                    if curr_items:
-                        curriculum_text = "\n".join(curr_items[:16])
-                        break
-        
-        return {
-            "doc_text": doc_text,
-            "curriculum_text": curriculum_text,
-            "success": bool(doc_text or curriculum_text)
-        }
-        
+        return parse_bologna_course(fetch_bologna_html(bologna_url, max_age=max_age))
+    except Exception as e:
+        return {"doc_text": "", "curriculum_text": "", "error": str(e)}
+
+
+def parse_bologna_course(html: str) -> dict:
+    """Bologna ders sayfası HTML'inden DÖÇ ve haftalık müfredatı çıkar"""
+    if not HAS_SCRAPING:
+        return {"doc_text": "", "curriculum_text": "", "error": "Scraping modülü yüklü değil"}
+    
+    try:
+        return bologna_extract.course_outcomes(html)
     except Exception as e:
         return {"doc_text": "", "curriculum_text": "", "error": str(e)}
 
@@ -329,192 +236,52 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, hashed: str) -> bool:
     return hash_password(password) == hashed
 
+# Sık çalışan sorgular - fonksiyonlar, page_context.py ve HOT_QUERIES aynı metni kullanır
+SQL_DRAFTS = "SELECT id, name, updated_at FROM drafts WHERE user_email=? ORDER BY updated_at DESC LIMIT 20"
+SQL_REPORT_HISTORY = ("SELECT id, title, overall_pct, department_id, course_code, created_at FROM report_history "
+                      "WHERE user_email=? ORDER BY created_at DESC LIMIT 50")
+SQL_FIND_REPORT = """SELECT id FROM report_history
+        WHERE user_email=? AND payload_hash=? AND IFNULL(course_code, '')=?
+        ORDER BY id DESC LIMIT 1"""
+SQL_USER_COURSES = """
+    SELECT uc.*, cd.course_name, cd.bologna_link
+    FROM user_courses uc
+    LEFT JOIN course_data cd ON uc.course_code = cd.course_code
+    WHERE uc.user_email = ?
+    ORDER BY uc.assigned_at DESC
+"""
+# Sıralama Python'da (ad users tablosunda - indeksle sıralanamaz, ders başına birkaç satır)
+SQL_COURSE_USERS = """
+    SELECT uc.*, u.full_name, u.role
+    FROM user_courses uc
+    LEFT JOIN users u ON uc.user_email = u.email
+    WHERE uc.course_code = ?
+"""
+SQL_DEPARTMENT_COURSES = """SELECT * FROM course_data 
+            WHERE department_id=? 
+            ORDER BY semester, course_code"""
+SQL_DEPARTMENT_SEMESTER_COURSES = """SELECT * FROM course_data 
+            WHERE department_id=? AND semester=? 
+            ORDER BY course_code"""
+
+# migrations.INDEXES ile tam tablo taraması ya da geçici sıralama yapmaması gereken sorgular (bench_db.py --plans)
+HOT_QUERIES = (
+    (SQL_DRAFTS, ("",)),
+    (SQL_REPORT_HISTORY, ("",)),
+    (SQL_FIND_REPORT, ("", "", "")),
+    (SQL_USER_COURSES, ("",)),
+    (SQL_COURSE_USERS, ("",)),
+    (SQL_DEPARTMENT_SEMESTER_COURSES, ("", 1)),
+    (SQL_DEPARTMENT_COURSES, ("",)),
+)
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    
-    # Users tablosu
-    conn.execute("""CREATE TABLE IF NOT EXISTS users (
-        email TEXT PRIMARY KEY,
-        password TEXT NOT NULL,
-        full_name TEXT,
-        role TEXT DEFAULT 'ogretim_elemani',
-        department_id TEXT,
-        course_code TEXT,
-        course_name TEXT,
-        term TEXT,
-        program_name TEXT,
-        instructor TEXT,
-        department TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )""")
-    
-    # Bölümler tablosu (yeni)
-    conn.execute("""CREATE TABLE IF NOT EXISTS departments (
-        department_id TEXT PRIMARY KEY,
-        name TEXT,
-        faculty TEXT,
-        bologna_courses_url TEXT,
-        bologna_pea_url TEXT,
-        bologna_poc_url TEXT,
-        pea_text TEXT,
-        poc_text TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        updated_by TEXT
-    )""")
-    
-    # Ders bazlı paylaşılan veriler (TYÇ, Bloom, STAR-K, PEA, PÖÇ, DÖÇ, Müfredat)
-    conn.execute("""CREATE TABLE IF NOT EXISTS course_data (
-        course_code TEXT PRIMARY KEY,
-        course_name TEXT,
-        department_id TEXT,
-        semester INTEGER,
-        akts INTEGER DEFAULT 5,
-        course_type TEXT DEFAULT 'Z',
-        bologna_link TEXT,
-        tyc_text TEXT,
-        bloom_text TEXT,
-        stark_text TEXT,
-        pea_text TEXT,
-        poc_text TEXT,
-        doc_text TEXT,
-        curriculum_text TEXT,
-        updated_at TEXT,
-        updated_by TEXT
-    )""")
-    
-    # akts ve course_type sütunları yoksa ekle
-    try:
-        conn.execute("ALTER TABLE course_data ADD COLUMN akts INTEGER DEFAULT 5")
-    except:
-        pass
-    try:
-        conn.execute("ALTER TABLE course_data ADD COLUMN course_type TEXT DEFAULT 'Z'")
-    except:
-        pass
-    
-    # Bölüm verileri (paylaşılan PEA/PÖÇ - eski sistem uyumluluğu)
-    conn.execute("""CREATE TABLE IF NOT EXISTS department_data (
-        department_id TEXT PRIMARY KEY,
-        peas_text TEXT,
-        pocs_text TEXT,
-        updated_at TEXT,
-        updated_by TEXT
-    )""")
-    
-    # Role sütunu yoksa ekle
-    try:
-        conn.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'ogretim_elemani'")
-    except:
-        pass
-    try:
-        conn.execute("ALTER TABLE users ADD COLUMN department_id TEXT")
-    except:
-        pass
-    
-    # Şifre sıfırlama token'ları
-    conn.execute("""CREATE TABLE IF NOT EXISTS password_resets (
-        email TEXT PRIMARY KEY,
-        token TEXT NOT NULL,
-        expires_at TEXT NOT NULL
-    )""")
-    
-    # Taslaklar tablosu
-    conn.execute("""CREATE TABLE IF NOT EXISTS drafts (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        name TEXT NOT NULL,
-        data TEXT NOT NULL,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )""")
-    
-    # Rapor geçmişi tablosu
-    conn.execute("""CREATE TABLE IF NOT EXISTS report_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        title TEXT,
-        payload TEXT NOT NULL,
-        result TEXT NOT NULL,
-        overall_pct REAL,
-        department_id TEXT,
-        course_code TEXT,
-        created_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )""")
-    
-    # report_history'ye department_id ve course_code ekle (mevcut tablolar için)
-    try:
-        conn.execute("ALTER TABLE report_history ADD COLUMN department_id TEXT")
-    except:
-        pass
-    try:
-        conn.execute("ALTER TABLE report_history ADD COLUMN course_code TEXT")
-    except:
-        pass
-    
-    # Kullanıcı Müfredat Verileri tablosu
-    conn.execute("""CREATE TABLE IF NOT EXISTS user_curriculum (
-        user_email TEXT PRIMARY KEY,
-        tyc_text TEXT,
-        stark_text TEXT,
-        docs_text TEXT,
-        pocs_text TEXT,
-        peas_text TEXT,
-        curriculum_text TEXT,
-        bloom_text TEXT,
-        doc_tyc_map_text TEXT,
-        poc_tyc_map_text TEXT,
-        pea_stark_map_text TEXT,
-        poc_pea_map_text TEXT,
-        doc_poc_weights_text TEXT,
-        curriculum_doc_map_text TEXT,
-        doc_stark_map_text TEXT,
-        doc_pea_map_text TEXT,
-        curriculum_tyc_map_text TEXT,
-        curriculum_stark_map_text TEXT,
-        curriculum_poc_map_text TEXT,
-        curriculum_pea_map_text TEXT,
-        components_text TEXT,
-        thresholds_met TEXT,
-        thresholds_partial TEXT,
-        grading_text TEXT,
-        question_map_text TEXT,
-        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
-    )""")
-    
-    # Yeni sütunları ekle (migration)
-    new_columns = [
-        "question_map_text", "doc_stark_map_text", "doc_pea_map_text",
-        "curriculum_tyc_map_text", "curriculum_stark_map_text",
-        "curriculum_poc_map_text", "curriculum_pea_map_text"
-    ]
-    for col in new_columns:
-        try:
-            conn.execute(f"ALTER TABLE user_curriculum ADD COLUMN {col} TEXT")
-        except:
-            pass  # Sütun zaten var
-    
-    # Kullanıcı-Ders İlişkisi tablosu (çoklu ders atama)
-    conn.execute("""CREATE TABLE IF NOT EXISTS user_courses (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_email TEXT NOT NULL,
-        course_code TEXT NOT NULL,
-        can_create_report INTEGER DEFAULT 1,
-        assigned_by TEXT,
-        assigned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE(user_email, course_code)
-    )""")
-    
-    # Bölüm Ortak Verileri tablosu (PEA, PÖÇ - sadece Dekan/Bölüm Başkanı düzenleyebilir)
-    conn.execute("""CREATE TABLE IF NOT EXISTS department_data (
-        department_id TEXT PRIMARY KEY,
-        peas_text TEXT,
-        pocs_text TEXT,
-        updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
-        updated_by TEXT
-    )""")
-    
-    conn.commit()
-    
+    """Şemayı güncel sürüme getir (bkz. migrations.py)"""
+    migrations.migrate()
+
+
+def seed_defaults(conn):
+    """Varsayılan kullanıcılar, bölüm ve ders verileri - 3. geçiş (bir kez, geçişin transaction'ında)"""
     # Admin kullanıcı oluştur
     hashed_admin = hash_password("Admin123!")
     cur = conn.execute("SELECT email FROM users WHERE email=?", ("admin@mku.edu.tr",))
@@ -522,7 +289,6 @@ def init_db():
         conn.execute("""INSERT INTO users (email, password, full_name, role, department_id, program_name, department) 
                         VALUES (?,?,?,?,?,?,?)""",
             ("admin@mku.edu.tr", hashed_admin, "Sistem Yöneticisi", "admin", None, "Tüm Bölümler", "Sistem"))
-        conn.commit()
     
     # Demo kullanıcı
     cur = conn.execute("SELECT password FROM users WHERE email=?", ("demo@example.com",))
@@ -533,11 +299,9 @@ def init_db():
                         VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
             ("demo@example.com", hashed_demo, "Dr. Ahmet Yilmaz", "ogretim_elemani", "siyaset_bilimi", "1403101",
              "Yönetim Bilimi I", "2024-2025 Güz", "Siyaset Bilimi ve Kamu Yönetimi", "Dr. Ahmet Yilmaz", "Siyaset Bilimi ve Kamu Yönetimi"))
-        conn.commit()
     elif row[0] == "P@ssw0rd!":
         conn.execute("UPDATE users SET password=?, role=?, department_id=? WHERE email=?", 
                      (hashed_demo, "ogretim_elemani", "siyaset_bilimi", "demo@example.com"))
-        conn.commit()
     
     # Varsayılan bölüm verilerini ekle
     cur = conn.execute("SELECT department_id FROM department_data WHERE department_id=?", ("siyaset_bilimi",))
@@ -548,7 +312,6 @@ def init_db():
         conn.execute("""INSERT INTO department_data (department_id, peas_text, pocs_text, updated_by)
                         VALUES (?,?,?,?)""",
             ("siyaset_bilimi", peas_text, pocs_text, "system"))
-        conn.commit()
     
     # Varsayılan ders verilerini ekle (tüm dersler için)
     _init_course_data(conn)
@@ -564,7 +327,6 @@ def init_db():
              "https://obs.mku.edu.tr/oibs/bologna/progGoalsObjectives.aspx?curCourse=1403&lang=tr",
              "https://obs.mku.edu.tr/oibs/bologna/progLearnOutcomes.aspx?curCourse=1403&lang=tr",
              "system"))
-        conn.commit()
     
     # departments ve department_data senkronizasyonu:
     # departments'taki her bölüm için department_data'da kayıt yoksa oluştur
@@ -575,9 +337,6 @@ def init_db():
         if not cur2.fetchone():
             conn.execute("""INSERT INTO department_data (department_id, peas_text, pocs_text, updated_by)
                 VALUES (?,?,?,?)""", (dept_id, '', '', 'system'))
-    conn.commit()
-    
-    conn.close()
 
 
 def _init_course_data(conn):
@@ -671,14 +430,14 @@ def _init_course_data(conn):
                     course_type = COALESCE(NULLIF(course_type, ''), ?)
                     WHERE course_code=?""",
                     ('siyaset_bilimi', semester_num, akts, course_type, code))
-        conn.commit()
 
 
 # ============ DERS VERİLERİ (COURSE_DATA) ============
 
+@ref_cache.cached(ref_cache.COURSES)
 def get_course_data(course_code: str) -> dict:
     """Ders bazlı verileri getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM course_data WHERE course_code=?", (course_code,))
     row = cur.fetchone()
@@ -686,9 +445,13 @@ def get_course_data(course_code: str) -> dict:
     return dict(row) if row else {}
 
 
+# outcome_store'da satır olarak da tutulan course_data metin alanları
+COURSE_OUTCOME_FIELDS = ("tyc_text", "stark_text", "pea_text", "poc_text", "doc_text", "curriculum_text")
+
+
 def save_course_data(course_code: str, data: dict, updated_by: str):
     """Ders bazlı verileri kaydet"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     cur = conn.execute("SELECT course_code FROM course_data WHERE course_code=?", (course_code,))
     
     if cur.fetchone():
@@ -711,11 +474,15 @@ def save_course_data(course_code: str, data: dict, updated_by: str):
     
     conn.commit()
     conn.close()
+    ref_cache.invalidate(ref_cache.COURSES)
+    outcome_store.sync(outcome_store.SCOPE_COURSE, course_code,
+                       {field: data.get(field, '') for field in COURSE_OUTCOME_FIELDS})
 
 
+@ref_cache.cached(ref_cache.COURSES)
 def get_all_courses_data() -> list:
     """Tüm derslerin verilerini getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM course_data ORDER BY course_code")
     rows = cur.fetchall()
@@ -723,18 +490,15 @@ def get_all_courses_data() -> list:
     return [dict(r) for r in rows]
 
 
+@ref_cache.cached(ref_cache.COURSES)
 def get_department_courses(dept_id: str, semester: int = None) -> list:
     """Bölüme ait dersleri getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     if semester:
-        cur = conn.execute("""SELECT * FROM course_data 
-            WHERE department_id=? AND semester=? 
-            ORDER BY course_code""", (dept_id, semester))
+        cur = conn.execute(SQL_DEPARTMENT_SEMESTER_COURSES, (dept_id, semester))
     else:
-        cur = conn.execute("""SELECT * FROM course_data 
-            WHERE department_id=? 
-            ORDER BY semester, course_code""", (dept_id,))
+        cur = conn.execute(SQL_DEPARTMENT_COURSES, (dept_id,))
     rows = cur.fetchall()
     conn.close()
     return [dict(r) for r in rows]
@@ -743,7 +507,7 @@ def get_department_courses(dept_id: str, semester: int = None) -> list:
 def add_course(dept_id: str, course_code: str, course_name: str, semester: int, 
                akts: int = 5, course_type: str = "Z", bologna_link: str = "", updated_by: str = "") -> bool:
     """Bölüme yeni ders ekle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         # Bölümün PEA/PÖÇ verilerini al
         dept_data = get_department_data(dept_id)
@@ -758,6 +522,9 @@ def add_course(dept_id: str, course_code: str, course_name: str, semester: int,
              DEFAULT_TYC, DEFAULT_BLOOM, DEFAULT_STARK, peas_text, pocs_text, '', '', updated_by))
         conn.commit()
         conn.close()
+        ref_cache.invalidate(ref_cache.COURSES)
+        outcome_store.sync(outcome_store.SCOPE_COURSE, course_code,
+                           {"tyc_text": DEFAULT_TYC, "stark_text": DEFAULT_STARK, "pea_text": peas_text, "poc_text": pocs_text})
         return True
     except sqlite3.IntegrityError:
         conn.close()
@@ -771,7 +538,7 @@ def add_course(dept_id: str, course_code: str, course_name: str, semester: int,
 def update_course(course_code: str, course_name: str = None, semester: int = None, 
                   akts: int = None, course_type: str = None, bologna_link: str = None, updated_by: str = "") -> bool:
     """Ders bilgilerini güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         updates = []
         params = []
@@ -801,6 +568,7 @@ def update_course(course_code: str, course_name: str = None, semester: int = Non
             sql = f"UPDATE course_data SET {', '.join(updates)} WHERE course_code=?"
             conn.execute(sql, params)
             conn.commit()
+            ref_cache.invalidate(ref_cache.COURSES)
         
         conn.close()
         return True
@@ -812,11 +580,13 @@ def update_course(course_code: str, course_name: str = None, semester: int = Non
 
 def delete_course(course_code: str) -> bool:
     """Dersi sil"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         conn.execute("DELETE FROM course_data WHERE course_code=?", (course_code,))
         conn.commit()
         conn.close()
+        ref_cache.invalidate(ref_cache.COURSES)
+        outcome_store.forget(outcome_store.SCOPE_COURSE, course_code)
         return True
     except Exception as e:
         print(f"delete_course error: {e}", file=sys.stderr)
@@ -824,8 +594,8 @@ def delete_course(course_code: str) -> bool:
         return False
 
 
-def fetch_courses_from_bologna(url: str, dept_id: str, updated_by: str = "") -> dict:
-    """Bologna'dan ders listesi çek ve veritabanına ekle"""
+def fetch_courses_from_bologna(url: str, dept_id: str, updated_by: str = "", max_age: float = None) -> dict:
+    """Bologna'dan ders listesi çek ve veritabanına ekle (max_age: bkz. fetch_bologna_data)"""
     if not HAS_SCRAPING or not url:
         return {"success": False, "error": "URL boş veya scraping modülü yüklü değil", "courses": []}
     
@@ -835,104 +605,8 @@ def fetch_courses_from_bologna(url: str, dept_id: str, updated_by: str = "") ->
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'tr-TR,tr;q=0.9,en;q=0.8',
         }
-        response = requests.get(url, headers=headers, timeout=30, verify=True)
-        response.encoding = 'utf-8'
-        html_content = response.text
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        courses = []
-        debug_info = {"tables_found": 0, "rows_checked": 0, "html_length": len(html_content)}
-        
-        # Tüm tabloları bul
-        tables = soup.find_all('table')
-        debug_info["tables_found"] = len(tables)
-        
-        # Yöntem 1: Standart tablo yapısı
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                debug_info["rows_checked"] += 1
-                cells = row.find_all(['td', 'th'])
-                
-                if len(cells) >= 2:
-                    # Her hücredeki metni al
-                    cell_texts = [c.get_text(strip=True) for c in cells]
-                    
-                    # Ders kodu bul - 7 haneli sayı veya harf+sayı kombinasyonu
-                    code_text = None
-                    name_text = None
-                    akts = 5
-                    course_type = "Z"
-                    semester = 1
-                    
-                    for i, text in enumerate(cell_texts):
-                        # Ders kodu kontrolü (7 haneli sayı veya ABC123 formatı)
-                        import re
-                        if re.match(r'^\d{6,8}$', text) or re.match(r'^[A-ZİĞÜŞÖÇ]{2,4}\d{3,4}$', text, re.IGNORECASE):
-                            code_text = text
-                            # Sonraki hücre muhtemelen ders adı
-                            if i + 1 < len(cell_texts) and len(cell_texts[i + 1]) > 3:
-                                name_text = cell_texts[i + 1]
-                            break
-                    
-                    # Ders adı bulunamadıysa, en uzun metni al
-                    if code_text and not name_text:
-                        longest = max(cell_texts, key=len)
-                        if longest != code_text and len(longest) > 5:
-                            name_text = longest
-                    
-                    if code_text and name_text:
-                        # AKTS bulmaya çalış
-                        for text in cell_texts:
-                            if text.isdigit() and 1 <= int(text) <= 30:
-                                akts = int(text)
-                                break
-                        
-                        # Tür bulmaya çalış
-                        for text in cell_texts:
-                            text_upper = text.upper()
-                            if text_upper in ['Z', 'S', 'ZORUNLU', 'SEÇMELİ', 'COMPULSORY', 'ELECTIVE']:
-                                course_type = 'Z' if text_upper in ['Z', 'ZORUNLU', 'COMPULSORY'] else 'S'
-                                break
-                        
-                        # Yarıyıl bulmaya çalış
-                        if len(code_text) >= 6 and code_text[0].isdigit():
-                            try:
-                                sem_digit = int(code_text[4]) if code_text[4].isdigit() else 1
-                                semester = sem_digit if 1 <= sem_digit <= 8 else 1
-                            except:
-                                pass
-                        
-                        # Duplicate kontrolü
-                        if not any(c['code'] == code_text for c in courses):
-                            courses.append({
-                                'code': code_text,
-                                'name': name_text,
-                                'akts': akts,
-                                'type': course_type,
-                                'semester': semester
-                            })
-        
-        # Yöntem 2: Link içindeki ders kodlarını ara (tabloda değilse)
-        if not courses:
-            links = soup.find_all('a', href=True)
-            for link in links:
-                href = link.get('href', '')
-                text = link.get_text(strip=True)
-                
-                import re
-                # URL'de ders kodu arama
-                code_match = re.search(r'curCourse=(\d{6,8})', href)
-                if code_match and text and len(text) > 5:
-                    code = code_match.group(1)
-                    if not any(c['code'] == code for c in courses):
-                        courses.append({
-                            'code': code,
-                            'name': text,
-                            'akts': 5,
-                            'type': 'Z',
-                            'semester': 1
-                        })
+        html_content = http_cache.get_text(url, headers=headers, timeout=30, max_age=max_age)
+        courses, debug_info = bologna_extract.course_list(html_content)
         
         # Dersleri veritabanına ekle
         added = 0
@@ -956,38 +630,22 @@ def fetch_courses_from_bologna(url: str, dept_id: str, updated_by: str = "") ->
 
 def update_course_bologna_link(course_code: str, bologna_link: str, updated_by: str):
     """Ders Bologna linkini güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("UPDATE course_data SET bologna_link=?, updated_at=CURRENT_TIMESTAMP, updated_by=? WHERE course_code=?",
                  (bologna_link, updated_by, course_code))
     conn.commit()
     conn.close()
+    ref_cache.invalidate(ref_cache.COURSES)
 
 
 # ============ KULLANICI-DERS İLİŞKİSİ ============
 
 def get_user_courses(email: str) -> list:
     """Kullanıcının yetkili olduğu dersleri getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     try:
-        # Önce tablo var mı kontrol et
-        conn.execute("""CREATE TABLE IF NOT EXISTS user_courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_email TEXT NOT NULL,
-            course_code TEXT NOT NULL,
-            can_create_report INTEGER DEFAULT 1,
-            assigned_by TEXT,
-            assigned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(user_email, course_code)
-        )""")
-        
-        cur = conn.execute("""
-            SELECT uc.*, cd.course_name, cd.bologna_link
-            FROM user_courses uc
-            LEFT JOIN course_data cd ON uc.course_code = cd.course_code
-            WHERE uc.user_email = ?
-            ORDER BY uc.assigned_at DESC
-        """, (email,))
+        cur = conn.execute(SQL_USER_COURSES, (email,))
         rows = cur.fetchall()
         conn.close()
         return [dict(r) for r in rows]
@@ -999,19 +657,8 @@ def get_user_courses(email: str) -> list:
 
 def add_user_course(email: str, course_code: str, assigned_by: str) -> bool:
     """Kullanıcıya ders yetkisi ekle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
-        # Önce tablo var mı kontrol et, yoksa oluştur
-        conn.execute("""CREATE TABLE IF NOT EXISTS user_courses (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_email TEXT NOT NULL,
-            course_code TEXT NOT NULL,
-            can_create_report INTEGER DEFAULT 1,
-            assigned_by TEXT,
-            assigned_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(user_email, course_code)
-        )""")
-        
         conn.execute("""INSERT OR IGNORE INTO user_courses 
             (user_email, course_code, assigned_by) VALUES (?,?,?)""",
             (email, course_code, assigned_by))
@@ -1026,7 +673,7 @@ def add_user_course(email: str, course_code: str, assigned_by: str) -> bool:
 
 def remove_user_course(email: str, course_code: str) -> bool:
     """Kullanıcıdan ders yetkisini kaldır"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("DELETE FROM user_courses WHERE user_email=? AND course_code=?", (email, course_code))
     conn.commit()
     conn.close()
@@ -1035,7 +682,7 @@ def remove_user_course(email: str, course_code: str) -> bool:
 
 def user_has_course_access(email: str, course_code: str) -> bool:
     """Kullanıcının derse erişimi var mı kontrol et"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     cur = conn.execute("SELECT 1 FROM user_courses WHERE user_email=? AND course_code=?", (email, course_code))
     result = cur.fetchone() is not None
     conn.close()
@@ -1044,25 +691,20 @@ def user_has_course_access(email: str, course_code: str) -> bool:
 
 def get_course_users(course_code: str) -> list:
     """Bir derse yetkili kullanıcıları getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
-    cur = conn.execute("""
-        SELECT uc.*, u.full_name, u.role
-        FROM user_courses uc
-        LEFT JOIN users u ON uc.user_email = u.email
-        WHERE uc.course_code = ?
-        ORDER BY u.full_name
-    """, (course_code,))
+    cur = conn.execute(SQL_COURSE_USERS, (course_code,))
     rows = cur.fetchall()
     conn.close()
-    return [dict(r) for r in rows]
+    # ORDER BY u.full_name ile aynı sıra: adı olmayanlar (NULL) önce
+    return sorted((dict(r) for r in rows), key=lambda r: (r["full_name"] is not None, r["full_name"] or ""))
 
 
 # ============ BÖLÜM YÖNETİMİ ============
 
 def add_department(dept_id: str, name: str, faculty: str, bologna_courses_url: str, bologna_pea_url: str, bologna_poc_url: str, updated_by: str) -> bool:
     """Yeni bölüm ekle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         # departments tablosuna ekle
         conn.execute("""INSERT INTO departments 
@@ -1078,15 +720,17 @@ def add_department(dept_id: str, name: str, faculty: str, bologna_courses_url: s
         
         conn.commit()
         conn.close()
+        ref_cache.invalidate(ref_cache.DEPARTMENTS)
         return True
     except sqlite3.IntegrityError:
         conn.close()
         return False
 
 
+@ref_cache.cached(ref_cache.DEPARTMENTS)
 def get_department(dept_id: str) -> dict:
     """Bölüm bilgilerini getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM departments WHERE department_id=?", (dept_id,))
     row = cur.fetchone()
@@ -1094,9 +738,10 @@ def get_department(dept_id: str) -> dict:
     return dict(row) if row else {}
 
 
+@ref_cache.cached(ref_cache.DEPARTMENTS)
 def get_all_departments() -> list:
     """Tüm bölümleri getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM departments ORDER BY name")
     rows = cur.fetchall()
@@ -1106,7 +751,7 @@ def get_all_departments() -> list:
 
 def update_department(dept_id: str, name: str, faculty: str, bologna_courses_url: str, bologna_pea_url: str, bologna_poc_url: str, updated_by: str) -> bool:
     """Bölüm bilgilerini güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         conn.execute("""UPDATE departments SET 
             name=?, faculty=?, bologna_courses_url=?, bologna_pea_url=?, bologna_poc_url=?, updated_by=?
@@ -1114,6 +759,7 @@ def update_department(dept_id: str, name: str, faculty: str, bologna_courses_url
             (name, faculty, bologna_courses_url, bologna_pea_url, bologna_poc_url, updated_by, dept_id))
         conn.commit()
         conn.close()
+        ref_cache.invalidate(ref_cache.DEPARTMENTS)
         return True
     except Exception as e:
         print(f"update_department error: {e}")
@@ -1123,7 +769,7 @@ def update_department(dept_id: str, name: str, faculty: str, bologna_courses_url
 
 def delete_department(dept_id: str) -> bool:
     """Bölümü sil"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     try:
         # Varsayılan bölümü silme
         if dept_id == "siyaset_bilimi":
@@ -1141,6 +787,8 @@ def delete_department(dept_id: str) -> bool:
         
         conn.commit()
         conn.close()
+        ref_cache.invalidate(ref_cache.DEPARTMENTS, ref_cache.COURSES)
+        outcome_store.forget(outcome_store.SCOPE_DEPARTMENT, dept_id)
         return True
     except Exception as e:
         print(f"delete_department error: {e}")
@@ -1148,7 +796,7 @@ def delete_department(dept_id: str) -> bool:
         return False
 
 
-def fetch_pea_from_bologna(url: str) -> dict:
+def fetch_pea_from_bologna(url: str, max_age: float = None) -> dict:
     """Bologna'dan PEA verilerini çek"""
     if not HAS_SCRAPING or not url:
         return {"pea_text": "", "error": "URL boş veya scraping modülü yüklü değil"}
@@ -1157,31 +805,14 @@ def fetch_pea_from_bologna(url: str) -> dict:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        pea_items = []
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                for cell in cells:
-                    text = cell.get_text(strip=True)
-                    if text and len(text) > 20:
-                        # Skip headers
-                        if any(skip in text.lower() for skip in ['amaç', 'objective', 'no', 'sıra']):
-                            continue
-                        pea_items.append(f"PEA{len(pea_items)+1}. {text}")
-        
-        return {"pea_text": "\n".join(pea_items[:10]), "success": bool(pea_items)}
+        pea_text = bologna_extract.table_outcomes(http_cache.get_text(url, headers=headers, timeout=15, max_age=max_age),
+                                                  "PEA", ('amaç', 'objective', 'no', 'sıra'), 10)
+        return {"pea_text": pea_text, "success": bool(pea_text)}
     except Exception as e:
         return {"pea_text": "", "error": str(e)}
 
 
-def fetch_poc_from_bologna(url: str) -> dict:
+def fetch_poc_from_bologna(url: str, max_age: float = None) -> dict:
     """Bologna'dan PÖÇ verilerini çek"""
     if not HAS_SCRAPING or not url:
         return {"poc_text": "", "error": "URL boş veya scraping modülü yüklü değil"}
@@ -1190,32 +821,15 @@ def fetch_poc_from_bologna(url: str) -> dict:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        poc_items = []
-        tables = soup.find_all('table')
-        
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                for cell in cells:
-                    text = cell.get_text(strip=True)
-                    if text and len(text) > 20:
-                        # Skip headers
-                        if any(skip in text.lower() for skip in ['çıktı', 'outcome', 'no', 'sıra']):
-                            continue
-                        poc_items.append(f"PÖÇ{len(poc_items)+1}. {text}")
-        
-        return {"poc_text": "\n".join(poc_items[:15]), "success": bool(poc_items)}
+        poc_text = bologna_extract.table_outcomes(http_cache.get_text(url, headers=headers, timeout=15, max_age=max_age),
+                                                  "PÖÇ", ('çıktı', 'outcome', 'no', 'sıra'), 15)
+        return {"poc_text": poc_text, "success": bool(poc_text)}
     except Exception as e:
         return {"poc_text": "", "error": str(e)}
 
 
 def fetch_user(email: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM users WHERE email=?", (email,))
     row = cur.fetchone()
@@ -1223,7 +837,7 @@ def fetch_user(email: str):
     return dict(row) if row else None
 
 def create_user(email: str, password: str, profile: dict):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     hashed = hash_password(password)
     conn.execute("""INSERT INTO users (email, password, full_name, role, department_id, course_code, course_name, term, program_name, instructor, department) 
                     VALUES (?,?,?,?,?,?,?,?,?,?,?)""",
@@ -1250,7 +864,7 @@ def create_user(email: str, password: str, profile: dict):
     conn.close()
 
 def update_user(email: str, profile: dict):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("""UPDATE users SET full_name=?, role=?, department_id=?, course_code=?, course_name=?, 
                     term=?, program_name=?, instructor=?, department=? WHERE email=?""",
         (profile.get("full_name",""), 
@@ -1267,7 +881,7 @@ def update_user(email: str, profile: dict):
     conn.close()
 
 def update_password(email: str, new_password: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     hashed = hash_password(new_password)
     conn.execute("UPDATE users SET password=? WHERE email=?", (hashed, email))
     conn.commit()
@@ -1280,8 +894,9 @@ def get_role_info(role: str) -> dict:
 def can_edit_pea_poc(role: str) -> bool:
     return role in ["admin", "dekan", "bolum_baskani"]
 
+@ref_cache.cached(ref_cache.DEPARTMENTS)
 def get_department_data(department_id: str) -> dict:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM department_data WHERE department_id=?", (department_id,))
     row = cur.fetchone()
@@ -1291,7 +906,7 @@ def get_department_data(department_id: str) -> dict:
     return {"department_id": department_id, "peas_text": "", "pocs_text": ""}
 
 def save_department_data(department_id: str, data: dict, updated_by: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("""INSERT OR REPLACE INTO department_data 
                     (department_id, peas_text, pocs_text, updated_at, updated_by)
                     VALUES (?,?,?,?,?)""",
@@ -1302,12 +917,15 @@ def save_department_data(department_id: str, data: dict, updated_by: str):
          updated_by))
     conn.commit()
     conn.close()
+    ref_cache.invalidate(ref_cache.DEPARTMENTS)
+    outcome_store.sync(outcome_store.SCOPE_DEPARTMENT, department_id,
+                       {"peas_text": data.get("peas_text", ""), "pocs_text": data.get("pocs_text", "")})
 
 # Şifre sıfırlama
 def create_reset_token(email: str) -> str:
     token = secrets.token_urlsafe(32)
     expires = (datetime.now() + timedelta(hours=1)).isoformat()
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("INSERT OR REPLACE INTO password_resets (email, token, expires_at) VALUES (?,?,?)",
                  (email, token, expires))
     conn.commit()
@@ -1315,7 +933,7 @@ def create_reset_token(email: str) -> str:
     return token
 
 def verify_reset_token(token: str) -> str:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     cur = conn.execute("SELECT email, expires_at FROM password_resets WHERE token=?", (token,))
     row = cur.fetchone()
     conn.close()
@@ -1327,79 +945,126 @@ def verify_reset_token(token: str) -> str:
     return email
 
 def delete_reset_token(email: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("DELETE FROM password_resets WHERE email=?", (email,))
     conn.commit()
     conn.close()
 
 # Taslak işlemleri
 def save_draft(user_email: str, name: str, data: str) -> int:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     now = datetime.now().isoformat()
     cur = conn.execute("INSERT INTO drafts (user_email, name, data, updated_at) VALUES (?,?,?,?)",
-                       (user_email, name, data, now))
+                       (user_email, name, blob_store.pack(data), now))
     draft_id = cur.lastrowid
     conn.commit()
     conn.close()
     return draft_id
 
 def update_draft(draft_id: int, data: str):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     now = datetime.now().isoformat()
-    conn.execute("UPDATE drafts SET data=?, updated_at=? WHERE id=?", (data, now, draft_id))
+    conn.execute("UPDATE drafts SET data=?, updated_at=? WHERE id=?", (blob_store.pack(data), now, draft_id))
     conn.commit()
     conn.close()
 
 def get_drafts(user_email: str) -> list:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
-    cur = conn.execute("SELECT id, name, updated_at FROM drafts WHERE user_email=? ORDER BY updated_at DESC LIMIT 20", (user_email,))
+    cur = conn.execute(SQL_DRAFTS, (user_email,))
     rows = cur.fetchall()
     conn.close()
     return [dict(r) for r in rows]
 
 def get_draft(draft_id: int) -> dict:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM drafts WHERE id=?", (draft_id,))
     row = cur.fetchone()
     conn.close()
-    return dict(row) if row else None
+    if not row:
+        return None
+    draft = dict(row)
+    draft["data"] = blob_store.unpack(draft["data"])
+    return draft
 
 def delete_draft(draft_id: int):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("DELETE FROM drafts WHERE id=?", (draft_id,))
     conn.commit()
     conn.close()
 
-# Rapor geçmişi
-def save_report(user_email: str, title: str, payload: str, result: str, overall_pct: float, department_id: str = None, course_code: str = None) -> int:
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.execute("INSERT INTO report_history (user_email, title, payload, result, overall_pct, department_id, course_code) VALUES (?,?,?,?,?,?,?)",
-                       (user_email, title, payload, result, overall_pct, department_id, course_code))
+# Rapor geçmişi - payload/result blob_store biçiminde (sıkıştırılmış, sonuçta payload kopyası yok)
+def save_report(user_email: str, title: str, payload: str, result: str, overall_pct: float, department_id: str = None, course_code: str = None,
+                payload_hash: str = None) -> int:
+    conn = db.connect()
+    cur = conn.execute("INSERT INTO report_history (user_email, title, payload, result, overall_pct, department_id, course_code, payload_hash) VALUES (?,?,?,?,?,?,?,?)",
+                       (user_email, title, blob_store.pack(payload), blob_store.pack_result(result, payload),
+                        overall_pct, department_id, course_code, payload_hash))
     report_id = cur.lastrowid
     conn.commit()
     conn.close()
     return report_id
 
+def find_report(user_email: str, course_code: str, payload_hash: str) -> dict:
+    """Kullanıcının aynı ders için aynı payload'la (hash) kaydettiği son rapor"""
+    conn = db.connect()
+    row = conn.execute(SQL_FIND_REPORT, (user_email, payload_hash, course_code or "")).fetchone()
+    conn.close()
+    return get_report(row[0]) if row else None
+
+def touch_report(report_id: int, title: str):
+    """Aynı veriyle tekrar hesaplanan raporu geçmişin başına al, sayacını artır"""
+    conn = db.connect()
+    conn.execute("UPDATE report_history SET title=?, created_at=CURRENT_TIMESTAMP, run_count=run_count+1 WHERE id=?",
+                 (title, report_id))
+    conn.commit()
+    conn.close()
+
 def get_report_history(user_email: str) -> list:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
-    cur = conn.execute("SELECT id, title, overall_pct, department_id, course_code, created_at FROM report_history WHERE user_email=? ORDER BY created_at DESC LIMIT 50", (user_email,))
+    cur = conn.execute(SQL_REPORT_HISTORY, (user_email,))
     rows = cur.fetchall()
     conn.close()
     return [dict(r) for r in rows]
 
 def get_report(report_id: int) -> dict:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM report_history WHERE id=?", (report_id,))
     row = cur.fetchone()
     conn.close()
-    return dict(row) if row else None
+    if not row:
+        return None
+    report = dict(row)
+    report["payload"] = blob_store.unpack(report["payload"])
+    report["result"] = blob_store.unpack_result(report["result"], report["payload"])
+    return report
+
+def report_exists(report_id: int) -> bool:
+    """Rapor hâlâ kayıtlı mı - önbellekteki HTML'i vermeden önceki ucuz kontrol"""
+    conn = db.connect()
+    row = conn.execute("SELECT 1 FROM report_history WHERE id=?", (report_id,)).fetchone()
+    conn.close()
+    return row is not None
+
+def while_report_exists(report_id: int, action) -> bool:
+    """Rapor kayıtlıysa action()'ı yazma kilidi altında çalıştır (bu sırada delete_report
+    bekler) ve True döndür; rapor silinmişse çalıştırmadan False"""
+    conn = db.connect()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM report_history WHERE id=?", (report_id,)).fetchone() is None:
+            return False
+        action()
+        return True
+    finally:
+        conn.rollback()
+        conn.close()
 
 def delete_report(report_id: int):
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("DELETE FROM report_history WHERE id=?", (report_id,))
     conn.commit()
     conn.close()
@@ -1458,214 +1123,6 @@ def get_poc_text(dept_id: str = None) -> str:
     return "\n".join([f"{p['id']} | {p['text']}" for p in DEPARTMENT_POC.get(dept_id, [])])
 
 
-# Template rendering
-def _css():
-    return """
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-
-* { margin: 0; padding: 0; box-sizing: border-box; }
-
-:root {
-  --primary: #1e3a5f;
-  --primary-light: #2c5282;
-  --bg: #f1f5f9;
-  --bg-card: #ffffff;
-  --border: #e2e8f0;
-  --text: #1e293b;
-  --text-muted: #64748b;
-  --success: #059669;
-  --danger: #dc2626;
-}
-
-body {
-  font-family: 'Inter', -apple-system, sans-serif;
-  min-height: 100vh;
-  background: var(--bg);
-  color: var(--text);
-  display: flex;
-  align-items: center;
-  justify-content: center;
-  padding: 2rem;
-  overflow-y: auto;
-}
-
-.card {
-  width: 100%;
-  max-width: 420px;
-  background: var(--bg-card);
-  border: 1px solid var(--border);
-  border-radius: 16px;
-  box-shadow: 0 4px 6px -1px rgba(0,0,0,0.1);
-  animation: fadeIn 0.3s ease;
-}
-
-@keyframes fadeIn {
-  from { opacity: 0; transform: translateY(10px); }
-  to { opacity: 1; transform: translateY(0); }
-}
-
-.card-header {
-  padding: 2rem;
-  text-align: center;
-  border-bottom: 1px solid var(--border);
-  background: linear-gradient(to bottom, #f8fafc, white);
-  border-radius: 16px 16px 0 0;
-}
-
-.logo-box {
-  width: 56px; height: 56px;
-  margin: 0 auto 1rem;
-  background: var(--primary);
-  border-radius: 12px;
-  display: flex;
-  align-items: center;
-  justify-content: center;
-}
-
-.logo-box img { width: 65%; height: 65%; object-fit: contain; }
-
-.card-header h1 { font-size: 0.95rem; font-weight: 600; margin-bottom: 0.25rem; }
-.card-header p { font-size: 0.8rem; color: var(--text-muted); }
-
-.card-body { padding: 1.5rem 2rem 2rem; }
-
-.welcome h2 { font-size: 1.25rem; font-weight: 700; margin-bottom: 0.25rem; }
-.welcome p { font-size: 0.85rem; color: var(--text-muted); margin-bottom: 1.5rem; }
-
-.form-group { margin-bottom: 1rem; }
-
-label {
-  display: block;
-  font-size: 0.8rem;
-  font-weight: 600;
-  color: var(--text-muted);
-  margin-bottom: 0.4rem;
-}
-
-input, select {
-  width: 100%;
-  padding: 0.75rem 1rem;
-  background: #f8fafc;
-  border: 1px solid var(--border);
-  border-radius: 8px;
-  font-size: 0.9rem;
-  font-family: inherit;
-  color: var(--text);
-  transition: border-color 0.15s, box-shadow 0.15s;
-}
-
-input::placeholder { color: var(--text-muted); }
-input:focus, select:focus {
-  outline: none;
-  border-color: var(--primary);
-  box-shadow: 0 0 0 3px rgba(30, 58, 95, 0.1);
-  background: white;
-}
-
-input.input-error { border-color: var(--danger); }
-
-.btn {
-  width: 100%;
-  padding: 0.75rem;
-  border: none;
-  border-radius: 8px;
-  font-family: inherit;
-  font-size: 0.9rem;
-  font-weight: 600;
-  cursor: pointer;
-  transition: all 0.15s;
-  margin-top: 0.5rem;
-}
-
-.btn-primary { background: var(--primary); color: white; }
-.btn-primary:hover { background: var(--primary-light); }
-
-.btn-secondary {
-  background: transparent;
-  color: var(--text-muted);
-  border: 1px solid var(--border);
-  margin-top: 0.75rem;
-}
-
-.btn-secondary:hover { background: #f8fafc; color: var(--text); }
-
-.btn-success { background: #059669; color: white; }
-.btn-success:hover { background: #047857; }
-
-.error {
-  padding: 0.75rem;
-  background: #fef2f2;
-  border: 1px solid #fecaca;
-  border-radius: 8px;
-  color: #dc2626;
-  font-size: 0.85rem;
-  margin-bottom: 1rem;
-}
-
-.success {
-  padding: 0.75rem;
-  background: #ecfdf5;
-  border: 1px solid #a7f3d0;
-  border-radius: 8px;
-  color: #059669;
-  font-size: 0.85rem;
-  margin-bottom: 1rem;
-}
-
-.info {
-  padding: 0.75rem;
-  background: #eff6ff;
-  border: 1px solid #bfdbfe;
-  border-radius: 8px;
-  color: #1d4ed8;
-  font-size: 0.85rem;
-  margin-bottom: 1rem;
-}
-
-.link {
-  text-align: center;
-  margin-top: 1.25rem;
-  font-size: 0.85rem;
-  color: var(--text-muted);
-}
-
-.link a { color: var(--primary); text-decoration: none; font-weight: 500; }
-.link a:hover { text-decoration: underline; }
-
-.card-footer {
-  padding: 1rem;
-  text-align: center;
-  font-size: 0.7rem;
-  color: var(--text-muted);
-  border-top: 1px solid var(--border);
-  background: #f8fafc;
-  border-radius: 0 0 16px 16px;
-}
-
-.grid-2 { display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }
-
-.field-error { color: var(--danger); font-size: 0.75rem; margin-top: 0.25rem; }
-
-.password-strength {
-  height: 4px;
-  background: var(--border);
-  border-radius: 2px;
-  margin-top: 0.5rem;
-  overflow: hidden;
-}
-
-.password-strength-bar {
-  height: 100%;
-  width: 0;
-  transition: width 0.3s, background 0.3s;
-}
-
-.strength-weak { width: 33%; background: var(--danger); }
-.strength-medium { width: 66%; background: #f59e0b; }
-.strength-strong { width: 100%; background: var(--success); }
-"""
-
-
 # ===== HTML RENDER FONKSİYONLARI =====
 
 def render_login(error_block: str = "") -> str:
@@ -1676,7 +1133,7 @@ def render_login(error_block: str = "") -> str:
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX - Giris</title>
-  <style>{_css()}</style>
+  {static_assets.stylesheet_tag("auth.css")}
 </head>
 <body>
   <div class="card">
@@ -1761,39 +1218,8 @@ def render_signup(error_block: str = "") -> str:
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX - Kayit</title>
-  <style>
-    {_css()}
-    .card {{ max-width: 700px; }}
-    .steps {{ display: flex; justify-content: center; gap: 0.5rem; margin-bottom: 1.5rem; }}
-    .step {{ width: 12px; height: 12px; border-radius: 50%; background: #e2e8f0; transition: all 0.3s; }}
-    .step.active {{ background: #1e3a5f; transform: scale(1.2); }}
-    .step.done {{ background: #059669; }}
-    .step-content {{ display: none; }}
-    .step-content.active {{ display: block; }}
-    .step-title {{ font-size: 1rem; font-weight: 600; color: #1e293b; margin-bottom: 0.5rem; }}
-    .step-desc {{ font-size: 0.8rem; color: #64748b; margin-bottom: 1rem; }}
-    .btn-group {{ display: flex; gap: 0.75rem; margin-top: 1rem; }}
-    .btn-back {{ background: #64748b; color: white; }}
-    .btn-back:hover {{ background: #475569; }}
-    textarea {{ width: 100%; min-height: 80px; padding: 0.75rem; border: 1px solid #e2e8f0; border-radius: 8px; font-size: 0.85rem; font-family: inherit; resize: vertical; }}
-    textarea:focus {{ outline: none; border-color: #1e3a5f; box-shadow: 0 0 0 3px rgba(30,58,95,0.1); }}
-    textarea.readonly {{ background: #f1f5f9; color: #64748b; }}
-    .helper {{ font-size: 0.75rem; color: #64748b; margin-top: 0.25rem; }}
-    .section-label {{ font-weight: 600; color: #1e293b; margin-bottom: 0.5rem; display: block; }}
-    .info-box {{ background: #eff6ff; border: 1px solid #bfdbfe; border-radius: 8px; padding: 0.75rem; margin-bottom: 1rem; font-size: 0.8rem; color: #1e40af; }}
-    .password-strength {{ height: 6px; background: #e2e8f0; border-radius: 3px; margin-top: 0.5rem; overflow: hidden; }}
-    .password-strength-bar {{ height: 100%; width: 0; transition: width 0.3s, background 0.3s; border-radius: 3px; }}
-    .strength-weak {{ width: 33%; background: #ef4444; }}
-    .strength-medium {{ width: 66%; background: #f59e0b; }}
-    .strength-strong {{ width: 100%; background: #10b981; }}
-    .strength-text {{ font-size: 0.7rem; margin-top: 0.25rem; }}
-    .strength-text.weak {{ color: #ef4444; }}
-    .strength-text.medium {{ color: #f59e0b; }}
-    .strength-text.strong {{ color: #10b981; }}
-    .bologna-btn {{ background: #059669; color: white; padding: 0.5rem 1rem; border: none; border-radius: 6px; cursor: pointer; font-size: 0.85rem; margin-bottom: 1rem; }}
-    .bologna-btn:hover {{ background: #047857; }}
-    .bologna-status {{ display: none; margin-bottom: 1rem; }}
-  </style>
+  {static_assets.stylesheet_tag("auth.css")}
+  {static_assets.stylesheet_tag("signup.css")}
 </head>
 <body>
   <div class="card">
@@ -1983,274 +1409,7 @@ def render_signup(error_block: str = "") -> str:
       2026 AkrediX Sistemi
     </div>
   </div>
-  <script>
-    // Dersler ve PEA/PÖÇ artık API'den dinamik çekiliyor
-    const COURSES = {{}};  // Geriye uyumluluk için boş
-    const PEA_DATA = '';
-    const POC_DATA = '';
-    
-    let currentStep = 1;
-    const password = document.getElementById('password');
-    const strengthBar = document.getElementById('strengthBar');
-    const strengthText = document.getElementById('strengthText');
-    const passwordConfirm = document.getElementById('passwordConfirm');
-    const confirmError = document.getElementById('confirmError');
-    
-    // Şifre güvenlik göstergesi
-    password.addEventListener('input', function() {{
-      const val = this.value;
-      let strength = 0;
-      let text = '';
-      
-      if (val.length >= 6) strength++;
-      if (val.length >= 10) strength++;
-      if (val.match(/[A-Z]/)) strength++;
-      if (val.match(/[0-9]/)) strength++;
-      if (val.match(/[^A-Za-z0-9]/)) strength++;
-      
-      strengthBar.className = 'password-strength-bar';
-      strengthText.className = 'strength-text';
-      
-      if (val.length === 0) {{
-        text = '';
-      }} else if (strength <= 2) {{
-        strengthBar.classList.add('strength-weak');
-        strengthText.classList.add('weak');
-        text = '⚠️ Zayıf şifre';
-      }} else if (strength <= 3) {{
-        strengthBar.classList.add('strength-medium');
-        strengthText.classList.add('medium');
-        text = '⚡ Orta güçlükte';
-      }} else {{
-        strengthBar.classList.add('strength-strong');
-        strengthText.classList.add('strong');
-        text = '✓ Güçlü şifre';
-      }}
-      strengthText.textContent = text;
-    }});
-    
-    // Şifre eşleşme kontrolü
-    passwordConfirm.addEventListener('input', function() {{
-      if (this.value && this.value !== password.value) {{
-        confirmError.textContent = 'Şifreler eşleşmiyor';
-        confirmError.style.color = '#ef4444';
-      }} else if (this.value && this.value === password.value) {{
-        confirmError.textContent = '✓ Şifreler eşleşiyor';
-        confirmError.style.color = '#10b981';
-      }} else {{
-        confirmError.textContent = '';
-      }}
-    }});
-    
-    function showStep(step) {{
-      document.querySelectorAll('.step-content').forEach(el => el.classList.remove('active'));
-      document.querySelectorAll('.step').forEach(el => {{
-        el.classList.remove('active', 'done');
-        if (parseInt(el.dataset.step) < step) el.classList.add('done');
-        if (parseInt(el.dataset.step) === step) el.classList.add('active');
-      }});
-      document.querySelector(`.step-content[data-step="${{step}}"]`).classList.add('active');
-      currentStep = step;
-    }}
-    
-    function nextStep(step) {{
-      // Adım 1 validasyonu
-      if (currentStep === 1) {{
-        const fullName = document.getElementById('fullName');
-        const email = document.getElementById('email');
-        
-        if (fullName.value.trim().length < 3) {{
-          alert('Ad soyad en az 3 karakter olmalı');
-          fullName.focus();
-          return;
-        }}
-        if (!email.value.includes('@')) {{
-          alert('Geçerli bir e-posta girin');
-          email.focus();
-          return;
-        }}
-        if (password.value.length < 6) {{
-          alert('Şifre en az 6 karakter olmalı');
-          password.focus();
-          return;
-        }}
-        if (password.value !== passwordConfirm.value) {{
-          alert('Şifreler eşleşmiyor');
-          passwordConfirm.focus();
-          return;
-        }}
-      }}
-      // Adım 2 validasyonu
-      if (currentStep === 2) {{
-        const courseSelect = document.getElementById('courseSelect');
-        if (!courseSelect.value) {{
-          alert('Lütfen bir ders seçin');
-          return;
-        }}
-      }}
-      showStep(step);
-    }}
-    
-    function prevStep(step) {{
-      showStep(step);
-    }}
-    
-    function updateCourses() {{
-      const semester = document.getElementById('semesterSelect').value;
-      const deptId = document.getElementById('departmentSelect').value;
-      const courseSelect = document.getElementById('courseSelect');
-      
-      courseSelect.innerHTML = '<option value="">Yükleniyor...</option>';
-      
-      // Bölüme göre dersleri API'den çek
-      fetch('/api/department-courses/' + deptId + '/' + semester)
-        .then(r => r.json())
-        .then(data => {{
-          const courses = data.courses || [];
-          if (courses.length === 0) {{
-            courseSelect.innerHTML = '<option value="">-- Bu yarıyılda ders yok --</option>';
-          }} else {{
-            courseSelect.innerHTML = '<option value="">-- Ders Seçin --</option>';
-            courses.forEach(c => {{
-              const opt = document.createElement('option');
-              opt.value = c.code;
-              opt.textContent = c.code + ' - ' + c.name + ' (' + c.akts + ' AKTS, ' + c.type + ')';
-              opt.dataset.name = c.name;
-              courseSelect.appendChild(opt);
-            }});
-          }}
-        }})
-        .catch((err) => {{
-          console.error('Ders listesi yüklenemedi:', err);
-          courseSelect.innerHTML = '<option value="">-- Dersler yüklenemedi --</option>';
-        }});
-      
-      updateTermInput();
-    }}
-    
-    function updateFaculty() {{
-      const deptSelect = document.getElementById('departmentSelect');
-      const selected = deptSelect.options[deptSelect.selectedIndex];
-      const faculty = selected ? selected.dataset.faculty || '' : '';
-      document.getElementById('facultyInput').value = faculty;
-      document.getElementById('programName').value = selected ? selected.textContent : '';
-      
-      // PEA/PÖÇ verilerini de bölüme göre yükle
-      loadPeaPocForDepartment(selected ? selected.value : '');
-      
-      updateCourses();
-    }}
-    
-    function loadPeaPocForDepartment(deptId) {{
-      if (!deptId) return;
-      
-      fetch('/api/department-pea-poc/' + deptId)
-        .then(r => r.json())
-        .then(data => {{
-          if (data.pea_text) {{
-            document.getElementById('peasText').value = data.pea_text;
-          }}
-          if (data.poc_text) {{
-            document.getElementById('pocsText').value = data.poc_text;
-          }}
-        }})
-        .catch(() => {{}});
-    }}
-    
-    function updateCourseName() {{
-      const courseSelect = document.getElementById('courseSelect');
-      const selected = courseSelect.options[courseSelect.selectedIndex];
-      document.getElementById('courseNameHidden').value = selected ? selected.dataset.name || '' : '';
-    }}
-    
-    function updateTermInput() {{
-      const year = document.getElementById('academicYear').value;
-      const sem = document.getElementById('semesterSelect').value;
-      const semType = parseInt(sem) % 2 === 1 ? 'Güz' : 'Bahar';
-      document.getElementById('termInput').value = year + ' ' + semType + ' (' + sem + '. Yarıyıl)';
-    }}
-    
-    function loadFromBologna() {{
-      const deptId = document.getElementById('departmentSelect').value;
-      const statusEl = document.getElementById('bolognaStatus');
-      
-      if (!deptId) {{
-        alert('Lütfen önce bölüm seçin!');
-        return;
-      }}
-      
-      statusEl.textContent = '⏳ PEA/PÖÇ yükleniyor...';
-      statusEl.style.display = 'block';
-      statusEl.style.background = '#fef3c7';
-      statusEl.style.color = '#92400e';
-      
-      fetch('/api/department-pea-poc/' + deptId)
-        .then(r => r.json())
-        .then(data => {{
-          if (data.pea_text || data.poc_text) {{
-            if (data.pea_text) document.getElementById('peasText').value = data.pea_text;
-            if (data.poc_text) document.getElementById('pocsText').value = data.poc_text;
-            statusEl.textContent = '✅ PEA ve PÖÇ yüklendi!';
-            statusEl.style.background = '#dcfce7';
-            statusEl.style.color = '#166534';
-          }} else {{
-            statusEl.textContent = '⚠️ PEA/PÖÇ verisi bulunamadı. Admin panelinden ekleyin.';
-            statusEl.style.background = '#fef2f2';
-            statusEl.style.color = '#dc2626';
-          }}
-        }})
-        .catch(() => {{
-          statusEl.textContent = '❌ Bağlantı hatası';
-          statusEl.style.background = '#fef2f2';
-          statusEl.style.color = '#dc2626';
-        }});
-    }}
-    
-    function fetchDocFromBologna() {{
-      const courseCode = document.getElementById('courseSelect').value;
-      if (!courseCode) {{
-        alert('Lütfen önce bir ders seçin!');
-        return;
-      }}
-      
-      const statusEl = document.getElementById('bolognaStatus');
-      statusEl.textContent = '⏳ Bologna\\'dan veriler çekiliyor...';
-      statusEl.style.display = 'block';
-      statusEl.style.background = '#fef3c7';
-      statusEl.style.color = '#92400e';
-      
-      fetch('/api/fetch-bologna-signup/' + courseCode)
-        .then(r => r.json())
-        .then(data => {{
-          if (data.success) {{
-            if (data.doc_text) {{
-              document.getElementById('docsText').value = data.doc_text;
-            }}
-            if (data.curriculum_text) {{
-              document.getElementById('curriculumText').value = data.curriculum_text;
-            }}
-            statusEl.textContent = '✅ DÖÇ ve Müfredat Bologna\\'dan yüklendi!';
-            statusEl.style.background = '#dcfce7';
-            statusEl.style.color = '#166534';
-          }} else {{
-            statusEl.textContent = '⚠️ ' + (data.error || 'Veri çekilemedi. Manuel giriş yapın.');
-            statusEl.style.background = '#fef2f2';
-            statusEl.style.color = '#dc2626';
-          }}
-        }})
-        .catch(err => {{
-          statusEl.textContent = '❌ Bağlantı hatası. Manuel giriş yapın.';
-          statusEl.style.background = '#fef2f2';
-          statusEl.style.color = '#dc2626';
-        }});
-    }}
-    
-    // Sayfa yüklendiğinde
-    document.addEventListener('DOMContentLoaded', function() {{
-      updateCourses();
-      updateTermInput();
-    }});
-  </script>
+  {static_assets.script_tag("signup.js")}
 </body>
 </html>
 """
@@ -2264,7 +1423,7 @@ def render_forgot_password(message_block: str = "") -> str:
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX - Sifremi Unuttum</title>
-  <style>{_css()}</style>
+  {static_assets.stylesheet_tag("auth.css")}
 </head>
 <body>
   <div class="card">
@@ -2305,7 +1464,7 @@ def render_reset_password(token: str, message_block: str = "") -> str:
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX - Yeni Sifre</title>
-  <style>{_css()}</style>
+  {static_assets.stylesheet_tag("auth.css")}
 </head>
 <body>
   <div class="card">
@@ -2375,7 +1534,7 @@ def render_reset_password(token: str, message_block: str = "") -> str:
 
 def get_all_users() -> list:
     """Tüm kullanıcıları getir"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT email, full_name, role, department_id, course_code, course_name, created_at FROM users ORDER BY created_at DESC")
     rows = cur.fetchall()
@@ -2384,14 +1543,14 @@ def get_all_users() -> list:
 
 def update_user_role(email: str, new_role: str):
     """Kullanıcı rolünü güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("UPDATE users SET role=? WHERE email=?", (new_role, email))
     conn.commit()
     conn.close()
 
 def update_user_course(email: str, course_code: str, course_name: str = ""):
     """Kullanıcının aktif dersini güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.execute("UPDATE users SET course_code=?, course_name=? WHERE email=?", 
                 (course_code, course_name, email))
     conn.commit()
@@ -2399,7 +1558,7 @@ def update_user_course(email: str, course_code: str, course_name: str = ""):
 
 def delete_user(email: str):
     """Kullanıcıyı sil"""
-    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn = db.connect()
     try:
         conn.execute("DELETE FROM users WHERE email=?", (email,))
         
@@ -2427,15 +1586,22 @@ def delete_user(email: str):
         except:
             pass
         
+        # sessions - açık oturumlar (sessions.py)
+        try:
+            conn.execute("DELETE FROM sessions WHERE email=?", (email,))
+        except:
+            pass
+        
         conn.commit()
     except Exception as e:
         print(f"delete_user error: {e}")
     finally:
         conn.close()
+    outcome_store.forget(outcome_store.SCOPE_USER, email)
 
 def add_user(email: str, password: str, full_name: str, role: str, department_id: str = None, course_code: str = None, course_name: str = None, program_name: str = None):
     """Yeni kullanıcı ekle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     hashed = hash_password(password)
     
     # Varsayılan değerler
@@ -2820,19 +1986,6 @@ def render_profile(user: dict, message_block: str = "") -> str:
                 .catch(() => {{}});
             }}
             
-            // Cookie'yi güncelle - ana sayfanın doğru ders kodunu okuması için
-            try {{
-              const profileCookie = document.cookie.split('; ').find(row => row.startsWith('profile='));
-              if (profileCookie) {{
-                let profileData = JSON.parse(decodeURIComponent(profileCookie.split('=')[1]));
-                profileData.course_code = courseCode;
-                profileData.course_name = data.course_name || '';
-                document.cookie = 'profile=' + encodeURIComponent(JSON.stringify(profileData)) + '; path=/; max-age=2592000';
-              }}
-            }} catch(e) {{
-              console.warn('Cookie güncelleme hatası:', e);
-            }}
-            
             // Eğer DÖÇ veya Müfredat boşsa ve Bologna linki varsa otomatik çek
             if ((!data.doc_text || !data.curriculum_text) && data.bologna_link) {{
               fetchFromBolognaAuto();
@@ -3162,113 +2315,7 @@ def render_admin_panel(message_block: str = "", current_user: dict = None) -> st
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX - Admin Paneli</title>
   <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-  <style>
-    * {{ margin:0; padding:0; box-sizing:border-box; }}
-    body {{ font-family:'Inter',sans-serif; background:#f1f5f9; min-height:100vh; color:#1e293b; }}
-    
-    .admin-container {{ display:grid; grid-template-columns:250px 1fr; min-height:100vh; }}
-    
-    /* Sidebar */
-    .sidebar {{ background:#4f46e5; border-right:1px solid #4338ca; padding:1.5rem 0; }}
-    .sidebar-header {{ padding:0 1.5rem 1.5rem; border-bottom:1px solid rgba(255,255,255,0.2); margin-bottom:1rem; }}
-    .sidebar-logo {{ display:flex; align-items:center; gap:0.75rem; }}
-    .sidebar-logo img {{ width:40px; height:40px; border-radius:8px; background:white; }}
-    .sidebar-logo span {{ font-weight:700; font-size:1.1rem; color:white; }}
-    
-    .sidebar-nav {{ padding:0 0.75rem; }}
-    .nav-item {{ display:flex; align-items:center; gap:0.75rem; padding:0.75rem 1rem; border-radius:8px; color:rgba(255,255,255,0.8); cursor:pointer; transition:all 0.2s; margin-bottom:0.25rem; border:none; background:none; width:100%; text-align:left; font-size:0.9rem; }}
-    .nav-item:hover {{ background:rgba(255,255,255,0.15); color:white; }}
-    .nav-item.active {{ background:white; color:#4f46e5; font-weight:600; }}
-    .nav-item span {{ font-size:1.1rem; }}
-    
-    .sidebar-footer {{ padding:1rem 1.5rem; border-top:1px solid rgba(255,255,255,0.2); margin-top:auto; position:absolute; bottom:0; width:250px; }}
-    .sidebar-footer a {{ color:rgba(255,255,255,0.8); text-decoration:none; font-size:0.85rem; display:flex; align-items:center; gap:0.5rem; }}
-    .sidebar-footer a:hover {{ color:white; }}
-    
-    /* Main Content */
-    .main-content {{ padding:2rem; overflow-y:auto; }}
-    .page-header {{ margin-bottom:2rem; }}
-    .page-header h1 {{ font-size:1.75rem; font-weight:700; color:#1e293b; margin-bottom:0.5rem; }}
-    .page-header p {{ color:#64748b; }}
-    
-    /* Stats Cards */
-    .stats-grid {{ display:grid; grid-template-columns:repeat(auto-fit, minmax(200px, 1fr)); gap:1rem; margin-bottom:2rem; }}
-    .stat-card {{ background:white; border-radius:12px; padding:1.25rem; border:1px solid #e2e8f0; box-shadow:0 1px 3px rgba(0,0,0,0.1); }}
-    .stat-card-header {{ display:flex; justify-content:space-between; align-items:center; margin-bottom:0.75rem; }}
-    .stat-card-icon {{ width:40px; height:40px; border-radius:10px; display:flex; align-items:center; justify-content:center; font-size:1.25rem; }}
-    .stat-card-icon.blue {{ background:#eff6ff; }}
-    .stat-card-icon.green {{ background:#ecfdf5; }}
-    .stat-card-icon.purple {{ background:#f5f3ff; }}
-    .stat-card-icon.orange {{ background:#fff7ed; }}
-    .stat-value {{ font-size:2rem; font-weight:700; color:#1e293b; }}
-    .stat-label {{ font-size:0.8rem; color:#64748b; margin-top:0.25rem; }}
-    .stat-change {{ font-size:0.75rem; padding:0.2rem 0.5rem; border-radius:20px; }}
-    .stat-change.up {{ background:#ecfdf5; color:#059669; }}
-    
-    /* Content Panels */
-    .content-panel {{ display:none; }}
-    .content-panel.active {{ display:block; }}
-    
-    .panel-card {{ background:white; border-radius:12px; border:1px solid #e2e8f0; overflow:hidden; margin-bottom:1.5rem; box-shadow:0 1px 3px rgba(0,0,0,0.1); }}
-    .panel-card-header {{ padding:1rem 1.5rem; border-bottom:1px solid #e2e8f0; display:flex; justify-content:space-between; align-items:center; background:#f8fafc; }}
-    .panel-card-header h3 {{ font-size:1rem; font-weight:600; color:#1e293b; }}
-    .panel-card-body {{ padding:1.5rem; }}
-    
-    /* Table */
-    table {{ width:100%; border-collapse:collapse; font-size:0.85rem; }}
-    th, td {{ padding:0.75rem 1rem; text-align:left; border-bottom:1px solid #e2e8f0; }}
-    th {{ background:#f8fafc; font-weight:600; color:#64748b; font-size:0.75rem; text-transform:uppercase; letter-spacing:0.5px; }}
-    tr:hover {{ background:#f8fafc; }}
-    
-    /* Badges */
-    .badge {{ padding:0.25rem 0.5rem; border-radius:20px; font-size:0.7rem; font-weight:600; }}
-    .badge-success {{ background:#ecfdf5; color:#059669; }}
-    .badge-warning {{ background:#fff7ed; color:#ea580c; }}
-    .badge-info {{ background:#eff6ff; color:#2563eb; }}
-    
-    /* Buttons */
-    .btn {{ padding:0.6rem 1.25rem; border-radius:8px; font-weight:600; font-size:0.85rem; cursor:pointer; border:none; transition:all 0.2s; }}
-    .btn-primary {{ background:#4f46e5; color:white; }}
-    .btn-primary:hover {{ background:#4338ca; transform:translateY(-1px); box-shadow:0 4px 12px rgba(79,70,229,0.3); }}
-    .btn-secondary {{ background:#f1f5f9; color:#475569; border:1px solid #e2e8f0; }}
-    .btn-secondary:hover {{ background:#e2e8f0; }}
-    .btn-danger {{ background:#dc2626; color:white; }}
-    .btn-icon {{ background:none; border:none; cursor:pointer; padding:0.25rem; font-size:1rem; }}
-    
-    /* Forms */
-    .form-group {{ margin-bottom:1.25rem; }}
-    .form-group label {{ display:block; font-size:0.8rem; font-weight:600; color:#64748b; margin-bottom:0.5rem; }}
-    textarea, input[type="text"], input[type="url"], input[type="email"], input[type="password"], select {{ 
-      width:100%; padding:0.75rem 1rem; background:white; border:1px solid #e2e8f0; border-radius:8px; 
-      color:#1e293b; font-size:0.9rem; font-family:inherit; resize:vertical;
-    }}
-    textarea:focus, input:focus, select:focus {{ outline:none; border-color:#4f46e5; box-shadow:0 0 0 3px rgba(79,70,229,0.1); }}
-    textarea {{ min-height:120px; }}
-    .helper {{ font-size:0.75rem; color:#94a3b8; margin-top:0.35rem; }}
-    
-    /* Search */
-    .search-box {{ position:relative; margin-bottom:1rem; }}
-    .search-box input {{ width:100%; padding:0.75rem 1rem 0.75rem 2.5rem; background:white; border:1px solid #e2e8f0; border-radius:8px; color:#1e293b; }}
-    .search-box::before {{ content:'🔍'; position:absolute; left:0.75rem; top:50%; transform:translateY(-50%); }}
-    
-    /* Messages */
-    .alert {{ padding:1rem; border-radius:8px; margin-bottom:1rem; }}
-    .alert-success {{ background:#ecfdf5; border:1px solid #10b981; color:#065f46; }}
-    .alert-error {{ background:#fef2f2; border:1px solid #dc2626; color:#991b1b; }}
-    
-    /* Quick Actions */
-    .quick-actions {{ display:grid; grid-template-columns:repeat(auto-fit, minmax(150px, 1fr)); gap:1rem; margin-top:1.5rem; }}
-    .quick-action {{ background:#334155; border-radius:10px; padding:1rem; text-align:center; cursor:pointer; transition:all 0.2s; border:1px solid transparent; }}
-    .quick-action:hover {{ border-color:#3b82f6; transform:translateY(-2px); }}
-    .quick-action span {{ font-size:1.5rem; display:block; margin-bottom:0.5rem; }}
-    .quick-action p {{ font-size:0.8rem; color:#94a3b8; }}
-    
-    /* Tabs (for sub-sections) */
-    .tabs {{ display:flex; gap:0.5rem; margin-bottom:1rem; border-bottom:1px solid #334155; padding-bottom:0.5rem; }}
-    .tab-btn {{ padding:0.5rem 1rem; background:none; border:none; color:#94a3b8; cursor:pointer; border-radius:6px 6px 0 0; font-size:0.85rem; }}
-    .tab-btn:hover {{ color:white; }}
-    .tab-btn.active {{ background:#334155; color:white; }}
-  </style>
+  {static_assets.stylesheet_tag("admin.css")}
 </head>
 <body>
   <div class="admin-container">
@@ -3579,521 +2626,7 @@ def render_admin_panel(message_block: str = "", current_user: dict = None) -> st
     </main>
   </div>
   
-  <script>
-    function showPanel(panelId) {{
-      document.querySelectorAll('.content-panel').forEach(p => p.classList.remove('active'));
-      document.querySelectorAll('.nav-item').forEach(n => n.classList.remove('active'));
-      document.getElementById('panel-' + panelId).classList.add('active');
-      event.target.classList.add('active');
-    }}
-    
-    function updateRole(email, newRole) {{
-      fetch('/admin/role', {{
-        method: 'POST',
-        headers: {{ 'Content-Type': 'application/x-www-form-urlencoded' }},
-        body: 'email=' + encodeURIComponent(email) + '&role=' + encodeURIComponent(newRole)
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Rol güncellendi!', 'success');
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function deleteUser(email) {{
-      if (confirm('Bu kullanıcıyı silmek istediğinizden emin misiniz?\\n' + email)) {{
-        fetch('/admin/delete-user', {{
-          method: 'POST',
-          headers: {{ 'Content-Type': 'application/x-www-form-urlencoded' }},
-          body: 'email=' + encodeURIComponent(email)
-        }}).then(r => r.json()).then(data => {{
-          if (data.success) location.reload();
-          else alert('Hata: ' + data.error);
-        }});
-      }}
-    }}
-    
-    // ============ DERS ATAMA FONKSİYONLARI ============
-    let currentUserEmail = '';
-    
-    function openUserCoursesModal(email, fullName) {{
-      currentUserEmail = email;
-      document.getElementById('userCoursesModalTitle').textContent = fullName || email;
-      document.getElementById('userCoursesModal').style.display = 'flex';
-      loadUserCourses(email);
-    }}
-    
-    function closeUserCoursesModal() {{
-      document.getElementById('userCoursesModal').style.display = 'none';
-      currentUserEmail = '';
-    }}
-    
-    function loadUserCourses(email) {{
-      const container = document.getElementById('userCoursesList');
-      container.innerHTML = '<p style="color:#64748b;">Yükleniyor...</p>';
-      
-      fetch('/api/user-courses/' + encodeURIComponent(email))
-        .then(r => r.json())
-        .then(data => {{
-          if (data.error) {{
-            container.innerHTML = '<p style="color:#dc2626;">Hata: ' + data.error + '</p>';
-            return;
-          }}
-          
-          if (!data.courses || data.courses.length === 0) {{
-            container.innerHTML = '<p style="color:#64748b;">Henüz ders atanmamış.</p>';
-            return;
-          }}
-          
-          let html = '<table style="width:100%;font-size:0.85rem;"><thead><tr><th>Kod</th><th>Ders Adı</th><th>İşlem</th></tr></thead><tbody>';
-          data.courses.forEach(c => {{
-            html += '<tr><td><strong>' + c.course_code + '</strong></td><td>' + (c.course_name || '-') + '</td>';
-            html += '<td><button onclick="removeCourseFromUser(\\'' + c.course_code + '\\')" style="background:#dc2626;color:white;border:none;padding:0.25rem 0.5rem;border-radius:4px;cursor:pointer;font-size:0.75rem;">Kaldır</button></td></tr>';
-          }});
-          html += '</tbody></table>';
-          container.innerHTML = html;
-        }})
-        .catch(err => {{
-          container.innerHTML = '<p style="color:#dc2626;">Hata: ' + err.message + '</p>';
-        }});
-    }}
-    
-    function assignCourseToUser() {{
-      const courseCode = document.getElementById('assignCourseSelect').value;
-      if (!courseCode || !currentUserEmail) {{
-        alert('Lütfen bir ders seçin');
-        return;
-      }}
-      
-      fetch('/api/assign-course', {{
-        method: 'POST',
-        headers: {{ 'Content-Type': 'application/json' }},
-        body: JSON.stringify({{ email: currentUserEmail, course_code: courseCode }})
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Ders atandı!', 'success');
-          loadUserCourses(currentUserEmail);
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function removeCourseFromUser(courseCode) {{
-      if (!confirm('Bu dersi kullanıcıdan kaldırmak istiyor musunuz?')) return;
-      
-      fetch('/api/remove-course', {{
-        method: 'POST',
-        headers: {{ 'Content-Type': 'application/json' }},
-        body: JSON.stringify({{ email: currentUserEmail, course_code: courseCode }})
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Ders kaldırıldı!', 'success');
-          loadUserCourses(currentUserEmail);
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function filterUsers(query) {{
-      const rows = document.querySelectorAll('#usersTable tbody tr');
-      query = query.toLowerCase();
-      rows.forEach(row => {{
-        const text = row.textContent.toLowerCase();
-        row.style.display = text.includes(query) ? '' : 'none';
-      }});
-    }}
-    
-    function addNewUser(e) {{
-      e.preventDefault();
-      const form = e.target;
-      const data = new FormData(form);
-      
-      fetch('/admin/add-user', {{
-        method: 'POST',
-        body: data
-      }}).then(r => r.json()).then(result => {{
-        if (result.success) {{
-          showNotification('Kullanıcı eklendi!', 'success');
-          setTimeout(() => location.reload(), 1000);
-        }} else {{
-          showNotification('Hata: ' + result.error, 'error');
-        }}
-      }});
-    }}
-    
-    function updateCourseLink(courseCode, link) {{
-      fetch('/admin/update-link', {{
-        method: 'POST',
-        headers: {{ 'Content-Type': 'application/x-www-form-urlencoded' }},
-        body: 'course_code=' + encodeURIComponent(courseCode) + '&bologna_link=' + encodeURIComponent(link)
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Link güncellendi!', 'success');
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function editCourseData(courseCode) {{
-      window.location.href = '/profile?course=' + courseCode;
-    }}
-    
-    function addDepartment(e) {{
-      e.preventDefault();
-      const form = e.target;
-      const data = new FormData(form);
-      
-      fetch('/admin/add-department', {{
-        method: 'POST',
-        body: data
-      }}).then(r => r.json()).then(result => {{
-        if (result.success) {{
-          showNotification('Bölüm eklendi!', 'success');
-          setTimeout(() => location.reload(), 1000);
-        }} else {{
-          showNotification('Hata: ' + result.error, 'error');
-        }}
-      }});
-    }}
-    
-    function fetchPeaPocFromBologna(deptId) {{
-      showNotification('Bologna\\'dan veriler çekiliyor...', 'info');
-      
-      fetch('/admin/fetch-pea-poc/' + deptId)
-        .then(r => r.json())
-        .then(data => {{
-          if (data.success) {{
-            // Bu bölüme ait textarea'ları bul
-            const card = document.getElementById('dept-card-' + deptId);
-            if (card) {{
-              const peaTextarea = card.querySelector('[name="peas_text"]');
-              const pocTextarea = card.querySelector('[name="pocs_text"]');
-              if (peaTextarea && data.pea_text) peaTextarea.value = data.pea_text;
-              if (pocTextarea && data.poc_text) pocTextarea.value = data.poc_text;
-            }}
-            showNotification('PEA ve PÖÇ Bologna\\'dan yüklendi!', 'success');
-          }} else {{
-            showNotification('Hata: ' + (data.error || 'Veri çekilemedi'), 'error');
-          }}
-        }});
-    }}
-    
-    function showNotification(message, type) {{
-      const div = document.createElement('div');
-      div.className = 'alert alert-' + type;
-      div.style.cssText = 'position:fixed;top:1rem;right:1rem;z-index:9999;min-width:300px;';
-      div.textContent = message;
-      document.body.appendChild(div);
-      setTimeout(() => div.remove(), 3000);
-    }}
-    
-    function deleteDepartment(deptId, deptName) {{
-      if (!confirm('Bu bölümü silmek istediğinizden emin misiniz?\\n\\nBölüm: ' + deptName + '\\n\\nBu işlem geri alınamaz!')) {{
-        return;
-      }}
-      
-      fetch('/admin/delete-department', {{
-        method: 'POST',
-        headers: {{ 'Content-Type': 'application/x-www-form-urlencoded' }},
-        body: 'dept_id=' + encodeURIComponent(deptId)
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Bölüm silindi!', 'success');
-          document.getElementById('dept-card-' + deptId).remove();
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function editDepartment(deptId) {{
-      const editForm = document.getElementById('edit-form-' + deptId);
-      if (editForm) {{
-        editForm.style.display = editForm.style.display === 'none' ? 'block' : 'none';
-      }}
-    }}
-    
-    function cancelDepartmentEdit(deptId) {{
-      const editForm = document.getElementById('edit-form-' + deptId);
-      if (editForm) {{
-        editForm.style.display = 'none';
-      }}
-    }}
-    
-    function saveDepartmentEdit(deptId) {{
-      const name = document.getElementById('edit-name-' + deptId).value;
-      const faculty = document.getElementById('edit-faculty-' + deptId).value;
-      const coursesUrl = document.getElementById('edit-courses-url-' + deptId).value;
-      const peaUrl = document.getElementById('edit-pea-url-' + deptId).value;
-      const pocUrl = document.getElementById('edit-poc-url-' + deptId).value;
-      
-      const formData = new FormData();
-      formData.append('dept_id', deptId);
-      formData.append('name', name);
-      formData.append('faculty', faculty);
-      formData.append('bologna_courses_url', coursesUrl);
-      formData.append('bologna_pea_url', peaUrl);
-      formData.append('bologna_poc_url', pocUrl);
-      
-      fetch('/admin/update-department', {{
-        method: 'POST',
-        body: formData
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Bölüm güncellendi!', 'success');
-          setTimeout(() => location.reload(), 1000);
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    // ===== DERS YÖNETİMİ FONKSİYONLARI =====
-    
-    function toggleCourseForm(deptId) {{
-      const form = document.getElementById('course-form-' + deptId);
-      if (form) {{
-        form.style.display = form.style.display === 'none' ? 'block' : 'none';
-      }}
-    }}
-    
-    function addCourse(deptId) {{
-      const code = document.getElementById('new-course-code-' + deptId).value.trim();
-      const name = document.getElementById('new-course-name-' + deptId).value.trim();
-      const semester = document.getElementById('new-course-semester-' + deptId).value;
-      const akts = document.getElementById('new-course-akts-' + deptId).value;
-      const link = document.getElementById('new-course-link-' + deptId).value.trim();
-      
-      if (!code || !name) {{
-        showNotification('Ders kodu ve adı zorunlu!', 'error');
-        return;
-      }}
-      
-      const formData = new FormData();
-      formData.append('dept_id', deptId);
-      formData.append('course_code', code);
-      formData.append('course_name', name);
-      formData.append('semester', semester);
-      formData.append('akts', akts);
-      formData.append('course_type', 'Z');
-      formData.append('bologna_link', link);
-      
-      fetch('/admin/add-course', {{
-        method: 'POST',
-        body: formData
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Ders eklendi!', 'success');
-          toggleCourseForm(deptId);
-          loadDepartmentCourses(deptId);
-          refreshCourseOptionsInModal();  // Modal'daki ders listesini güncelle
-          // Formu temizle
-          document.getElementById('new-course-code-' + deptId).value = '';
-          document.getElementById('new-course-name-' + deptId).value = '';
-          document.getElementById('new-course-link-' + deptId).value = '';
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    function loadDepartmentCourses(deptId) {{
-      const container = document.getElementById('courses-list-' + deptId);
-      if (!container) return;
-      
-      container.innerHTML = '<p style="padding:1rem; color:#64748b; text-align:center;">Yükleniyor...</p>';
-      
-      fetch('/api/department-courses/' + deptId)
-        .then(r => r.json())
-        .then(data => {{
-          if (data.error) {{
-            container.innerHTML = '<p style="padding:1rem; color:#dc2626;">Hata: ' + data.error + '</p>';
-            return;
-          }}
-          
-          const courses = data.courses || {{}};
-          const total = data.total || 0;
-          
-          if (total === 0) {{
-            container.innerHTML = '<p style="padding:1rem; color:#64748b; text-align:center;">Henüz ders eklenmemiş.</p>';
-            return;
-          }}
-          
-          let html = '<table style="width:100%; border-collapse:collapse; font-size:0.85rem;">';
-          html += '<thead><tr style="background:#e2e8f0;"><th style="padding:0.5rem; text-align:left;">YY</th><th style="padding:0.5rem; text-align:left;">Kod</th><th style="padding:0.5rem; text-align:left;">Ders Adı</th><th style="padding:0.5rem; text-align:center;">AKTS</th><th style="padding:0.5rem; text-align:left;">Bologna Link</th><th style="padding:0.5rem; text-align:center;">İşlem</th></tr></thead>';
-          html += '<tbody>';
-          
-          // Yarıyıla göre sırala
-          const semesters = Object.keys(courses).sort((a, b) => parseInt(a) - parseInt(b));
-          for (const sem of semesters) {{
-            const semCourses = courses[sem];
-            for (const c of semCourses) {{
-              const safeCode = c.code.replace(/'/g, "\\\\'");
-              html += '<tr style="border-bottom:1px solid #e2e8f0;" id="course-row-' + c.code + '">';
-              html += '<td style="padding:0.4rem; width:40px;">' + sem + '</td>';
-              html += '<td style="padding:0.4rem; font-weight:600; width:80px;">' + c.code + '</td>';
-              html += '<td style="padding:0.4rem;"><input type="text" id="course-name-' + c.code + '" value="' + (c.name || '').replace(/"/g, '&quot;') + '" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.8rem;"></td>';
-              html += '<td style="padding:0.4rem; width:60px;"><input type="number" id="course-akts-' + c.code + '" value="' + (c.akts || 5) + '" min="1" max="30" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.8rem; text-align:center;"></td>';
-              html += '<td style="padding:0.4rem;"><input type="url" id="course-link-' + c.code + '" value="' + (c.bologna_link || '').replace(/"/g, '&quot;') + '" placeholder="Bologna URL" style="width:100%; padding:0.3rem; border:1px solid #e2e8f0; border-radius:4px; font-size:0.75rem;"></td>';
-              html += '<td style="padding:0.4rem; text-align:center; width:80px; white-space:nowrap;">';
-              html += '<button onclick="saveCourseUpdate(\\'' + safeCode + '\\', \\'' + deptId + '\\')" class="btn-icon" title="Kaydet" style="color:#059669; border:none; background:none; cursor:pointer; font-size:1rem;">💾</button>';
-              html += '<button onclick="deleteCourseFromDept(\\'' + safeCode + '\\', \\'' + deptId + '\\')" class="btn-icon" title="Sil" style="color:#dc2626; border:none; background:none; cursor:pointer; font-size:1rem;">🗑️</button>';
-              html += '</td>';
-              html += '</tr>';
-            }}
-          }}
-          
-          html += '</tbody></table>';
-          html += '<p style="padding:0.5rem; font-size:0.75rem; color:#64748b; text-align:right;">Toplam: ' + total + ' ders</p>';
-          
-          container.innerHTML = html;
-        }})
-        .catch(err => {{
-          container.innerHTML = '<p style="padding:1rem; color:#dc2626;">Bağlantı hatası</p>';
-        }});
-    }}
-    
-    function saveCourseUpdate(courseCode, deptId) {{
-      const name = document.getElementById('course-name-' + courseCode)?.value || '';
-      const akts = document.getElementById('course-akts-' + courseCode)?.value || '5';
-      const link = document.getElementById('course-link-' + courseCode)?.value || '';
-      
-      if (!name.trim()) {{
-        showNotification('Ders adı boş olamaz!', 'error');
-        return;
-      }}
-      
-      const formData = new FormData();
-      formData.append('course_code', courseCode);
-      formData.append('course_name', name.trim());
-      formData.append('akts', akts);
-      formData.append('bologna_link', link.trim());
-      
-      fetch('/admin/update-course', {{
-        method: 'POST',
-        body: formData
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Ders güncellendi!', 'success');
-          // Satırı yeşil yap kısa süreliğine
-          const row = document.getElementById('course-row-' + courseCode);
-          if (row) {{
-            row.style.backgroundColor = '#dcfce7';
-            setTimeout(() => {{ row.style.backgroundColor = ''; }}, 1500);
-          }}
-        }} else {{
-          showNotification('Hata: ' + (data.error || 'Güncelleme başarısız'), 'error');
-        }}
-      }}).catch(() => {{
-        showNotification('Bağlantı hatası!', 'error');
-      }});
-    }}
-    
-    function fetchCoursesFromBologna(deptId, url) {{
-      if (!url) {{
-        showNotification('Bologna ders listesi URL\\'si tanımlı değil!', 'error');
-        return;
-      }}
-      
-      if (!confirm('Bologna\\'dan ders listesi çekilecek. Bu işlem mevcut dersleri etkilemez, sadece yeni dersler ekler. Devam?')) {{
-        return;
-      }}
-      
-      showNotification('Bologna\\'dan dersler çekiliyor...', 'info');
-      
-      const formData = new FormData();
-      formData.append('dept_id', deptId);
-      formData.append('url', url);
-      
-      fetch('/admin/fetch-courses-from-bologna', {{
-        method: 'POST',
-        body: formData
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          if (data.total === 0) {{
-            // Debug bilgisini göster
-            let debugMsg = 'Hiç ders bulunamadı.';
-            if (data.debug) {{
-              debugMsg += '\\n\\nDebug: ' + data.debug.tables_found + ' tablo, ' + data.debug.rows_checked + ' satır kontrol edildi.';
-              debugMsg += '\\nHTML boyutu: ' + data.debug.html_length + ' karakter';
-            }}
-            showNotification(debugMsg, 'warning');
-          }} else {{
-            showNotification('Toplam ' + data.total + ' ders bulundu, ' + data.added + ' yeni ders eklendi!', 'success');
-            loadDepartmentCourses(deptId);
-          }}
-        }} else {{
-          let errorMsg = data.error || 'Dersler çekilemedi';
-          if (data.traceback) {{
-            console.error('Bologna fetch error:', data.traceback);
-          }}
-          showNotification('Hata: ' + errorMsg, 'error');
-        }}
-      }}).catch(err => {{
-        console.error('Bologna fetch connection error:', err);
-        showNotification('Bağlantı hatası! Konsolu kontrol edin.', 'error');
-      }});
-    }}
-    
-    function deleteCourseFromDept(courseCode, deptId) {{
-      if (!confirm('Bu dersi silmek istediğinizden emin misiniz?\\n\\nDers Kodu: ' + courseCode)) {{
-        return;
-      }}
-      
-      const formData = new FormData();
-      formData.append('course_code', courseCode);
-      
-      fetch('/admin/delete-course', {{
-        method: 'POST',
-        body: formData
-      }}).then(r => r.json()).then(data => {{
-        if (data.success) {{
-          showNotification('Ders silindi!', 'success');
-          loadDepartmentCourses(deptId);
-          refreshCourseOptionsInModal();  // Modal'daki ders listesini güncelle
-        }} else {{
-          showNotification('Hata: ' + data.error, 'error');
-        }}
-      }});
-    }}
-    
-    // Modal'daki ders seçeneklerini API'den güncelle
-    function refreshCourseOptionsInModal() {{
-      const select = document.getElementById('assignCourseSelect');
-      if (!select) return;
-      
-      fetch('/api/all-courses')
-        .then(r => r.json())
-        .then(data => {{
-          select.innerHTML = '<option value="">Ders seçin...</option>';
-          const courses = data.courses || {{}};
-          
-          // Bölümlere göre grupla
-          Object.keys(courses).sort().forEach(deptId => {{
-            const deptCourses = courses[deptId];
-            if (deptCourses && deptCourses.length > 0) {{
-              const optgroup = document.createElement('optgroup');
-              optgroup.label = '📚 ' + (data.dept_names[deptId] || deptId);
-              
-              deptCourses.forEach(c => {{
-                const opt = document.createElement('option');
-                opt.value = c.code;
-                const semStr = c.semester ? ' [' + c.semester + '. YY]' : '';
-                opt.textContent = c.code + semStr + ' - ' + c.name;
-                optgroup.appendChild(opt);
-              }});
-              
-              select.appendChild(optgroup);
-            }}
-          }});
-        }})
-        .catch(() => {{}});
-    }}
-  </script>
+  {static_assets.script_tag("admin.js")}
   
   <!-- Ders Atama Modal -->
   <div id="userCoursesModal" style="display:none;position:fixed;top:0;left:0;right:0;bottom:0;background:rgba(0,0,0,0.5);z-index:9999;align-items:center;justify-content:center;">
@@ -4140,7 +2673,7 @@ PROFILE_HTML = ""
 
 def save_user_curriculum(email: str, data: dict):
     """Kullanıcının curriculum verilerini kaydet - mevcut verileri koruyarak güncelle"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     now = datetime.now().isoformat()
     
@@ -4218,10 +2751,11 @@ def save_user_curriculum(email: str, data: dict):
     ))
     conn.commit()
     conn.close()
+    outcome_store.sync(outcome_store.SCOPE_USER, email, final_data)
 
 
 def get_user_curriculum(email: str) -> dict:
-    conn = sqlite3.connect(DB_PATH)
+    conn = db.connect()
     conn.row_factory = sqlite3.Row
     cur = conn.execute("SELECT * FROM user_curriculum WHERE user_email=?", (email,))
     row = cur.fetchone()
@@ -0,0 +1,504 @@
+"""
+AkrediX - Şema Geçişleri (Migrations)
+auth.db şemasının numaralı, idempotent geçişlerle sürümlenmesi
+
+login.init_db() her import'ta (her gunicorn worker'ının her açılışında) bir
+düzine CREATE TABLE, çıplak except'lerle sarılmış ALTER TABLE'lar, varsayılan
+kullanıcı/bölüm/ders verisi ekleme ve _init_course_data toplu işlemini
+çalıştırıyordu. Artık:
+  - schema_version tablosu uygulanmış geçişleri tutar
+  - Sıcak açılışta (şema güncel) tek bir sürüm okuması yapılır
+  - Eksik geçişler bir dosya kilidi altında, her biri kendi transaction'ında
+    ve yalnızca bir worker tarafından uygulanır
+Geçişler idempotenttir (IF NOT EXISTS, sütun varsa eklememe): schema_version'ı
+olmayan eski bir auth.db de 1'den itibaren güvenle taşınır.
+
+Yeni geçiş: bir sonraki numarayla @migration(n, "açıklama") - eskiler değiştirilmez.
+
+    python migrations.py   # sürümü göster, eksik geçişleri uygula
+"""
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows - tek süreçli geliştirme sunucusu
+    HAS_FCNTL = False
+
+import db
+from db import DB_PATH
+
+# Uygulanan geçişler her worker'ın stderr'ine (diğer modüllerin [modül] önekli satırlarıyla aynı biçim)
+log = logging.getLogger("migrations")
+if not log.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+_migrations = []  # (sürüm, ad, fonksiyon) - artan sırada
+_local = threading.local()
+
+
+def migration(version: int, name: str):
+    """Geçiş kaydet: fn(conn) açık bir transaction içinde çağrılır, commit etmez"""
+    def decorator(fn):
+        if _migrations and version <= _migrations[-1][0]:
+            raise ValueError(f"Geçiş sürümleri artan sırada olmalı: {version}")
+        _migrations.append((version, name, fn))
+        return fn
+    return decorator
+
+
+def latest_version() -> int:
+    return _migrations[-1][0] if _migrations else 0
+
+
+def _columns(conn, table: str) -> set:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def add_column(conn, table: str, column: str, decl: str):
+    """Sütun yoksa ekle"""
+    if column not in _columns(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+# ============ GEÇİŞLER ============
+
+@migration(1, "temel şema")
+def _base_schema(conn):
+    conn.execute("""CREATE TABLE IF NOT EXISTS users (
+        email TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        full_name TEXT,
+        role TEXT DEFAULT 'ogretim_elemani',
+        department_id TEXT,
+        course_code TEXT,
+        course_name TEXT,
+        term TEXT,
+        program_name TEXT,
+        instructor TEXT,
+        department TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+    add_column(conn, "users", "role", "TEXT DEFAULT 'ogretim_elemani'")
+    add_column(conn, "users", "department_id", "TEXT")
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS departments (
+        department_id TEXT PRIMARY KEY,
+        name TEXT,
+        faculty TEXT,
+        bologna_courses_url TEXT,
+        bologna_pea_url TEXT,
+        bologna_poc_url TEXT,
+        pea_text TEXT,
+        poc_text TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_by TEXT
+    )""")
+
+    # Ders bazlı paylaşılan veriler (TYÇ, Bloom, STAR-K, PEA, PÖÇ, DÖÇ, Müfredat)
+    conn.execute("""CREATE TABLE IF NOT EXISTS course_data (
+        course_code TEXT PRIMARY KEY,
+        course_name TEXT,
+        department_id TEXT,
+        semester INTEGER,
+        akts INTEGER DEFAULT 5,
+        course_type TEXT DEFAULT 'Z',
+        bologna_link TEXT,
+        tyc_text TEXT,
+        bloom_text TEXT,
+        stark_text TEXT,
+        pea_text TEXT,
+        poc_text TEXT,
+        doc_text TEXT,
+        curriculum_text TEXT,
+        updated_at TEXT,
+        updated_by TEXT
+    )""")
+    add_column(conn, "course_data", "akts", "INTEGER DEFAULT 5")
+    add_column(conn, "course_data", "course_type", "TEXT DEFAULT 'Z'")
+
+    # Bölüm ortak PEA/PÖÇ verileri (init_db bu tabloyu iki kez tanımlıyordu; geçerli olan ilkiydi)
+    conn.execute("""CREATE TABLE IF NOT EXISTS department_data (
+        department_id TEXT PRIMARY KEY,
+        peas_text TEXT,
+        pocs_text TEXT,
+        updated_at TEXT,
+        updated_by TEXT
+    )""")
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS password_resets (
+        email TEXT PRIMARY KEY,
+        token TEXT NOT NULL,
+        expires_at TEXT NOT NULL
+    )""")
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS drafts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        name TEXT NOT NULL,
+        data TEXT NOT NULL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS report_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        title TEXT,
+        payload TEXT NOT NULL,
+        result TEXT NOT NULL,
+        overall_pct REAL,
+        department_id TEXT,
+        course_code TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+    add_column(conn, "report_history", "department_id", "TEXT")
+    add_column(conn, "report_history", "course_code", "TEXT")
+
+    conn.execute("""CREATE TABLE IF NOT EXISTS user_curriculum (
+        user_email TEXT PRIMARY KEY,
+        tyc_text TEXT,
+        stark_text TEXT,
+        docs_text TEXT,
+        pocs_text TEXT,
+        peas_text TEXT,
+        curriculum_text TEXT,
+        bloom_text TEXT,
+        doc_tyc_map_text TEXT,
+        poc_tyc_map_text TEXT,
+        pea_stark_map_text TEXT,
+        poc_pea_map_text TEXT,
+        doc_poc_weights_text TEXT,
+        curriculum_doc_map_text TEXT,
+        doc_stark_map_text TEXT,
+        doc_pea_map_text TEXT,
+        curriculum_tyc_map_text TEXT,
+        curriculum_stark_map_text TEXT,
+        curriculum_poc_map_text TEXT,
+        curriculum_pea_map_text TEXT,
+        components_text TEXT,
+        thresholds_met TEXT,
+        thresholds_partial TEXT,
+        grading_text TEXT,
+        question_map_text TEXT,
+        updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""")
+    for col in ("question_map_text", "doc_stark_map_text", "doc_pea_map_text",
+                "curriculum_tyc_map_text", "curriculum_stark_map_text",
+                "curriculum_poc_map_text", "curriculum_pea_map_text"):
+        add_column(conn, "user_curriculum", col, "TEXT")
+
+    # Kullanıcı-Ders İlişkisi (çoklu ders atama)
+    conn.execute("""CREATE TABLE IF NOT EXISTS user_courses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        course_code TEXT NOT NULL,
+        can_create_report INTEGER DEFAULT 1,
+        assigned_by TEXT,
+        assigned_at TEXT DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_email, course_code)
+    )""")
+
+
+# Sık sorguların erişim desenine göre ikincil indeksler: (ad, tablo(sütunlar))
+# Sorgu planları: python bench_db.py --plans (login.HOT_QUERIES)
+INDEXES = (
+    # get_drafts / get_report_history: kullanıcıya göre, en yeniden eskiye
+    ("idx_drafts_user_updated", "drafts(user_email, updated_at)"),
+    ("idx_report_history_user_created", "report_history(user_email, created_at)"),
+    # get_course_users
+    ("idx_user_courses_course", "user_courses(course_code)"),
+    # get_user_courses: kullanıcıya göre, en son atanandan eskiye
+    ("idx_user_courses_user_assigned", "user_courses(user_email, assigned_at)"),
+    # get_department_courses: department_id [+ semester], semester/course_code sıralı
+    ("idx_course_data_department", "course_data(department_id, semester, course_code)"),
+)
+
+
+@migration(2, "ikincil indeksler")
+def _secondary_indexes(conn):
+    for name, target in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+@migration(3, "varsayılan kullanıcı, bölüm ve ders verileri")
+def _seed_defaults(conn):
+    import login  # Sabitler (DEPARTMENT_COURSES, DEFAULT_TYC...) login.py'de
+    login.seed_defaults(conn)
+
+
+@migration(4, "oturum ve PDF işi tabloları")
+def _session_and_job_tables(conn):
+    # sessions.py
+    conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        email TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_email ON sessions(email)")
+    # pdf_jobs.py
+    conn.execute("""CREATE TABLE IF NOT EXISTS pdf_jobs (
+        job_id TEXT PRIMARY KEY,
+        owner_key TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        result_hash TEXT,
+        status TEXT NOT NULL,
+        pdf_path TEXT,
+        error TEXT,
+        created_at TEXT,
+        finished_at TEXT
+    )""")
+    add_column(conn, "pdf_jobs", "result_hash", "TEXT")
+
+
+@migration(5, "Bologna senkronizasyon işleri")
+def _bologna_sync_jobs(conn):
+    # bologna_sync.py
+    conn.execute("""CREATE TABLE IF NOT EXISTS bologna_sync_jobs (
+        job_id TEXT PRIMARY KEY,
+        department_id TEXT NOT NULL,
+        started_by TEXT,
+        status TEXT NOT NULL,
+        total INTEGER DEFAULT 0,
+        fetched INTEGER DEFAULT 0,
+        parsed INTEGER DEFAULT 0,
+        updated INTEGER DEFAULT 0,
+        failed INTEGER DEFAULT 0,
+        errors TEXT,
+        created_at TEXT,
+        finished_at TEXT
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bologna_sync_dept ON bologna_sync_jobs(department_id, created_at)")
+
+
+@migration(6, "HTTP yanıt önbelleği")
+def _http_cache(conn):
+    # http_cache.py - body: zlib ile sıkıştırılmış UTF-8 gövde
+    conn.execute("""CREATE TABLE IF NOT EXISTS http_cache (
+        url TEXT PRIMARY KEY,
+        body BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        stored_at REAL NOT NULL,
+        validated_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at)")
+
+
+@migration(7, "Bologna kaynak hash'leri ve ders verisi değişiklik geçmişi")
+def _course_data_changes(conn):
+    # bologna_sync.py - son Bologna'dan çıkarılan metinlerin hash'leri
+    conn.execute("""CREATE TABLE IF NOT EXISTS bologna_sources (
+        course_code TEXT PRIMARY KEY,
+        doc_hash TEXT,
+        curriculum_hash TEXT,
+        synced_at TEXT
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS course_data_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        course_code TEXT NOT NULL,
+        department_id TEXT,
+        field TEXT NOT NULL,
+        old_hash TEXT,
+        new_hash TEXT,
+        diff TEXT,
+        job_id TEXT,
+        changed_at TEXT
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_course_changes_dept ON course_data_changes(department_id, changed_at)")
+
+
+@migration(8, "referans veri önbelleği sürüm sayaçları")
+def _cache_versions(conn):
+    # ref_cache.py - ad alanı başına artan sayaç; worker'lar değişince önbelleğini boşaltır
+    conn.execute("""CREATE TABLE IF NOT EXISTS cache_versions (
+        name TEXT PRIMARY KEY,
+        version INTEGER NOT NULL DEFAULT 0
+    )""")
+    conn.executemany("INSERT OR IGNORE INTO cache_versions (name, version) VALUES (?, 0)",
+                     [("courses",), ("departments",)])
+
+
+
+@migration(9, "normalize DÖÇ/PÖÇ/PEA, eşleştirme ve soru tabloları")
+def _outcome_tables(conn):
+    # outcome_store.py - kümeler içerik adresli (set_hash: tür + normalize metin)
+    conn.execute("""CREATE TABLE IF NOT EXISTS outcome_sets (
+        set_hash TEXT PRIMARY KEY,
+        kind TEXT NOT NULL,
+        items INTEGER NOT NULL,
+        created_at TEXT
+    )""")
+    # Hangi satırın hangi metin alanı hangi kümeye karşılık geliyor
+    conn.execute("""CREATE TABLE IF NOT EXISTS outcome_sources (
+        scope TEXT NOT NULL,
+        owner_id TEXT NOT NULL,
+        field TEXT NOT NULL,
+        set_hash TEXT NOT NULL,
+        synced_at TEXT,
+        PRIMARY KEY (scope, owner_id, field)
+    )""")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_outcome_sources_set ON outcome_sources(set_hash)")
+    conn.execute("""CREATE TABLE IF NOT EXISTS outcomes (
+        set_hash TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        outcome_id TEXT NOT NULL,
+        text TEXT NOT NULL,
+        PRIMARY KEY (set_hash, position)
+    )""")
+    # target_id NULL: hedefi olmayan anahtar; weight yalnızca DÖÇ->PÖÇ ağırlıklarında
+    conn.execute("""CREATE TABLE IF NOT EXISTS outcome_links (
+        set_hash TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        source_id TEXT NOT NULL,
+        target_id TEXT,
+        weight REAL,
+        PRIMARY KEY (set_hash, position)
+    )""")
+    conn.execute("""CREATE TABLE IF NOT EXISTS questions (
+        set_hash TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        question_id TEXT NOT NULL,
+        week TEXT,
+        max_points REAL,
+        text TEXT,
+        PRIMARY KEY (set_hash, position)
+    )""")
+    # kind: component, doc, bloom, poc, pea, tyc, stark, curriculum
+    conn.execute("""CREATE TABLE IF NOT EXISTS question_links (
+        set_hash TEXT NOT NULL,
+        question_position INTEGER NOT NULL,
+        kind TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        target_id TEXT NOT NULL,
+        PRIMARY KEY (set_hash, question_position, kind, position)
+    )""")
+
+
+@migration(10, "rapor geçmişinde payload hash'i ile tekilleştirme")
+def _report_payload_hash(conn):
+    # app.py /compute: aynı kullanıcı + ders + payload hash'i -> mevcut satır yeniden kullanılır
+    add_column(conn, "report_history", "payload_hash", "TEXT")
+    add_column(conn, "report_history", "run_count", "INTEGER DEFAULT 1")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_report_history_payload ON report_history(user_email, payload_hash)")
+
+
+@migration(11, "otomatik kayıt taslağı için anahtarlı yuva")
+def _draft_slots(conn):
+    # autosave.py - kullanıcı başına tek otomatik kayıt taslağı, ada göre aramak yerine (user_email, slot)
+    add_column(conn, "drafts", "slot", "TEXT")
+    conn.execute("""UPDATE drafts SET slot='autosave' WHERE id IN (
+        SELECT MAX(id) FROM drafts WHERE name='Otomatik Kayit' AND slot IS NULL GROUP BY user_email)
+        AND user_email NOT IN (SELECT user_email FROM drafts WHERE slot='autosave')""")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_drafts_user_slot ON drafts(user_email, slot) WHERE slot IS NOT NULL")
+
+
+@migration(12, "PDF işleri için kira süresi")
+def _pdf_job_leases(conn):
+    # pdf_jobs.py - sahibi worker öldüğünde kuyrukta kalan işler başka bir worker'a devredilir
+    add_column(conn, "pdf_jobs", "lease_until", "REAL")
+
+
+@migration(13, "kullanılmayan rapor geçmişi indeksleri")
+def _prune_indexes(conn):
+    # Bölüm/ders bazlı rapor listesi sorgusu yok - her INSERT'te boşa güncelleniyorlardı
+    conn.execute("DROP INDEX IF EXISTS idx_report_history_department")
+    conn.execute("DROP INDEX IF EXISTS idx_report_history_course")
+    # INDEXES'e sonradan eklenenler (2. geçişi önceden uygulanmış veritabanları için)
+    for name, target in INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+@migration(14, "sonuç deposu tablosu")
+def _result_store(conn):
+    # result_store.py - kullanıcı/oturum başına son hesaplama sonucu
+    conn.execute("""CREATE TABLE IF NOT EXISTS result_store (
+        store_key TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1,
+        updated_at TEXT
+    )""")
+
+
+# ============ ÇALIŞTIRICI ============
+
+def current_version(conn) -> int:
+    try:
+        row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    except sqlite3.OperationalError:
+        return 0  # schema_version yok - hiç geçiş uygulanmamış
+    return row[0] or 0
+
+
+@contextmanager
+def _file_lock(path):
+    """Aynı anda açılan worker'lardan yalnızca biri geçiş uygulasın"""
+    if not HAS_FCNTL:
+        yield
+        return
+    with open(f"{path}.migrate.lock", "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def migrate(path=DB_PATH) -> int:
+    """Eksik geçişleri uygula, uygulanan geçiş sayısını döndür (şema güncelse 0)"""
+    if getattr(_local, "running", False):
+        return 0  # Geçiş içinden dolaylı çağrı (3. geçiş login'i import eder)
+    conn = db.connect(path)
+    _local.running = True
+    try:
+        if current_version(conn) >= latest_version():
+            return 0
+        with _file_lock(path):
+            conn.execute("""CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TEXT NOT NULL
+            )""")
+            conn.commit()
+            applied = 0
+            for version, name, fn in _migrations:
+                # Kilidi beklerken başka bir worker uygulamış olabilir - her adımda yeniden oku
+                if version <= current_version(conn):
+                    continue
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    fn(conn)
+                    conn.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?,?,?)",
+                                 (version, name, datetime.now().isoformat()))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                log.info("%d: %s uygulandı", version, name)
+                applied += 1
+            return applied
+    finally:
+        _local.running = False
+        conn.close()
+
+
+if __name__ == "__main__":
+    # 3. geçiş login'i, login da "migrations"ı import eder: __main__ kopyası değil, o modül çalışsın
+    import migrations
+    migrations.migrate()
+    conn = db.connect()
+    try:
+        print(f"Şema sürümü: {migrations.current_version(conn)} / {migrations.latest_version()}")
+    finally:
+        conn.close()
@@ -0,0 +1,393 @@
+"""
+AkrediX - Çıktı Deposu
+DÖÇ/PÖÇ/PEA/TYÇ/STAR-K listeleri, eşleştirmeler ve soru haritası için
+normalize edilmiş tablolar
+
+course_data, department_data ve user_curriculum bu verileri serbest metin
+olarak tutuyor (doc_text, poc_pea_map_text, question_map_text...);
+build_payload_from_form her hesaplamada kilobaytlarca metni parse_docs,
+parse_generic_map, parse_question_map ile yeniden ayrıştırıyordu. Bu modül:
+  - Metin alanlarının ayrıştırılmış halini satır olarak saklar: outcomes
+    (sıralı id + metin), outcome_links (kaynak -> hedef, ağırlıklı),
+    questions ve question_links (sorunun DÖÇ/PÖÇ/PEA/Bloom... bağları)
+  - Kümeler içerik adreslidir: anahtar, tür + normalize metnin hash'idir;
+    aynı metni paylaşan dersler/kullanıcılar tek kümeyi kullanır
+  - outcome_sources hangi satırın hangi alanının hangi kümeye karşılık
+    geldiğini tutar; kaydeden fonksiyonlar sync() çağırır, kimsenin
+    kullanmadığı kümeler silinir
+  - compiled(tür, metin) ayrıştırıcının döndüreceği yapıyı önce süreç içi
+    önbellekten, sonra indeksli satırlardan kurar; ikisinde de yoksa metni
+    ayrıştırır (kaydedilmemiş form metni - tabloya yazılmaz)
+Ayrıştırıcılar web_server.py'dedir; çıktılar onlarınkiyle birebir aynıdır.
+
+Tablolar migrations.py'de (9. geçiş). Mevcut kayıtları tablolara aktarmak için:
+
+    python outcome_store.py
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import db
+
+OUTCOME_CACHE_MAX = int(os.environ.get("AKREDIX_OUTCOME_CACHE_MAX", "512"))
+
+# Sahip türleri (outcome_sources.scope)
+SCOPE_COURSE = "course"          # course_data.course_code
+SCOPE_DEPARTMENT = "department"  # department_data.department_id
+SCOPE_USER = "user"              # user_curriculum.user_email
+
+# Küme türü -> (web_server ayrıştırıcısı, satır biçimi)
+KINDS = {
+    "docs": ("parse_docs", "list"),
+    "pocs": ("parse_pocs", "list"),
+    "peas": ("parse_peas", "list"),
+    "curriculum": ("parse_curriculum", "list"),
+    "map": ("parse_generic_map", "map"),
+    "poc_pea_map": ("parse_poc_pea_map", "map"),
+    "doc_poc_weights": ("parse_doc_poc_weights", "weights"),
+    "question_map": ("parse_question_map", "questions"),
+}
+
+# Metin alanı -> küme türü (üç tabloda aynı adlı alanlar aynı biçimde)
+FIELD_KINDS = {
+    "tyc_text": "docs",
+    "stark_text": "docs",
+    "doc_text": "docs",
+    "docs_text": "docs",
+    "poc_text": "pocs",
+    "pocs_text": "pocs",
+    "pea_text": "peas",
+    "peas_text": "peas",
+    "curriculum_text": "curriculum",
+    "doc_tyc_map_text": "map",
+    "poc_tyc_map_text": "map",
+    "pea_stark_map_text": "map",
+    "doc_pea_map_text": "map",
+    "doc_stark_map_text": "map",
+    "curriculum_doc_map_text": "map",
+    "curriculum_tyc_map_text": "map",
+    "curriculum_stark_map_text": "map",
+    "curriculum_poc_map_text": "map",
+    "curriculum_pea_map_text": "map",
+    "poc_pea_map_text": "poc_pea_map",
+    "doc_poc_weights_text": "doc_poc_weights",
+    "question_map_text": "question_map",
+}
+
+# Soru sözlüğündeki liste alanı -> question_links.kind
+QUESTION_LINKS = (
+    ("component_ids", "component"),
+    ("doc_ids", "doc"),
+    ("bloom_list", "bloom"),
+    ("poc_list", "poc"),
+    ("pea_list", "pea"),
+    ("tyc_list", "tyc"),
+    ("stark_list", "stark"),
+    ("curriculum_list", "curriculum"),
+)
+
+CHILD_TABLES = ("outcomes", "outcome_links", "questions", "question_links")
+
+_memo = OrderedDict()  # küme hash'i -> satırlar (değişmez demetler)
+_memo_lock = threading.Lock()
+_stats = {"memory": 0, "rows": 0, "parsed": 0}
+
+
+def _canonical(text: str) -> str:
+    """Ayrıştırıcıların gördüğü biçim: kırpılmış, boş olmayan satırlar"""
+    return "\n".join(ln.strip() for ln in (text or "").splitlines() if ln.strip())
+
+
+def _hash(kind: str, canonical: str) -> str:
+    return hashlib.sha256(f"{kind}\0{canonical}".encode("utf-8")).hexdigest()
+
+
+def _parse(kind: str, text: str, label: str = ""):
+    import web_server  # döngüsel import - web_server bu modülü kullanıyor
+    parser = getattr(web_server, KINDS[kind][0])
+    return parser(text, label) if kind == "map" else parser(text)
+
+
+# ============ AYRIŞTIRILMIŞ YAPI <-> SATIRLAR ============
+
+def _rows(kind: str, parsed):
+    shape = KINDS[kind][1]
+    if shape == "list":
+        return tuple((i, item["id"], item["text"]) for i, item in enumerate(parsed))
+    if shape in ("map", "weights"):
+        links = []
+        for source, targets in parsed.items():
+            pairs = targets.items() if shape == "weights" else ((t, None) for t in targets)
+            start = len(links)
+            links.extend((len(links), source, target, weight) for target, weight in pairs)
+            if len(links) == start:  # hedefsiz anahtar da korunur
+                links.append((len(links), source, None, None))
+        return tuple(links)
+    questions, links = [], []
+    for i, q in enumerate(parsed.get("questions", [])):
+        questions.append((i, q["id"], q["week"], q["max_points"], q["text"]))
+        for field, link_kind in QUESTION_LINKS:
+            links.extend((i, link_kind, j, target) for j, target in enumerate(q[field]))
+    return tuple(questions), tuple(links)
+
+
+def _build(kind: str, rows):
+    """Satırlardan ayrıştırıcının döndürdüğü yapıyı (yeni nesnelerle) kur"""
+    shape = KINDS[kind][1]
+    if shape == "list":
+        return [{"id": oid, "text": text} for _, oid, text in rows]
+    if shape in ("map", "weights"):
+        mapping = {}
+        for _, source, target, weight in rows:
+            targets = mapping.setdefault(source, {} if shape == "weights" else [])
+            if target is None:
+                continue
+            if shape == "weights":
+                targets[target] = weight
+            else:
+                targets.append(target)
+        return mapping
+
+    question_rows, link_rows = rows
+    lists = {}
+    for qpos, link_kind, _, target in link_rows:
+        lists.setdefault((qpos, link_kind), []).append(target)
+    questions = []
+    doc_poc_weights = {}
+    poc_pea_map = {}
+    for qpos, qid, week, max_points, text in question_rows:
+        fields = {field: lists.get((qpos, link_kind), []) for field, link_kind in QUESTION_LINKS}
+        comp_list, doc_ids, bloom_list = fields["component_ids"], fields["doc_ids"], fields["bloom_list"]
+        poc_list, pea_list = fields["poc_list"], fields["pea_list"]
+        questions.append({
+            "id": qid,
+            "week": week,
+            "component_id": comp_list[0] if comp_list else "",
+            "component_ids": comp_list,
+            "doc_id": doc_ids[0] if doc_ids else "",
+            "doc_ids": doc_ids,
+            "bloom": bloom_list[0] if bloom_list else "",
+            "bloom_list": bloom_list,
+            "max_points": max_points,
+            "text": text,
+            "poc_list": poc_list,
+            "pea_list": pea_list,
+            "tyc_list": fields["tyc_list"],
+            "stark_list": fields["stark_list"],
+            "curriculum_list": fields["curriculum_list"],
+        })
+        # parse_question_map ile aynı türetilmiş haritalar
+        for did in doc_ids:
+            for pid in poc_list:
+                doc_poc_weights.setdefault(did, {})
+                doc_poc_weights[did][pid] = doc_poc_weights[did].get(pid, 0) + 1
+        for pid in poc_list:
+            if pea_list:
+                poc_pea_map[pid] = sorted(list(set(poc_pea_map.get(pid, []) + pea_list)))
+    return {"questions": questions, "doc_poc_weights": doc_poc_weights, "poc_pea_map": poc_pea_map}
+
+
+# ============ OKUMA ============
+
+def _remember(set_hash: str, rows):
+    with _memo_lock:
+        _memo[set_hash] = rows
+        _memo.move_to_end(set_hash)
+        while len(_memo) > OUTCOME_CACHE_MAX:
+            _memo.popitem(last=False)
+
+
+def _load_rows(set_hash: str, kind: str):
+    """Kümenin satırlarını oku; küme yoksa (ya da tablo yoksa) None"""
+    conn = db.connect()
+    try:
+        if not conn.execute("SELECT 1 FROM outcome_sets WHERE set_hash=? AND kind=?", (set_hash, kind)).fetchone():
+            return None
+        shape = KINDS[kind][1]
+        if shape == "list":
+            return tuple(conn.execute(
+                "SELECT position, outcome_id, text FROM outcomes WHERE set_hash=? ORDER BY position", (set_hash,)))
+        if shape in ("map", "weights"):
+            return tuple(conn.execute(
+                "SELECT position, source_id, target_id, weight FROM outcome_links WHERE set_hash=? ORDER BY position",
+                (set_hash,)))
+        questions = tuple(conn.execute(
+            "SELECT position, question_id, week, max_points, text FROM questions WHERE set_hash=? ORDER BY position",
+            (set_hash,)))
+        links = tuple(conn.execute(
+            """SELECT question_position, kind, position, target_id FROM question_links
+               WHERE set_hash=? ORDER BY question_position, kind, position""", (set_hash,)))
+        return questions, links
+    except sqlite3.OperationalError as e:  # geçiş uygulanmamış
+        print(f"[outcome_store] okunamadı: {e}", file=sys.stderr, flush=True)
+        return None
+    finally:
+        conn.close()
+
+
+def compiled(kind: str, text: str, label: str = ""):
+    """`text` için KINDS[kind] ayrıştırıcısının döndüreceği yapı.
+
+    Ayrıştırma hataları (ValueError) ayrıştırıcıdakiyle aynı mesajla yükselir;
+    label yalnızca "map" türünde hata mesajında kullanılır.
+    """
+    canonical = _canonical(text)
+    if not canonical:
+        return _parse(kind, "", label)
+    set_hash = _hash(kind, canonical)
+    with _memo_lock:
+        rows = _memo.get(set_hash)
+        if rows is not None:
+            _memo.move_to_end(set_hash)
+            _stats["memory"] += 1
+    if rows is None:
+        rows = _load_rows(set_hash, kind)
+        if rows is None:
+            parsed = _parse(kind, canonical, label)
+            _remember(set_hash, _rows(kind, parsed))
+            _stats["parsed"] += 1
+            return parsed
+        _remember(set_hash, rows)
+        _stats["rows"] += 1
+    return _build(kind, rows)
+
+
+def stats() -> dict:
+    """compiled() çağrılarının kaynağı: süreç içi önbellek / tablo / ayrıştırma"""
+    with _memo_lock:
+        return dict(_stats, cached_sets=len(_memo))
+
+
+# ============ YAZMA ============
+
+def _store(conn, set_hash: str, kind: str, rows, now: str):
+    shape = KINDS[kind][1]
+    items = len(rows[0]) if shape == "questions" else len(rows)
+    inserted = conn.execute("INSERT OR IGNORE INTO outcome_sets (set_hash, kind, items, created_at) VALUES (?,?,?,?)",
+                            (set_hash, kind, items, now)).rowcount
+    if not inserted:  # aynı metin başka bir sahip için zaten saklı
+        return
+    if shape == "list":
+        conn.executemany("INSERT INTO outcomes (set_hash, position, outcome_id, text) VALUES (?,?,?,?)",
+                         [(set_hash, *row) for row in rows])
+    elif shape in ("map", "weights"):
+        conn.executemany("INSERT INTO outcome_links (set_hash, position, source_id, target_id, weight) VALUES (?,?,?,?,?)",
+                         [(set_hash, *row) for row in rows])
+    else:
+        questions, links = rows
+        conn.executemany("INSERT INTO questions (set_hash, position, question_id, week, max_points, text) VALUES (?,?,?,?,?,?)",
+                         [(set_hash, *row) for row in questions])
+        conn.executemany("INSERT INTO question_links (set_hash, question_position, kind, position, target_id) VALUES (?,?,?,?,?)",
+                         [(set_hash, *row) for row in links])
+
+
+def _collect(conn, set_hashes):
+    """Hiçbir sahibin kullanmadığı kümeleri sil"""
+    for set_hash in set_hashes:
+        if conn.execute("SELECT 1 FROM outcome_sources WHERE set_hash=? LIMIT 1", (set_hash,)).fetchone():
+            continue
+        conn.execute("DELETE FROM outcome_sets WHERE set_hash=?", (set_hash,))
+        for table in CHILD_TABLES:
+            conn.execute(f"DELETE FROM {table} WHERE set_hash=?", (set_hash,))
+
+
+def sync(scope: str, owner_id: str, row: dict):
+    """Sahibin metin alanlarını (row içindeki FIELD_KINDS alanları) tablolarla
+    eşitle. Kayıt commit edildikten sonra çağrılır; yalnızca hash'i değişen
+    alanlar ayrıştırılır. Ayrıştırılamayan ya da boş alanın kaydı silinir."""
+    fields = [(field, FIELD_KINDS[field], row.get(field) or "") for field in row if field in FIELD_KINDS]
+    if not fields or not owner_id:
+        return
+    try:
+        conn = db.connect()
+        try:
+            current = dict(conn.execute("SELECT field, set_hash FROM outcome_sources WHERE scope=? AND owner_id=?",
+                                        (scope, owner_id)).fetchall())
+            pending = []
+            for field, kind, text in fields:
+                canonical = _canonical(text)
+                set_hash = _hash(kind, canonical) if canonical else None
+                if set_hash == current.get(field):
+                    continue
+                rows = None
+                if set_hash:
+                    try:
+                        rows = _rows(kind, _parse(kind, canonical, field))
+                    except ValueError:
+                        set_hash = None
+                        if field not in current:
+                            continue
+                pending.append((field, kind, set_hash, rows))
+            if not pending:
+                return
+
+            now = datetime.now().isoformat()
+            conn.execute("BEGIN IMMEDIATE")
+            for field, kind, set_hash, rows in pending:
+                if set_hash is None:
+                    conn.execute("DELETE FROM outcome_sources WHERE scope=? AND owner_id=? AND field=?",
+                                 (scope, owner_id, field))
+                    continue
+                _store(conn, set_hash, kind, rows, now)
+                conn.execute("""INSERT INTO outcome_sources (scope, owner_id, field, set_hash, synced_at)
+                    VALUES (?,?,?,?,?)
+                    ON CONFLICT(scope, owner_id, field) DO UPDATE SET set_hash=excluded.set_hash, synced_at=excluded.synced_at""",
+                    (scope, owner_id, field, set_hash, now))
+            _collect(conn, {current[field] for field, *_ in pending if field in current})
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        # Metin alanı asıl kayıttır; eşitleme bir sonraki kayıtta tekrarlanır
+        print(f"[outcome_store] {scope}/{owner_id} eşitlenemedi: {e}", file=sys.stderr, flush=True)
+
+
+def forget(scope: str, owner_id: str):
+    """Silinen sahibin kayıtlarını ve artık kullanılmayan kümelerini kaldır"""
+    try:
+        conn = db.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            hashes = {h for (h,) in conn.execute("SELECT set_hash FROM outcome_sources WHERE scope=? AND owner_id=?",
+                                                 (scope, owner_id))}
+            conn.execute("DELETE FROM outcome_sources WHERE scope=? AND owner_id=?", (scope, owner_id))
+            _collect(conn, hashes)
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"[outcome_store] {scope}/{owner_id} silinemedi: {e}", file=sys.stderr, flush=True)
+
+
+# Mevcut kayıtların aktarımı: (sahip türü, tablo, anahtar sütunu)
+SOURCES = (
+    (SCOPE_COURSE, "course_data", "course_code"),
+    (SCOPE_DEPARTMENT, "department_data", "department_id"),
+    (SCOPE_USER, "user_curriculum", "user_email"),
+)
+
+
+def backfill() -> int:
+    """Üç tablodaki tüm satırları eşitle; işlenen satır sayısını döndür"""
+    count = 0
+    for scope, table, key in SOURCES:
+        conn = db.connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = [dict(r) for r in conn.execute(f"SELECT * FROM {table}")]
+        finally:
+            conn.close()
+        for row in rows:
+            sync(scope, row[key], row)
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    import login  # noqa: F401 - init_db: geçişleri uygula
+    print(f"{backfill()} kayıt eşitlendi")
@@ -0,0 +1,75 @@
+"""
+AkrediX - Sayfa Bağlamı
+Ana sayfa (/) ve /compute için gereken kullanıcı verilerinin tek seferde yüklenmesi
+
+index() fetch_user, get_course_data, get_user_curriculum, get_drafts,
+get_report_history ve get_user_courses'u ayrı ayrı çağırıyordu; her biri
+kendi bağlantısını açıyordu (get_user_courses her çağrıda CREATE TABLE de
+çalıştırıyordu). load() hepsini tek bağlantıda, tek okuma transaction'ı
+içinde çalıştırır: sorgular aynı anlık görüntüyü (snapshot) görür, bağlantının
+deyim önbelleği sayesinde her sorgu bir kez derlenir.
+"""
+import sqlite3
+
+import db
+import login
+
+SQL_USER = "SELECT * FROM users WHERE email=?"
+SQL_COURSE_DATA = "SELECT * FROM course_data WHERE course_code=?"
+SQL_CURRICULUM = "SELECT * FROM user_curriculum WHERE user_email=?"
+# get_drafts / get_report_history / get_user_courses ile aynı sorgular (login.HOT_QUERIES)
+SQL_DRAFTS = login.SQL_DRAFTS
+SQL_REPORTS = login.SQL_REPORT_HISTORY
+SQL_USER_COURSES = login.SQL_USER_COURSES
+
+# Sayfa bölümleri - course_data kullanıcının ana dersinden okunur (user gerektirir)
+INDEX_SECTIONS = ("user", "course_data", "curriculum", "drafts", "reports", "user_courses")
+COMPUTE_SECTIONS = ("drafts", "reports", "user_courses")
+
+
+def _empty() -> dict:
+    return {"user": None, "course_data": {}, "curriculum": {}, "drafts": [], "reports": [], "user_courses": []}
+
+
+def _one(conn, sql: str, params) -> dict:
+    row = conn.execute(sql, params).fetchone()
+    return dict(row) if row else None
+
+
+def _all(conn, sql: str, params) -> list:
+    return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+
+def load(email: str, sections=INDEX_SECTIONS) -> dict:
+    """İstenen bölümleri tek bağlantı / tek okuma transaction'ında yükle.
+
+    Döner: {"user": dict|None, "course_data": dict, "curriculum": dict,
+            "drafts": list, "reports": list, "user_courses": list}
+    """
+    ctx = _empty()
+    if not email:
+        return ctx
+
+    conn = db.connect()
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("BEGIN")
+        try:
+            if "user" in sections or "course_data" in sections:
+                ctx["user"] = _one(conn, SQL_USER, (email,))
+            course_code = (ctx["user"] or {}).get("course_code") or ""
+            if "course_data" in sections and course_code:
+                ctx["course_data"] = _one(conn, SQL_COURSE_DATA, (course_code,)) or {}
+            if "curriculum" in sections:
+                ctx["curriculum"] = _one(conn, SQL_CURRICULUM, (email,)) or {}
+            if "drafts" in sections:
+                ctx["drafts"] = _all(conn, SQL_DRAFTS, (email,))
+            if "reports" in sections:
+                ctx["reports"] = _all(conn, SQL_REPORTS, (email,))
+            if "user_courses" in sections:
+                ctx["user_courses"] = _all(conn, SQL_USER_COURSES, (email,))
+        finally:
+            conn.commit()
+    finally:
+        conn.close()
+    return ctx
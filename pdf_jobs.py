@@ -0,0 +1,222 @@
+"""
+AkrediX - PDF İş Kuyruğu
+Rapor PDF'lerinin arka planda, sınırlı bir worker havuzunda üretilmesi
+
+/compute artık PDF üretimini beklemez: her PDF bir iş (job) olarak kuyruğa
+alınır, iş durumu SQLite'ta tutulur (tüm gunicorn worker'ları görebilir),
+/download.pdf ise biten işin dosyasını verir ya da bitmesini bekler.
+PDF dosyaları report_variants üzerinden artifact_cache'te sonuç hash'iyle
+tutulur; aynı sonuç için ikinci iş yeniden render etmez.
+
+İşi kuyruğa alan worker, iş bitene kadar satırdaki kirayı (lease_until) her
+PDF_HEARTBEAT saniyede bir uzatır. Worker ölürse kira dolar; bekleyen başka
+bir istek işi üstlenip kendi havuzunda yeniden çalıştırır. Başarısız işler
+kalıcı değildir: aynı PDF'in sonraki isteği yeni bir iş açar.
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import db
+
+# Aynı anda çalışacak PDF işi sayısı (WeasyPrint bellek dostu değil)
+PDF_WORKERS = int(os.environ.get("AKREDIX_PDF_WORKERS", "2"))
+# /download.pdf'in bir işi en fazla bekleme süresi (saniye)
+PDF_WAIT_TIMEOUT = float(os.environ.get("AKREDIX_PDF_WAIT_TIMEOUT", "120"))
+# Kira süresi (saniye): bu süre yenilenmeyen kuyruktaki/çalışan iş sahipsiz sayılır
+PDF_LEASE = float(os.environ.get("AKREDIX_PDF_LEASE", "30"))
+PDF_HEARTBEAT = PDF_LEASE / 3
+
+# İş türleri: main/v2 WeasyPrint (yoksa ReportLab), legacy doğrudan ReportLab
+KINDS = ("main", "v2", "legacy")
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_executor = ThreadPoolExecutor(max_workers=PDF_WORKERS, thread_name_prefix="pdf-job")
+_futures = {}  # job_id -> Future (sadece bu worker'da kuyruğa alınan işler)
+_futures_lock = threading.Lock()
+_heartbeat = None
+
+
+def _connect():
+    # pdf_jobs tablosu: migrations.py (4. geçiş; lease_until 12. geçiş)
+    conn = db.connect()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _set_status(job_id: str, status: str, error: str = None, pdf_path: str = None):
+    conn = _connect()
+    try:
+        finished = datetime.now().isoformat() if status in (STATUS_DONE, STATUS_FAILED) else None
+        conn.execute("UPDATE pdf_jobs SET status=?, error=?, finished_at=?, pdf_path=COALESCE(?, pdf_path) WHERE job_id=?",
+                     (status, error, finished, pdf_path, job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _render(job_id: str, kind: str, result: dict, result_hash: str):
+    """Worker thread'inde çalışır: PDF varyantını önbellekten al ya da üret"""
+    import report_variants
+
+    _set_status(job_id, STATUS_RUNNING)
+    try:
+        pdf_path = report_variants.materialize_pdf(result, result_hash, kind)
+        if not pdf_path:
+            raise RuntimeError("PDF dosyası oluşmadı")
+        _set_status(job_id, STATUS_DONE, pdf_path=str(pdf_path))
+    except Exception as e:
+        print(f"[pdf_jobs] {job_id} ({kind}) hatası: {e}", file=sys.stderr, flush=True)
+        _set_status(job_id, STATUS_FAILED, str(e))
+    finally:
+        with _futures_lock:
+            _futures.pop(job_id, None)
+
+
+def _renew(job_ids: list):
+    conn = _connect()
+    try:
+        conn.executemany("UPDATE pdf_jobs SET lease_until=? WHERE job_id=? AND status IN (?, ?)",
+                         [(time.time() + PDF_LEASE, job_id, STATUS_QUEUED, STATUS_RUNNING) for job_id in job_ids])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _heartbeat_loop():
+    """Bu worker'daki bitmemiş işlerin kirasını uzat"""
+    while True:
+        time.sleep(PDF_HEARTBEAT)
+        with _futures_lock:
+            job_ids = list(_futures)
+        if not job_ids:
+            continue
+        try:
+            _renew(job_ids)
+        except sqlite3.Error as e:
+            print(f"[pdf_jobs] kira yenilenemedi: {e}", file=sys.stderr, flush=True)
+
+
+def _start(job_id: str, kind: str, result: dict, result_hash: str):
+    global _heartbeat
+    with _futures_lock:
+        _futures[job_id] = _executor.submit(_render, job_id, kind, result, result_hash)
+        if _heartbeat is None:
+            _heartbeat = threading.Thread(target=_heartbeat_loop, name="pdf-job-lease", daemon=True)
+            _heartbeat.start()
+
+
+def _claim(job_id: str) -> bool:
+    """Kirası dolmuş işi bu worker'a al (aynı anda yalnızca bir worker başarır)"""
+    now = time.time()
+    conn = _connect()
+    try:
+        cur = conn.execute("""UPDATE pdf_jobs SET status=?, lease_until=?
+            WHERE job_id=? AND status IN (?, ?) AND COALESCE(lease_until, 0) < ?""",
+            (STATUS_QUEUED, now + PDF_LEASE, job_id, STATUS_QUEUED, STATUS_RUNNING, now))
+        conn.commit()
+        return cur.rowcount == 1
+    finally:
+        conn.close()
+
+
+def _discard_previous(conn, owner_key: str, kind: str):
+    """Aynı kullanıcının aynı türdeki bitmiş eski işlerini temizle.
+    Dosyalar artifact önbelleğine ait - orada boyut sınırıyla çıkarılır."""
+    conn.execute("DELETE FROM pdf_jobs WHERE owner_key=? AND kind=? AND status IN (?, ?)",
+                 (owner_key, kind, STATUS_DONE, STATUS_FAILED))
+
+
+def submit(owner_key: str, kind: str, result: dict, result_hash: str) -> str:
+    """PDF işini kuyruğa al ve job_id döndür"""
+    if kind not in KINDS:
+        raise ValueError(f"Bilinmeyen PDF türü: {kind}")
+    job_id = uuid4().hex
+
+    conn = _connect()
+    try:
+        _discard_previous(conn, owner_key, kind)
+        conn.execute("""INSERT INTO pdf_jobs (job_id, owner_key, kind, result_hash, status, created_at, lease_until)
+            VALUES (?,?,?,?,?,?,?)""",
+            (job_id, owner_key, kind, result_hash, STATUS_QUEUED, datetime.now().isoformat(), time.time() + PDF_LEASE))
+        conn.commit()
+    finally:
+        conn.close()
+
+    _start(job_id, kind, result, result_hash)
+    return job_id
+
+
+def ensure(owner_key: str, kind: str, result: dict, result_hash: str) -> str:
+    """Aynı sonucun geçerli işinin job_id'si; yoksa (ya da dosyası önbellekten
+    çıkarılmışsa) yeni iş kuyruğa alınır. Başarısız işler find()'a görünmez."""
+    job = find(owner_key, kind, result_hash)
+    if not job or (job["status"] == STATUS_DONE and not Path(job["pdf_path"] or "").exists()):
+        return submit(owner_key, kind, result, result_hash)
+    return job["job_id"]
+
+
+def find(owner_key: str, kind: str, result_hash: str) -> dict:
+    """Aynı sonuç için kuyruktaki, çalışan veya bitmiş işi getir (başarısızlar hariç)"""
+    conn = _connect()
+    try:
+        row = conn.execute("""SELECT * FROM pdf_jobs
+            WHERE owner_key=? AND kind=? AND result_hash=? AND status != ?
+            ORDER BY created_at DESC LIMIT 1""",
+            (owner_key, kind, result_hash, STATUS_FAILED)).fetchone()
+        return dict(row) if row else {}
+    finally:
+        conn.close()
+
+
+def status(job_id: str) -> dict:
+    """İş durumunu getir (herhangi bir worker'dan)"""
+    if not job_id:
+        return {}
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM pdf_jobs WHERE job_id=?", (job_id,)).fetchone()
+        return dict(row) if row else {}
+    finally:
+        conn.close()
+
+
+def _expired(job: dict) -> bool:
+    return job["status"] in (STATUS_QUEUED, STATUS_RUNNING) and (job.get("lease_until") or 0) < time.time()
+
+
+def wait(job_id: str, timeout: float = PDF_WAIT_TIMEOUT, result: dict = None) -> dict:
+    """İş bitene (veya süre dolana) kadar bekle, son durumu döndür.
+    result verilirse kirası dolan (sahibi ölmüş) iş bu worker'da yeniden çalıştırılır."""
+    deadline = time.monotonic() + timeout
+    job = status(job_id)
+    while job and job["status"] in (STATUS_QUEUED, STATUS_RUNNING):
+        if result is not None and _expired(job) and _claim(job_id):
+            print(f"[pdf_jobs] {job_id} ({job['kind']}) sahipsiz kaldı, bu worker'da yeniden çalıştırılıyor",
+                  file=sys.stderr, flush=True)
+            _start(job_id, job["kind"], result, job["result_hash"])
+        with _futures_lock:
+            future = _futures.get(job_id)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        if future is not None:
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                pass
+            return status(job_id)
+        # İş başka bir worker'da - durumu SQLite'tan yokla
+        time.sleep(min(0.25, remaining))
+        job = status(job_id)
+    return job
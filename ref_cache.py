@@ -0,0 +1,138 @@
+"""
+AkrediX - Referans Veri Önbelleği
+course_data, departments ve department_data okumaları için süreç içi,
+okumada-dolan (read-through) önbellek
+
+get_course_data, get_department_data, get_department, get_all_departments,
+get_department_courses (ve onları kullanan get_pea_text / get_poc_text) hemen
+her sayfada, ders seçicilerinde ve /api/department-courses, /api/all-courses'ta
+çağrılıyor; veriler ise nadiren değişiyor. @cached(ad) ile sarılan okuyucular
+sonucu worker belleğinde tutar:
+  - Her kayıt en fazla REF_CACHE_TTL saniye yaşar
+  - Yazan fonksiyonlar invalidate(ad) çağırır: yerel önbellek boşalır ve
+    SQLite'taki cache_versions sayacı artar
+  - Diğer worker'lar sayacı en fazla VERSION_CHECK_INTERVAL saniyede bir okur;
+    sayaç değiştiyse kendi önbelleklerini boşaltır
+Önbellekten dönen dict/list'ler kopyadır; çağıran değiştirebilir.
+"""
+import functools
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import db
+
+# Kayıt ömrü (saniye) - sayaç kaçırılsa bile üst sınır
+REF_CACHE_TTL = float(os.environ.get("AKREDIX_REF_CACHE_TTL", "300"))
+# Diğer worker'ların yazmalarını fark etme gecikmesi (saniye)
+VERSION_CHECK_INTERVAL = float(os.environ.get("AKREDIX_REF_CACHE_CHECK", "1"))
+REF_CACHE_MAX = int(os.environ.get("AKREDIX_REF_CACHE_MAX", "4096"))
+
+# Ad alanları: cache_versions satırları (migrations.py, 8. geçiş)
+COURSES = "courses"          # course_data
+DEPARTMENTS = "departments"  # departments + department_data
+NAMESPACES = (COURSES, DEPARTMENTS)
+
+
+class _Namespace:
+    __slots__ = ("lock", "entries", "version", "checked_at", "generation")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # anahtar -> (değer, yüklenme zamanı)
+        self.version = None           # SQLite'ta görülen son sayaç
+        self.checked_at = 0.0
+        self.generation = 0           # yerel boşaltma sayısı - yükleme sırasında yazma olduysa saklama
+
+
+_namespaces = {name: _Namespace() for name in NAMESPACES}
+
+
+def _read_version(name: str):
+    conn = db.connect()
+    try:
+        row = conn.execute("SELECT version FROM cache_versions WHERE name=?", (name,)).fetchone()
+    except sqlite3.OperationalError as e:  # geçiş uygulanmamış - önbelleği kullanma
+        print(f"[ref_cache] sürüm okunamadı: {e}", file=sys.stderr, flush=True)
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def _clear(ns: _Namespace):
+    ns.entries.clear()
+    ns.generation += 1
+
+
+def _check_version(ns: _Namespace, name: str, now: float) -> bool:
+    """Sayaç kontrolü zamanı geldiyse oku; önbellek kullanılabilirse True"""
+    if now - ns.checked_at < VERSION_CHECK_INTERVAL and ns.version is not None:
+        return True
+    version = _read_version(name)
+    with ns.lock:
+        if version != ns.version:
+            _clear(ns)
+            ns.version = version
+        ns.checked_at = now
+    return version is not None
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return [dict(v) if isinstance(v, dict) else v for v in value]
+    return value
+
+
+def cached(name: str):
+    """Okuyucu fonksiyonu `name` ad alanında önbelleğe al (anahtar: fonksiyon + argümanlar)"""
+    ns = _namespaces[name]
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            if not _check_version(ns, name, now):
+                return fn(*args, **kwargs)
+            with ns.lock:
+                hit = ns.entries.get(key)
+                if hit is not None and now - hit[1] < REF_CACHE_TTL:
+                    ns.entries.move_to_end(key)
+                    return _copy(hit[0])
+                generation = ns.generation
+
+            value = fn(*args, **kwargs)
+            with ns.lock:
+                if ns.generation == generation:
+                    ns.entries[key] = (value, now)
+                    ns.entries.move_to_end(key)
+                    while len(ns.entries) > REF_CACHE_MAX:
+                        ns.entries.popitem(last=False)
+            return _copy(value)
+        return wrapper
+    return decorator
+
+
+def invalidate(*names: str):
+    """Yazma commit edildikten sonra çağrılır: yerel önbelleği boşalt, diğer
+    worker'lar için sayacı artır"""
+    for name in names:
+        ns = _namespaces[name]
+        with ns.lock:
+            _clear(ns)
+            ns.checked_at = 0.0  # sonraki okumada sayaç yeniden okunur
+
+    conn = db.connect()
+    try:
+        conn.executemany("UPDATE cache_versions SET version=version+1 WHERE name=?", [(name,) for name in names])
+        conn.commit()
+    except sqlite3.OperationalError as e:
+        print(f"[ref_cache] sayaç artırılamadı: {e}", file=sys.stderr, flush=True)
+    finally:
+        conn.close()
@@ -0,0 +1,178 @@
+"""
+AkrediX - PDF Render Havuzu
+WeasyPrint'i bir kez yükleyen, uzun ömürlü render worker süreçleri
+
+Her export_pdf_from_html çağrısı WeasyPrint'i import ediyor, raporların büyük
+CSS'ini baştan parse ediyor, fontları ve base_url varlıklarını (Google Fonts
+dahil) her seferinde yeniden çözüyordu. Bu havuzdaki worker'lar:
+  - WeasyPrint'i ve FontConfiguration'ı süreç başında bir kez yükler
+  - web_server.SHARED_REPORT_STYLESHEETS'i önceden ayrıştırır
+  - Uzak/yerel varlıkları (font CSS'i, font dosyaları, logo) süreç içinde önbelleğe alır
+Eşzamanlı render sayısı sınırlıdır; gunicorn web worker'ları WeasyPrint'in
+belleğini taşımaz ve kuyruk dolduğunda sonsuza kadar beklemez. Kuyruk yeri
+render gerçekten bitene kadar tutulur; zaman aşımında çağıran beklemeyi
+bırakır ve havuz yenilenir (çalışan render iptal edilemez, süreci sonlandırılır).
+"""
+import importlib.util
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+# Render worker süreci sayısı (0: havuz yok, aynı süreçte sıcak render)
+RENDER_WORKERS = int(os.environ.get("AKREDIX_RENDER_WORKERS", "2"))
+# Bir worker kaç render'dan sonra yenilensin (bellek sızıntılarına karşı)
+RENDER_MAX_TASKS = int(os.environ.get("AKREDIX_RENDER_MAX_TASKS", "50"))
+# Kuyrukta bekleyebilecek render sayısı (çalışanlara ek olarak)
+RENDER_QUEUE_SIZE = int(os.environ.get("AKREDIX_RENDER_QUEUE_SIZE", "4"))
+# Tek render için üst süre (saniye) - kuyruk bekleme dahil
+RENDER_TIMEOUT = float(os.environ.get("AKREDIX_RENDER_TIMEOUT", "120"))
+
+BASE_URL = str(Path(__file__).parent)
+
+HAS_WEASYPRINT = importlib.util.find_spec("weasyprint") is not None
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(RENDER_WORKERS, 1) + RENDER_QUEUE_SIZE)
+
+# Worker süreci içindeki sıcak durum (fontlar, ayrıştırılmış CSS, varlık önbelleği)
+_warm = {}
+
+
+def _init_worker(shared_css: dict, base_url: str):
+    """Worker başlangıcı: WeasyPrint'i yükle, ortak CSS'i bir kez ayrıştır"""
+    from weasyprint import CSS, default_url_fetcher  # type: ignore
+    try:
+        from weasyprint.text.fonts import FontConfiguration  # type: ignore
+    except ImportError:  # WeasyPrint < 53
+        from weasyprint.fonts import FontConfiguration  # type: ignore
+
+    font_config = FontConfiguration()
+    fetched = {}
+
+    def cached_fetcher(url, *args, **kwargs):
+        # Google Fonts CSS'i, font dosyaları ve /assets altındaki görseller süreç boyunca bir kez çekilir
+        if url not in fetched:
+            result = default_url_fetcher(url, *args, **kwargs)
+            if "string" not in result and result.get("file_obj") is not None:
+                result["string"] = result.pop("file_obj").read()
+            fetched[url] = result
+        return dict(fetched[url])
+
+    _warm["font_config"] = font_config
+    _warm["url_fetcher"] = cached_fetcher
+    _warm["base_url"] = base_url
+    _warm["stylesheets"] = [
+        (f"<style>\n{css_text}</style>",
+         CSS(string=css_text, base_url=base_url, font_config=font_config, url_fetcher=cached_fetcher))
+        for css_text in shared_css.values()
+    ]
+
+
+def _render(html: str, out_path: str) -> bool:
+    """Worker içinde çalışır: ortak CSS bloklarını çıkar, önceden ayrıştırılmış halleriyle render et"""
+    from weasyprint import HTML  # type: ignore
+
+    stylesheets = []
+    for block, parsed in _warm["stylesheets"]:
+        if block in html:
+            html = html.replace(block, "", 1)
+            stylesheets.append(parsed)
+    HTML(string=html, base_url=_warm["base_url"], url_fetcher=_warm["url_fetcher"]).write_pdf(
+        out_path, stylesheets=stylesheets, font_config=_warm["font_config"])
+    return True
+
+
+def _shared_css() -> dict:
+    import web_server
+    return dict(web_server.SHARED_REPORT_STYLESHEETS)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: çok thread'li gunicorn worker'ından fork etmek güvenli değil
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(_shared_css(), BASE_URL),
+                max_tasks_per_child=RENDER_MAX_TASKS or None,
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _kill_pool():
+    """Havuzu worker süreçleriyle birlikte sonlandır - çalışan render'lar BrokenProcessPool ile biter"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is None:
+        return
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_local(html: str, out_path: Path) -> bool:
+    # Havuz kapalı: aynı süreçte, yine bir kez ısınmış durumla
+    try:
+        with _pool_lock:
+            if not _warm:
+                _init_worker(_shared_css(), BASE_URL)
+        return _render(html, str(out_path))
+    except Exception as e:
+        print(f"[render_pool] Render hatası: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+        return False
+    finally:
+        _slots.release()
+
+
+def render_pdf(html: str, out_path: Path) -> bool:
+    """HTML'i PDF'e dönüştür. Başarılıysa True; WeasyPrint yoksa, kuyruk doluysa veya hata olursa False."""
+    if not HAS_WEASYPRINT:
+        return False
+    if not _slots.acquire(timeout=RENDER_TIMEOUT):
+        print("[render_pool] Render kuyruğu dolu, zaman aşımı", file=sys.stderr, flush=True)
+        return False
+    if RENDER_WORKERS <= 0:
+        return _render_local(html, out_path)
+    try:
+        future = _get_pool().submit(_render, html, str(out_path))
+    except Exception as e:
+        _slots.release()
+        print(f"[render_pool] Render kuyruğa alınamadı, havuz yenileniyor: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+        _reset_pool()
+        return False
+    # Yer, render worker'da bitince (ya da iptal/çökme ile sonlanınca) bırakılır - zaman
+    # aşımında bırakmak çalışmaya devam eden render'ın üzerine yenisini başlatırdı
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=RENDER_TIMEOUT)
+    except FutureTimeout:
+        print(f"[render_pool] Render {RENDER_TIMEOUT:.0f} sn'de bitmedi, havuz yenileniyor", file=sys.stderr, flush=True)
+        _kill_pool()
+        return False
+    except BrokenProcessPool as e:
+        print(f"[render_pool] Worker süreci çöktü, havuz yenileniyor: {e}", file=sys.stderr, flush=True)
+        _reset_pool()
+        return False
+    except Exception as e:
+        print(f"[render_pool] Render hatası: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+        return False
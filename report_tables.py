@@ -0,0 +1,160 @@
+"""
+AkrediX - Rapor Tabloları
+Büyük öğrenci/soru tablolarının kayıtlı sonuç üzerinden sayfalı sorgulanması
+
+1500 öğrencili ortak derslerde raporlar her öğrenci ve her soru için bir HTML
+satırı gömüyor, sayfa megabaytlara çıkıyordu. Ekrandaki raporlar artık bu
+tabloları /api/report-table/<tablo> üzerinden sayfa sayfa çeker
+(assets/js/virtual_table.js, sanal kaydırma). Sıralama ve süzme (harf notu,
+başarı %, GR durumu, arama) sunucuda yapılır. PDF ve yazdırma varyantları
+tabloların tamamını içermeye devam eder.
+"""
+import os
+
+# Bu kadar satırdan küçük tablolar sayfaya doğrudan gömülür
+VIRTUAL_MIN_ROWS = int(os.environ.get("AKREDIX_VIRTUAL_TABLE_MIN_ROWS", "100"))
+DEFAULT_PER_PAGE = 100
+MAX_PER_PAGE = 500
+
+GRADE_ORDER = ["AA", "BA", "BB", "CB", "CC", "DC", "DD", "FD", "FF", "GR"]
+
+STATUS_ATTENDING = "attending"
+STATUS_ABSENT = "absent"
+
+
+def _student_status(grade: str) -> str:
+    if grade in ["AA", "BA", "BB", "CB", "CC"]:
+        return "Başarılı"
+    if grade in ["DC", "DD"]:
+        return "Koşullu"
+    if grade == "GR":
+        return "Girmedi"
+    return "Başarısız"
+
+
+def student_rows(result: dict) -> list:
+    """Öğrenci tablosu satırları - render_tables'daki sırayla (katılanlar başarıya göre, sonra GR)"""
+    students_data = result.get("students_data", [])
+    attending = [s for s in students_data if not s.get("is_absent")]
+    absent = [s for s in students_data if s.get("is_absent")]
+    rows = []
+    for rank, s in enumerate(attending + absent, 1):
+        sid = s.get("id", "")
+        grade = "GR" if s.get("is_absent") else s.get("grade", "FF")
+        rows.append({
+            "rank": rank,
+            "id": sid,
+            "name": s.get("name", sid),
+            "pct": None if s.get("is_absent") else round(float(s.get("pct", 0) or 0), 2),
+            "grade": grade,
+            "status": _student_status(grade),
+            "is_absent": bool(s.get("is_absent")),
+        })
+    return rows
+
+
+def question_rows(result: dict) -> list:
+    """Soru tablosu satırları - eşleme bilgileri + soru bazlı başarı"""
+    per_q = result.get("question_outcomes", {}).get("per_question", {})
+    rows = []
+    for q in result.get("input_questions", []):
+        qid = q.get("id", "")
+        data = per_q.get(qid, {})
+        rows.append({
+            "id": qid,
+            "week": q.get("week", ""),
+            "component_id": q.get("component_id", ""),
+            "docs": ", ".join(q.get("doc_ids") or [q.get("doc_id", "")]),
+            "pocs": ", ".join(q.get("poc_list", [])),
+            "peas": ", ".join(q.get("pea_list", [])),
+            "bloom": ", ".join(q.get("bloom_list", []) or [q.get("bloom", "")]),
+            "tyc": ", ".join(q.get("tyc_list", [])),
+            "stark": ", ".join(q.get("stark_list", [])),
+            "curriculum": ", ".join(q.get("curriculum_list", [])),
+            "max_points": q.get("max_points", 0),
+            "correct_pct": data.get("correct_pct"),
+            "incorrect_pct": data.get("incorrect_pct"),
+            "avg_score": data.get("avg_score"),
+        })
+    return rows
+
+
+def _grade_rank(grade: str) -> int:
+    return GRADE_ORDER.index(grade) if grade in GRADE_ORDER else len(GRADE_ORDER)
+
+
+# tablo -> (satır üretici, sıralama anahtarları, varsayılan sıralama)
+TABLES = {
+    "students": (student_rows, {
+        "rank": lambda r: r["rank"],
+        "pct": lambda r: r["pct"],
+        "grade": lambda r: _grade_rank(r["grade"]),
+        "name": lambda r: str(r["name"]).casefold(),
+        "id": lambda r: str(r["id"]),
+    }, "rank"),
+    "questions": (question_rows, {
+        "id": lambda r: str(r["id"]),
+        "week": lambda r: str(r["week"]),
+        "max_points": lambda r: float(r["max_points"] or 0),
+        "correct_pct": lambda r: r["correct_pct"],
+        "avg_score": lambda r: r["avg_score"],
+    }, "id"),
+}
+
+
+def row_count(result: dict, table: str) -> int:
+    if table == "students":
+        return len(result.get("students_data", []))
+    return len(result.get("input_questions", []))
+
+
+def should_virtualize(result: dict, table: str) -> bool:
+    return row_count(result, table) >= VIRTUAL_MIN_ROWS
+
+
+def query(result: dict, table: str, sort: str = None, order: str = "asc", grades=None,
+          status: str = None, min_pct: float = None, max_pct: float = None, search: str = None,
+          page: int = 1, per_page: int = DEFAULT_PER_PAGE) -> dict:
+    """Tabloyu süz, sırala ve istenen sayfayı döndür"""
+    if table not in TABLES:
+        raise ValueError(f"Bilinmeyen tablo: {table}")
+    build_rows, sort_keys, default_sort = TABLES[table]
+    rows = build_rows(result)
+
+    if table == "students":
+        if grades:
+            wanted = {g.strip().upper() for g in grades if g.strip()}
+            rows = [r for r in rows if r["grade"] in wanted]
+        if status == STATUS_ABSENT:
+            rows = [r for r in rows if r["is_absent"]]
+        elif status == STATUS_ATTENDING:
+            rows = [r for r in rows if not r["is_absent"]]
+        if min_pct is not None:
+            rows = [r for r in rows if r["pct"] is not None and r["pct"] >= min_pct]
+        if max_pct is not None:
+            rows = [r for r in rows if r["pct"] is not None and r["pct"] <= max_pct]
+    if search:
+        needle = search.casefold()
+        rows = [r for r in rows if any(needle in str(v).casefold() for v in r.values() if isinstance(v, str))]
+
+    sort = sort if sort in sort_keys else default_sort
+    sort_key = sort_keys[sort]
+    # Değeri olmayanlar (GR öğrencilerin başarı %'si gibi) yön ne olursa olsun sonda
+    missing = [r for r in rows if sort_key(r) is None]
+    rows = sorted((r for r in rows if sort_key(r) is not None), key=sort_key, reverse=(order == "desc")) + missing
+
+    per_page = max(1, min(int(per_page or DEFAULT_PER_PAGE), MAX_PER_PAGE))
+    total = len(rows)
+    pages = max(1, -(-total // per_page))
+    page = max(1, min(int(page or 1), pages))
+    start = (page - 1) * per_page
+    return {
+        "table": table,
+        "total": total,
+        "page": page,
+        "pages": pages,
+        "per_page": per_page,
+        "sort": sort,
+        "order": "desc" if order == "desc" else "asc",
+        "rows": rows[start:start + per_page],
+    }
@@ -0,0 +1,209 @@
+"""
+AkrediX - Rapor Varyantları
+Kayıtlı bir sonuç üzerinde tembel (lazy) üretilen rapor çıktıları
+
+Standart HTML, tam sayfa, V2, öğrenci raporları ve PDF'ler artık /compute
+sırasında değil, ilk istendiklerinde üretilir ve sonucun hash'iyle
+anahtarlanarak saklanır:
+  - HTML varyantları: süreç içi, bayt sınırlı LRU
+  - PDF varyantları: artifact_cache (disk, tüm worker'lar ortak)
+Sonuç değişince hash değişir; eski varyantlar forget() ile bırakılır.
+
+Kayıtlı raporlar (rapor geçmişi) değişmez: sayfaları ilk görüntülemede
+gzip'li olarak artifact_cache'e yazılır ve rapor id'si + şablon sürümüyle
+anahtarlanır; sonraki görüntülemeler JSON çözmeden/render etmeden diskten
+sıkıştırılmış haliyle gönderilir. İsteğe bağlı bir bölümü (AI önerileri) hata
+veren çıktı hiçbir katmanda saklanmaz; silinmiş raporun dosyası yazılmaz.
+"""
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+import artifact_cache
+import login
+import static_assets
+import web_server as ws
+
+MEMO_MAX_BYTES = int(os.environ.get("AKREDIX_VARIANT_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+# PDF varyantı -> pdf_jobs/export_report_pdf türü
+PDF_VARIANTS = {"pdf_main": "main", "pdf_v2": "v2", "pdf_legacy": "legacy"}
+
+# Kayıtlı rapor sayfalarının önbellekteki biçimi
+HISTORY_SUFFIX = ".html.gz"
+
+_renderers = {}
+_streamers = {}
+_memo = OrderedDict()  # (result_hash, name, params) -> html
+_memo_bytes = 0
+_memo_lock = threading.Lock()
+
+
+def register(name: str, renderer, streamer=None):
+    """HTML varyantı kaydet: renderer(result, **params) -> str,
+    streamer(result, **params) -> parça üreteci (akışla gönderim için, isteğe bağlı)"""
+    _renderers[name] = renderer
+    if streamer is not None:
+        _streamers[name] = streamer
+
+
+register("html", lambda result: ws.render_tables(result, virtual_tables=True))
+register("html_standalone",
+         lambda result, report_id=None, virtual_tables=False: ws.render_tables(
+             result, standalone=True, report_id=report_id, virtual_tables=virtual_tables),
+         lambda result, report_id=None, virtual_tables=False: ws.iter_render_tables(
+             result, standalone=True, report_id=report_id, virtual_tables=virtual_tables))
+register("html_v2",
+         lambda result, show_toolbar=False, report_id=None, virtual_tables=False: ws.render_v2_report(
+             result, show_toolbar=show_toolbar, report_id=report_id, virtual_tables=virtual_tables),
+         lambda result, show_toolbar=False, report_id=None, virtual_tables=False: ws.iter_render_v2_report(
+             result, show_toolbar=show_toolbar, report_id=report_id, virtual_tables=virtual_tables))
+
+
+def _memo_key(result: dict, result_hash: str, name: str, params: dict):
+    result_hash = result_hash or artifact_cache.result_hash(result)
+    return (result_hash, name, tuple(sorted(params.items())))
+
+
+def _recall(memo_key):
+    with _memo_lock:
+        html = _memo.get(memo_key)
+        if html is not None:
+            _memo.move_to_end(memo_key)
+        return html
+
+
+def _remember(memo_key, html: str):
+    global _memo_bytes
+    size = len(html.encode("utf-8"))
+    if size > MEMO_MAX_BYTES:
+        return
+    with _memo_lock:
+        if memo_key not in _memo:
+            _memo[memo_key] = html
+            _memo_bytes += size
+        while _memo_bytes > MEMO_MAX_BYTES and _memo:
+            _, evicted = _memo.popitem(last=False)
+            _memo_bytes -= len(evicted.encode("utf-8"))
+
+
+def materialize(result: dict, result_hash: str, name: str, **params) -> str:
+    """HTML varyantını getir; ilk istekte üret ve sonuçla birlikte sakla"""
+    memo_key = _memo_key(result, result_hash, name, params)
+    html = _recall(memo_key)
+    if html is None:
+        degraded = ws.track_degraded()
+        html = _renderers[name](result, **params)
+        if not degraded:
+            _remember(memo_key, html)
+    return html
+
+
+def stream(result: dict, result_hash: str, name: str, **params):
+    """Saklanmışsa HTML'i (str) döndür; yoksa bölüm bölüm üreten bir üreteç.
+    Üreteç sonuna kadar tüketilirse (istemci yarıda kopmazsa) HTML saklanır."""
+    memo_key = _memo_key(result, result_hash, name, params)
+    html = _recall(memo_key)
+    if html is not None:
+        return html
+    streamer = _streamers.get(name)
+    if streamer is None:
+        return materialize(result, result_hash, name, **params)
+    return _stream_and_remember(memo_key, streamer(result, **params))
+
+
+def _stream_and_remember(memo_key, chunks):
+    degraded = ws.track_degraded()
+    parts = []
+    for chunk in chunks:
+        if chunk:
+            parts.append(chunk)
+            yield chunk
+    if not degraded:
+        _remember(memo_key, "".join(parts))
+
+
+def forget(result_hash: str):
+    """Sonuç değişti - o sonuca ait bellekteki HTML varyantlarını bırak"""
+    global _memo_bytes
+    if not result_hash:
+        return
+    with _memo_lock:
+        for memo_key in [k for k in _memo if k[0] == result_hash]:
+            _memo_bytes -= len(_memo.pop(memo_key).encode("utf-8"))
+
+
+def report_group(report_id: int) -> str:
+    """Kayıtlı rapora ait artifact'ların grubu (sayfalar ve PDF'ler) - rapor silinince discard_report"""
+    return f"report-{int(report_id)}"
+
+
+def discard_report(report_id: int):
+    artifact_cache.discard(report_group(report_id))
+
+
+def report_guard(report_id: int):
+    """artifact_cache.get_or_create(place=...) için: dosya ancak rapor hâlâ kayıtlıysa, silme
+    ile yarışmayacak şekilde (rapor satırının yazma kilidi altında) yerine konur"""
+    return lambda move: login.while_report_exists(report_id, move)
+
+
+def report_pdf_key(report_id: int, variant: str, renderer: str = None) -> str:
+    return artifact_cache.artifact_key("report", report_id, variant, renderer or ws.pdf_renderer_id(),
+                                       ws.REPORT_TEMPLATE_VERSION)
+
+
+def history_key(report_id: int, name: str, **params) -> str:
+    # Sayfa paket URL'lerini gömüyor - paketler değişince eski HTML kullanılmasın
+    return artifact_cache.artifact_key("report-html", report_id, name, tuple(sorted(params.items())),
+                                       ws.REPORT_TEMPLATE_VERSION, static_assets.asset_path("app.js"),
+                                       static_assets.asset_path("app.css"), static_assets.asset_path("virtual_table.js"))
+
+
+def cached_history_html(report_id: int, name: str, **params):
+    """Kayıtlı raporun sayfası daha önce üretildiyse gzip'li dosyanın yolu, yoksa None"""
+    return artifact_cache.lookup(history_key(report_id, name, **params), HISTORY_SUFFIX, report_group(report_id))
+
+
+def stream_history(result: dict, report_id: int, name: str, **params):
+    """Kayıtlı raporun sayfasını bölüm bölüm üret; sonuna kadar gönderilirse
+    gzip'leyip artifact_cache'e yaz (sonraki istekler cached_history_html ile)"""
+    key = history_key(report_id, name, **params)
+    return _stream_and_store(key, report_id, _streamers[name](result, report_id=report_id, **params))
+
+
+def _stream_and_store(key: str, report_id: int, chunks):
+    degraded = ws.track_degraded()
+    parts = []
+    for chunk in chunks:
+        if chunk:
+            parts.append(chunk)
+            yield chunk
+    if degraded:  # ör. AI önerileri alınamadı - sonraki görüntüleme yeniden üretir
+        return
+    data = gzip.compress("".join(parts).encode("utf-8"), mtime=0)
+    artifact_cache.get_or_create(key, lambda tmp: tmp.write_bytes(data), HISTORY_SUFFIX, report_group(report_id),
+                                 place=report_guard(report_id))
+
+
+def pdf_key(result_hash: str, kind: str, renderer: str = None) -> str:
+    if renderer is None:
+        renderer = "reportlab" if kind == "legacy" else ws.pdf_renderer_id()
+    return artifact_cache.artifact_key("result", result_hash, kind, renderer, ws.REPORT_TEMPLATE_VERSION)
+
+
+def cached_pdf(result_hash: str, kind: str):
+    """PDF varyantı daha önce üretildiyse yolunu döndür, yoksa None"""
+    if not result_hash:
+        return None
+    return artifact_cache.lookup(pdf_key(result_hash, kind))
+
+
+def materialize_pdf(result: dict, result_hash: str, kind: str):
+    """PDF varyantını getir; yoksa üret (pdf_jobs worker'ında çağrılır)"""
+    if kind == "legacy":
+        return artifact_cache.get_or_create(pdf_key(result_hash, kind), lambda tmp: ws.legacy_pdf(result, str(tmp)))
+    # WeasyPrint başarısız olup legacy PDF'e düşülürse çıktı reportlab anahtarıyla saklanır
+    return artifact_cache.get_or_create(pdf_key(result_hash, kind), lambda tmp: ws.export_report_pdf(result, tmp, kind),
+                                        rekey=lambda renderer: pdf_key(result_hash, kind, renderer))
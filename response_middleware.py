@@ -0,0 +1,145 @@
+"""
+AkrediX - Yanıt Sıkıştırma ve Koşullu GET
+Flask yanıtları için gzip/brotli sıkıştırma, ETag ve 304 Not Modified
+
+build_page, V2 rapor ve admin paneli yüzlerce KB sıkıştırılmamış HTML,
+/api/reports/<id> ise payload + sonucun tamamını JSON olarak gönderiyordu.
+install(app) bir after_request katmanı ekler:
+  - Gövde yeterince büyük ve türü metinse istemcinin kabul ettiği en iyi
+    kodlamayla (br > gzip) sıkıştırılır
+  - GET yanıtlarına gövde hash'inden ETag eklenir; If-None-Match tutarsa
+    gövde gönderilmeden 304 döner
+  - Akış (streamed) ve dosya (send_file) yanıtlarına dokunulmaz
+Davranış rota bazında @response_policy(...) ile değiştirilebilir.
+"""
+import gzip
+import hashlib
+import os
+
+from flask import request
+
+try:
+    import brotli  # type: ignore
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Bu boyuttan küçük gövdeler sıkıştırılmaz (başlık maliyeti kazancı aşar)
+COMPRESS_MIN_BYTES = int(os.environ.get("AKREDIX_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.environ.get("AKREDIX_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("AKREDIX_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = {
+    "text/html", "text/css", "text/plain", "text/csv",
+    "application/json", "application/javascript", "image/svg+xml",
+}
+
+ETAG_NONE = None
+ETAG_WEAK = "weak"      # Dinamik sayfalar: aynı gövde -> aynı ETag
+ETAG_STRONG = "strong"  # Değişmeyen içerik (kayıtlı raporlar): bayt bayt aynı
+
+DEFAULT_POLICY = {
+    "compress": True,
+    "etag": ETAG_WEAK,
+    "min_size": COMPRESS_MIN_BYTES,
+    "cache_control": None,
+}
+
+
+def response_policy(**options):
+    """Rota bazında yanıt ayarları.
+
+    @response_policy(etag=ETAG_STRONG, cache_control="private, no-cache")
+    @response_policy(compress=False)
+    """
+    unknown = set(options) - set(DEFAULT_POLICY)
+    if unknown:
+        raise ValueError(f"Bilinmeyen yanıt ayarı: {', '.join(sorted(unknown))}")
+
+    def decorator(view):
+        view._response_policy = {**DEFAULT_POLICY, **options}
+        return view
+    return decorator
+
+
+def _policy(app) -> dict:
+    view = app.view_functions.get(request.endpoint)
+    return getattr(view, "_response_policy", DEFAULT_POLICY)
+
+
+def _accepted(accept_encoding: str) -> dict:
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    return accepted
+
+
+def accepts(accept_encoding: str, encoding: str) -> bool:
+    """İstemci bu kodlamayı kabul ediyor mu (q=0 reddetmek demek)"""
+    return _accepted(accept_encoding).get(encoding, 0) > 0
+
+
+def _choose_encoding(accept_encoding: str):
+    accepted = _accepted(accept_encoding)
+    if HAS_BROTLI and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _process(app, response):
+    policy = _policy(app)
+    if policy["cache_control"]:
+        response.headers["Cache-Control"] = policy["cache_control"]
+
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+
+    data = response.get_data()
+
+    encoding = None
+    if (policy["compress"] and response.status_code == 200
+            and len(data) >= policy["min_size"]
+            and response.mimetype in COMPRESSIBLE_TYPES):
+        encoding = _choose_encoding(request.headers.get("Accept-Encoding"))
+        response.vary.add("Accept-Encoding")
+
+    if (policy["etag"] and request.method in ("GET", "HEAD")
+            and response.status_code == 200 and "ETag" not in response.headers):
+        # Sıkıştırılmış gövde farklı bayt dizisi - kodlama ETag'in parçası
+        digest = hashlib.sha256(data).hexdigest()[:32]
+        etag = f"{digest}-{encoding}" if encoding else digest
+        response.set_etag(etag, weak=policy["etag"] == ETAG_WEAK)
+        response = response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if encoding:
+        response.set_data(_compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def install(app):
+    """Sıkıştırma/ETag katmanını Flask uygulamasına ekle"""
+    @app.after_request
+    def _compress_and_tag(response):
+        return _process(app, response)
+    return app
@@ -0,0 +1,165 @@
+"""
+AkrediX - Sonuç Deposu
+Kullanıcı/oturum bazlı son hesaplama sonuçları (bellek içi LRU + SQLite)
+
+web_server.STATE tüm süreç için tek bir sonuç tutuyordu; eşzamanlı kullanıcılar
+birbirinin sonucunu eziyor, her gunicorn worker'ı da kendi kopyasını görüyordu.
+Bu modül sonuçları anahtar (kullanıcı e-postası / oturum) bazında saklar:
+  - Bellek katmanı: bayt boyutuna göre çıkarma yapan LRU
+  - Kalıcı katman: SQLite (tüm worker'lar aynı kaydı okuyabilir)
+Bellekteki kaydın SQLite sürümü en fazla VERSION_CHECK_INTERVAL saniyede bir
+denetlenir: başka bir worker'ın yazdığı sonuç en geç bu süre sonra görülür
+(aynı worker'ın yazdıkları hemen görülür). get() paylaşılan LRU kaydının
+sığ bir kopyasını döndürür.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import db
+from db import DB_PATH
+
+# Bellek katmanının üst sınırı (bayt)
+MAX_MEMORY_BYTES = int(os.environ.get("AKREDIX_RESULT_CACHE_BYTES", str(64 * 1024 * 1024)))
+# Bellekteki kaydın SQLite sürümüyle karşılaştırılma aralığı (saniye)
+VERSION_CHECK_INTERVAL = float(os.environ.get("AKREDIX_RESULT_VERSION_CHECK", "1"))
+
+# Bir kayıtta tutulan alanlar (result_hash: rapor varyantları ve PDF işleri bu hash'le anahtarlanır)
+ENTRY_KEYS = ("last_result", "result_hash", "last_payload_text", "loaded_report_id")
+
+
+class SQLiteResultBackend:
+    """Kalıcı katman - her anahtar için tek satır JSON"""
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+
+    def _connect(self):
+        # result_store tablosu: migrations.py (14. geçiş)
+        return db.connect(self.db_path)
+
+    def version(self, key: str):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT version FROM result_store WHERE store_key=?", (key,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def load(self, key: str):
+        """(version, data_text) döndürür, kayıt yoksa None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT version, data FROM result_store WHERE store_key=?", (key,)).fetchone()
+            return (row[0], row[1]) if row else None
+        finally:
+            conn.close()
+
+    def save(self, key: str, data_text: str) -> int:
+        conn = self._connect()
+        try:
+            now = datetime.now().isoformat()
+            conn.execute("""INSERT INTO result_store (store_key, data, size, version, updated_at)
+                VALUES (?,?,?,1,?)
+                ON CONFLICT(store_key) DO UPDATE SET
+                    data=excluded.data, size=excluded.size,
+                    version=result_store.version + 1, updated_at=excluded.updated_at""",
+                (key, data_text, len(data_text.encode("utf-8")), now))
+            conn.commit()
+            row = conn.execute("SELECT version FROM result_store WHERE store_key=?", (key,)).fetchone()
+            return row[0]
+        finally:
+            conn.close()
+
+    def delete(self, key: str):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM result_store WHERE store_key=?", (key,))
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class ResultStore:
+    """Bellek içi LRU katmanı + değiştirilebilir kalıcı katman (backend)"""
+
+    def __init__(self, backend=None, max_bytes: int = MAX_MEMORY_BYTES):
+        self.backend = backend or SQLiteResultBackend()
+        self.max_bytes = max_bytes
+        self._lru = OrderedDict()  # key -> [version, entry, size, checked_at]
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, version: int, entry: dict, size: int):
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old:
+                self._bytes -= old[2]
+            if size > self.max_bytes:
+                return  # Tek başına sınırı aşan kayıt sadece SQLite'ta kalır
+            self._lru[key] = [version, entry, size, time.monotonic()]
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._lru:
+                _, evicted = self._lru.popitem(last=False)
+                self._bytes -= evicted[2]
+
+    def get(self, key: str) -> dict:
+        """Anahtarın kaydının sığ kopyasını getir. Başka bir worker güncellediyse
+        (en fazla VERSION_CHECK_INTERVAL gecikmeyle) SQLite'tan yeniden okunur."""
+        if not key:
+            return {}
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached and time.monotonic() - cached[3] < VERSION_CHECK_INTERVAL:
+                self._lru.move_to_end(key)
+                return dict(cached[1])
+        current = self.backend.version(key)
+        if current is None:
+            with self._lock:
+                old = self._lru.pop(key, None)
+                if old:
+                    self._bytes -= old[2]
+            return {}
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached and cached[0] == current:
+                cached[3] = time.monotonic()
+                self._lru.move_to_end(key)
+                return dict(cached[1])
+        loaded = self.backend.load(key)
+        if not loaded:
+            return {}
+        version, data_text = loaded
+        entry = json.loads(data_text)
+        self._remember(key, version, entry, len(data_text.encode("utf-8")))
+        return dict(entry)
+
+    def put(self, key: str, entry: dict):
+        """Anahtarın kaydını tamamen değiştir"""
+        if not key:
+            return
+        entry = {k: entry.get(k) for k in ENTRY_KEYS}
+        data_text = json.dumps(entry, ensure_ascii=False)
+        version = self.backend.save(key, data_text)
+        self._remember(key, version, entry, len(data_text.encode("utf-8")))
+
+    def update(self, key: str, **fields):
+        """Mevcut kaydın bazı alanlarını güncelle"""
+        entry = self.get(key)
+        entry.update(fields)
+        self.put(key, entry)
+
+    def delete(self, key: str):
+        if not key:
+            return
+        self.backend.delete(key)
+        with self._lock:
+            old = self._lru.pop(key, None)
+            if old:
+                self._bytes -= old[2]
+
+
+STORE = ResultStore()
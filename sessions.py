@@ -0,0 +1,161 @@
+"""
+AkrediX - Oturumlar
+Tüm gunicorn worker'larının paylaştığı oturum deposu ve istek bazlı kimlik
+
+Oturumlar app.py'deki süreç içi ACTIVE_TOKENS kümesinde tutuluyordu: başka
+bir worker'a düşen istek /login'e atılıyor, her yeniden başlatma herkesi
+dışarı atıyordu. Oturumlar artık SQLite'ta (sessions tablosu) duruyor;
+token'ın kendisi değil SHA-256'sı saklanır. Her worker doğrulanmış
+token'ları kısa süreli (TTL) bir bellek önbelleğinde tutar, böylece
+isteklerin çoğu veritabanına gitmez. Başka bir worker'da kapatılan oturum
+en geç SESSION_CACHE_TTL saniye sonra burada da geçersiz olur.
+
+current() isteğin kimliğini istek başına bir kez çözer ve flask.g'de tutar.
+Rol ve profil (ders, program, ad...) istemcinin değiştirebileceği profile
+çerezinden değil, oturumun e-postasıyla users satırından okunur; istemcide
+yalnızca opak oturum token'ı durur. Silinmiş kullanıcının oturumu anonimdir.
+"""
+import hashlib
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, request
+
+import db
+
+AUTH_COOKIE = "auth"
+# Eski sürümlerin yazdığı profil çerezi - yalnızca çıkışta silinir, okunmaz
+PROFILE_COOKIE = "profile"
+# Identity.profile: users tablosundan
+PROFILE_COLUMNS = ("email", "full_name", "role", "department_id", "course_code", "course_name",
+                   "term", "program_name", "instructor")
+
+# Oturum ömrü (saniye) - varsayılan 30 gün, profile çereziyle aynı
+SESSION_TTL = int(os.environ.get("AKREDIX_SESSION_TTL", str(30 * 86400)))
+# Doğrulanmış token'ın bellekte tekrar kontrol edilmeden kullanılacağı süre (saniye)
+SESSION_CACHE_TTL = float(os.environ.get("AKREDIX_SESSION_CACHE_TTL", "60"))
+SESSION_CACHE_MAX = 10000
+
+_cache = OrderedDict()  # token hash -> (email, expires_at, checked_at)
+_cache_lock = threading.Lock()
+
+
+class Identity:
+    """İstek boyunca geçerli kimlik - oturum token'ı, e-posta ve users satırındaki profil"""
+
+    __slots__ = ("token", "email", "profile")
+
+    def __init__(self, token: str, email: str, profile: dict):
+        self.token = token
+        self.email = email
+        self.profile = profile
+
+    @property
+    def authenticated(self) -> bool:
+        return self.token is not None
+
+
+ANONYMOUS = Identity(None, "", {})
+
+
+def _connect():
+    # sessions tablosu: migrations.py (4. geçiş)
+    return db.connect()
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _cache_put(token_hash: str, email: str, expires_at: float):
+    with _cache_lock:
+        _cache[token_hash] = (email, expires_at, time.time())
+        _cache.move_to_end(token_hash)
+        while len(_cache) > SESSION_CACHE_MAX:
+            _cache.popitem(last=False)
+
+
+def create(email: str) -> str:
+    """Yeni oturum aç, çereze yazılacak token'ı döndür"""
+    token = secrets.token_hex(32)
+    token_hash = _hash(token)
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("INSERT INTO sessions (token_hash, email, created_at, expires_at) VALUES (?,?,?,?)",
+                     (token_hash, email, now, now + SESSION_TTL))
+        # Süresi dolmuşları giriş sırasında temizle - ayrı bir zamanlayıcı gerekmesin
+        conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+        conn.commit()
+    finally:
+        conn.close()
+    _cache_put(token_hash, email, now + SESSION_TTL)
+    return token
+
+
+def resolve(token: str):
+    """Token geçerliyse oturumun e-postasını, değilse None döndür"""
+    if not token:
+        return None
+    token_hash = _hash(token)
+    now = time.time()
+    with _cache_lock:
+        cached = _cache.get(token_hash)
+    if cached:
+        email, expires_at, checked_at = cached
+        if now - checked_at < SESSION_CACHE_TTL:
+            return email if expires_at > now else None
+
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT email, expires_at FROM sessions WHERE token_hash=?", (token_hash,)).fetchone()
+    finally:
+        conn.close()
+    if not row or row[1] <= now:
+        with _cache_lock:
+            _cache.pop(token_hash, None)
+        return None
+    _cache_put(token_hash, row[0], row[1])
+    return row[0]
+
+
+def revoke(token: str):
+    """Oturumu kapat (çıkış)"""
+    if not token:
+        return
+    token_hash = _hash(token)
+    with _cache_lock:
+        _cache.pop(token_hash, None)
+    conn = _connect()
+    try:
+        conn.execute("DELETE FROM sessions WHERE token_hash=?", (token_hash,))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _load_profile(email: str):
+    """Kullanıcının profili (boş sütunlar olmadan); kullanıcı yoksa None"""
+    conn = _connect()
+    try:
+        row = conn.execute(f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users WHERE email=?", (email,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        return None
+    return {column: value for column, value in zip(PROFILE_COLUMNS, row) if value is not None}
+
+
+def current() -> Identity:
+    """İsteğin kimliği - ilk çağrıda çözülür, istek boyunca flask.g'de tutulur"""
+    identity = g.get("identity")
+    if identity is None:
+        token = request.cookies.get(AUTH_COOKIE)
+        email = resolve(token)
+        profile = _load_profile(email) if email is not None else None
+        identity = ANONYMOUS if profile is None else Identity(token, email, profile)
+        g.identity = identity
+    return identity
@@ -0,0 +1,129 @@
+"""
+AkrediX - Statik Varlık Paketleri
+Sayfaların CSS/JS'inin içerik hash'li (fingerprinted) paketler olarak sunulması
+
+HTML_HEAD/HTML_FOOT ve login.py sayfaları her yanıtta yüzlerce satır inline
+<style>/<script> gönderiyordu. Bu kaynaklar artık assets/css ve assets/js
+altında duruyor; ilk kullanımda paketlenip assets/dist altına
+<ad>.<hash>.<uzantı> olarak, gzip (ve brotli kuruluysa br) sıkıştırılmış
+kopyalarıyla yazılıyor. Dosya adı içeriğe bağlı olduğundan tarayıcı paketi
+süresiz (immutable) önbellekler; içerik değişince URL de değişir.
+Paket yazılamazsa (dist salt okunur vb.) kaynak dosyaların her biri için
+ayrı etiket üretilir; sayfa paketin hiçbir parçasını kaybetmez.
+"""
+import gzip
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+import response_middleware
+
+try:
+    import brotli  # type: ignore
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+DIST_DIR = ASSETS_DIR / "dist"
+DIST_PREFIX = "dist/"
+
+# Paket adı -> assets altındaki kaynak dosyalar (sırayla birleştirilir)
+BUNDLES = {
+    "app.css": ["css/app.css"],
+    "app.js": ["js/app.js", "js/virtual_table.js"],
+    "auth.css": ["css/auth.css"],
+    "signup.css": ["css/signup.css"],
+    "signup.js": ["js/signup.js"],
+    "admin.css": ["css/admin.css"],
+    "admin.js": ["js/admin.js"],
+    "virtual_table.js": ["js/virtual_table.js"],
+}
+
+# Sıkıştırılmış kopyalar: Accept-Encoding değeri -> dosya uzantısı (tercih sırasıyla)
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+MIME_TYPES = {".css": "text/css; charset=utf-8", ".js": "application/javascript; charset=utf-8"}
+
+_manifest = {}  # paket adı -> "dist/<ad>.<hash><uzantı>"
+_lock = threading.Lock()
+
+
+def _write_once(path: Path, data: bytes):
+    """Aynı içerik hash'i aynı dosya demek - varsa yeniden yazma"""
+    if path.exists():
+        return
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _build(name: str) -> str:
+    body = b"\n".join((ASSETS_DIR / src).read_bytes() for src in BUNDLES[name])
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    stem, ext = os.path.splitext(name)
+    filename = f"{stem}.{digest}{ext}"
+
+    DIST_DIR.mkdir(parents=True, exist_ok=True)
+    path = DIST_DIR / filename
+    _write_once(path, body)
+    _write_once(path.with_name(filename + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+    if HAS_BROTLI:
+        _write_once(path.with_name(filename + ".br"), brotli.compress(body, quality=11))
+    return DIST_PREFIX + filename
+
+
+def asset_paths(name: str) -> list:
+    """Paketin assets altındaki yolları: paket dosyası (ilk çağrıda paketlenir);
+    paketlenemezse sırayla kaynak dosyaların her biri"""
+    path = _manifest.get(name)
+    if path is None:
+        with _lock:
+            path = _manifest.get(name)
+            if path is None:
+                try:
+                    path = _manifest[name] = _build(name)
+                except OSError as e:
+                    # dist yazılamıyorsa: sayfa yine de stilsiz/betiksiz kalmasın, kaynak dosyaları göster
+                    print(f"[static_assets] {name} paketlenemedi: {e}", file=sys.stderr, flush=True)
+                    return list(BUNDLES[name])
+    return [path]
+
+
+def asset_path(name: str) -> str:
+    """Paketin yolları tek metin olarak (önbellek anahtarları için)"""
+    return " ".join(asset_paths(name))
+
+
+def urls(name: str) -> list:
+    return [f"/assets/{path}" for path in asset_paths(name)]
+
+
+def stylesheet_tag(name: str) -> str:
+    return "\n".join(f'<link rel="stylesheet" href="{href}">' for href in urls(name))
+
+
+def script_tag(name: str) -> str:
+    return "\n".join(f'<script src="{src}"></script>' for src in urls(name))
+
+
+def is_fingerprinted(filename: str) -> bool:
+    return filename.startswith(DIST_PREFIX)
+
+
+def is_source(filename: str) -> bool:
+    """Bir paketin kaynak dosyası mı (paketleme başarısızsa doğrudan sunulur)"""
+    return any(filename in sources for sources in BUNDLES.values())
+
+
+def negotiate(file_path: Path, accept_encoding: str):
+    """İstemcinin kabul ettiği önceden sıkıştırılmış kopyayı seç: (yol, encoding) - yoksa (file_path, None).
+    q=0 ile reddedilen kodlama seçilmez."""
+    for encoding, suffix in ENCODINGS:
+        if response_middleware.accepts(accept_encoding, encoding):
+            candidate = file_path.with_name(file_path.name + suffix)
+            if candidate.exists():
+                return candidate, encoding
+    return file_path, None
@@ -0,0 +1,49 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Testler auth.db'ye dokunmaz: login import edilmeden önce geçici veritabanına yönlendir
+os.environ.setdefault("AKREDIX_DB_PATH", str(Path(tempfile.mkdtemp(prefix="akredix-test-")) / "auth.db"))
+# app import edilince Bologna zamanlayıcısı açılmasın
+os.environ.setdefault("AKREDIX_BOLOGNA_RESYNC_INTERVAL", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """İstekleri testin verdiği server.app(handler) fonksiyonuna yönlendirir"""
+
+    def do_GET(self):
+        self.server.seen.append((self.command, self.path, dict(self.headers)))
+        self.server.app(self)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_server():
+    """Yerel HTTP sunucusu; testte server.app atanır, gelen istekler server.seen'de"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.seen = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
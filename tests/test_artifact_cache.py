@@ -0,0 +1,127 @@
+import gzip
+import os
+import time
+
+import pytest
+
+import artifact_cache
+import login
+import report_variants
+
+
+@pytest.fixture(autouse=True)
+def artifact_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(artifact_cache, "ARTIFACT_DIR", tmp_path / "artifacts")
+    return tmp_path / "artifacts"
+
+
+def _report() -> int:
+    return login.save_report("artifacts@example.edu", "Rapor", "{}", "{}", 0.0)
+
+
+@pytest.fixture
+def plain_page(monkeypatch):
+    """Tek parçalı sahte sayfa; sections["ai"] hata verirse AI önerileri alınamamış gibi"""
+    sections = {"ai": True}
+
+    def streamer(result, report_id):
+        yield "<p>rapor</p>"
+        if not sections["ai"]:
+            report_variants.ws._note_degraded("ai_suggestions")
+        yield "<p>öneriler</p>"
+    monkeypatch.setitem(report_variants._streamers, "plain", streamer)
+    return sections
+
+
+def test_discard_report_removes_pages_and_pdfs(plain_page):
+    report_id, other_id = _report(), _report()
+    assert "".join(report_variants.stream_history({}, report_id, "plain")) == "<p>rapor</p><p>öneriler</p>"
+    page = report_variants.cached_history_html(report_id, "plain")
+    assert gzip.decompress(page.read_bytes()).decode("utf-8") == "<p>rapor</p><p>öneriler</p>"
+
+    pdf_key = artifact_cache.artifact_key("report", report_id, "main")
+    group = report_variants.report_group(report_id)
+    pdf = artifact_cache.get_or_create(pdf_key, lambda tmp: tmp.write_bytes(b"%PDF-1.4"), group=group)
+    other = artifact_cache.get_or_create(artifact_cache.artifact_key("report", other_id, "main"),
+                                         lambda tmp: tmp.write_bytes(b"%PDF-1.4"), group=report_variants.report_group(other_id))
+
+    report_variants.discard_report(report_id)
+    assert not page.exists() and not pdf.exists()
+    assert report_variants.cached_history_html(report_id, "plain") is None
+    assert artifact_cache.lookup(pdf_key, group=group) is None
+    assert other.exists()
+    report_variants.discard_report(report_id)  # zaten silinmiş: hata yok
+
+
+def test_page_with_failed_optional_section_is_not_stored(plain_page):
+    report_id = _report()
+    plain_page["ai"] = False
+    assert "".join(report_variants.stream_history({}, report_id, "plain")) == "<p>rapor</p><p>öneriler</p>"
+    assert report_variants.cached_history_html(report_id, "plain") is None
+
+    plain_page["ai"] = True
+    "".join(report_variants.stream_history({}, report_id, "plain"))
+    assert report_variants.cached_history_html(report_id, "plain") is not None
+
+
+def test_page_of_deleted_report_is_not_stored(plain_page):
+    report_id = _report()
+    chunks = report_variants.stream_history({}, report_id, "plain")
+    next(chunks)
+    login.delete_report(report_id)  # sayfa gönderilirken silindi
+    report_variants.discard_report(report_id)
+    list(chunks)
+    assert report_variants.cached_history_html(report_id, "plain") is None
+    assert not list((artifact_cache.ARTIFACT_DIR / report_variants.report_group(report_id)).glob("*"))
+
+
+def test_grouped_artifacts_are_evicted():
+    artifact_cache.get_or_create("k1", lambda tmp: tmp.write_bytes(b"x" * 100), group="report-1")
+    artifact_cache.evict(max_bytes=0)
+    assert artifact_cache.lookup("k1", group="report-1") is None
+
+
+def test_fallback_pdf_is_not_stored_under_requested_renderer(monkeypatch):
+    monkeypatch.setattr(report_variants.ws, "pdf_renderer_id", lambda: "weasyprint-test")
+    attempts = []
+
+    def export_report_pdf(result, tmp, kind):
+        attempts.append(kind)
+        tmp.write_bytes(b"%PDF-1.4")
+        return "reportlab" if len(attempts) == 1 else "weasyprint-test"
+    monkeypatch.setattr(report_variants.ws, "export_report_pdf", export_report_pdf)
+
+    fallback = report_variants.materialize_pdf({}, "hash-fallback", "main")
+    assert fallback == artifact_cache.artifact_path(report_variants.pdf_key("hash-fallback", "main", "reportlab"))
+    assert report_variants.cached_pdf("hash-fallback", "main") is None
+
+    assert report_variants.materialize_pdf({}, "hash-fallback", "main") == report_variants.cached_pdf("hash-fallback", "main")
+    assert len(attempts) == 2
+
+
+def test_stale_temp_files_are_reclaimed(artifact_dir):
+    stale = artifact_dir / "ab" / ".abc.pdf.1.2.tmp.pdf"
+    fresh = artifact_dir / "ab" / ".abd.pdf.1.3.tmp.pdf"
+    stale.parent.mkdir(parents=True)
+    stale.write_bytes(b"yarim")
+    fresh.write_bytes(b"suruyor")
+    old = time.time() - artifact_cache.TMP_MAX_AGE - 60
+    os.utime(stale, (old, old))
+
+    artifact_cache.evict()
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_eviction_scan_is_throttled(monkeypatch):
+    scans = []
+    monkeypatch.setattr(artifact_cache, "evict", lambda: scans.append(1))
+    monkeypatch.setattr(artifact_cache, "EVICT_EVERY_BYTES", 1000)
+    monkeypatch.setattr(artifact_cache, "_last_evict", time.monotonic())
+    monkeypatch.setattr(artifact_cache, "_written_since_evict", 0)
+
+    for i in range(3):
+        artifact_cache.get_or_create(f"small{i}", lambda tmp: tmp.write_bytes(b"x" * 100))
+    assert not scans
+    artifact_cache.get_or_create("large", lambda tmp: tmp.write_bytes(b"x" * 1000))
+    assert len(scans) == 1
@@ -0,0 +1,50 @@
+import sqlite3
+import threading
+
+import pytest
+
+import autosave
+import db
+import login  # noqa: F401 - geçici veritabanında geçişleri uygular
+
+
+def _draft_count(email: str) -> int:
+    conn = db.connect()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM drafts WHERE user_email=? AND slot=?",
+                            (email, autosave.AUTOSAVE_SLOT)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_requests_in_window_are_written_in_one_transaction(monkeypatch):
+    monkeypatch.setattr(autosave, "FLUSH_WINDOW", 0.2)
+    flushes = []
+    flush = autosave._flush
+    monkeypatch.setattr(autosave, "_flush", lambda: flushes.append(1) or flush())
+
+    emails = [f"window{i}@example.edu" for i in range(4)]
+    threads = [threading.Thread(target=autosave.submit, args=(email, {"grading_text": "A 90"})) for email in emails]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(flushes) == 1
+    assert all(_draft_count(email) == 1 for email in emails)
+
+
+def test_failed_write_is_dropped_from_queue(monkeypatch):
+    monkeypatch.setattr(autosave, "FLUSH_WINDOW", 0)
+    write_user = autosave._write_user
+
+    def locked(conn, email, changes, now):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(autosave, "_write_user", locked)
+    with pytest.raises(sqlite3.Error):
+        autosave.submit("failed@example.edu", {"grading_text": "A 90"})
+    assert autosave.pending_count() == 0
+
+    monkeypatch.setattr(autosave, "_write_user", write_user)
+    assert autosave.submit("other@example.edu", {"grading_text": "A 90"}) == 1
+    assert _draft_count("failed@example.edu") == 0
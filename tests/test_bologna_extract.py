@@ -0,0 +1,16 @@
+import pytest
+
+import bench_bologna
+import bologna_extract
+
+PAGES = sorted(bench_bologna.FIXTURES.glob("*.html"))
+
+
+@pytest.mark.parametrize("page", PAGES, ids=[p.name for p in PAGES])
+def test_course_outcomes_match_baseline_parser(page):
+    html = page.read_text(encoding="utf-8")
+    result = bologna_extract.course_outcomes(html)
+    assert result == bench_bologna.baseline_course_outcomes(html)
+    assert result["success"]
+    assert result["doc_text"].startswith("DÖÇ")
+    assert result["curriculum_text"].startswith("H")
@@ -0,0 +1,126 @@
+import json
+import subprocess
+import sys
+import urllib.parse
+from pathlib import Path
+
+import pytest
+
+import app as akredix
+import bologna_sync
+import db
+import login
+import sessions
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def client_as(monkeypatch):
+    started = []
+    monkeypatch.setattr(bologna_sync, "start", lambda dept_id, email, **kw: started.append(dept_id) or "job-1")
+
+    def make(email: str, role: str, department_id: str):
+        login.add_user(email, "Parola123!", "Test Kullanıcı", role, department_id)
+        client = akredix.app.test_client()
+        client.set_cookie(sessions.AUTH_COOKIE, sessions.create(email))
+        client.started = started
+        return client
+    return make
+
+
+def test_department_head_can_sync_own_department(client_as):
+    client = client_as("bb-own@example.edu", "bolum_baskani", "siyaset_bilimi")
+    response = client.post("/admin/bologna-sync/siyaset_bilimi")
+    assert response.status_code == 202
+    assert client.started == ["siyaset_bilimi"]
+
+
+def test_department_head_cannot_sync_other_department(client_as):
+    client = client_as("bb-other@example.edu", "bolum_baskani", "siyaset_bilimi")
+    response = client.post("/admin/bologna-sync/baska_bolum")
+    assert response.status_code == 403
+    assert not client.started
+
+
+def test_admin_can_sync_any_department(client_as):
+    client = client_as("admin-sync@example.edu", "admin", "")
+    assert client.post("/admin/bologna-sync/siyaset_bilimi").status_code == 202
+
+
+def test_forged_profile_cookie_does_not_grant_admin(client_as):
+    client = client_as("forged@example.edu", "ogretim_elemani", "siyaset_bilimi")
+    client.set_cookie(sessions.PROFILE_COOKIE, urllib.parse.quote(json.dumps({"role": "admin"})))
+    assert client.post("/admin/bologna-sync/siyaset_bilimi").status_code == 403
+    assert not client.started
+
+
+def test_role_comes_from_users_table(client_as):
+    client = client_as("promoted@example.edu", "ogretim_elemani", "siyaset_bilimi")
+    assert client.post("/admin/bologna-sync/siyaset_bilimi").status_code == 403
+    login.update_user_role("promoted@example.edu", "admin")
+    assert client.post("/admin/bologna-sync/siyaset_bilimi").status_code == 202
+
+
+@pytest.mark.skipif(not bologna_sync.HAS_FCNTL, reason="dosya kilidi yok")
+def test_only_one_process_runs_scheduler(monkeypatch):
+    monkeypatch.setattr(bologna_sync, "_leader_lock", None)
+    assert bologna_sync._is_leader()
+    other = subprocess.run([sys.executable, "-c", "import bologna_sync; print(bologna_sync._is_leader())"],
+                           cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert other.stdout.strip() == "False"
+    bologna_sync._leader_lock.close()  # kilidi tutan süreç ölünce olduğu gibi
+    other = subprocess.run([sys.executable, "-c", "import bologna_sync; print(bologna_sync._is_leader())"],
+                           cwd=ROOT, capture_output=True, text=True, timeout=60)
+    assert other.stdout.strip() == "True"
+
+
+def _course(code: str, doc_text: str, curriculum_text: str = ""):
+    conn = db.connect()
+    try:
+        conn.execute("""INSERT INTO course_data (course_code, course_name, department_id, doc_text, curriculum_text)
+            VALUES (?,?,?,?,?)""", (code, code, "siyaset_bilimi", doc_text, curriculum_text))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _texts(code: str) -> tuple:
+    conn = db.connect()
+    try:
+        return conn.execute("SELECT doc_text, curriculum_text FROM course_data WHERE course_code=?", (code,)).fetchone()
+    finally:
+        conn.close()
+
+
+def test_first_sync_fills_empty_fields_and_keeps_edits():
+    _course("SYNC101", "DÖÇ1 elle düzeltilmiş")
+    bologna = {"doc_text": "DÖÇ1 bologna", "curriculum_text": "H1 | Giriş"}
+    assert bologna_sync._write("job-first", {"SYNC101": bologna}, "test") == 1
+    assert _texts("SYNC101") == ("DÖÇ1 elle düzeltilmiş", "H1 | Giriş")
+
+    # Bologna değişmedi: elle düzeltme korunur
+    assert bologna_sync._write("job-same", {"SYNC101": bologna}, "test") == 0
+    assert _texts("SYNC101")[0] == "DÖÇ1 elle düzeltilmiş"
+
+    # Bologna değişti: yeni metin yazılır
+    assert bologna_sync._write("job-new", {"SYNC101": {**bologna, "doc_text": "DÖÇ1 yeni"}}, "test") == 1
+    assert _texts("SYNC101")[0] == "DÖÇ1 yeni"
+
+
+def test_scheduler_revalidates_pages(monkeypatch):
+    started = []
+    monkeypatch.setattr(bologna_sync, "_due_departments", lambda: ["siyaset_bilimi"])
+    monkeypatch.setattr(bologna_sync, "_prune", lambda: None)
+    monkeypatch.setattr(bologna_sync, "_is_leader", lambda: True)
+    monkeypatch.setattr(bologna_sync, "start", lambda dept_id, user, max_age: started.append(max_age))
+    monkeypatch.setattr(bologna_sync, "SCHEDULER_TICK", 0)
+
+    def stop(seconds):
+        if started:
+            raise SystemExit
+    monkeypatch.setattr(bologna_sync.time, "sleep", stop)
+    with pytest.raises(SystemExit):
+        bologna_sync._scheduler_loop()
+    assert started == [bologna_sync.SCHEDULER_MAX_AGE]
+    assert started[0] is not None
@@ -0,0 +1,98 @@
+import gzip
+import time
+
+import pytest
+
+import db
+import http_cache
+import login  # noqa: F401 - geçici veritabanında geçişleri uygular
+
+PAGE = "<html><body>Ders öğrenme çıktıları</body></html>" * 50
+
+
+def _set_validated_at(url: str, when: float):
+    conn = db.connect()
+    try:
+        conn.execute("UPDATE http_cache SET validated_at=? WHERE url=?", (when, url))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _wait(predicate, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "zaman aşımı"
+        time.sleep(0.02)
+
+
+def test_etag_revalidation_uses_304(stub_server):
+    def app(handler):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            handler.reply(304, headers={"ETag": '"v1"'})
+        else:
+            handler.reply(200, PAGE.encode("utf-8"), {"ETag": '"v1"', "Content-Type": "text/html"})
+    stub_server.app = app
+    url = stub_server.url + "/etag"
+
+    assert http_cache.get_text(url) == PAGE
+    assert http_cache.get_text(url) == PAGE  # taze: istek atılmaz
+    assert len(stub_server.seen) == 1
+
+    assert http_cache.get_text(url, max_age=0) == PAGE  # elle yenileme: koşullu istek
+    assert len(stub_server.seen) == 2
+    assert stub_server.seen[1][2].get("If-None-Match") == '"v1"'
+    assert url not in http_cache._inflight
+
+
+def test_max_age_zero_picks_up_changed_page(stub_server):
+    version = {"body": "eski"}
+    stub_server.app = lambda handler: handler.reply(200, version["body"].encode("utf-8"))
+    url = stub_server.url + "/changed"
+
+    assert http_cache.get_text(url) == "eski"
+    version["body"] = "yeni"
+    assert http_cache.get_text(url) == "eski"
+    assert http_cache.get_text(url, max_age=0) == "yeni"
+
+
+def test_stale_entry_is_served_and_revalidated_in_background(stub_server):
+    version = {"body": "eski"}
+    stub_server.app = lambda handler: handler.reply(200, version["body"].encode("utf-8"))
+    url = stub_server.url + "/stale"
+
+    assert http_cache.get_text(url) == "eski"
+    version["body"] = "yeni"
+    _set_validated_at(url, time.time() - http_cache.HTTP_CACHE_TTL - 60)
+
+    assert http_cache.get_text(url) == "eski"  # bayat kayıt beklemeden döner
+    _wait(lambda: url not in http_cache._revalidating and len(stub_server.seen) == 2)
+    assert http_cache.get_text(url) == "yeni"
+    assert len(stub_server.seen) == 2
+    assert url not in http_cache._inflight
+
+
+def test_gzip_response_is_decoded_and_stored_compressed(stub_server):
+    def app(handler):
+        assert "gzip" in handler.headers.get("Accept-Encoding", "")
+        handler.reply(200, gzip.compress(PAGE.encode("utf-8")), {"Content-Encoding": "gzip"})
+    stub_server.app = app
+    url = stub_server.url + "/gzip"
+
+    assert http_cache.get_text(url) == PAGE
+    conn = db.connect()
+    try:
+        size = conn.execute("SELECT size FROM http_cache WHERE url=?", (url,)).fetchone()[0]
+    finally:
+        conn.close()
+    assert size < len(PAGE.encode("utf-8")) / 4
+
+
+def test_error_response_is_not_cached(stub_server):
+    stub_server.app = lambda handler: handler.reply(404, b"yok")
+    url = stub_server.url + "/missing"
+
+    with pytest.raises(http_cache.HTTPError):
+        http_cache.get_text(url)
+    assert http_cache._load(url) is None
+    assert url not in http_cache._inflight
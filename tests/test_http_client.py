@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+import http_client
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Geri çekilme beklemelerini kaydet, gerçekten bekleme"""
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+def _sequence(*statuses, headers=None):
+    remaining = list(statuses)
+
+    def app(handler):
+        handler.reply(remaining.pop(0) if remaining else 200, b"ok", headers)
+    return app
+
+
+def test_retries_retryable_status_then_succeeds(stub_server, sleeps):
+    stub_server.app = _sequence(503, 502)
+    response = http_client.get(stub_server.url + "/retry", retries=2)
+    assert response.status_code == 200
+    assert len(stub_server.seen) == 3
+    assert len(sleeps) == 2
+    assert http_client.metrics()[http_client._host(stub_server.url)]["retries"] == 2
+
+
+def test_gives_up_after_retries_and_returns_last_response(stub_server, sleeps):
+    stub_server.app = _sequence(503, 503, 503, 503)
+    response = http_client.get(stub_server.url + "/down", retries=2)
+    assert response.status_code == 503
+    assert len(stub_server.seen) == 3
+
+
+def test_post_not_retried_on_ambiguous_status(stub_server, sleeps):
+    stub_server.app = _sequence(502)
+    response = http_client.post(stub_server.url + "/post", retries=2)
+    assert response.status_code == 502
+    assert len(stub_server.seen) == 1
+    assert not sleeps
+
+
+def test_backoff_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    assert http_client._backoff(0) == http_client.HTTP_BACKOFF
+    assert http_client._backoff(1) == http_client.HTTP_BACKOFF * 2
+    assert http_client._backoff(30) == http_client.HTTP_BACKOFF_MAX
+    monkeypatch.undo()
+    delays = {http_client._backoff(3) for _ in range(50)}
+    assert len(delays) > 1
+    assert all(0 <= d <= min(http_client.HTTP_BACKOFF_MAX, http_client.HTTP_BACKOFF * 8) for d in delays)
+
+
+def test_retry_after_is_honoured(stub_server, sleeps):
+    stub_server.app = _sequence(429, headers={"Retry-After": "2"})
+    response = http_client.get(stub_server.url + "/limited", retries=1)
+    assert response.status_code == 200
+    assert sleeps == [2.0]
+
+
+def test_retry_after_above_cap_falls_back_to_backoff(stub_server, sleeps):
+    stub_server.app = _sequence(429, headers={"Retry-After": "3600"})
+    http_client.get(stub_server.url + "/limited-long", retries=1)
+    assert sleeps and sleeps[0] <= http_client.HTTP_BACKOFF_MAX
+
+
+def test_breaker_opens_half_opens_and_closes(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "BREAKER_THRESHOLD", 2)
+    monkeypatch.setattr(http_client, "BREAKER_COOLDOWN", 0.2)
+    status = {"code": 500}
+    stub_server.app = lambda handler: handler.reply(status["code"], b"")
+    url = stub_server.url + "/breaker"
+    host = http_client._host(url)
+
+    for _ in range(2):
+        assert http_client.get(url, retries=0).status_code == 500
+    assert http_client.metrics()[host]["breaker"] == "open"
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.get(url, retries=0)
+    assert len(stub_server.seen) == 2
+
+    time.sleep(0.25)
+    assert http_client.metrics()[host]["breaker"] == "half-open"
+    assert http_client.get(url, retries=0).status_code == 500  # başarısız deneme: yeniden açılır
+    with pytest.raises(http_client.CircuitOpenError):
+        http_client.get(url, retries=0)
+
+    time.sleep(0.25)
+    status["code"] = 200
+    assert http_client.get(url, retries=0).status_code == 200
+    assert http_client.metrics()[host]["breaker"] == "closed"
+    assert http_client.get(url, retries=0).status_code == 200
+
+
+def test_probe_released_when_hook_raises(stub_server, monkeypatch):
+    monkeypatch.setattr(http_client, "BREAKER_THRESHOLD", 1)
+    monkeypatch.setattr(http_client, "BREAKER_COOLDOWN", 0.1)
+    status = {"code": 500}
+    stub_server.app = lambda handler: handler.reply(status["code"], b"")
+    url = stub_server.url + "/hook"
+
+    http_client.get(url, retries=0)
+    time.sleep(0.15)
+
+    def broken_hook(response, **kwargs):
+        raise ValueError("hook hatası")
+    with pytest.raises(ValueError):
+        http_client.get(url, retries=0, hooks={"response": broken_hook})
+
+    status["code"] = 200
+    assert http_client.get(url, retries=0).status_code == 200
@@ -0,0 +1,68 @@
+import time
+from datetime import datetime
+
+import pytest
+
+import db
+import login  # noqa: F401 - geçici veritabanında geçişleri uygular
+import pdf_jobs
+import report_variants
+
+
+@pytest.fixture
+def renders(monkeypatch, tmp_path):
+    """PDF üretimini dosya yazan sahte bir işleyiciyle değiştir; çağrıları say"""
+    calls = []
+
+    def materialize_pdf(result, result_hash, kind):
+        calls.append((result_hash, kind))
+        if result.get("fail"):
+            raise RuntimeError("render hatası")
+        path = tmp_path / f"{result_hash}-{kind}.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        return path
+    monkeypatch.setattr(report_variants, "materialize_pdf", materialize_pdf)
+    return calls
+
+
+def _orphan(job_id: str, owner_key: str, result_hash: str, status: str, lease_until):
+    """Ölmüş bir worker'ın bıraktığı iş satırı"""
+    conn = db.connect()
+    try:
+        conn.execute("""INSERT INTO pdf_jobs (job_id, owner_key, kind, result_hash, status, created_at, lease_until)
+            VALUES (?,?,?,?,?,?,?)""", (job_id, owner_key, "main", result_hash, status, datetime.now().isoformat(), lease_until))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_expired_job_is_taken_over(renders):
+    _orphan("orphan-running", "owner-a", "hash-a", pdf_jobs.STATUS_RUNNING, time.time() - 1)
+    job_id = pdf_jobs.ensure("owner-a", "main", {"x": 1}, "hash-a")
+    assert job_id == "orphan-running"
+    job = pdf_jobs.wait(job_id, timeout=5, result={"x": 1})
+    assert job["status"] == pdf_jobs.STATUS_DONE
+    assert renders == [("hash-a", "main")]
+
+
+def test_job_from_before_leases_is_taken_over(renders):
+    _orphan("orphan-legacy", "owner-b", "hash-b", pdf_jobs.STATUS_QUEUED, None)
+    job = pdf_jobs.wait("orphan-legacy", timeout=5, result={"x": 1})
+    assert job["status"] == pdf_jobs.STATUS_DONE
+
+
+def test_live_lease_is_not_taken_over(renders):
+    _orphan("live-job", "owner-c", "hash-c", pdf_jobs.STATUS_RUNNING, time.time() + 60)
+    job = pdf_jobs.wait("live-job", timeout=0.3, result={"x": 1})
+    assert job["status"] == pdf_jobs.STATUS_RUNNING
+    assert not renders
+
+
+def test_failed_job_is_retried_on_next_request(renders):
+    job = pdf_jobs.wait(pdf_jobs.ensure("owner-d", "main", {"fail": True}, "hash-d"), timeout=5)
+    assert job["status"] == pdf_jobs.STATUS_FAILED
+
+    retry_id = pdf_jobs.ensure("owner-d", "main", {"x": 1}, "hash-d")
+    assert retry_id != job["job_id"]
+    assert pdf_jobs.wait(retry_id, timeout=5)["status"] == pdf_jobs.STATUS_DONE
+    assert len(renders) == 2
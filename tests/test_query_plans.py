@@ -0,0 +1,20 @@
+import pytest
+
+import db
+import login
+import migrations
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = tmp_path / "plans.db"
+    migrations.migrate(path)
+    conn = db.connect(path)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize("sql, params", login.HOT_QUERIES, ids=[sql[:60] for sql, _ in login.HOT_QUERIES])
+def test_hot_query_uses_index(conn, sql, params):
+    plan = db.query_plan(conn, sql, params)
+    assert not db.plan_problems(plan), "\n".join(plan)
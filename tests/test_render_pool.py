@@ -0,0 +1,23 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import render_pool
+
+
+def test_slot_held_until_timed_out_render_finishes(monkeypatch, tmp_path):
+    finish = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(render_pool, "HAS_WEASYPRINT", True)
+    monkeypatch.setattr(render_pool, "RENDER_WORKERS", 1)
+    monkeypatch.setattr(render_pool, "RENDER_TIMEOUT", 0.1)
+    monkeypatch.setattr(render_pool, "_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(render_pool, "_get_pool", lambda: pool)
+    monkeypatch.setattr(render_pool, "_render", lambda html, out_path: finish.wait(5))
+
+    assert render_pool.render_pdf("<p>rapor</p>", tmp_path / "a.pdf") is False
+    # Zaman aşımına uğrayan render hâlâ çalışıyor: yeni render yer bulamaz
+    assert render_pool.render_pdf("<p>rapor</p>", tmp_path / "b.pdf") is False
+
+    finish.set()
+    pool.shutdown(wait=True)
+    assert render_pool._slots.acquire(timeout=1)
@@ -0,0 +1,50 @@
+import pytest
+
+import migrations
+import result_store
+
+
+@pytest.fixture
+def backend(tmp_path):
+    path = tmp_path / "results.db"
+    migrations.migrate(path)
+    return result_store.SQLiteResultBackend(path)
+
+
+def test_get_returns_copy_of_cached_entry(backend):
+    store = result_store.ResultStore(backend)
+    store.put("user@x", {"last_result": {"overall": 1}, "result_hash": "h1"})
+    entry = store.get("user@x")
+    entry["result_hash"] = "değişti"
+    entry["extra"] = True
+    assert store.get("user@x")["result_hash"] == "h1"
+    assert "extra" not in store.get("user@x")
+
+
+def test_version_checked_at_most_once_per_interval(backend, monkeypatch):
+    store = result_store.ResultStore(backend)
+    store.put("user@x", {"result_hash": "h1"})
+    calls = []
+    version = backend.version
+    monkeypatch.setattr(backend, "version", lambda key: calls.append(key) or version(key))
+    for _ in range(20):
+        store.get("user@x")
+    assert not calls
+
+    monkeypatch.setattr(result_store, "VERSION_CHECK_INTERVAL", 0)
+    store.get("user@x")
+    assert calls == ["user@x"]
+
+
+def test_other_worker_update_seen_after_interval(backend, monkeypatch):
+    worker_a = result_store.ResultStore(backend)
+    worker_b = result_store.ResultStore(backend)
+    worker_a.put("user@x", {"result_hash": "h1"})
+    assert worker_b.get("user@x")["result_hash"] == "h1"
+    worker_a.put("user@x", {"result_hash": "h2"})
+    assert worker_a.get("user@x")["result_hash"] == "h2"  # kendi yazdığı hemen görülür
+
+    monkeypatch.setattr(result_store, "VERSION_CHECK_INTERVAL", 0)
+    assert worker_b.get("user@x")["result_hash"] == "h2"
+    worker_a.delete("user@x")
+    assert worker_b.get("user@x") == {}
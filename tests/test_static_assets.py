@@ -0,0 +1,43 @@
+import pytest
+
+import static_assets
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    path = tmp_path / "app.0123456789ab.js"
+    for suffix in ("", ".gz", ".br"):
+        path.with_name(path.name + suffix).write_bytes(b"x")
+    return path
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("gzip, deflate", "gzip"),
+    ("br;q=1.0, gzip;q=0.5", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("br;q=0, gzip;q=0", None),
+    ("", None),
+])
+def test_negotiate_honours_q_values(bundle, accept, expected):
+    path, encoding = static_assets.negotiate(bundle, accept)
+    assert encoding == expected
+    assert path.name == bundle.name + {"gzip": ".gz", "br": ".br", None: ""}[expected]
+
+
+def test_failed_build_emits_tag_per_source(monkeypatch):
+    def fail(name):
+        raise OSError("salt okunur")
+    monkeypatch.setattr(static_assets, "_build", fail)
+    monkeypatch.setattr(static_assets, "_manifest", {})
+    tags = static_assets.script_tag("app.js")
+    assert tags.splitlines() == [
+        '<script src="/assets/js/app.js"></script>',
+        '<script src="/assets/js/virtual_table.js"></script>',
+    ]
+    assert all(static_assets.is_source(src) for src in static_assets.BUNDLES["app.js"])
+
+
+def test_built_bundle_is_single_tag(monkeypatch):
+    monkeypatch.setattr(static_assets, "_manifest", {"app.css": "dist/app.0123456789ab.css"})
+    assert static_assets.stylesheet_tag("app.css") == '<link rel="stylesheet" href="/assets/dist/app.0123456789ab.css">'
@@ -2,26 +2,50 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import urllib.parse
-import urllib.request
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from http.cookies import SimpleCookie
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 from datetime import datetime
 import pandas as pd
 
 from engine import compute
 from pdf_report import build_pdf as legacy_pdf
+import http_client
+import outcome_store
+import render_pool
+import report_tables
+import static_assets
 from login import get_user_curriculum, save_user_curriculum, get_course_data
 
 # Claude API Key - SADECE environment variable'dan oku (güvenlik için)
 CLAUDE_API_KEY = os.environ.get("CLAUDE_API_KEY", "")
+# Claude yanıtı için okuma zaman aşımı (saniye) - worker'ı en fazla bu kadar bekletir
+AI_TIMEOUT = float(os.environ.get("AKREDIX_AI_TIMEOUT", "45"))
+
+
+# Render sırasında hata veren isteğe bağlı bölümler (thread başına) - bkz. track_degraded
+_render_state = threading.local()
+
+
+def track_degraded() -> List[str]:
+    """Bu thread'deki sonraki render'da hata veren isteğe bağlı bölümlerin (ör. AI önerileri)
+    adlarını toplayan listeyi başlat ve döndür. Liste boş değilse çıktı kalıcı saklanmamalı:
+    bölüm yedek içerikle (ya da hiç) üretilmiştir, sonraki üretim düzelebilir."""
+    _render_state.degraded = []
+    return _render_state.degraded
+
+
+def _note_degraded(section: str):
+    degraded = getattr(_render_state, "degraded", None)
+    if degraded is not None:
+        degraded.append(section)
 
 
 def generate_ai_suggestions(result: Dict[str, Any]) -> List[str]:
     """Claude API kullanarak detaylı sorun tespiti ve çözüm önerileri üret"""
-    import ssl
     import traceback
     
     # API key kontrolü
@@ -155,35 +179,30 @@ Her öneriyi tek satırda, başında numara ile yaz. SORUN ve ÇÖZÜM etiketler
             ]
         }
         
-        # SSL context - sertifika doğrulamasını esnek yap
-        try:
-            ssl_context = ssl.create_default_context()
-        except Exception as ssl_err:
-            print(f"[Claude AI] SSL context hatası, varsayılan kullanılıyor: {ssl_err}")
-            ssl_context = ssl._create_unverified_context()
+        print(f"[Claude AI] API isteği gönderiliyor: {url}")
         
-        req = urllib.request.Request(
-            url, 
-            data=json.dumps(data).encode('utf-8'),
+        # Paylaşılan oturum: keep-alive bağlantı, sınırlı tekrar, devre kesici (http_client)
+        response = http_client.post(
+            url,
+            json=data,
             headers={
-                'Content-Type': 'application/json',
                 'x-api-key': CLAUDE_API_KEY,
                 'anthropic-version': '2023-06-01'
             },
-            method='POST'
+            timeout=AI_TIMEOUT
         )
-        
-        print(f"[Claude AI] API isteği gönderiliyor: {url}")
-        print(f"[Claude AI] API Key: {CLAUDE_API_KEY[:20]}...")
-        
-        with urllib.request.urlopen(req, timeout=60, context=ssl_context) as response:
-            response_body = response.read().decode('utf-8')
-            print(f"[Claude AI] Yanıt alındı: {len(response_body)} byte")
-            result_json = json.loads(response_body)
+        if response.status_code >= 400:
+            print(f"[Claude AI] HTTP Hatası: {response.status_code} - {response.reason}")
+            print(f"[Claude AI] Hata detayı: {response.text[:1000]}")
+            _note_degraded("ai_suggestions")
+            return None
+        print(f"[Claude AI] Yanıt alındı: {len(response.content)} byte")
+        result_json = response.json()
         
         # Hata kontrolü
         if "error" in result_json:
             print(f"[Claude AI] API Hatası: {result_json['error']}")
+            _note_degraded("ai_suggestions")
             return None
         
         text = result_json.get("content", [{}])[0].get("text", "")
@@ -205,37 +224,22 @@ Her öneriyi tek satırda, başında numara ile yaz. SORUN ve ÇÖZÜM etiketler
         print(f"[Claude AI] ✅ {len(suggestions)} öneri oluşturuldu")
         return suggestions[:8] if suggestions else None
         
-    except urllib.error.HTTPError as e:
-        print(f"[Claude AI] HTTP Hatası: {e.code} - {e.reason}")
-        try:
-            error_body = e.read().decode('utf-8')
-            print(f"[Claude AI] Hata detayı: {error_body}")
-        except:
-            pass
-        return None
-    except urllib.error.URLError as e:
-        print(f"[Claude AI] URL/Network Hatası: {e.reason}")
+    except http_client.CircuitOpenError as e:
+        print(f"[Claude AI] İstek atılmadı: {e}")
+        _note_degraded("ai_suggestions")
         return None
-    except ssl.SSLError as e:
-        print(f"[Claude AI] SSL Hatası: {e}")
-        # SSL hatası durumunda sertifika doğrulamasız dene
-        try:
-            print("[Claude AI] SSL doğrulamasız tekrar deneniyor...")
-            ssl_context = ssl._create_unverified_context()
-            with urllib.request.urlopen(req, timeout=60, context=ssl_context) as response:
-                result_json = json.loads(response.read().decode('utf-8'))
-            text = result_json.get("content", [{}])[0].get("text", "")
-            suggestions = [line.strip() for line in text.strip().split('\n') if line.strip() and len(line.strip()) > 20]
-            return suggestions[:8] if suggestions else None
-        except Exception as retry_err:
-            print(f"[Claude AI] SSL bypass da başarısız: {retry_err}")
-            return None
     except json.JSONDecodeError as e:
         print(f"[Claude AI] JSON Parse Hatası: {e}")
+        _note_degraded("ai_suggestions")
+        return None
+    except OSError as e:  # requests ağ hataları (bağlantı, zaman aşımı) OSError'dan türer
+        print(f"[Claude AI] Ağ Hatası: {type(e).__name__}: {e}")
+        _note_degraded("ai_suggestions")
         return None
     except Exception as e:
         print(f"[Claude AI] Beklenmeyen Hata: {type(e).__name__}: {e}")
         traceback.print_exc()
+        _note_degraded("ai_suggestions")
         return None
 
 
@@ -264,7 +268,7 @@ FORM_KEYS = [
 # MODERN TASARIM - CSS + JavaScript
 # =============================================================================
 
-HTML_HEAD = """<!doctype html>
+HTML_HEAD = f"""<!doctype html>
 <html lang="tr">
 <head>
   <meta charset="utf-8"/>
@@ -272,824 +276,7 @@ HTML_HEAD = """<!doctype html>
   <link rel="icon" type="image/png" href="/assets/logo.png">
   <title>AkrediX</title>
   <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=JetBrains+Mono:wght@400&display=swap" rel="stylesheet">
-  <style>
-    * { margin: 0; padding: 0; box-sizing: border-box; }
-    
-    :root {
-      --primary: #4f46e5;
-      --primary-light: #6366f1;
-      --secondary: #7c3aed;
-      --success: #059669;
-      --success-bg: #ecfdf5;
-      --warning: #d97706;
-      --warning-bg: #fffbeb;
-      --danger: #dc2626;
-      --danger-bg: #fef2f2;
-      --bg: #f1f5f9;
-      --bg-card: #ffffff;
-      --border: #e2e8f0;
-      --text: #1e293b;
-      --text-secondary: #475569;
-      --text-muted: #94a3b8;
-    }
-    
-    body {
-      font-family: 'Inter', -apple-system, sans-serif;
-      background: var(--bg);
-      min-height: 100vh;
-      color: var(--text);
-    }
-    
-    /* Header */
-    .main-header {
-      background: var(--primary);
-      color: white;
-    }
-    
-    .header-content {
-      max-width: 1800px;
-      margin: 0 auto;
-      padding: 1rem 2rem;
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-    }
-    
-    .header-brand { display: flex; align-items: center; gap: 1rem; }
-    
-    .brand-logo {
-      width: 44px; height: 44px;
-      background: white;
-      border-radius: 10px;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-    }
-    
-    .brand-logo img { width: 75%; height: 75%; object-fit: contain; }
-    .brand-text h1 { font-size: 1rem; font-weight: 600; }
-    .brand-text span { font-size: 0.75rem; opacity: 0.9; }
-    
-    .header-user { display: flex; align-items: center; gap: 1rem; }
-    .user-info { text-align: right; }
-    .user-info .name { font-size: 0.9rem; font-weight: 500; }
-    .user-info .details { font-size: 0.75rem; opacity: 0.85; }
-    
-    .user-avatar {
-      width: 40px; height: 40px;
-      background: white;
-      color: var(--primary);
-      border-radius: 50%;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      font-weight: 700;
-    }
-    
-    .header-actions { display: flex; gap: 0.5rem; }
-    
-    .header-btn {
-      padding: 0.5rem 1rem;
-      border-radius: 8px;
-      font-size: 0.8rem;
-      font-weight: 500;
-      text-decoration: none;
-      transition: all 0.2s;
-    }
-    
-    .header-btn-ghost { background: rgba(255,255,255,0.15); color: white; }
-    .header-btn-ghost:hover { background: rgba(255,255,255,0.25); }
-    .header-btn-success { background: #10b981; color: white; }
-    .header-btn-success:hover { background: #059669; }
-    .header-btn-danger { background: white; color: var(--danger); }
-    
-    /* Container */
-    .container { max-width: 1800px; margin: 0 auto; padding: 1.5rem 2rem; }
-    
-    .grid {
-      display: grid;
-      grid-template-columns: 580px 1fr;
-      gap: 1.5rem;
-      align-items: start;
-    }
-    
-    @media (max-width: 1200px) { .grid { grid-template-columns: 1fr; } }
-    
-    /* Box */
-    .box {
-      background: var(--bg-card);
-      border: 1px solid var(--border);
-      border-radius: 12px;
-      box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-    }
-    
-    .box > h2:first-child {
-      padding: 1.25rem 1.5rem;
-      font-size: 0.95rem;
-      font-weight: 600;
-      background: linear-gradient(to right, #f8fafc, #f1f5f9);
-      border-bottom: 1px solid var(--border);
-      border-radius: 12px 12px 0 0;
-    }
-    
-    .box-body { padding: 1.5rem; }
-    
-    /* Tabs */
-    .tabs {
-      display: flex;
-      background: #f8fafc;
-      border-radius: 8px;
-      padding: 4px;
-      margin-bottom: 1.25rem;
-      gap: 4px;
-    }
-    
-    .tab {
-      flex: 1;
-      padding: 0.65rem 1rem;
-      border: none;
-      background: transparent;
-      cursor: pointer;
-      font-size: 0.8rem;
-      font-weight: 500;
-      color: var(--text-muted);
-      border-radius: 6px;
-      transition: all 0.15s;
-    }
-    
-    .tab:hover { color: var(--text-secondary); background: white; }
-    .tab.active { background: var(--primary); color: white; }
-    
-    .tab-content { display: none; }
-    .tab-content.active { display: block; }
-    
-    /* Section Title */
-    .section-title {
-      font-size: 0.85rem;
-      font-weight: 600;
-      color: var(--primary);
-      margin: 1.5rem 0 1rem 0;
-      padding-bottom: 0.5rem;
-      border-bottom: 2px solid var(--border);
-    }
-    
-    .section-title:first-child { margin-top: 0; }
-    
-    /* Forms */
-    label {
-      display: block;
-      font-size: 0.8rem;
-      font-weight: 600;
-      color: var(--text-secondary);
-      margin-bottom: 0.4rem;
-      margin-top: 1rem;
-    }
-    
-    label:first-child { margin-top: 0; }
-    
-    input[type="text"], input[type="number"], textarea, select {
-      width: 100%;
-      padding: 0.75rem 1rem;
-      background: #f8fafc;
-      border: 1px solid var(--border);
-      border-radius: 8px;
-      font-size: 0.9rem;
-      font-family: inherit;
-      color: var(--text);
-      transition: border-color 0.15s, box-shadow 0.15s;
-    }
-    
-    input:focus, textarea:focus, select:focus {
-      outline: none;
-      border-color: var(--primary);
-      box-shadow: 0 0 0 3px rgba(79, 70, 229, 0.1);
-      background: white;
-    }
-    
-    input::placeholder, textarea::placeholder { color: var(--text-muted); }
-    
-    textarea {
-      font-family: 'JetBrains Mono', monospace;
-      font-size: 0.8rem;
-      min-height: 90px;
-      resize: vertical;
-    }
-    
-    .helper { font-size: 0.75rem; color: var(--text-muted); margin-top: 0.35rem; }
-    
-    /* Buttons */
-    .btn {
-      display: inline-flex;
-      align-items: center;
-      justify-content: center;
-      gap: 0.5rem;
-      padding: 0.75rem 1.25rem;
-      font-size: 0.85rem;
-      font-weight: 600;
-      border-radius: 8px;
-      cursor: pointer;
-      transition: all 0.15s;
-      text-decoration: none;
-      border: none;
-      font-family: inherit;
-    }
-    
-    .btn-primary { background: var(--primary); color: white; }
-    .btn-primary:hover { background: var(--primary-light); }
-    
-    .btn-accent { background: var(--warning); color: white; }
-    .btn-success { background: var(--success); color: white; }
-    .btn-purple { background: var(--secondary); color: white; }
-    .btn-secondary { background: #f1f5f9; color: var(--text-secondary); border: 1px solid var(--border); }
-    .btn-danger { background: var(--danger); color: white; }
-    .btn-sm { padding: 0.5rem 0.875rem; font-size: 0.8rem; }
-    .btn-group { display: flex; gap: 0.75rem; flex-wrap: wrap; margin-top: 1.25rem; padding-top: 1.25rem; border-top: 1px solid var(--border); }
-    
-    /* Badges */
-    .badge { display: inline-flex; padding: 0.25rem 0.625rem; border-radius: 6px; font-size: 0.75rem; font-weight: 600; }
-    .badge-success { background: var(--success-bg); color: var(--success); }
-    .badge-warning { background: var(--warning-bg); color: var(--warning); }
-    .badge-danger { background: var(--danger-bg); color: var(--danger); }
-    
-    /* Tables */
-    table { width: 100%; border-collapse: collapse; font-size: 0.85rem; }
-    
-    th {
-      padding: 0.75rem 1rem;
-      text-align: left;
-      font-size: 0.75rem;
-      font-weight: 600;
-      color: var(--text-secondary);
-      background: #f8fafc;
-      border-bottom: 2px solid var(--border);
-    }
-    
-    td { padding: 0.75rem 1rem; border-bottom: 1px solid var(--border); }
-    tr:hover td { background: #f8fafc; }
-    
-    tr.row-success td { background: var(--success-bg); border-left: 3px solid var(--success); }
-    tr.row-warning td { background: var(--warning-bg); border-left: 3px solid var(--warning); }
-    tr.row-danger td { background: var(--danger-bg); border-left: 3px solid var(--danger); }
-    tr.total td { background: #f1f5f9; font-weight: 600; color: var(--primary); }
-    
-    /* Checkbox Items */
-    .checkbox-group { margin-bottom: 1rem; }
-    .checkbox-list { display: flex; flex-wrap: wrap; gap: 0.5rem; }
-    
-    .cb-item {
-      display: inline-flex;
-      align-items: center;
-      gap: 0.35rem;
-      padding: 0.4rem 0.75rem;
-      background: #f8fafc;
-      border: 1px solid var(--border);
-      border-radius: 6px;
-      cursor: pointer;
-      font-size: 0.8rem;
-      color: var(--text-secondary);
-      transition: all 0.15s;
-    }
-    
-    .cb-item:hover { border-color: var(--primary); }
-    .cb-item.selected { background: var(--primary); border-color: var(--primary); color: white; }
-    
-    .cb-box { width: 16px; height: 16px; border: 2px solid currentColor; border-radius: 4px; display: flex; align-items: center; justify-content: center; font-size: 0.65rem; }
-    .cb-item.selected .cb-box { background: white; color: var(--primary); }
-    
-    /* Questions */
-    .question-card { border: 1px solid var(--border); border-radius: 10px; margin-bottom: 1rem; background: white; }
-    
-    .question-header {
-      display: flex;
-      justify-content: space-between;
-      align-items: center;
-      padding: 1.25rem 1.5rem;
-      background: #f8fafc;
-      cursor: pointer;
-      border-radius: 10px 10px 0 0;
-      border-bottom: 1px solid var(--border);
-    }
-    
-    .question-title { font-weight: 600; font-size: 0.9rem; display: flex; align-items: center; gap: 0.75rem; }
-    
-    .question-num {
-      background: var(--primary);
-      color: white;
-      width: 28px; height: 28px;
-      border-radius: 8px;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      font-size: 0.8rem;
-    }
-    
-    .question-body { padding: 1.5rem; }
-    .question-body.collapsed { display: none; }
-    .question-row { display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-bottom: 1rem; }
-    .question-checkboxes { display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; margin-top: 1rem; padding-top: 1rem; border-top: 1px solid var(--border); }
-    
-    /* Mappings */
-    .mapping-card { border: 1px solid var(--border); border-radius: 10px; margin-bottom: 1rem; }
-    .mapping-card h4 { padding: 0.875rem 1rem; background: #f8fafc; font-size: 0.85rem; border-bottom: 1px solid var(--border); border-radius: 10px 10px 0 0; }
-    .mapping-content { padding: 1rem; }
-    .mapping-row { display: flex; gap: 1rem; padding: 0.625rem 0; border-bottom: 1px solid var(--border); }
-    .mapping-row:last-child { border-bottom: none; }
-    .mapping-source { min-width: 70px; font-weight: 600; color: var(--primary); }
-    .mapping-targets { flex: 1; display: flex; flex-wrap: wrap; gap: 0.35rem; }
-    
-    /* Stats */
-    .stats-grid { display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; margin-bottom: 1.25rem; }
-    
-    .stat-card {
-      background: #f8fafc;
-      border: 1px solid var(--border);
-      border-radius: 10px;
-      padding: 1.5rem;
-      text-align: center;
-    }
-    
-    .stat-value { font-size: 1.75rem; font-weight: 700; color: var(--primary); }
-    .stat-label { font-size: 0.7rem; color: var(--text-muted); margin-top: 0.25rem; text-transform: uppercase; }
-    
-    /* Collapsible */
-    h2.collapsible {
-      padding: 1.25rem 1.5rem;
-      background: #f8fafc;
-      font-size: 0.9rem;
-      font-weight: 600;
-      cursor: pointer;
-      display: flex;
-      align-items: center;
-      gap: 0.5rem;
-      border-bottom: 1px solid var(--border);
-    }
-    
-    h2.collapsible:hover { background: #f1f5f9; }
-    h2.collapsible::before { content: "▼"; font-size: 0.65rem; color: var(--primary); }
-    h2.collapsible.collapsed::before { transform: rotate(-90deg); }
-    .collapsible-content { padding: 1.5rem; }
-    
-    /* Progress */
-    .progress-bar { height: 8px; background: var(--border); border-radius: 4px; overflow: hidden; }
-    .progress-fill { height: 100%; border-radius: 4px; }
-    
-    /* Alerts */
-    .alert { padding: 1.25rem 1.5rem; border-radius: 8px; margin-bottom: 1rem; font-size: 0.85rem; }
-    .alert-success { background: var(--success-bg); color: var(--success); }
-    .alert-warning { background: var(--warning-bg); color: var(--warning); }
-    .alert-danger { background: var(--danger-bg); color: var(--danger); }
-    .alert-info { background: #eff6ff; color: #1d4ed8; }
-    .alert-error { background: var(--danger-bg); color: var(--danger); }
-    
-    /* Empty State */
-    .empty-state { text-align: center; padding: 4rem 2rem; }
-    .empty-state-icon { font-size: 3rem; margin-bottom: 1rem; opacity: 0.3; }
-    .empty-state h3 { color: var(--text-muted); }
-    
-    /* Helpers */
-    .text-muted { color: var(--text-muted); }
-    .text-success { color: var(--success); }
-    .text-warning { color: var(--warning); }
-    .text-danger { color: var(--danger); }
-    
-    .add-question-btn {
-      width: 100%;
-      padding: 1rem;
-      border: 2px dashed var(--border);
-      border-radius: 10px;
-      background: transparent;
-      color: var(--text-muted);
-      cursor: pointer;
-      font-size: 0.9rem;
-      font-weight: 500;
-    }
-    
-    .add-question-btn:hover { border-color: var(--primary); color: var(--primary); background: #f8fafc; }
-    
-    .questions-summary {
-      display: flex;
-      justify-content: space-between;
-      padding: 1.25rem 1.5rem;
-      background: #f8fafc;
-      border-radius: 8px;
-      margin-bottom: 1rem;
-    }
-    
-    .questions-summary .count { color: var(--primary); font-weight: 700; }
-    .result-panel .box { margin-bottom: 1rem; }
-    
-    /* Renkli Satır Stilleri */
-    tr.row-success td { background: #ecfdf5; border-left: 4px solid #059669; }
-    tr.row-warning td { background: #fffbeb; border-left: 4px solid #d97706; }
-    tr.row-danger td { background: #fef2f2; border-left: 4px solid #dc2626; }
-    
-    /* Stat value renkleri */
-    .stat-value.success { color: #059669; }
-    .stat-value.warning { color: #d97706; }
-    .stat-value.danger { color: #dc2626; }
-    
-    /* Check list */
-    .check-list { list-style: none; padding: 0; margin: 0; }
-    .check-list li { 
-      display: flex; 
-      gap: 1rem; 
-      padding: 1rem; 
-      border-bottom: 1px solid var(--border);
-      background: #fefce8;
-    }
-    .check-list li:last-child { border-bottom: none; }
-    .check-list .icon { font-size: 1.25rem; flex-shrink: 0; }
-    
-    /* Progress bars with colors */
-    .progress-fill.success { background: #059669; }
-    .progress-fill.warning { background: #d97706; }
-    .progress-fill.danger { background: #dc2626; }
-    
-    /* Table hover daha belirgin */
-    table { background: white; }
-    tr:hover td { background: #f1f5f9 !important; }
-    
-    /* Badge daha belirgin */
-    .badge { font-weight: 700; padding: 0.35rem 0.75rem; }
-    
-    /* ============ LOADING SPINNER ============ */
-    .loading-overlay {
-      display: none;
-      position: fixed;
-      top: 0; left: 0; right: 0; bottom: 0;
-      background: rgba(15, 23, 42, 0.7);
-      z-index: 9999;
-      justify-content: center;
-      align-items: center;
-      flex-direction: column;
-      gap: 1.5rem;
-    }
-    
-    .loading-overlay.active { display: flex; }
-    
-    .spinner {
-      width: 56px; height: 56px;
-      border: 4px solid rgba(255,255,255,0.2);
-      border-top-color: var(--primary-light);
-      border-radius: 50%;
-      animation: spin 0.8s linear infinite;
-    }
-    
-    @keyframes spin {
-      to { transform: rotate(360deg); }
-    }
-    
-    .loading-text {
-      color: white;
-      font-size: 1rem;
-      font-weight: 500;
-    }
-    
-    .loading-progress {
-      width: 200px;
-      height: 6px;
-      background: rgba(255,255,255,0.2);
-      border-radius: 3px;
-      overflow: hidden;
-    }
-    
-    .loading-progress-bar {
-      height: 100%;
-      background: var(--primary-light);
-      width: 0%;
-      animation: progress 2s ease-in-out infinite;
-    }
-    
-    @keyframes progress {
-      0% { width: 0%; }
-      50% { width: 70%; }
-      100% { width: 100%; }
-    }
-    
-    /* ============ TOOLTIP ============ */
-    .tooltip-container { position: relative; display: inline-block; }
-    
-    .tooltip-icon {
-      display: inline-flex;
-      align-items: center;
-      justify-content: center;
-      width: 16px; height: 16px;
-      background: var(--border);
-      color: var(--text-muted);
-      border-radius: 50%;
-      font-size: 0.65rem;
-      font-weight: 700;
-      cursor: help;
-      margin-left: 0.35rem;
-      vertical-align: middle;
-    }
-    
-    .tooltip-icon:hover { background: var(--primary); color: white; }
-    
-    .tooltip-content {
-      visibility: hidden;
-      opacity: 0;
-      position: absolute;
-      bottom: calc(100% + 8px);
-      left: 50%;
-      transform: translateX(-50%);
-      background: #1e293b;
-      color: white;
-      padding: 0.75rem 1rem;
-      border-radius: 8px;
-      font-size: 0.8rem;
-      font-weight: 400;
-      width: 280px;
-      z-index: 1000;
-      box-shadow: 0 4px 12px rgba(0,0,0,0.2);
-      transition: opacity 0.2s, visibility 0.2s;
-      line-height: 1.5;
-    }
-    
-    .tooltip-content::after {
-      content: '';
-      position: absolute;
-      top: 100%;
-      left: 50%;
-      transform: translateX(-50%);
-      border: 6px solid transparent;
-      border-top-color: #1e293b;
-    }
-    
-    .tooltip-container:hover .tooltip-content {
-      visibility: visible;
-      opacity: 1;
-    }
-    
-    /* ============ FORM VALIDATION ============ */
-    .field-error {
-      color: var(--danger);
-      font-size: 0.75rem;
-      margin-top: 0.25rem;
-      display: none;
-    }
-    
-    .field-error.show { display: block; }
-    
-    input.input-error, textarea.input-error, select.input-error {
-      border-color: var(--danger) !important;
-      background: #fef2f2 !important;
-    }
-    
-    input.input-success, textarea.input-success {
-      border-color: var(--success) !important;
-    }
-    
-    /* ============ AUTO-SAVE INDICATOR ============ */
-    .autosave-status {
-      display: flex;
-      align-items: center;
-      gap: 0.5rem;
-      font-size: 0.75rem;
-      color: var(--text-muted);
-      padding: 0.5rem 0;
-    }
-    
-    .autosave-dot {
-      width: 8px; height: 8px;
-      border-radius: 50%;
-      background: var(--border);
-    }
-    
-    .autosave-dot.saving { background: var(--warning); animation: pulse 1s infinite; }
-    .autosave-dot.saved { background: var(--success); }
-    .autosave-dot.error { background: var(--danger); }
-    
-    @keyframes pulse {
-      0%, 100% { opacity: 1; }
-      50% { opacity: 0.5; }
-    }
-    
-    /* ============ SIDEBAR (Taslak & Rapor Geçmişi) ============ */
-    .sidebar-panel {
-      background: var(--bg-card);
-      border: 1px solid var(--border);
-      border-radius: 12px;
-      margin-bottom: 1rem;
-      overflow: hidden;
-    }
-    
-    .sidebar-header {
-      padding: 1rem 1.25rem;
-      background: linear-gradient(to right, #f8fafc, #f1f5f9);
-      border-bottom: 1px solid var(--border);
-      font-weight: 600;
-      font-size: 0.9rem;
-      display: flex;
-      align-items: center;
-      gap: 0.5rem;
-      cursor: pointer;
-    }
-    
-    .sidebar-header:hover { background: #f1f5f9; }
-    
-    .sidebar-header .toggle-icon {
-      margin-left: auto;
-      transition: transform 0.2s;
-    }
-    
-    .sidebar-header.collapsed .toggle-icon { transform: rotate(-90deg); }
-    
-    .sidebar-body { padding: 0.75rem; }
-    .sidebar-body.collapsed { display: none; }
-    
-    .sidebar-item {
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-      padding: 0.75rem;
-      border-radius: 8px;
-      cursor: pointer;
-      transition: background 0.15s;
-      margin-bottom: 0.25rem;
-    }
-    
-    .sidebar-item:hover { background: #f8fafc; }
-    
-    .sidebar-item-info { flex: 1; min-width: 0; }
-    .sidebar-item-title { font-size: 0.85rem; font-weight: 500; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
-    .sidebar-item-meta { font-size: 0.7rem; color: var(--text-muted); margin-top: 0.15rem; }
-    
-    .sidebar-item-pct {
-      font-size: 0.8rem;
-      font-weight: 700;
-      padding: 0.25rem 0.5rem;
-      border-radius: 6px;
-      margin-left: 0.5rem;
-    }
-    
-    .sidebar-item-pct.success { background: var(--success-bg); color: var(--success); }
-    .sidebar-item-pct.warning { background: var(--warning-bg); color: var(--warning); }
-    .sidebar-item-pct.danger { background: var(--danger-bg); color: var(--danger); }
-    
-    .sidebar-item-actions {
-      display: flex;
-      gap: 0.25rem;
-      opacity: 0;
-      transition: opacity 0.15s;
-    }
-    
-    .sidebar-item:hover .sidebar-item-actions { opacity: 1; }
-    
-    .sidebar-action-btn {
-      width: 28px; height: 28px;
-      border: none;
-      background: transparent;
-      cursor: pointer;
-      border-radius: 6px;
-      display: flex;
-      align-items: center;
-      justify-content: center;
-      font-size: 0.8rem;
-    }
-    
-    .sidebar-action-btn:hover { background: var(--border); }
-    .sidebar-action-btn.delete:hover { background: var(--danger-bg); color: var(--danger); }
-    
-    .sidebar-empty {
-      text-align: center;
-      padding: 1.5rem;
-      color: var(--text-muted);
-      font-size: 0.85rem;
-    }
-    
-    /* ============ SAVE DRAFT MODAL ============ */
-    .modal-overlay {
-      display: none;
-      position: fixed;
-      top: 0; left: 0; right: 0; bottom: 0;
-      background: rgba(15, 23, 42, 0.5);
-      z-index: 9998;
-      justify-content: center;
-      align-items: center;
-    }
-    
-    .modal-overlay.active { display: flex; }
-    
-    .modal {
-      background: white;
-      border-radius: 16px;
-      width: 100%;
-      max-width: 400px;
-      box-shadow: 0 25px 50px rgba(0,0,0,0.25);
-      animation: modalIn 0.2s ease;
-    }
-    
-    @keyframes modalIn {
-      from { opacity: 0; transform: scale(0.95); }
-      to { opacity: 1; transform: scale(1); }
-    }
-    
-    .modal-header {
-      padding: 1.25rem 1.5rem;
-      border-bottom: 1px solid var(--border);
-      font-weight: 600;
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-    }
-    
-    .modal-close {
-      background: none;
-      border: none;
-      font-size: 1.25rem;
-      cursor: pointer;
-      color: var(--text-muted);
-    }
-    
-    .modal-body { padding: 1.5rem; }
-    
-    .modal-footer {
-      padding: 1rem 1.5rem;
-      border-top: 1px solid var(--border);
-      display: flex;
-      gap: 0.75rem;
-      justify-content: flex-end;
-    }
-    
-    /* Mapping Table Stilleri */
-    .mapping-table-container {
-      overflow-x: auto;
-      margin-bottom: 1rem;
-    }
-    .mapping-table {
-      width: 100%;
-      border-collapse: collapse;
-      font-size: 0.8rem;
-      min-width: 600px;
-    }
-    .mapping-table th, .mapping-table td {
-      padding: 0.5rem;
-      border: 1px solid var(--border);
-      text-align: center;
-    }
-    .mapping-table th {
-      background: #1e3a5f;
-      color: white;
-      font-weight: 600;
-      white-space: nowrap;
-    }
-    .mapping-table th.row-header {
-      background: #475569;
-      text-align: left;
-      min-width: 120px;
-    }
-    .mapping-table td.row-label {
-      background: var(--bg);
-      font-weight: 500;
-      text-align: left;
-    }
-    .mapping-table input[type="checkbox"] {
-      width: 18px;
-      height: 18px;
-      cursor: pointer;
-      accent-color: #667eea;
-    }
-    .mapping-table tr:hover td {
-      background: rgba(102, 126, 234, 0.05);
-    }
-    .mapping-group-header {
-      background: #1e293b !important;
-      color: #94a3b8 !important;
-      font-size: 0.75rem;
-      text-transform: uppercase;
-      letter-spacing: 0.5px;
-    }
-    
-    /* Tablo Checkbox Stilleri (Sorular Sekmesi) */
-    .table-cb-row {
-      display: flex;
-      flex-wrap: wrap;
-      gap: 0.35rem;
-    }
-    .table-cb {
-      display: inline-flex;
-      align-items: center;
-      gap: 0.25rem;
-      padding: 0.3rem 0.6rem;
-      background: var(--bg);
-      border: 2px solid var(--border);
-      border-radius: 6px;
-      cursor: pointer;
-      font-size: 0.75rem;
-      font-weight: 600;
-      transition: all 0.15s;
-      user-select: none;
-    }
-    .table-cb input { display: none; }
-    .table-cb span { color: var(--text); }
-    .table-cb:hover { border-color: var(--cb-color, #667eea); }
-    .table-cb.selected {
-      background: var(--cb-color, #667eea);
-      border-color: var(--cb-color, #667eea);
-    }
-    .table-cb.selected span { color: white; }
-  </style>
+  {static_assets.stylesheet_tag("app.css")}
   <script src="https://cdnjs.cloudflare.com/ajax/libs/xlsx/0.18.5/xlsx.full.min.js"></script>
 </head>
 <body>
@@ -1152,1809 +339,132 @@ HTML_HEAD = """<!doctype html>
 <div class="container">
 """
 
-HTML_FOOT = """
+HTML_FOOT = f"""
 </div>
 
 <!-- Nasıl Hesaplanıyor Modal -->
 <div id="helpModal" style="display:none; position:fixed; top:0; left:0; right:0; bottom:0; background:rgba(0,0,0,0.7); z-index:9999; overflow:auto;">
-  <div style="background:var(--card); max-width:900px; margin:2rem auto; border-radius:16px; max-height:90vh; overflow:auto; box-shadow:0 25px 50px rgba(0,0,0,0.5);">
-    <div style="background:linear-gradient(135deg,#667eea,#764ba2); padding:1.5rem 2rem; border-radius:16px 16px 0 0; display:flex; justify-content:space-between; align-items:center;">
-      <h2 style="margin:0; color:white; font-size:1.5rem;">📖 Nasıl Hesaplanıyor?</h2>
-      <button onclick="closeHelpModal()" style="background:rgba(255,255,255,0.2); border:none; color:white; width:36px; height:36px; border-radius:50%; cursor:pointer; font-size:1.2rem;">✕</button>
-    </div>
-    <div style="padding:2rem; color:var(--text);">
-      
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#667eea; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📊 Genel Başarı Oranı</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #667eea;">
-          <p><strong>Formül:</strong></p>
-          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
-            Genel Başarı = (Tüm Öğrencilerin Başarı %'lerinin Toplamı) / Öğrenci Sayısı
-          </div>
-          <p style="margin-top:0.75rem;"><strong>Her Öğrencinin Başarısı:</strong></p>
-          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
-            Öğrenci Başarı % = (Aldığı Toplam Puan / Maksimum Puan) × 100
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: 3 öğrenci var. Başarıları: %80, %65, %72. Genel Başarı = (80+65+72)/3 = %72.3</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#10b981; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📚 DÖÇ (Ders Öğrenme Çıktısı) Başarısı</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #10b981;">
-          <p><strong>Adım 1:</strong> Her sorunun hangi DÖÇ'ü ölçtüğü belirlenir (Soru Eşleştirme)</p>
-          <p><strong>Adım 2:</strong> O DÖÇ'e ait tüm sorulardan öğrencilerin aldığı puanlar toplanır</p>
-          <p><strong>Adım 3:</strong> Maksimum alınabilecek puana bölünür</p>
-          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
-            DÖÇ-1 Başarı = Σ(DÖÇ-1 sorularından alınan puanlar) / Σ(DÖÇ-1 sorularının max puanları) × 100
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: DÖÇ-1'i ölçen S1(20p), S3(30p), S5(10p) var. Sınıf ortalaması: S1=15, S3=22, S5=8 puan. DÖÇ-1 = (15+22+8)/(20+30+10) = 45/60 = %75</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#8b5cf6; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🎯 PÖÇ (Program Öğrenme Çıktısı) Başarısı</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #8b5cf6;">
-          <p><strong>Adım 1:</strong> Her DÖÇ'ün hangi PÖÇ'e katkı sağladığı belirlenir (DÖÇ-PÖÇ Ağırlıkları)</p>
-          <p><strong>Adım 2:</strong> Ağırlıklı ortalama hesaplanır</p>
-          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
-            PÖÇ-1 Başarı = Σ(DÖÇ_başarısı × Ağırlık) / Σ(Ağırlıklar)
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: PÖÇ-1'e DÖÇ-1(%75, ağırlık:2) ve DÖÇ-2(%60, ağırlık:1) katkı yapıyor. PÖÇ-1 = (75×2 + 60×1)/(2+1) = 210/3 = %70</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#f59e0b; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🧠 Bloom Taksonomisi Başarısı</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #f59e0b;">
-          <p><strong>Düzeyler:</strong> Bilgi (Hatırlama) → Kavrama (Anlama) → Uygulama → Analiz → Sentez → Değerlendirme</p>
-          <p style="margin-top:0.5rem;"><strong>Hesaplama:</strong> Her düzeye ait soruların başarı ortalaması</p>
-          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
-            Uygulama Başarı = Σ(Uygulama düzeyi sorularından alınan) / Σ(Uygulama düzeyi max puanlar) × 100
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Üst düzey (Analiz, Sentez, Değerlendirme) düşük ise → Öğrenciler ezberleme yapıyor, derin öğrenme eksik</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#06b6d4; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📝 Harf Notu Hesaplama</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #06b6d4;">
-          <p><strong>Mutlak Değerlendirme Sistemi:</strong></p>
-          <div style="display:grid; grid-template-columns:repeat(auto-fit, minmax(80px, 1fr)); gap:0.5rem; margin-top:0.75rem;">
-            <span style="background:#10b981; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">AA: 90-100</span>
-            <span style="background:#22c55e; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">BA: 85-89</span>
-            <span style="background:#84cc16; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">BB: 75-84</span>
-            <span style="background:#eab308; color:black; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">CB: 65-74</span>
-            <span style="background:#f59e0b; color:black; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">CC: 55-64</span>
-            <span style="background:#f97316; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">DC: 50-54</span>
-            <span style="background:#ef4444; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">DD: 45-49</span>
-            <span style="background:#dc2626; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">FD: 40-44</span>
-            <span style="background:#991b1b; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">FF: 0-39</span>
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Not aralıkları Profil sayfasından özelleştirilebilir.</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:2rem;">
-        <h3 style="color:#ef4444; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">✅ Akreditasyon Başarı Kriterleri</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #ef4444;">
-          <div style="display:grid; grid-template-columns:repeat(3, 1fr); gap:1rem; margin-top:0.5rem;">
-            <div style="text-align:center; padding:0.75rem; background:#10b98122; border-radius:8px;">
-              <div style="font-size:1.5rem;">✓</div>
-              <div style="color:#10b981; font-weight:bold;">Sağlandı</div>
-              <div style="color:#94a3b8; font-size:0.85rem;">≥ %70</div>
-            </div>
-            <div style="text-align:center; padding:0.75rem; background:#f59e0b22; border-radius:8px;">
-              <div style="font-size:1.5rem;">⚠</div>
-              <div style="color:#f59e0b; font-weight:bold;">Kısmen</div>
-              <div style="color:#94a3b8; font-size:0.85rem;">%50 - %69</div>
-            </div>
-            <div style="text-align:center; padding:0.75rem; background:#ef444422; border-radius:8px;">
-              <div style="font-size:1.5rem;">✗</div>
-              <div style="color:#ef4444; font-weight:bold;">Sağlanmadı</div>
-              <div style="color:#94a3b8; font-size:0.85rem;">< %50</div>
-            </div>
-          </div>
-          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Bu eşik değerleri akreditasyon kurumu gereksinimlerine göre Profil'den ayarlanabilir.</em></p>
-        </div>
-      </div>
-
-      <div style="margin-bottom:1rem;">
-        <h3 style="color:#3b82f6; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🤖 AI Destekli Sistem Önerileri</h3>
-        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #3b82f6;">
-          <p><strong>Yapay zeka şunları analiz eder:</strong></p>
-          <ul style="margin:0.5rem 0 0 1.5rem; color:#94a3b8;">
-            <li>Başarısız DÖÇ, PÖÇ ve PEA'ları tespit eder</li>
-            <li>Bloom taksonomisi eksikliklerini belirler</li>
-            <li>Ölçülmemiş veya az ölçülmüş çıktıları saptar</li>
-            <li>Her sorun için spesifik çözüm önerisi sunar</li>
-            <li>Acil müdahale gerektiren alanları vurgular</li>
-          </ul>
-        </div>
-      </div>
-
-    </div>
-  </div>
-</div>
-
-<script>
-// Newline karakteri için sabit (Python escape sorunlarını önler)
-const NL = String.fromCharCode(10);
-
-function openHelpModal() {
-  document.getElementById('helpModal').style.display = 'block';
-  document.body.style.overflow = 'hidden';
-}
-function closeHelpModal() {
-  document.getElementById('helpModal').style.display = 'none';
-  document.body.style.overflow = 'auto';
-}
-document.getElementById('helpModal').addEventListener('click', function(e) {
-  if (e.target === this) closeHelpModal();
-});
-
-// Ölçme bileşenleri checkbox işleme
-const COMP_CONFIG = [
-  { id: 'vize', code: 'C1', name: 'Vize' },
-  { id: 'final', code: 'C2', name: 'Final' },
-  { id: 'odev', code: 'C3', name: 'Ödev' },
-  { id: 'proje', code: 'C4', name: 'Proje' },
-  { id: 'quiz', code: 'C5', name: 'Quiz' },
-  { id: 'lab', code: 'C6', name: 'Lab' },
-  { id: 'sunum', code: 'C7', name: 'Sunum' },
-  { id: 'katilim', code: 'C8', name: 'Katılım' }
-];
-
-function updateAssessments() {
-  const lines = [];
-  let totalWeight = 0;
-  
-  COMP_CONFIG.forEach(comp => {
-    const checkbox = document.getElementById('comp_' + comp.id);
-    const weightInput = document.getElementById('comp_' + comp.id + '_w');
-    
-    if (checkbox && checkbox.checked) {
-      let weight = parseFloat(weightInput?.value) || 0;
-      totalWeight += weight;
-      lines.push(comp.code + ' | ' + comp.name + ' | ' + weight);
-      
-      // Checkbox card styling
-      checkbox.closest('.checkbox-card').style.borderColor = '#667eea';
-      checkbox.closest('.checkbox-card').style.background = 'rgba(102, 126, 234, 0.1)';
-    } else if (checkbox) {
-      checkbox.closest('.checkbox-card').style.borderColor = 'transparent';
-      checkbox.closest('.checkbox-card').style.background = 'var(--bg)';
-    }
-  });
-  
-  // Textarea'yı güncelle
-  const textarea = document.querySelector('[name="assessments_text"]');
-  if (textarea && lines.length > 0) {
-    textarea.value = lines.join(NL);
-  }
-  
-  // Ağırlık uyarısı
-  const warning = document.getElementById('assessmentWeightWarning');
-  const totalSpan = document.getElementById('weightTotal');
-  if (warning && totalSpan) {
-    totalSpan.textContent = totalWeight.toFixed(2);
-    if (lines.length > 0 && Math.abs(totalWeight - 1.0) > 0.01) {
-      warning.style.display = 'block';
-    } else {
-      warning.style.display = 'none';
-    }
-  }
-}
-
-// Sayfa yüklendiğinde mevcut değerleri checkbox'lara yükle
-function loadAssessmentsToCheckboxes() {
-  const textarea = document.querySelector('[name="assessments_text"]');
-  if (!textarea || !textarea.value.trim()) return;
-  
-  const lines = textarea.value.trim().split(NL);
-  lines.forEach(line => {
-    const parts = line.split('|').map(p => p.trim());
-    if (parts.length < 3) return;
-    
-    const name = parts[1].toLowerCase();
-    const weight = parseFloat(parts[2]) || 0;
-    
-    COMP_CONFIG.forEach(comp => {
-      if (name.includes(comp.name.toLowerCase()) || name.includes(comp.id)) {
-        const checkbox = document.getElementById('comp_' + comp.id);
-        const weightInput = document.getElementById('comp_' + comp.id + '_w');
-        if (checkbox) checkbox.checked = true;
-        if (weightInput) weightInput.value = weight;
-      }
-    });
-  });
-  
-  updateAssessments();
-}
-
-// Sayfa yüklendiğinde çalıştır
-document.addEventListener('DOMContentLoaded', loadAssessmentsToCheckboxes);
-setTimeout(loadAssessmentsToCheckboxes, 100);
-</script>
-
-<script>
-// Tab switching
-document.querySelectorAll('.tab').forEach(tab => {
-  tab.addEventListener('click', () => {
-    const group = tab.closest('.box').querySelector('.tabs');
-    group.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-    tab.classList.add('active');
-    const contents = tab.closest('.box').querySelectorAll('.tab-content');
-    contents.forEach(c => c.classList.remove('active'));
-    document.getElementById(tab.dataset.tab).classList.add('active');
-    if (tab.dataset.tab === 'tab-questions') rebuildAllQuestions();
-    if (tab.dataset.tab === 'tab-mappings') rebuildMappingTables();
-  });
-});
-document.querySelectorAll('.collapsible').forEach(el => {
-  el.addEventListener('click', () => el.classList.toggle('collapsed'));
-});
-
-// Parse helpers - hem | hem - destekler
-function parseItems(text) {
-  if (!text || !text.trim()) return [];
-  return text.trim().split(NL).map((line, index) => {
-    line = line.trim();
-    if (!line || line.length < 2) return null;
-    
-    // Önce | ile dene
-    let parts;
-    if (line.includes('|')) {
-      parts = line.split('|');
-    } else if (line.includes(' - ')) {
-      parts = line.split(' - ');
-    } else {
-      // Hafta formatını dene: "1.Hafta: ..." veya "Hafta 1: ..."
-      const weekMatch = line.match(/^(\\d+)\\.?\\s*[Hh]afta\\s*[:\\-]?\\s*(.+)$/);
-      if (weekMatch) {
-        return { id: 'H' + weekMatch[1], desc: weekMatch[2].trim() };
-      }
-      const weekMatch2 = line.match(/^[Hh]afta\\s*(\\d+)\\s*[:\\-]?\\s*(.+)$/);
-      if (weekMatch2) {
-        return { id: 'H' + weekMatch2[1], desc: weekMatch2[2].trim() };
-      }
-      // ID formatını dene: "DÖÇ1 açıklama" veya "PÖÇ1 açıklama"
-      const idMatch = line.match(/^([A-ZÖÜÇŞĞİa-zöüçşğı]+\\d+)\\s*[:\\-\\.]*\\s*(.*)$/);
-      if (idMatch) {
-        return { id: idMatch[1].toUpperCase(), desc: idMatch[2].trim() || idMatch[1] };
-      }
-      // Hiçbiri eşleşmedi - tüm satırı ID olarak kullan
-      parts = [line, ''];
-    }
-    const id = parts[0]?.trim();
-    const desc = parts[1]?.trim() || '';
-    return id ? { id, desc } : null;
-  }).filter(Boolean);
-}
-function parseComponents(text) {
-  if (!text || !text.trim()) return [];
-  return text.trim().split(NL).map(line => {
-    // Önce | ile dene, yoksa - ile böl
-    let parts;
-    if (line.includes('|')) {
-      parts = line.split('|');
-    } else {
-      parts = line.split(' - ');
-      if (parts.length < 2) parts = line.split('-');
-    }
-    const id = parts[0]?.trim();
-    const name = parts[1]?.trim() || '';
-    return id ? { id, desc: name } : null;
-  }).filter(Boolean);
-}
-const BLOOM_LEVELS = [
-  { id: 'Bilgi', desc: 'Hatırlama' },
-  { id: 'Kavrama', desc: 'Anlama' },
-  { id: 'Uygulama', desc: 'Uygulama' },
-  { id: 'Analiz', desc: 'Çözümleme' },
-  { id: 'Sentez', desc: 'Birleştirme' },
-  { id: 'Değerlendirme', desc: 'Yargılama' }
-];
-
-function getBloomLevels() {
-  const bloomText = document.querySelector('[name="bloom_text"]')?.value || '';
-  if (!bloomText.trim()) return BLOOM_LEVELS;
-  return parseItems(bloomText);
-}
-
-let questionsData = [];
-
-function createCheckboxes(items, type, selectedValues = []) {
-  if (!items || items.length === 0) return '<div class="no-items-msg">Önce verileri girin</div>';
-  return items.map(item => {
-    const isSelected = selectedValues.includes(item.id);
-    return `<div class="cb-item ${type}-type ${isSelected ? 'selected' : ''}" data-value="${item.id}" data-type="${type}" title="${item.desc || item.id}">
-      <span class="cb-box">${isSelected ? '✓' : ''}</span><span>${item.id}</span>
-    </div>`;
-  }).join('');
-}
-
-function createCheckboxGroup(title, items, type, color, selectedValues = []) {
-  return `<div class="checkbox-group">
-    <div class="checkbox-group-title"><span class="cdot" style="background:${color}"></span>${title}</div>
-    <div class="checkbox-list" data-type="${type}">${createCheckboxes(items, type, selectedValues)}</div>
-  </div>`;
-}
-
-function createQuestionCard(index, data = {}) {
-  const num = index + 1;
-  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
-  const comps = parseComponents(document.querySelector('[name="assessments_text"]')?.value || '');
-  const blooms = getBloomLevels();
-  const curricula = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
-  
-  // Tablo formatında checkbox'lar oluştur
-  function createTableCheckboxes(items, type, color, selected = []) {
-    if (!items.length) return '<span class="text-muted" style="font-size:0.75rem;">Veri yok</span>';
-    return items.map(item => {
-      const isSelected = selected.includes(item.id);
-      return `<label class="table-cb ${isSelected ? 'selected' : ''}" style="--cb-color:${color};">
-        <input type="checkbox" ${isSelected ? 'checked' : ''} data-type="${type}" data-value="${item.id}" onchange="handleCheckboxChange(this, ${index})">
-        <span>${item.id}</span>
-      </label>`;
-    }).join('');
-  }
-  
-  return `<div class="question-card" data-index="${index}">
-    <div class="question-header" onclick="toggleQuestion(${index})">
-      <div class="question-title"><span class="num">${num}</span><span>Soru ${num}</span><span class="q-preview text-muted" style="font-weight:normal;font-size:0.75rem;"></span></div>
-      <div class="question-actions">
-        <button type="button" class="btn btn-sm btn-secondary" onclick="event.stopPropagation();duplicateQuestion(${index})">📋</button>
-        <button type="button" class="btn btn-sm btn-danger" onclick="event.stopPropagation();removeQuestion(${index})">✕</button>
-      </div>
-    </div>
-    <div class="question-body">
-      <div class="question-row">
-        <div><label style="margin-top:0">Soru ID</label><input type="text" class="q-id" value="${data.id || 'S' + num}" onchange="updateQuestionData(${index})"></div>
-        <div><label style="margin-top:0">Max Puan</label><input type="number" class="q-points" value="${data.points || '10'}" min="1" onchange="updateQuestionData(${index})"></div>
-      </div>
-      <div class="question-row" style="grid-template-columns:1fr;">
-        <div><label style="margin-top:0;font-size:0.95rem;">Metin (Opsiyonel)</label><textarea class="q-text" rows="2" style="width:100%;padding:0.7rem;font-size:0.9rem;line-height:1.4;" onchange="updateQuestionData(${index})" placeholder="Soru metni...">${data.text || ''}</textarea></div>
-      </div>
-      
-      <div class="question-mapping-table" style="margin-top:1rem;">
-        <table style="width:100%; border-collapse:collapse; font-size:0.8rem;">
-          <thead>
-            <tr style="background:var(--bg);">
-              <th style="padding:0.5rem; text-align:left; border:1px solid var(--border); width:120px;">Eşleştirme</th>
-              <th style="padding:0.5rem; text-align:left; border:1px solid var(--border);">Seçenekler</th>
-            </tr>
-          </thead>
-          <tbody>
-            <tr>
-              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#06b6d4;">📝 Ölçme Türü</td>
-              <td style="padding:0.5rem; border:1px solid var(--border);">
-                <div class="table-cb-row">${createTableCheckboxes(comps, 'comp', '#06b6d4', data.comp || [])}</div>
-              </td>
-            </tr>
-            <tr>
-              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#3b82f6;">📘 DÖÇ</td>
-              <td style="padding:0.5rem; border:1px solid var(--border);">
-                <div class="table-cb-row">${createTableCheckboxes(docs, 'doc', '#3b82f6', data.doc || [])}</div>
-              </td>
-            </tr>
-            <tr>
-              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#14b8a6;">📚 Müfredat</td>
-              <td style="padding:0.5rem; border:1px solid var(--border);">
-                <div class="table-cb-row">${createTableCheckboxes(curricula, 'curriculum', '#14b8a6', data.curriculum || [])}</div>
-              </td>
-            </tr>
-            <tr>
-              <td style="padding:0.5rem; border:1px solid var(--border); font-weight:600; color:#f59e0b;">🧠 Bloom</td>
-              <td style="padding:0.5rem; border:1px solid var(--border);">
-                <div class="table-cb-row">${createTableCheckboxes(blooms, 'bloom', '#f59e0b', data.bloom || [])}</div>
-              </td>
-            </tr>
-          </tbody>
-        </table>
-      </div>
-    </div>
-  </div>`;
-}
-
-function toggleTableCb(label, index) {
-  // Artık kullanılmıyor - handleCheckboxChange kullanılıyor
-}
-
-function handleCheckboxChange(checkbox, index) {
-  const label = checkbox.closest('.table-cb');
-  if (label) {
-    if (checkbox.checked) {
-      label.classList.add('selected');
-    } else {
-      label.classList.remove('selected');
-    }
-  }
-  updateQuestionData(index);
-}
-
-// Checkbox click handler - event delegation
-document.addEventListener('click', function(e) {
-  const cbItem = e.target.closest('.cb-item');
-  if (cbItem) {
-    e.preventDefault();
-    e.stopPropagation();
-    cbItem.classList.toggle('selected');
-    cbItem.querySelector('.cb-box').textContent = cbItem.classList.contains('selected') ? '✓' : '';
-    const questionCard = cbItem.closest('.question-card');
-    if (questionCard) updateQuestionData(parseInt(questionCard.dataset.index));
-    const mappingCard = cbItem.closest('.mapping-card');
-    if (mappingCard) collectAllMappings();
-  }
-});
-
-function getSelectedValues(container, type) {
-  const values = [];
-  // Hem eski hem yeni format için
-  container.querySelectorAll(`.cb-item.${type}-type.selected`).forEach(item => values.push(item.dataset.value));
-  // Tablo formatı için
-  container.querySelectorAll(`input[data-type="${type}"]:checked`).forEach(input => values.push(input.dataset.value));
-  return [...new Set(values)]; // Tekrarları kaldır
-}
-
-function updateQuestionData(index) {
-  const card = document.querySelector(`.question-card[data-index="${index}"]`);
-  if (!card) return;
-  questionsData[index] = {
-    id: card.querySelector('.q-id')?.value || 'S' + (index + 1),
-    points: card.querySelector('.q-points')?.value || '10',
-    text: card.querySelector('.q-text')?.value || '',
-    comp: getSelectedValues(card, 'comp'),
-    doc: getSelectedValues(card, 'doc'),
-    poc: getSelectedValues(card, 'poc'),
-    pea: getSelectedValues(card, 'pea'),
-    bloom: getSelectedValues(card, 'bloom'),
-    tyc: getSelectedValues(card, 'tyc'),
-    stark: getSelectedValues(card, 'stark'),
-    curriculum: getSelectedValues(card, 'curriculum')
-  };
-  updateQuestionPreview(index);
-  collectAllQuestions();
-}
-
-function updateQuestionPreview(index) {
-  const card = document.querySelector(`.question-card[data-index="${index}"]`);
-  if (!card) return;
-  const data = questionsData[index] || {};
-  const parts = [];
-  if (data.doc?.length) parts.push(data.doc.join(','));
-  if (data.bloom?.length) parts.push(data.bloom.join(','));
-  card.querySelector('.q-preview').textContent = parts.length ? `(${parts.join(' • ')})` : '';
-}
-
-function addQuestion(data = {}) {
-  const index = questionsData.length;
-  questionsData.push({
-    id: data.id || 'S' + (index + 1), points: data.points || '10', text: data.text || '',
-    comp: data.comp || [], doc: data.doc || [], poc: data.poc || [], pea: data.pea || [],
-    bloom: data.bloom || [], tyc: data.tyc || [], stark: data.stark || [], curriculum: data.curriculum || []
-  });
-  rebuildAllQuestions();
-  collectAllQuestions();
-}
-
-function removeQuestion(index) {
-  if (!confirm('Bu soruyu silmek istediğinizden emin misiniz?')) return;
-  questionsData.splice(index, 1);
-  questionsData.forEach((q, i) => { if (q.id.match(/^S\\d+$/)) q.id = 'S' + (i + 1); });
-  rebuildAllQuestions();
-  collectAllQuestions();
-}
-
-function duplicateQuestion(index) {
-  const original = questionsData[index];
-  if (!original) return;
-  const newData = JSON.parse(JSON.stringify(original));
-  newData.id = 'S' + (questionsData.length + 1);
-  questionsData.push(newData);
-  rebuildAllQuestions();
-  collectAllQuestions();
-}
-
-function toggleQuestion(index) {
-  const card = document.querySelector(`.question-card[data-index="${index}"]`);
-  if (card) card.classList.toggle('collapsed');
-}
-
-function rebuildAllQuestions() {
-  const container = document.getElementById('questions-container');
-  if (!container) return;
-  container.innerHTML = questionsData.map((data, index) => createQuestionCard(index, data)).join('');
-  const summary = document.getElementById('questions-summary');
-  if (summary) summary.querySelector('.count').textContent = questionsData.length;
-  questionsData.forEach((_, i) => updateQuestionPreview(i));
-}
-
-// ============ YENİ TABLO BAZLI EŞLEŞTİRMELER ============
-
-function buildDocMappingTable() {
-  const container = document.getElementById('doc-mapping-table');
-  if (!container) return;
-  
-  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
-  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
-  
-  if (!docs.length) {
-    container.innerHTML = '<p class="helper">Önce Çıktılar sekmesinden DÖÇ verilerini girin.</p>';
-    return;
-  }
-  
-  // Mevcut eşleştirmeleri yükle
-  const docTycMap = parseMapText(document.querySelector('[name="doc_tyc_map_text"]')?.value || '');
-  const docStarkMap = parseMapText(document.querySelector('[name="doc_stark_map_text"]')?.value || '');
-  const docPocMap = parseMapText(document.querySelector('[name="doc_poc_weights_text"]')?.value || '');
-  const docPeaMap = parseMapText(document.querySelector('[name="doc_pea_map_text"]')?.value || '');
-  
-  let html = '<table class="mapping-table"><thead><tr>';
-  html += '<th class="row-header">DÖÇ</th>';
-  
-  // TYÇ başlıkları
-  if (tycs.length) {
-    html += `<th colspan="${tycs.length}" style="background:#2563eb;">TYÇ</th>`;
-  }
-  // STAR-K başlıkları
-  if (starks.length) {
-    html += `<th colspan="${starks.length}" style="background:#7c2d12;">STAR-K</th>`;
-  }
-  // PÖÇ başlıkları
-  if (pocs.length) {
-    html += `<th colspan="${pocs.length}" style="background:#065f46;">PÖÇ</th>`;
-  }
-  // PEA başlıkları
-  if (peas.length) {
-    html += `<th colspan="${peas.length}" style="background:#7c3aed;">PEA</th>`;
-  }
-  html += '</tr><tr><th></th>';
-  
-  // Alt başlıklar
-  tycs.forEach(t => { html += `<th style="background:#3b82f6; font-size:0.7rem;">${t.id}</th>`; });
-  starks.forEach(s => { html += `<th style="background:#9c4221; font-size:0.7rem;">${s.id}</th>`; });
-  pocs.forEach(p => { html += `<th style="background:#047857; font-size:0.7rem;">${p.id}</th>`; });
-  peas.forEach(p => { html += `<th style="background:#8b5cf6; font-size:0.7rem;">${p.id}</th>`; });
-  html += '</tr></thead><tbody>';
-  
-  // Her DÖÇ için satır
-  docs.forEach(doc => {
-    html += `<tr><td class="row-label" title="${doc.text || ''}">${doc.id}</td>`;
-    
-    // TYÇ checkboxları
-    tycs.forEach(t => {
-      const checked = (docTycMap[doc.id] || []).includes(t.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${t.id}', 'tyc', this.checked)"></td>`;
-    });
-    
-    // STAR-K checkboxları
-    starks.forEach(s => {
-      const checked = (docStarkMap[doc.id] || []).includes(s.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${s.id}', 'stark', this.checked)"></td>`;
-    });
-    
-    // PÖÇ checkboxları
-    pocs.forEach(p => {
-      const checked = (docPocMap[doc.id] || []).includes(p.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${p.id}', 'poc', this.checked)"></td>`;
-    });
-    
-    // PEA checkboxları
-    peas.forEach(p => {
-      const checked = (docPeaMap[doc.id] || []).includes(p.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateDocMapping('${doc.id}', '${p.id}', 'pea', this.checked)"></td>`;
-    });
-    
-    html += '</tr>';
-  });
-  
-  html += '</tbody></table>';
-  container.innerHTML = html;
-}
-
-function buildCurriculumMappingTable() {
-  const container = document.getElementById('curriculum-mapping-table');
-  if (!container) return;
-  
-  const curriculum = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
-  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
-  
-  if (!curriculum.length) {
-    container.innerHTML = '<p class="helper">Önce Çıktılar sekmesinden Müfredat verilerini girin.</p>';
-    return;
-  }
-  
-  // Mevcut eşleştirmeleri yükle
-  const currTycMap = parseMapText(document.querySelector('[name="curriculum_tyc_map_text"]')?.value || '');
-  const currStarkMap = parseMapText(document.querySelector('[name="curriculum_stark_map_text"]')?.value || '');
-  const currPocMap = parseMapText(document.querySelector('[name="curriculum_poc_map_text"]')?.value || '');
-  const currPeaMap = parseMapText(document.querySelector('[name="curriculum_pea_map_text"]')?.value || '');
-  
-  let html = '<table class="mapping-table"><thead><tr>';
-  html += '<th class="row-header">Müfredat</th>';
-  
-  if (tycs.length) html += `<th colspan="${tycs.length}" style="background:#2563eb;">TYÇ</th>`;
-  if (starks.length) html += `<th colspan="${starks.length}" style="background:#7c2d12;">STAR-K</th>`;
-  if (pocs.length) html += `<th colspan="${pocs.length}" style="background:#065f46;">PÖÇ</th>`;
-  if (peas.length) html += `<th colspan="${peas.length}" style="background:#7c3aed;">PEA</th>`;
-  
-  html += '</tr><tr><th></th>';
-  tycs.forEach(t => { html += `<th style="background:#3b82f6; font-size:0.7rem;">${t.id}</th>`; });
-  starks.forEach(s => { html += `<th style="background:#9c4221; font-size:0.7rem;">${s.id}</th>`; });
-  pocs.forEach(p => { html += `<th style="background:#047857; font-size:0.7rem;">${p.id}</th>`; });
-  peas.forEach(p => { html += `<th style="background:#8b5cf6; font-size:0.7rem;">${p.id}</th>`; });
-  html += '</tr></thead><tbody>';
-  
-  curriculum.forEach(curr => {
-    html += `<tr><td class="row-label" title="${curr.text || ''}">${curr.id}</td>`;
-    
-    tycs.forEach(t => {
-      const checked = (currTycMap[curr.id] || []).includes(t.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${t.id}', 'tyc', this.checked)"></td>`;
-    });
-    starks.forEach(s => {
-      const checked = (currStarkMap[curr.id] || []).includes(s.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${s.id}', 'stark', this.checked)"></td>`;
-    });
-    pocs.forEach(p => {
-      const checked = (currPocMap[curr.id] || []).includes(p.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${p.id}', 'poc', this.checked)"></td>`;
-    });
-    peas.forEach(p => {
-      const checked = (currPeaMap[curr.id] || []).includes(p.id) ? 'checked' : '';
-      html += `<td><input type="checkbox" ${checked} onchange="updateCurriculumMapping('${curr.id}', '${p.id}', 'pea', this.checked)"></td>`;
-    });
-    
-    html += '</tr>';
-  });
-  
-  html += '</tbody></table>';
-  container.innerHTML = html;
-}
-
-function updateDocMapping(docId, targetId, targetType, isChecked) {
-  const fieldName = targetType === 'tyc' ? 'doc_tyc_map_text' : 
-                    targetType === 'stark' ? 'doc_stark_map_text' :
-                    targetType === 'poc' ? 'doc_poc_weights_text' : 'doc_pea_map_text';
-  updateMappingField(fieldName, docId, targetId, isChecked);
-}
-
-function updateCurriculumMapping(currId, targetId, targetType, isChecked) {
-  const fieldName = targetType === 'tyc' ? 'curriculum_tyc_map_text' : 
-                    targetType === 'stark' ? 'curriculum_stark_map_text' :
-                    targetType === 'poc' ? 'curriculum_poc_map_text' : 'curriculum_pea_map_text';
-  updateMappingField(fieldName, currId, targetId, isChecked);
-}
-
-function updateMappingField(fieldName, sourceId, targetId, isChecked) {
-  const field = document.querySelector(`[name="${fieldName}"]`);
-  if (!field) return;
-  
-  const map = parseMapText(field.value);
-  if (!map[sourceId]) map[sourceId] = [];
-  
-  if (isChecked) {
-    if (!map[sourceId].includes(targetId)) map[sourceId].push(targetId);
-  } else {
-    map[sourceId] = map[sourceId].filter(v => v !== targetId);
-  }
-  
-  // Map'i text'e çevir - gerçek newline kullan
-  const lines = Object.entries(map)
-    .filter(([k, v]) => v.length > 0)
-    .map(([k, v]) => `${k} | ${v.join(', ')}`);
-  field.value = lines.join(NL);
-  
-  // Otomatik kayıt tetikle
-  if (typeof triggerAutoSave === 'function') triggerAutoSave();
-}
-
-function rebuildMappingTables() {
-  buildDocMappingTable();
-  buildCurriculumMappingTable();
-  rebuildAllMappings(); // Eski sistemle uyumluluk
-}
-
-// ============ ESKİ SİSTEM ============
-
-function collectAllQuestions() {
-  const lines = [];
-  questionsData.forEach(q => {
-    // Soru ID varsa kaydet (DÖÇ zorunlu değil)
-    if (q.id) {
-      lines.push([
-        q.id, 
-        '', 
-        (q.comp||[]).join(','), 
-        (q.doc||[]).join(','), 
-        (q.poc||[]).join(','), 
-        (q.pea||[]).join(','), 
-        (q.bloom||[]).join(','), 
-        q.points || '10', 
-        q.text || '', 
-        (q.tyc||[]).join(','), 
-        (q.stark||[]).join(','), 
-        (q.curriculum||[]).join(',')
-      ].join(' | '));
-    }
-  });
-  const hidden = document.querySelector('[name="question_map_text"]');
-  if (hidden) {
-    hidden.value = lines.join(NL);
-    // Otomatik kayıt tetikle
-    debounceAutoSave();
-  }
-}
-
-// Mappings
-function createMappingCard(title, sourceItems, targetItems, sourceType, targetType, existingMap = {}) {
-  if (!sourceItems?.length) return `<div class="mapping-card"><h4>${title}</h4><div class="no-items-msg">Önce kaynak verileri girin</div></div>`;
-  if (!targetItems?.length) return `<div class="mapping-card"><h4>${title}</h4><div class="no-items-msg">Önce hedef verileri girin</div></div>`;
-  const rows = sourceItems.map(source => {
-    const selected = existingMap[source.id] || [];
-    const checkboxes = targetItems.map(target => {
-      const isSelected = selected.includes(target.id);
-      return `<div class="cb-item ${targetType}-type ${isSelected ? 'selected' : ''}" data-value="${target.id}" data-source="${source.id}" data-map-type="${sourceType}-${targetType}">
-        <span class="cb-box">${isSelected ? '✓' : ''}</span><span>${target.id}</span>
-      </div>`;
-    }).join('');
-    return `<div class="mapping-row"><div class="mapping-source">${source.id}</div><div class="mapping-targets">${checkboxes}</div></div>`;
-  }).join('');
-  return `<div class="mapping-card" data-source-type="${sourceType}" data-target-type="${targetType}"><h4>${title}</h4>${rows}</div>`;
-}
-
-function parseMapText(text) {
-  const map = {};
-  if (!text) return map;
-  // Hem \\n hem de gerçek newline karakterini destekle
-  text.trim().split(NL).forEach(line => {
-    const parts = line.split('|');
-    if (parts.length >= 2) {
-      const key = parts[0].trim();
-      const values = parts[1].split(',').map(v => v.trim().split(':')[0]).filter(Boolean);
-      if (key && values.length) map[key] = values;
-    }
-  });
-  return map;
-}
-
-function rebuildAllMappings() {
-  const container = document.getElementById('mappings-container');
-  if (!container) return;
-  const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
-  const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-  const peas = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
-  const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-  const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-  const docTycMap = parseMapText(document.querySelector('[name="doc_tyc_map_text"]')?.value || '');
-  const pocTycMap = parseMapText(document.querySelector('[name="poc_tyc_map_text"]')?.value || '');
-  const peaStarkMap = parseMapText(document.querySelector('[name="pea_stark_map_text"]')?.value || '');
-  const docPocMap = parseMapText(document.querySelector('[name="doc_poc_weights_text"]')?.value || '');
-  const pocPeaMap = parseMapText(document.querySelector('[name="poc_pea_map_text"]')?.value || '');
-  container.innerHTML = `
-    ${createMappingCard('🔗 DÖÇ → TYÇ', docs, tycs, 'doc', 'tyc', docTycMap)}
-    ${createMappingCard('🔗 PÖÇ → TYÇ', pocs, tycs, 'poc', 'tyc', pocTycMap)}
-    ${createMappingCard('🔗 PEA → STAR-K', peas, starks, 'pea', 'stark', peaStarkMap)}
-    ${createMappingCard('🔗 DÖÇ → PÖÇ', docs, pocs, 'doc', 'poc', docPocMap)}
-    ${createMappingCard('🔗 PÖÇ → PEA', pocs, peas, 'poc', 'pea', pocPeaMap)}
-  `;
-  
-  // Müfredat-DÖÇ eşleştirmesi
-  const currDocContainer = document.getElementById('curriculum-doc-container');
-  if (currDocContainer) {
-    const curriculum = parseItems(document.querySelector('[name="curriculum_text"]')?.value || '');
-    const currDocMap = parseMapText(document.querySelector('[name="curriculum_doc_map_text"]')?.value || '');
-    currDocContainer.innerHTML = createMappingCard('📚 Müfredat → DÖÇ', curriculum, docs, 'curriculum', 'doc', currDocMap);
-  }
-}
-
-function collectAllMappings() {
-  collectMapping('doc', 'tyc', 'doc_tyc_map_text');
-  collectMapping('doc', 'stark', 'doc_stark_map_text');
-  collectMapping('doc', 'pea', 'doc_pea_map_text');
-  collectMapping('poc', 'tyc', 'poc_tyc_map_text');
-  collectMapping('pea', 'stark', 'pea_stark_map_text');
-  collectMappingWithWeight('doc', 'poc', 'doc_poc_weights_text');
-  collectMapping('poc', 'pea', 'poc_pea_map_text');
-  collectCurriculumDocMapping();
-}
-
-function collectCurriculumDocMapping() {
-  const map = {};
-  const field = document.querySelector('[name="curriculum_doc_map_text"]');
-  
-  // Önce mevcut textarea değerlerini koru
-  if (field && field.value) {
-    field.value.trim().split(NL).forEach(line => {
-      const parts = line.split('|');
-      if (parts.length >= 2) {
-        const key = parts[0].trim();
-        const values = parts[1].split(',').map(v => v.trim()).filter(Boolean);
-        if (key && values.length) map[key] = values;
-      }
-    });
-  }
-  
-  // DOM'daki seçili checkbox'ları topla
-  const domMap = {};
-  document.querySelectorAll('.cb-item[data-map-type="curriculum-doc"].selected').forEach(item => {
-    const source = item.dataset.source;
-    if (!domMap[source]) domMap[source] = [];
-    domMap[source].push(item.dataset.value);
-  });
-  
-  // Görünen source'ları bul
-  const visibleSources = new Set();
-  document.querySelectorAll('.cb-item[data-map-type="curriculum-doc"]').forEach(item => {
-    visibleSources.add(item.dataset.source);
-  });
-  
-  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
-  visibleSources.forEach(source => {
-    map[source] = domMap[source] || [];
-  });
-  
-  // Boş olmayan satırları yaz
-  const lines = Object.entries(map)
-    .filter(([key, values]) => values.length > 0)
-    .map(([key, values]) => `${key} | ${values.join(', ')}`);
-  if (field) field.value = lines.join(NL);
-}
-
-function collectMapping(sourceType, targetType, fieldName) {
-  const map = {};
-  
-  // Önce mevcut textarea değerlerini koru (DOM'da olmayan eşleştirmeler için)
-  const field = document.querySelector(`[name="${fieldName}"]`);
-  if (field && field.value) {
-    field.value.trim().split(NL).forEach(line => {
-      const parts = line.split('|');
-      if (parts.length >= 2) {
-        const key = parts[0].trim();
-        const values = parts[1].split(',').map(v => v.trim().split(':')[0]).filter(Boolean);
-        if (key && values.length) map[key] = values;
-      }
-    });
-  }
-  
-  // YENİ TABLO SİSTEMİ: #doc-mapping-table içindeki checkbox'ları topla
-  const docMappingTable = document.querySelector('#doc-mapping-table table');
-  if (docMappingTable && sourceType === 'doc') {
-    // Tablo varsa, tablodaki checkbox'lardan değerleri al
-    const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
-    let targetItems = [];
-    let targetStartIdx = 0;
-    
-    if (targetType === 'tyc') {
-      targetItems = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-      targetStartIdx = 0;
-    } else if (targetType === 'stark') {
-      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-      targetItems = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-      targetStartIdx = tycs.length;
-    } else if (targetType === 'poc') {
-      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-      const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-      targetItems = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-      targetStartIdx = tycs.length + starks.length;
-    } else if (targetType === 'pea') {
-      const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-      const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-      const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-      targetItems = parseItems(document.querySelector('[name="peas_text"]')?.value || '');
-      targetStartIdx = tycs.length + starks.length + pocs.length;
-    }
-    
-    // Her satırı (DÖÇ) kontrol et
-    const rows = docMappingTable.querySelectorAll('tbody tr');
-    rows.forEach((row, rowIdx) => {
-      if (rowIdx >= docs.length) return;
-      const docId = docs[rowIdx].id;
-      const cells = row.querySelectorAll('td');
-      const selectedTargets = [];
-      
-      // İlgili hedef sütunlarındaki checkbox'ları kontrol et
-      for (let i = 0; i < targetItems.length; i++) {
-        const cellIdx = 1 + targetStartIdx + i; // +1 for row label
-        if (cellIdx < cells.length) {
-          const checkbox = cells[cellIdx].querySelector('input[type="checkbox"]');
-          if (checkbox && checkbox.checked) {
-            selectedTargets.push(targetItems[i].id);
-          }
-        }
-      }
-      
-      if (selectedTargets.length > 0) {
-        map[docId] = selectedTargets;
-      } else {
-        delete map[docId]; // Hiç seçili değilse kaldır
-      }
-    });
-    
-    // Sonucu yaz
-    const lines = Object.entries(map)
-      .filter(([key, values]) => values.length > 0)
-      .map(([key, values]) => `${key} | ${values.join(', ')}`);
-    if (field) field.value = lines.join(NL);
-    return; // Yeni tablo sistemini kullandık, eski sisteme geçme
-  }
-  
-  // ESKİ SİSTEM: .cb-item öğelerini kullan
-  const domMap = {};
-  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"].selected`).forEach(item => {
-    const source = item.dataset.source;
-    if (!domMap[source]) domMap[source] = [];
-    domMap[source].push(item.dataset.value);
-  });
-  
-  // DOM'da görünen source'lar için DOM değerlerini kullan
-  const visibleSources = new Set();
-  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"]`).forEach(item => {
-    visibleSources.add(item.dataset.source);
-  });
-  
-  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
-  visibleSources.forEach(source => {
-    map[source] = domMap[source] || [];
-  });
-  
-  // Boş olmayan satırları yaz
-  const lines = Object.entries(map)
-    .filter(([key, values]) => values.length > 0)
-    .map(([key, values]) => `${key} | ${values.join(', ')}`);
-  if (field) field.value = lines.join(NL);
-}
-
-function collectMappingWithWeight(sourceType, targetType, fieldName) {
-  const map = {};
-  
-  // Önce mevcut textarea değerlerini koru
-  const field = document.querySelector(`[name="${fieldName}"]`);
-  if (field && field.value) {
-    field.value.trim().split(NL).forEach(line => {
-      const parts = line.split('|');
-      if (parts.length >= 2) {
-        const key = parts[0].trim();
-        const values = parts[1].split(',').map(v => v.trim()).filter(Boolean);
-        if (key && values.length) map[key] = values;
-      }
-    });
-  }
-  
-  // YENİ TABLO SİSTEMİ: #doc-mapping-table içindeki checkbox'ları topla (doc-poc için)
-  const docMappingTable = document.querySelector('#doc-mapping-table table');
-  if (docMappingTable && sourceType === 'doc' && targetType === 'poc') {
-    const docs = parseItems(document.querySelector('[name="docs_text"]')?.value || '');
-    const tycs = parseItems(document.querySelector('[name="tyc_text"]')?.value || '');
-    const starks = parseItems(document.querySelector('[name="stark_text"]')?.value || '');
-    const pocs = parseItems(document.querySelector('[name="pocs_text"]')?.value || '');
-    const targetStartIdx = tycs.length + starks.length;
-    
-    // Her satırı (DÖÇ) kontrol et
-    const rows = docMappingTable.querySelectorAll('tbody tr');
-    rows.forEach((row, rowIdx) => {
-      if (rowIdx >= docs.length) return;
-      const docId = docs[rowIdx].id;
-      const cells = row.querySelectorAll('td');
-      const selectedTargets = [];
-      
-      // PÖÇ sütunlarındaki checkbox'ları kontrol et
-      for (let i = 0; i < pocs.length; i++) {
-        const cellIdx = 1 + targetStartIdx + i; // +1 for row label
-        if (cellIdx < cells.length) {
-          const checkbox = cells[cellIdx].querySelector('input[type="checkbox"]');
-          if (checkbox && checkbox.checked) {
-            selectedTargets.push(pocs[i].id + ':1'); // Varsayılan ağırlık 1
-          }
-        }
-      }
-      
-      if (selectedTargets.length > 0) {
-        map[docId] = selectedTargets;
-      } else {
-        delete map[docId];
-      }
-    });
-    
-    // Sonucu yaz
-    const lines = Object.entries(map)
-      .filter(([key, values]) => values.length > 0)
-      .map(([key, values]) => `${key} | ${values.join(', ')}`);
-    if (field) field.value = lines.join(NL);
-    return;
-  }
-  
-  // ESKİ SİSTEM
-  const domMap = {};
-  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"].selected`).forEach(item => {
-    const source = item.dataset.source;
-    if (!domMap[source]) domMap[source] = [];
-    domMap[source].push(item.dataset.value + ':1');
-  });
-  
-  // Görünen source'ları bul
-  const visibleSources = new Set();
-  document.querySelectorAll(`.cb-item[data-map-type="${sourceType}-${targetType}"]`).forEach(item => {
-    visibleSources.add(item.dataset.source);
-  });
-  
-  // Görünen source'lar için DOM'dan al, görünmeyenler için eski değeri koru
-  visibleSources.forEach(source => {
-    map[source] = domMap[source] || [];
-  });
-  
-  // Boş olmayan satırları yaz
-  const lines = Object.entries(map)
-    .filter(([key, values]) => values.length > 0)
-    .map(([key, values]) => `${key} | ${values.join(', ')}`);
-  if (field) field.value = lines.join(NL);
-}
-
-function loadSampleData() {
-  if (!confirm('Örnek veri yüklenecek. Mevcut veriler silinecek. Devam?')) return;
-  document.querySelector('[name="course_code"]').value = 'BM203';
-  document.querySelector('[name="course_name"]').value = 'Veri Yapıları ve Algoritmalar';
-  document.querySelector('[name="program_name"]').value = 'Bilgisayar Mühendisliği';
-  document.querySelector('[name="term"]').value = '2024-2025 Güz';
-  document.querySelector('[name="instructor"]').value = 'Dr. Öğr. Üyesi Ahmet Yılmaz';
-  document.querySelector('[name="curriculum_text"]').value = 'MUC1 - Temel veri yapılarını açıklar\\nMUC2 - Algoritma karmaşıklığını analiz eder\\nMUC3 - Problem çözme yeteneği geliştirir';
-  document.querySelector('[name="tyc_text"]').value = 'TYC1 - Bilgi, Kuramsal ve uygulamalı bilgi\\nTYC2 - Beceri, Bilişsel ve uygulamalı\\nTYC3 - Yetkinlik, Bağımsız çalışabilme';
-  document.querySelector('[name="stark_text"]').value = 'ST1 - Yazılım geliştirme yetkinliği\\nST2 - Analitik düşünme becerisi';
-  document.querySelector('[name="docs_text"]').value = 'DÖÇ1 - Stack ve Queue yapılarını uygular\\nDÖÇ2 - Ağaç yapılarını analiz eder\\nDÖÇ3 - Sıralama algoritmalarını karşılaştırır\\nDÖÇ4 - Graf algoritmalarını uygular';
-  document.querySelector('[name="pocs_text"]').value = 'PÖÇ1 - Mühendislik problemlerini çözer\\nPÖÇ2 - Algoritma tasarlama becerisi\\nPÖÇ3 - Analitik düşünme yetkinliği';
-  document.querySelector('[name="peas_text"]').value = 'PEA1 - Yazılım sektöründe etkin mezunlar\\nPEA2 - Araştırma yapabilen mezunlar';
-  document.querySelector('[name="assessments_text"]').value = 'C1 | Vize | 0.4\\nC2 | Final | 0.6';
-  document.querySelector('[name="bloom_text"]').value = 'Bilgi - Hatırlama düzeyi\\nKavrama - Anlama düzeyi\\nUygulama - Uygulama düzeyi\\nAnaliz - Çözümleme düzeyi\\nSentez - Birleştirme düzeyi\\nDeğerlendirme - Yargılama düzeyi';
-  document.querySelector('[name="curriculum_doc_map_text"]').value = 'MUC1 | DÖÇ1, DÖÇ2\\nMUC2 | DÖÇ2, DÖÇ3\\nMUC3 | DÖÇ3, DÖÇ4';
-  // TÜM EŞLEMELERİ DOLDUR
-  document.querySelector('[name="doc_tyc_map_text"]').value = 'DÖÇ1 | TYC1, TYC2\\nDÖÇ2 | TYC2\\nDÖÇ3 | TYC2, TYC3\\nDÖÇ4 | TYC3';
-  document.querySelector('[name="poc_tyc_map_text"]').value = 'PÖÇ1 | TYC1\\nPÖÇ2 | TYC2\\nPÖÇ3 | TYC2, TYC3';
-  document.querySelector('[name="pea_stark_map_text"]').value = 'PEA1 | ST1\\nPEA2 | ST1, ST2';
-  document.querySelector('[name="doc_poc_weights_text"]').value = 'DÖÇ1 | PÖÇ1:2, PÖÇ2:1\\nDÖÇ2 | PÖÇ1:1, PÖÇ2:3\\nDÖÇ3 | PÖÇ2:2, PÖÇ3:2\\nDÖÇ4 | PÖÇ1:1, PÖÇ2:1, PÖÇ3:2';
-  document.querySelector('[name="poc_pea_map_text"]').value = 'PÖÇ1 | PEA1\\nPÖÇ2 | PEA1, PEA2\\nPÖÇ3 | PEA2';
-  
-  let students = '';
-  for (let i = 1; i <= 25; i++) students += `OGR${String(i).padStart(2,'0')} - Öğrenci ${i}\\n`;
-  document.querySelector('[name="students_text"]').value = students.trim();
-  
-  // Örnek sorular - questionsData'ya ekle
-  questionsData = [
-    { id: 'S1', points: '10', text: 'Stack nedir?', comp: ['C1'], doc: ['DÖÇ1'], poc: ['PÖÇ1'], pea: ['PEA1'], bloom: ['Bilgi'], tyc: ['TYC1'], stark: ['ST1'], curriculum: ['MUC1'] },
-    { id: 'S2', points: '15', text: 'Queue ve Stack farkı', comp: ['C1'], doc: ['DÖÇ1','DÖÇ2'], poc: ['PÖÇ1','PÖÇ2'], pea: ['PEA1'], bloom: ['Kavrama'], tyc: ['TYC1','TYC2'], stark: ['ST1'], curriculum: ['MUC1','MUC2'] },
-    { id: 'S3', points: '20', text: 'Binary tree oluştur', comp: ['C1'], doc: ['DÖÇ2'], poc: ['PÖÇ2'], pea: ['PEA1'], bloom: ['Uygulama'], tyc: ['TYC2'], stark: ['ST1','ST2'], curriculum: ['MUC2'] },
-    { id: 'S4', points: '15', text: 'QuickSort karmaşıklığı', comp: ['C1'], doc: ['DÖÇ3'], poc: ['PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Analiz'], tyc: ['TYC2','TYC3'], stark: ['ST2'], curriculum: ['MUC2'] },
-    { id: 'S5', points: '10', text: 'Stack uygulamaları', comp: ['C2'], doc: ['DÖÇ1','DÖÇ2'], poc: ['PÖÇ1'], pea: ['PEA1'], bloom: ['Bilgi'], tyc: ['TYC1'], stark: ['ST1'], curriculum: ['MUC1','MUC3'] },
-    { id: 'S6', points: '15', text: 'Heap yapısı', comp: ['C2'], doc: ['DÖÇ2','DÖÇ3'], poc: ['PÖÇ2'], pea: ['PEA1'], bloom: ['Kavrama'], tyc: ['TYC1','TYC2'], stark: ['ST1'], curriculum: ['MUC2','MUC3'] },
-    { id: 'S7', points: '25', text: 'MergeSort implement et', comp: ['C2'], doc: ['DÖÇ3'], poc: ['PÖÇ2','PÖÇ3'], pea: ['PEA2'], bloom: ['Uygulama'], tyc: ['TYC2','TYC3'], stark: ['ST1','ST2'], curriculum: ['MUC2','MUC3'] },
-    { id: 'S8', points: '20', text: 'Graf traversal', comp: ['C2'], doc: ['DÖÇ4'], poc: ['PÖÇ1','PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Analiz'], tyc: ['TYC3'], stark: ['ST2'], curriculum: ['MUC3'] },
-    { id: 'S9', points: '20', text: 'Algoritma tasarla', comp: ['C2'], doc: ['DÖÇ3','DÖÇ4'], poc: ['PÖÇ3'], pea: ['PEA2'], bloom: ['Sentez'], tyc: ['TYC3'], stark: ['ST2'], curriculum: ['MUC2','MUC3'] },
-    { id: 'S10', points: '25', text: 'Karşılaştırmalı analiz', comp: ['C2'], doc: ['DÖÇ1','DÖÇ2','DÖÇ3','DÖÇ4'], poc: ['PÖÇ1','PÖÇ2','PÖÇ3'], pea: ['PEA1','PEA2'], bloom: ['Değerlendirme'], tyc: ['TYC1','TYC2','TYC3'], stark: ['ST1','ST2'], curriculum: ['MUC1','MUC2','MUC3'] }
-  ];
-  rebuildAllQuestions();
-  collectAllQuestions();
-  
-  let scores = '';
-  const maxScores = [10, 15, 20, 15, 10, 15, 25, 20, 20, 25];
-  for (let i = 1; i <= 25; i++) {
-    const sid = `OGR${String(i).padStart(2,'0')}`;
-    for (let q = 1; q <= 10; q++) {
-      const max = maxScores[q-1];
-      const score = Math.round(max * (0.4 + Math.random() * 0.55));
-      scores += `${sid}, S${q}, ${score}\\n`;
-    }
-  }
-  document.querySelector('[name="scores_text"]').value = scores.trim();
-}
-function clearAllData() {
-  if (!confirm('Tüm veriler silinecek (eşleştirmeler, sorular, öğrenciler dahil). Emin misiniz?')) return;
-  
-  // Tüm text input ve textarea'ları temizle
-  document.querySelectorAll('input[type="text"], textarea').forEach(el => el.value = '');
-  
-  // Hidden alanları da temizle
-  const hiddenFields = [
-    'doc_tyc_map_text', 'poc_tyc_map_text', 'pea_stark_map_text',
-    'doc_poc_weights_text', 'poc_pea_map_text', 'curriculum_doc_map_text',
-    'doc_stark_map_text', 'doc_pea_map_text',
-    'curriculum_tyc_map_text', 'curriculum_stark_map_text',
-    'curriculum_poc_map_text', 'curriculum_pea_map_text',
-    'question_map_text', 'scores_text', 'students_text'
-  ];
-  hiddenFields.forEach(name => {
-    const field = document.querySelector(`[name="${name}"]`);
-    if (field) field.value = '';
-  });
-  
-  // Soru verilerini temizle
-  questionsData = [];
-  rebuildAllQuestions();
-  
-  // Eşleştirme tablolarını yeniden oluştur (boş olarak)
-  setTimeout(() => {
-    rebuildMappingTables();
-    rebuildAllMappings();
-  }, 100);
-  
-  // Varsayılan Bloom değerlerini koru
-  const bloomField = document.querySelector('[name="bloom_text"]');
-  if (bloomField && !bloomField.value) {
-    bloomField.value = 'Bilgi\\nKavrama\\nUygulama\\nAnaliz\\nSentez\\nDeğerlendirme';
-  }
-  
-  // Varsayılan eşik değerlerini koru
-  const metField = document.querySelector('[name="thresholds_met"]');
-  const partialField = document.querySelector('[name="thresholds_partial"]');
-  if (metField && !metField.value) metField.value = '70';
-  if (partialField && !partialField.value) partialField.value = '50';
-  
-  alert('Tüm veriler temizlendi.');
-}
-
-async function loadExcelGrades() {
-  try {
-    const res = await fetch('/load-grades');
-    const data = await res.json();
-    if (data.error) { alert(data.error); return; }
-    if (data.students_text) document.querySelector('[name="students_text"]').value = data.students_text;
-    if (data.scores_text) document.querySelector('[name="scores_text"]').value = data.scores_text;
-  } catch (e) {
-    alert('Excel okunamadı: ' + e);
-  }
-}
-
-// ============ LOADING SPINNER ============
-function showLoading(text = 'Hesaplanıyor...') {
-  const overlay = document.getElementById('loadingOverlay');
-  overlay.querySelector('.loading-text').textContent = text;
-  overlay.classList.add('active');
-}
-
-function hideLoading() {
-  document.getElementById('loadingOverlay').classList.remove('active');
-}
-
-// Form submit'te loading göster
-document.getElementById('mainForm')?.addEventListener('submit', function(e) {
-  // Hidden textarea'ları güncelle
-  collectAllQuestions();
-  collectAllMappings();
-  
-  // Validation
-  if (!validateForm()) {
-    e.preventDefault();
-    return;
-  }
-  showLoading('Rapor hesaplanıyor...');
-});
-
-// ============ FORM VALIDATION ============
-function validateForm() {
-  let isValid = true;
-  const errors = [];
-  
-  // Program adı kontrolü
-  const programName = document.querySelector('[name="program_name"]');
-  if (programName && !programName.value.trim()) {
-    showFieldError(programName, 'Program adı zorunludur');
-    isValid = false;
-  } else if (programName) {
-    clearFieldError(programName);
-  }
-  
-  // Ölçme bileşenleri kontrolü
-  const assessments = document.querySelector('[name="assessments_text"]');
-  if (assessments && !assessments.value.trim()) {
-    showFieldError(assessments, 'En az bir ölçme bileşeni gerekli');
-    isValid = false;
-  } else if (assessments) {
-    clearFieldError(assessments);
-  }
-  
-  // DÖÇ kontrolü
-  const docs = document.querySelector('[name="docs_text"]');
-  if (docs && !docs.value.trim()) {
-    showFieldError(docs, 'En az bir DÖÇ tanımlanmalı');
-    isValid = false;
-  } else if (docs) {
-    clearFieldError(docs);
-  }
-  
-  if (!isValid) {
-    const firstError = document.querySelector('.input-error');
-    if (firstError) firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
-  }
-  
-  return isValid;
-}
-
-function showFieldError(field, message) {
-  field.classList.add('input-error');
-  let errorEl = field.nextElementSibling;
-  if (!errorEl || !errorEl.classList.contains('field-error')) {
-    errorEl = document.createElement('div');
-    errorEl.className = 'field-error';
-    field.parentNode.insertBefore(errorEl, field.nextSibling);
-  }
-  errorEl.textContent = message;
-  errorEl.classList.add('show');
-}
-
-function clearFieldError(field) {
-  field.classList.remove('input-error');
-  const errorEl = field.nextElementSibling;
-  if (errorEl && errorEl.classList.contains('field-error')) {
-    errorEl.classList.remove('show');
-  }
-}
-
-// ============ AUTO-SAVE ============
-let autoSaveTimer = null;
-let lastSavedData = '';
-
-function initAutoSave() {
-  const form = document.getElementById('mainForm');
-  if (!form) return;
-  
-  const inputs = form.querySelectorAll('input, textarea, select');
-  inputs.forEach(input => {
-    input.addEventListener('change', debounceAutoSave);
-    input.addEventListener('input', debounceAutoSave);
-  });
-  
-  updateAutoSaveStatus('idle');
-}
-
-function debounceAutoSave() {
-  if (autoSaveTimer) clearTimeout(autoSaveTimer);
-  updateAutoSaveStatus('pending');
-  autoSaveTimer = setTimeout(performAutoSave, 3000);
-}
-
-async function performAutoSave() {
-  const form = document.getElementById('mainForm');
-  if (!form) return;
-  
-  const formData = new FormData(form);
-  const data = {};
-  formData.forEach((value, key) => { data[key] = value; });
-  
-  const dataStr = JSON.stringify(data);
-  if (dataStr === lastSavedData) return;
-  
-  updateAutoSaveStatus('saving');
-  
-  try {
-    const res = await fetch('/api/autosave', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: dataStr
-    });
-    
-    if (res.ok) {
-      lastSavedData = dataStr;
-      updateAutoSaveStatus('saved');
-    } else {
-      updateAutoSaveStatus('error');
-    }
-  } catch (e) {
-    updateAutoSaveStatus('error');
-  }
-}
-
-function updateAutoSaveStatus(status) {
-  const indicator = document.getElementById('autosaveIndicator');
-  if (!indicator) return;
-  
-  const dot = indicator.querySelector('.autosave-dot');
-  const text = indicator.querySelector('.autosave-text');
-  
-  dot.className = 'autosave-dot';
-  
-  switch(status) {
-    case 'saving':
-      dot.classList.add('saving');
-      text.textContent = 'Kaydediliyor...';
-      break;
-    case 'saved':
-      dot.classList.add('saved');
-      text.textContent = 'Kaydedildi';
-      setTimeout(() => updateAutoSaveStatus('idle'), 3000);
-      break;
-    case 'error':
-      dot.classList.add('error');
-      text.textContent = 'Kayıt hatası';
-      break;
-    default:
-      text.textContent = 'Otomatik kayıt aktif';
-  }
-}
-
-// ============ TASLAK YÖNETİMİ ============
-function openSaveDraftModal() {
-  document.getElementById('saveDraftModal').classList.add('active');
-  document.getElementById('draftName').focus();
-}
-
-function closeSaveDraftModal() {
-  document.getElementById('saveDraftModal').classList.remove('active');
-}
-
-async function confirmSaveDraft() {
-  const name = document.getElementById('draftName').value.trim() || 
-               'Taslak ' + new Date().toLocaleDateString('tr-TR');
-  
-  // Önce tüm verileri topla
-  collectAllMappings();
-  collectAllQuestions();
-  
-  const form = document.getElementById('mainForm');
-  const formData = new FormData(form);
-  const data = {};
-  formData.forEach((value, key) => { data[key] = value; });
-  
-  showLoading('Taslak kaydediliyor...');
-  
-  try {
-    const res = await fetch('/api/drafts', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ name, data })
-    });
-    
-    if (res.ok) {
-      closeSaveDraftModal();
-      location.reload();
-    } else {
-      alert('Taslak kaydedilemedi');
-    }
-  } catch (e) {
-    alert('Hata: ' + e);
-  } finally {
-    hideLoading();
-  }
-}
-
-async function loadDraft(id) {
-  showLoading('Taslak yükleniyor...');
-  try {
-    const res = await fetch('/api/drafts/' + id);
-    const result = await res.json();
-    
-    if (result.data) {
-      Object.entries(result.data).forEach(([key, value]) => {
-        const field = document.querySelector('[name="' + key + '"]');
-        if (field) field.value = value;
-      });
-      // Soruları yeniden yükle
-      loadQuestionsFromText();
-      // Eşlemeleri yeniden oluştur
-      rebuildAllMappings();
-    }
-    hideLoading();
-  } catch (e) {
-    alert('Taslak yüklenemedi: ' + e);
-    hideLoading();
-  }
-}
-
-async function deleteDraft(id) {
-  if (!confirm('Bu taslağı silmek istediğinize emin misiniz?')) return;
-  
-  try {
-    const res = await fetch('/api/drafts/' + id, { method: 'DELETE' });
-    if (res.ok) {
-      // Sidebar'dan öğeyi kaldır
-      const item = document.querySelector(`.sidebar-item[data-type="draft"][data-id="${id}"]`);
-      if (item) item.remove();
-    } else {
-      alert('Silme işlemi başarısız');
-    }
-  } catch (e) {
-    alert('Silinemedi: ' + e);
-  }
-}
-
-// ============ RAPOR GEÇMİŞİ ============
-async function deleteReportConfirm(id) {
-  if (!confirm('Bu raporu silmek istediğinize emin misiniz?')) return;
-  
-  try {
-    const res = await fetch('/api/reports/' + id, { method: 'DELETE' });
-    if (res.ok) {
-      // Sidebar'dan öğeyi kaldır
-      const item = document.querySelector(`.sidebar-item[data-type="report"][data-id="${id}"]`);
-      if (item) item.remove();
-    } else {
-      alert('Silme işlemi başarısız');
-    }
-  } catch (e) {
-    alert('Silinemedi: ' + e);
-  }
-}
-
-// ============ SIDEBAR TOGGLE ============
-function toggleSidebar(header) {
-  header.classList.toggle('collapsed');
-  const body = header.nextElementSibling;
-  if (body) body.classList.toggle('collapsed');
-}
-
-// ============ INIT ============
-document.addEventListener('DOMContentLoaded', function() {
-  initAutoSave();
-  loadQuestionsFromText();
-  // Eşleşmeleri de yükle (biraz gecikmeyle, DOM hazır olsun)
-  setTimeout(() => {
-    rebuildAllMappings();
-    rebuildMappingTables(); // Yeni tablo bazlı eşleştirmeleri de yükle
-  }, 100);
-});
-
-// Sayfa yüklendiğinde question_map_text'ten soruları yükle
-function loadQuestionsFromText() {
-  const hidden = document.querySelector('[name="question_map_text"]');
-  if (!hidden || !hidden.value.trim()) return;
-  
-  const lines = hidden.value.trim().split(NL).filter(ln => ln.trim());
-  questionsData = [];
-  
-  lines.forEach(line => {
-    const parts = line.split('|').map(p => p.trim());
-    if (parts.length >= 8) {
-      questionsData.push({
-        id: parts[0] || '',
-        week: parts[1] || '',
-        comp: parts[2] ? parts[2].split(',').map(s => s.trim()).filter(s => s) : [],
-        doc: parts[3] ? parts[3].split(',').map(s => s.trim()).filter(s => s) : [],
-        poc: parts[4] ? parts[4].split(',').map(s => s.trim()).filter(s => s) : [],
-        pea: parts[5] ? parts[5].split(',').map(s => s.trim()).filter(s => s) : [],
-        bloom: parts[6] ? parts[6].split(',').map(s => s.trim()).filter(s => s) : [],
-        points: parts[7] || '10',
-        text: parts[8] || '',
-        tyc: parts[9] ? parts[9].split(',').map(s => s.trim()).filter(s => s) : [],
-        stark: parts[10] ? parts[10].split(',').map(s => s.trim()).filter(s => s) : [],
-        curriculum: parts[11] ? parts[11].split(',').map(s => s.trim()).filter(s => s) : []
-      });
-    }
-  });
-  
-  if (questionsData.length > 0) {
-    rebuildAllQuestions();
-  }
-}
-
-// ============ EXCEL IMPORT FONKSİYONLARI ============
-function importStudentsFromExcel(input) {
-  const file = input.files[0];
-  if (!file) return;
-  
-  showLoading('Excel dosyası okunuyor...');
-  
-  const reader = new FileReader();
-  reader.onload = function(e) {
-    try {
-      const data = new Uint8Array(e.target.result);
-      const workbook = XLSX.read(data, { type: 'array' });
-      
-      // Öğrenci listesi sayfasını bul - ismine göre veya ilk sayfa
-      let sheetName = workbook.SheetNames[0];
-      for (const name of workbook.SheetNames) {
-        const lower = name.toLowerCase();
-        if (lower.includes('öğrenci') || lower.includes('ogrenci') || lower.includes('liste') || lower.includes('student')) {
-          sheetName = name;
-          break;
-        }
-      }
-      console.log('Öğrenci listesi sayfası:', sheetName);
-      
-      const sheet = workbook.Sheets[sheetName];
-      const rows = XLSX.utils.sheet_to_json(sheet, { header: 1 });
-      
-      // Boş satırları atla, başlık satırını bul
-      let headerRowIdx = -1;
-      let idCol = 0, adCol = -1, soyadCol = -1, durumCol = -1;
-      
-      for (let i = 0; i < rows.length; i++) {
-        const row = rows[i];
-        if (!row || row.length < 2) continue;
-        
-        // Başlık satırını bul
-        const cells = row.map(c => String(c || '').toLowerCase().trim());
-        
-        for (let j = 0; j < cells.length; j++) {
-          const c = cells[j];
-          if (c.includes('numara') || c === 'no' || c === 'id' || c.includes('öğrenci no')) {
-            idCol = j;
-            headerRowIdx = i;
-          }
-          if (c === 'ad' || c === 'isim' || c === 'name') adCol = j;
-          if (c === 'soyad' || c === 'soyadı' || c === 'surname') soyadCol = j;
-          if (c.includes('durum') || c === 'status') durumCol = j;
-        }
-        
-        if (headerRowIdx >= 0) break;
-      }
-      
-      // Başlık bulunamadıysa ilk satırı başlık say
-      if (headerRowIdx < 0) {
-        headerRowIdx = 0;
-        const firstRow = rows[0] || [];
-        if (firstRow.length >= 2) {
-          adCol = 1;
-        }
-      }
-      
-      const lines = [];
-      const startRow = headerRowIdx + 1;
-      
-      for (let i = startRow; i < rows.length; i++) {
-        const row = rows[i];
-        if (!row || !row[idCol]) continue;
-        
-        const studentId = String(row[idCol]).trim();
-        if (!studentId) continue;
-        
-        // Ad ve Soyad birleştir
-        let name = '';
-        if (adCol >= 0 && soyadCol >= 0) {
-          const ad = String(row[adCol] || '').trim();
-          const soyad = String(row[soyadCol] || '').trim();
-          name = (ad + ' ' + soyad).trim();
-        } else if (adCol >= 0) {
-          name = String(row[adCol] || '').trim();
-        } else {
-          name = String(row[idCol + 1] || '').trim();
-        }
-        
-        // Durum kontrolü
-        let status = '';
-        if (durumCol >= 0) {
-          status = String(row[durumCol] || '').trim().toUpperCase();
-        }
-        
-        if (studentId && name) {
-          if (status === 'GR' || status === 'DZ' || status === 'GİRMEDİ') {
-            lines.push(studentId + ' - ' + name + ' - GR');
-          } else {
-            lines.push(studentId + ' - ' + name);
-          }
-        }
-      }
-      
-      if (lines.length > 0) {
-        document.querySelector('[name="students_text"]').value = lines.join(NL);
-        const grCount = lines.filter(l => l.includes(' - GR')).length;
-        let msg = '✅ ' + lines.length + ' öğrenci başarıyla yüklendi!';
-        if (grCount > 0) msg += '\\n(' + grCount + ' öğrenci derse girmemiş olarak işaretlendi)';
-        alert(msg);
-      } else {
-        alert('⚠️ Excel dosyasında geçerli öğrenci verisi bulunamadı.');
-      }
-    } catch (err) {
-      alert('❌ Excel okuma hatası: ' + err.message);
-    } finally {
-      hideLoading();
-      input.value = '';
-    }
-  };
-  reader.readAsArrayBuffer(file);
-}
-
-function importScoresFromExcel(input) {
-  const file = input.files[0];
-  if (!file) return;
-  
-  showLoading('Not dosyası okunuyor...');
-  
-  const reader = new FileReader();
-  reader.onload = function(e) {
-    try {
-      const data = new Uint8Array(e.target.result);
-      const workbook = XLSX.read(data, { type: 'array' });
-      
-      // Notlar sayfasını bul - ismine göre veya ikinci sayfa (yoksa ilk)
-      let sheetName = workbook.SheetNames.length > 1 ? workbook.SheetNames[1] : workbook.SheetNames[0];
-      for (const name of workbook.SheetNames) {
-        const lower = name.toLowerCase();
-        if (lower.includes('not') || lower.includes('puan') || lower.includes('score') || lower.includes('grade')) {
-          sheetName = name;
-          break;
-        }
-      }
-      console.log('Notlar sayfası:', sheetName);
-      
-      const sheet = workbook.Sheets[sheetName];
-      const rows = XLSX.utils.sheet_to_json(sheet, { header: 1 });
-      
-      // Boş satırları atla, başlık satırını bul
-      let headerRowIdx = 0;
-      for (let i = 0; i < rows.length; i++) {
-        const row = rows[i];
-        if (row && row.length > 2) {
-          headerRowIdx = i;
-          break;
-        }
-      }
-      
-      if (headerRowIdx >= rows.length - 1) {
-        alert('⚠️ Excel dosyasında yeterli veri yok.');
-        hideLoading();
-        return;
-      }
-      
-      const headers = rows[headerRowIdx];
-      const questionCols = []; // {colIdx, qid}
-      
-      // Atlanacak kelimeler
-      const skipWords = ['numara', 'no', 'id', 'ad', 'soyad', 'isim', 'durum', 'status', 'name', 'öğrenci', 'toplam', 'total', 'ortalama', 'average', 'sum'];
-      
-      for (let i = 0; i < headers.length; i++) {
-        const hVal = headers[i];
-        if (hVal === null || hVal === undefined) continue;
-        
-        const hStr = String(hVal).trim().toLowerCase();
-        
-        // Atlanacak kelimeleri kontrol et
-        if (skipWords.some(w => hStr.includes(w))) continue;
-        
-        // Sayısal değer mi kontrol et (number tipi veya sayıya çevrilebilir string)
-        if (typeof hVal === 'number') {
-          // Number tipinde - S prefix ekle
-          questionCols.push({ colIdx: i, qid: 'S' + Math.floor(hVal) });
-        } else {
-          const hTrim = String(hVal).trim();
-          // Sadece rakamlardan oluşuyor mu?
-          if (/^[0-9]+$/.test(hTrim)) {
-            questionCols.push({ colIdx: i, qid: 'S' + parseInt(hTrim) });
-          } else if (/^[0-9]+\\.[0-9]+$/.test(hTrim)) {
-            questionCols.push({ colIdx: i, qid: 'S' + Math.floor(parseFloat(hTrim)) });
-          } else if (/^[SsQq][0-9]+$/.test(hTrim)) {
-            questionCols.push({ colIdx: i, qid: hTrim.toUpperCase() });
-          }
-        }
-      }
-      
-      if (questionCols.length === 0) {
-        alert('⚠️ Başlık satırında soru sütunu bulunamadı.');
-        hideLoading();
-        return;
-      }
-      
-      // Öğrenci ID sütununu bul
-      let studentIdCol = 0;
-      for (let i = 0; i < headers.length; i++) {
-        const h = String(headers[i] || '').toLowerCase();
-        if (h.includes('numara') || h.includes('no') || h === 'id' || h.includes('öğrenci')) {
-          studentIdCol = i;
-          break;
-        }
-      }
-      
-      const lines = [];
-      for (let i = headerRowIdx + 1; i < rows.length; i++) {
-        const row = rows[i];
-        if (!row || !row[studentIdCol]) continue;
-        
-        const studentId = String(row[studentIdCol]).trim();
-        if (!studentId) continue;
-        
-        for (const qc of questionCols) {
-          const score = row[qc.colIdx];
-          if (score === undefined || score === null || score === '') continue;
-          
-          const scoreStr = String(score).trim().toUpperCase();
-          if (scoreStr === '-' || scoreStr === 'GR' || scoreStr === 'DZ' || scoreStr === 'NAN') continue;
-          
-          const numScore = parseFloat(score);
-          if (!isNaN(numScore)) {
-            lines.push(studentId + ', ' + qc.qid + ', ' + numScore);
-          }
-        }
-      }
+  <div style="background:var(--card); max-width:900px; margin:2rem auto; border-radius:16px; max-height:90vh; overflow:auto; box-shadow:0 25px 50px rgba(0,0,0,0.5);">
+    <div style="background:linear-gradient(135deg,#667eea,#764ba2); padding:1.5rem 2rem; border-radius:16px 16px 0 0; display:flex; justify-content:space-between; align-items:center;">
+      <h2 style="margin:0; color:white; font-size:1.5rem;">📖 Nasıl Hesaplanıyor?</h2>
+      <button onclick="closeHelpModal()" style="background:rgba(255,255,255,0.2); border:none; color:white; width:36px; height:36px; border-radius:50%; cursor:pointer; font-size:1.2rem;">✕</button>
+    </div>
+    <div style="padding:2rem; color:var(--text);">
       
-      if (lines.length > 0) {
-        document.querySelector('[name="scores_text"]').value = lines.join(NL);
-        const uniqueStudents = new Set(lines.map(l => l.split(',')[0].trim())).size;
-        alert('✅ ' + uniqueStudents + ' öğrenci için ' + lines.length + ' not yüklendi!\\n\\nSorular: ' + questionCols.map(q => q.qid).join(', '));
-      } else {
-        alert('⚠️ Excel dosyasında geçerli not verisi bulunamadı.');
-      }
-    } catch (err) {
-      alert('❌ Excel okuma hatası: ' + err.message);
-    } finally {
-      hideLoading();
-      input.value = '';
-    }
-  };
-  reader.readAsArrayBuffer(file);
-}
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#667eea; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📊 Genel Başarı Oranı</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #667eea;">
+          <p><strong>Formül:</strong></p>
+          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
+            Genel Başarı = (Tüm Öğrencilerin Başarı %'lerinin Toplamı) / Öğrenci Sayısı
+          </div>
+          <p style="margin-top:0.75rem;"><strong>Her Öğrencinin Başarısı:</strong></p>
+          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
+            Öğrenci Başarı % = (Aldığı Toplam Puan / Maksimum Puan) × 100
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: 3 öğrenci var. Başarıları: %80, %65, %72. Genel Başarı = (80+65+72)/3 = %72.3</em></p>
+        </div>
+      </div>
 
-// ============ ÖĞRENCİ RAPORU ============
-function openStudentReportModal(studentId, studentName) {
-  const modal = document.getElementById('studentReportModal');
-  if (modal) {
-    document.getElementById('studentReportTitle').textContent = studentName + ' - Bireysel Rapor';
-    document.getElementById('studentReportContent').innerHTML = '<div style="text-align:center;padding:2rem;"><div class="spinner"></div><p>Rapor yükleniyor...</p></div>';
-    modal.classList.add('active');
-    
-    fetch('/api/student-report/' + encodeURIComponent(studentId), {
-      credentials: 'same-origin'
-    })
-      .then(res => {
-        if (!res.ok) {
-          throw new Error('HTTP ' + res.status);
-        }
-        return res.text();
-      })
-      .then(text => {
-        try {
-          const data = JSON.parse(text);
-          if (data.error) {
-            document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger"><strong>Hata:</strong> ' + data.error + (data.detail ? '<pre style="font-size:0.7rem;margin-top:1rem;white-space:pre-wrap;">' + data.detail + '</pre>' : '') + '</div>';
-          } else {
-            document.getElementById('studentReportContent').innerHTML = data.html;
-          }
-        } catch(parseErr) {
-          document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger"><strong>JSON Parse Hatası:</strong><pre style="font-size:0.7rem;">' + text.substring(0, 500) + '</pre></div>';
-        }
-      })
-      .catch(e => {
-        document.getElementById('studentReportContent').innerHTML = '<div class="alert alert-danger">Rapor yüklenemedi: ' + e.message + '</div>';
-      });
-  }
-}
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#10b981; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📚 DÖÇ (Ders Öğrenme Çıktısı) Başarısı</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #10b981;">
+          <p><strong>Adım 1:</strong> Her sorunun hangi DÖÇ'ü ölçtüğü belirlenir (Soru Eşleştirme)</p>
+          <p><strong>Adım 2:</strong> O DÖÇ'e ait tüm sorulardan öğrencilerin aldığı puanlar toplanır</p>
+          <p><strong>Adım 3:</strong> Maksimum alınabilecek puana bölünür</p>
+          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
+            DÖÇ-1 Başarı = Σ(DÖÇ-1 sorularından alınan puanlar) / Σ(DÖÇ-1 sorularının max puanları) × 100
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: DÖÇ-1'i ölçen S1(20p), S3(30p), S5(10p) var. Sınıf ortalaması: S1=15, S3=22, S5=8 puan. DÖÇ-1 = (15+22+8)/(20+30+10) = 45/60 = %75</em></p>
+        </div>
+      </div>
 
-function closeStudentReportModal() {
-  const modal = document.getElementById('studentReportModal');
-  if (modal) modal.classList.remove('active');
-}
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#8b5cf6; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🎯 PÖÇ (Program Öğrenme Çıktısı) Başarısı</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #8b5cf6;">
+          <p><strong>Adım 1:</strong> Her DÖÇ'ün hangi PÖÇ'e katkı sağladığı belirlenir (DÖÇ-PÖÇ Ağırlıkları)</p>
+          <p><strong>Adım 2:</strong> Ağırlıklı ortalama hesaplanır</p>
+          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
+            PÖÇ-1 Başarı = Σ(DÖÇ_başarısı × Ağırlık) / Σ(Ağırlıklar)
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Örnek: PÖÇ-1'e DÖÇ-1(%75, ağırlık:2) ve DÖÇ-2(%60, ağırlık:1) katkı yapıyor. PÖÇ-1 = (75×2 + 60×1)/(2+1) = 210/3 = %70</em></p>
+        </div>
+      </div>
 
-// ============ DERS DEĞİŞTİRME FONKSİYONU ============
-
-function switchCourse(courseCode) {
-  if (!courseCode) return;
-  
-  console.log('[switchCourse] Ders değiştiriliyor:', courseCode);
-  
-  // Önce sunucuya bildir (user tablosunu güncelle), sonra sayfayı yenile
-  fetch('/api/switch-course', {
-    method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
-    body: JSON.stringify({ course_code: courseCode })
-  })
-  .then(res => {
-    console.log('[switchCourse] API response status:', res.status);
-    return res.json();
-  })
-  .then(data => {
-    console.log('[switchCourse] API response:', data);
-    if (data.success) {
-      console.log('[switchCourse] Başarılı, sayfa yenileniyor...');
-      window.location.reload();
-    } else {
-      console.error('[switchCourse] API hatası:', data.error);
-      alert('Ders değiştirme hatası: ' + (data.error || 'Bilinmeyen hata'));
-      window.location.reload();
-    }
-  })
-  .catch(err => {
-    console.error('[switchCourse] Fetch hatası:', err);
-    window.location.reload();
-  });
-}
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#f59e0b; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🧠 Bloom Taksonomisi Başarısı</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #f59e0b;">
+          <p><strong>Düzeyler:</strong> Bilgi (Hatırlama) → Kavrama (Anlama) → Uygulama → Analiz → Sentez → Değerlendirme</p>
+          <p style="margin-top:0.5rem;"><strong>Hesaplama:</strong> Her düzeye ait soruların başarı ortalaması</p>
+          <div style="background:#1e293b; padding:0.75rem; border-radius:6px; margin:0.5rem 0; font-family:monospace; color:#10b981;">
+            Uygulama Başarı = Σ(Uygulama düzeyi sorularından alınan) / Σ(Uygulama düzeyi max puanlar) × 100
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Üst düzey (Analiz, Sentez, Değerlendirme) düşük ise → Öğrenciler ezberleme yapıyor, derin öğrenme eksik</em></p>
+        </div>
+      </div>
+
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#06b6d4; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">📝 Harf Notu Hesaplama</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #06b6d4;">
+          <p><strong>Mutlak Değerlendirme Sistemi:</strong></p>
+          <div style="display:grid; grid-template-columns:repeat(auto-fit, minmax(80px, 1fr)); gap:0.5rem; margin-top:0.75rem;">
+            <span style="background:#10b981; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">AA: 90-100</span>
+            <span style="background:#22c55e; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">BA: 85-89</span>
+            <span style="background:#84cc16; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">BB: 75-84</span>
+            <span style="background:#eab308; color:black; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">CB: 65-74</span>
+            <span style="background:#f59e0b; color:black; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">CC: 55-64</span>
+            <span style="background:#f97316; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">DC: 50-54</span>
+            <span style="background:#ef4444; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">DD: 45-49</span>
+            <span style="background:#dc2626; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">FD: 40-44</span>
+            <span style="background:#991b1b; color:white; padding:0.25rem 0.5rem; border-radius:4px; text-align:center; font-size:0.85rem;">FF: 0-39</span>
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Not aralıkları Profil sayfasından özelleştirilebilir.</em></p>
+        </div>
+      </div>
 
-// ============ EXCEL IMPORT FONKSİYONLARI ============
+      <div style="margin-bottom:2rem;">
+        <h3 style="color:#ef4444; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">✅ Akreditasyon Başarı Kriterleri</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #ef4444;">
+          <div style="display:grid; grid-template-columns:repeat(3, 1fr); gap:1rem; margin-top:0.5rem;">
+            <div style="text-align:center; padding:0.75rem; background:#10b98122; border-radius:8px;">
+              <div style="font-size:1.5rem;">✓</div>
+              <div style="color:#10b981; font-weight:bold;">Sağlandı</div>
+              <div style="color:#94a3b8; font-size:0.85rem;">≥ %70</div>
+            </div>
+            <div style="text-align:center; padding:0.75rem; background:#f59e0b22; border-radius:8px;">
+              <div style="font-size:1.5rem;">⚠</div>
+              <div style="color:#f59e0b; font-weight:bold;">Kısmen</div>
+              <div style="color:#94a3b8; font-size:0.85rem;">%50 - %69</div>
+            </div>
+            <div style="text-align:center; padding:0.75rem; background:#ef444422; border-radius:8px;">
+              <div style="font-size:1.5rem;">✗</div>
+              <div style="color:#ef4444; font-weight:bold;">Sağlanmadı</div>
+              <div style="color:#94a3b8; font-size:0.85rem;">< %50</div>
+            </div>
+          </div>
+          <p style="margin-top:0.75rem; color:#94a3b8;"><em>Bu eşik değerleri akreditasyon kurumu gereksinimlerine göre Profil'den ayarlanabilir.</em></p>
+        </div>
+      </div>
 
+      <div style="margin-bottom:1rem;">
+        <h3 style="color:#3b82f6; margin-bottom:0.75rem; display:flex; align-items:center; gap:0.5rem;">🤖 AI Destekli Sistem Önerileri</h3>
+        <div style="background:var(--bg); padding:1rem; border-radius:8px; border-left:4px solid #3b82f6;">
+          <p><strong>Yapay zeka şunları analiz eder:</strong></p>
+          <ul style="margin:0.5rem 0 0 1.5rem; color:#94a3b8;">
+            <li>Başarısız DÖÇ, PÖÇ ve PEA'ları tespit eder</li>
+            <li>Bloom taksonomisi eksikliklerini belirler</li>
+            <li>Ölçülmemiş veya az ölçülmüş çıktıları saptar</li>
+            <li>Her sorun için spesifik çözüm önerisi sunar</li>
+            <li>Acil müdahale gerektiren alanları vurgular</li>
+          </ul>
+        </div>
+      </div>
 
+    </div>
+  </div>
+</div>
 
-</script>
+{static_assets.script_tag("app.js")}
 </body>
 </html>
 """
@@ -3762,21 +1272,57 @@ def get_empty_form_defaults() -> Dict[str, str]:
     return defaults
 
 
+# Rapor şablonları (render_tables / render_v2_report) değiştiğinde artırın -
+# önbellekteki PDF'ler bu sürümle anahtarlandığı için kendiliğinden geçersiz olur
+REPORT_TEMPLATE_VERSION = "1"
+
+_PDF_RENDERER_ID = None
+
+
+def pdf_renderer_id() -> str:
+    """PDF üreticisinin kimliği (önbellek anahtarı için)"""
+    global _PDF_RENDERER_ID
+    if _PDF_RENDERER_ID is None:
+        _PDF_RENDERER_ID = "reportlab"
+        if render_pool.HAS_WEASYPRINT:
+            try:
+                from importlib.metadata import version
+                _PDF_RENDERER_ID = f"weasyprint-{version('weasyprint')}"
+            except Exception:
+                _PDF_RENDERER_ID = "weasyprint"
+    return _PDF_RENDERER_ID
+
+
+def export_report_pdf(result: Dict[str, Any], out_path: Path, variant: str = "main") -> str:
+    """Raporu (main: standart, v2: V2) PDF'e dönüştür; WeasyPrint yoksa ya da render
+    başarısızsa legacy PDF. PDF'i üreten renderer'ın kimliğini döndürür (önbellek
+    anahtarı için - yedek PDF WeasyPrint anahtarıyla saklanmasın, isteğe bağlı bölümü
+    hata veren PDF "-partial" ekiyle); PDF oluşmadıysa ""."""
+    degraded = track_degraded()
+    if variant == "v2":
+        html = render_v2_report(result)
+    else:
+        html = render_tables(result, standalone=True)
+    renderer = pdf_renderer_id()
+    if not export_pdf_from_html(html, out_path):
+        legacy_pdf(result, str(out_path))
+        renderer = "reportlab"
+    if degraded:
+        renderer += "-partial"
+    return renderer if out_path.exists() else ""
+
+
 def export_pdf_from_html(html: str, out_path: Path):
-    """Render verilen HTML'i PDF'e dönüştür. Başarılıysa True, aksi halde False."""
-    try:
-        from weasyprint import HTML  # type: ignore
-    except Exception:
-        out_path.with_suffix(".html").write_text(html, encoding="utf-8")
-        return False
-    try:
-        HTML(string=html, base_url=str(Path(__file__).parent)).write_pdf(out_path)
+    """Render verilen HTML'i PDF'e dönüştür. Başarılıysa True, aksi halde False.
+    Render, WeasyPrint'in sıcak tutulduğu render_pool worker'larında yapılır."""
+    if render_pool.render_pdf(html, out_path):
         return True
-    except Exception:
-        out_path.with_suffix(".html").write_text(html, encoding="utf-8")
-        return False
+    out_path.with_suffix(".html").write_text(html, encoding="utf-8")
+    return False
 
 def build_payload_from_form(values: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    # DÖÇ/PÖÇ/PEA listeleri, eşleştirmeler ve soru haritası kayıtlı metinle aynıysa
+    # outcome_store tablolarından kurulur, değilse ayrıştırılır (çıktı aynı)
     raw_json = values.get("payload_json_raw", "").strip()
     if raw_json:
         payload = json.loads(raw_json)
@@ -3819,30 +1365,30 @@ def build_payload_from_form(values: Dict[str, str]) -> Tuple[Dict[str, Any], Dic
             "term": values.get("term", ""),
             "instructor": values.get("instructor", ""),
         },
-        "curriculum": parse_curriculum(values.get("curriculum_text", "")),
-        "tyc": parse_docs(values.get("tyc_text", "")),
-        "stark": parse_docs(values.get("stark_text", "")),
-        "docs": parse_docs(values.get("docs_text", "")),
-        "pocs": parse_pocs(values.get("pocs_text", "")),
-        "peas": parse_peas(values.get("peas_text", "")),
+        "curriculum": outcome_store.compiled("curriculum", values.get("curriculum_text", "")),
+        "tyc": outcome_store.compiled("docs", values.get("tyc_text", "")),
+        "stark": outcome_store.compiled("docs", values.get("stark_text", "")),
+        "docs": outcome_store.compiled("docs", values.get("docs_text", "")),
+        "pocs": outcome_store.compiled("pocs", values.get("pocs_text", "")),
+        "peas": outcome_store.compiled("peas", values.get("peas_text", "")),
         "bloom": bloom_list,
         "assessments": parse_assessments(values.get("assessments_text", "")),
         "students": parse_students(values.get("students_text", "")),
         "scores": parse_scores(values.get("scores_text", "")),
-        "doc_tyc_map": parse_generic_map(values.get("doc_tyc_map_text", ""), "DOC->TYÇ"),
-        "poc_tyc_map": parse_generic_map(values.get("poc_tyc_map_text", ""), "POC->TYÇ"),
-        "pea_stark_map": parse_generic_map(values.get("pea_stark_map_text", ""), "PEA->STAR-K"),
-        "doc_pea_map": parse_generic_map(values.get("doc_pea_map_text", ""), "DOC->PEA"),
-        "doc_stark_map": parse_generic_map(values.get("doc_stark_map_text", ""), "DOC->STARK"),
+        "doc_tyc_map": outcome_store.compiled("map", values.get("doc_tyc_map_text", ""), "DOC->TYÇ"),
+        "poc_tyc_map": outcome_store.compiled("map", values.get("poc_tyc_map_text", ""), "POC->TYÇ"),
+        "pea_stark_map": outcome_store.compiled("map", values.get("pea_stark_map_text", ""), "PEA->STAR-K"),
+        "doc_pea_map": outcome_store.compiled("map", values.get("doc_pea_map_text", ""), "DOC->PEA"),
+        "doc_stark_map": outcome_store.compiled("map", values.get("doc_stark_map_text", ""), "DOC->STARK"),
         "thresholds": {"met": thresholds_met, "partially": thresholds_partial},
         "grading": grading,
     }
     
     # ÖNCE form'dan gelen ayrı eşleştirmeleri al
-    form_doc_poc_weights = parse_doc_poc_weights(values.get("doc_poc_weights_text", ""))
-    form_poc_pea_map = parse_poc_pea_map(values.get("poc_pea_map_text", ""))
+    form_doc_poc_weights = outcome_store.compiled("doc_poc_weights", values.get("doc_poc_weights_text", ""))
+    form_poc_pea_map = outcome_store.compiled("poc_pea_map", values.get("poc_pea_map_text", ""))
     
-    qmap = parse_question_map(values.get("question_map_text", ""))
+    qmap = outcome_store.compiled("question_map", values.get("question_map_text", ""))
     if qmap and qmap.get("questions"):
         payload["questions"] = qmap.get("questions", [])
         # Soru bazlı eşleştirmeler
@@ -3884,15 +1430,219 @@ def build_payload_from_form(values: Dict[str, str]) -> Tuple[Dict[str, Any], Dic
         payload["poc_pea_map"] = form_poc_pea_map
     
     # Müfredat-DÖÇ eşleştirmesini ekle
-    payload["curriculum_doc_map"] = parse_generic_map(values.get("curriculum_doc_map_text", ""), "Curriculum->DÖÇ")
+    payload["curriculum_doc_map"] = outcome_store.compiled("map", values.get("curriculum_doc_map_text", ""), "Curriculum->DÖÇ")
     return payload, form_defaults_from_payload(payload)
 
 
+# =============================================================================
+# RAPOR STİL SAYFALARI
+# Sabit CSS modül düzeyinde tutulur: render_pool worker'ları bunları bir kez
+# ayrıştırır (preparse) ve her PDF'te yeniden parse etmez.
+# =============================================================================
+
+STANDARD_REPORT_CSS = """@page { size: A4; margin: 1cm; }
+@media print {
+  .no-print { display: none !important; }
+  body { background: white !important; padding: 0 !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+  .container { max-width: 100% !important; }
+  .box { break-inside: avoid; page-break-inside: avoid; box-shadow: none !important; border: 1px solid #ccc !important; }
+  .stats-grid { display: block !important; }
+  .stat-card { display: inline-block !important; width: 23% !important; margin: 0.5% !important; box-shadow: none !important; }
+  table { font-size: 0.75rem !important; }
+  th, td { padding: 0.5rem !important; }
+}
+*{margin:0;padding:0;box-sizing:border-box;}
+body{font-family:'Inter',-apple-system,BlinkMacSystemFont,sans-serif;background:#f1f5f9;padding:2rem;color:#1e293b;}
+.container{max-width:1200px;margin:0 auto;}
+.box{background:white;border:1px solid #e2e8f0;border-radius:12px;padding:1.5rem;margin-bottom:1.5rem;}
+h2{font-size:1.1rem;margin-bottom:1rem;color:#1e293b;}
+table{width:100%;border-collapse:collapse;margin:1rem 0;}
+th,td{padding:0.75rem;text-align:left;border-bottom:1px solid #e2e8f0;font-size:0.85rem;}
+th{background:#f8fafc;font-weight:600;}
+.badge{display:inline-block;padding:0.25rem 0.5rem;border-radius:6px;font-size:0.75rem;font-weight:600;}
+.badge-success{background:#ecfdf5;color:#059669;}
+.badge-warning{background:#fffbeb;color:#d97706;}
+.badge-danger{background:#fef2f2;color:#dc2626;}
+.row-success{background:#ecfdf5;}
+.row-warning{background:#fffbeb;}
+.row-danger{background:#fef2f2;}
+.stats-grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(150px,1fr));gap:1rem;margin-bottom:1.5rem;}
+.stat-card{background:white;border:1px solid #e2e8f0;border-radius:12px;padding:1.25rem;text-align:center;}
+.stat-value{font-size:1.5rem;font-weight:700;}
+.stat-value.success{color:#059669;}
+.stat-value.warning{color:#d97706;}
+.stat-value.danger{color:#dc2626;}
+.stat-label{font-size:0.75rem;color:#64748b;margin-top:0.25rem;}
+.btn-group{display:flex;gap:0.75rem;flex-wrap:wrap;margin-top:1.5rem;}
+.btn{padding:0.75rem 1.25rem;border-radius:8px;font-weight:600;text-decoration:none;display:inline-block;font-size:0.85rem;border:none;cursor:pointer;}
+.btn-success{background:#059669;color:white;}
+.btn-purple{background:#7c3aed;color:white;}
+.btn-secondary{background:#64748b;color:white;border:none;cursor:pointer;}
+.btn-ghost{background:transparent;color:#64748b;border:1px solid #e2e8f0;}
+.text-muted{color:#64748b;font-size:0.85rem;}
+"""
+
+V2_REPORT_CSS = """@page { size: A4; margin: 1cm; }
+@media print {
+  body { background: white !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }
+  .no-print { display: none !important; }
+  .page-break { page-break-before: always; }
+  .card, .section, .alert, .info-box { break-inside: avoid; page-break-inside: avoid; }
+  .page { padding: 0.5cm !important; max-width: 100% !important; }
+  .hero { padding: 1rem !important; background: #f5f5f5 !important; }
+  .hero h1 { background: none !important; -webkit-text-fill-color: #7c8bf8 !important; color: #7c8bf8 !important; }
+  .score-ring::before { display: none !important; }
+  .grid-2, .grid-3 { display: block !important; }
+  .card { margin-bottom: 0.75rem !important; box-shadow: none !important; border: 1px solid #ccc !important; }
+  .stat-box { box-shadow: none !important; }
+}
+*{margin:0;padding:0;box-sizing:border-box;}
+body{font-family:'Inter',-apple-system,BlinkMacSystemFont,sans-serif;background:#f8f7f3;min-height:100vh;color:#1f1f1a;line-height:1.6;}
+.page{max-width:1400px;margin:0 auto;padding:2rem;}
+.hero{text-align:center;padding:2rem;background:linear-gradient(135deg,rgba(124,139,248,0.12) 0%,rgba(240,139,160,0.12) 100%);border-radius:20px;border:1px solid #d7d3c8;margin-bottom:2rem;}
+.hero h1{font-size:1.75rem;font-weight:800;background:linear-gradient(135deg,#7c8bf8 0%,#f08ba0 100%);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;margin-bottom:0.5rem;}
+.hero .subtitle{color:#3b3b32;font-size:1rem;}
+.hero .meta{display:flex;justify-content:center;gap:2rem;margin-top:1rem;flex-wrap:wrap;font-size:0.85rem;color:#6b6b61;}
+.hero .meta strong{color:#1f1f1a;}
+.info-box{background:#f6f4ee;border:1px solid #d7d3c8;border-radius:12px;padding:1rem;margin:1rem 0;font-size:0.85rem;color:#3b3b32;}
+.info-box h4{margin-bottom:0.5rem;color:#7c8bf8;}
+.score-section{display:flex;justify-content:center;align-items:center;gap:2.5rem;margin:2rem 0;flex-wrap:wrap;}
+.score-ring::before{content:'';position:absolute;inset:10px;border-radius:50%;background:#f8f7f3;border:1px solid #d7d3c8;}
+.score-inner{position:relative;text-align:center;}
+.score-inner .label{font-size:0.7rem;color:#6b6b61;text-transform:uppercase;letter-spacing:1px;}
+.stats-row{display:flex;gap:1rem;flex-wrap:wrap;}
+.stat-box{background:#ffffff;border:1px solid #d7d3c8;border-radius:12px;padding:1rem 1.25rem;text-align:center;min-width:100px;box-shadow:0 6px 14px rgba(0,0,0,0.06);}
+.stat-box .num{font-size:1.5rem;font-weight:700;color:#1f1f1a;}
+.stat-box .txt{font-size:0.7rem;color:#6b6b61;text-transform:uppercase;margin-top:0.25rem;}
+.section{margin:2rem 0;}
+.section-title{font-size:0.85rem;font-weight:700;color:#7c8bf8;text-transform:uppercase;letter-spacing:1px;margin-bottom:1rem;padding-bottom:0.5rem;border-bottom:2px solid #d7d3c8;display:flex;align-items:center;gap:0.5rem;}
+.grid-2{display:grid;grid-template-columns:repeat(auto-fit,minmax(380px,1fr));gap:1.25rem;}
+.grid-3{display:grid;grid-template-columns:repeat(auto-fit,minmax(280px,1fr));gap:1.25rem;}
+.card{background:#ffffff;border:1px solid #d7d3c8;border-radius:16px;padding:1.25rem;box-shadow:0 8px 18px rgba(0,0,0,0.04);}
+.card-header{display:flex;align-items:center;gap:0.75rem;margin-bottom:1rem;padding-bottom:0.75rem;border-bottom:1px solid #e4e0d6;}
+.card-icon{width:40px;height:40px;border-radius:10px;display:flex;align-items:center;justify-content:center;font-size:1.1rem;}
+.card-title{font-size:0.9rem;font-weight:600;color:#1f1f1a;}
+.card-subtitle{font-size:0.75rem;color:#6b6b61;}
+.card-description{font-size:0.8rem;color:#3b3b32;margin-bottom:1rem;padding:0.75rem;background:#f6f4ee;border-radius:8px;border-left:3px solid #7c8bf8;}
+.progress-item{margin-bottom:0.75rem;}
+.progress-header{display:flex;justify-content:space-between;margin-bottom:0.25rem;font-size:0.8rem;}
+.progress-label{color:#6b6b61;}
+.progress-label small{color:#6b6b61;font-size:0.7rem;display:block;}
+.progress-value{font-weight:600;}
+.progress-bar{height:8px;background:#ece9e2;border-radius:4px;overflow:hidden;}
+.progress-fill{height:100%;border-radius:4px;transition:width 0.8s ease;}
+table{width:100%;border-collapse:collapse;font-size:0.8rem;margin-top:0.5rem;}
+th{padding:0.625rem;text-align:left;font-size:0.7rem;font-weight:600;text-transform:uppercase;letter-spacing:0.5px;color:#6b6b61;background:#f6f4ee;}
+th:first-child{border-radius:8px 0 0 0;}
+th:last-child{border-radius:0 8px 0 0;}
+td{padding:0.625rem;border-bottom:1px solid #e4e0d6;color:#1f1f1a;}
+tr:hover td{background:rgba(124,139,248,0.08);}
+.badge{display:inline-flex;padding:0.2rem 0.5rem;font-size:0.7rem;font-weight:600;border-radius:4px;margin:0.1rem;}
+.badge-success{background:rgba(47,133,90,0.15);color:#2f855a;}
+.badge-warning{background:rgba(197,106,0,0.15);color:#c56a00;}
+.badge-danger{background:rgba(214,63,63,0.15);color:#d63f3f;}
+.badge-info{background:rgba(124,139,248,0.15);color:#7c8bf8;}
+.alert{padding:1rem;border-radius:10px;margin:1rem 0;}
+.alert-warning{background:rgba(197,106,0,0.12);border:1px solid rgba(197,106,0,0.25);color:#c56a00;}
+.alert-danger{background:rgba(214,63,63,0.12);border:1px solid rgba(214,63,63,0.25);color:#d63f3f;}
+.alert-success{background:rgba(47,133,90,0.12);border:1px solid rgba(47,133,90,0.25);color:#2f855a;}
+.alert h4{margin-bottom:0.5rem;display:flex;align-items:center;gap:0.5rem;}
+.alert ul{margin:0.5rem 0 0 1.25rem;}
+.alert li{margin-bottom:0.375rem;font-size:0.85rem;}
+.relation-matrix{overflow-x:auto;}
+.relation-table td{vertical-align:middle;}
+.relation-arrow{color:#7c8bf8;font-weight:bold;padding:0 0.5rem;}
+.bloom-grid{display:grid;grid-template-columns:repeat(6,1fr);gap:0.5rem;}
+.bloom-item{background:#ffffff;border-radius:10px;padding:0.75rem 0.5rem;text-align:center;border:1px solid #e4e0d6;}
+.bloom-item .level{font-size:0.6rem;color:#6b6b61;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:0.25rem;}
+.bloom-item .pct{font-size:1.25rem;font-weight:700;color:#1f1f1a;}
+.bloom-item .count{font-size:0.65rem;color:#6b6b61;}
+.question-grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(42px,1fr));gap:0.375rem;}
+.q-cell{aspect-ratio:1;border-radius:6px;display:flex;align-items:center;justify-content:center;font-weight:600;font-size:0.7rem;cursor:default;transition:transform 0.2s;background:#f6f4ee;border:1px solid #e4e0d6;color:#1f1f1a;}
+.q-cell:hover{transform:scale(1.15);z-index:1;box-shadow:0 6px 14px rgba(0,0,0,0.08);}
+.week-bar{display:flex;align-items:center;gap:0.5rem;margin-bottom:0.5rem;}
+.week-label{width:60px;font-size:0.75rem;color:#6b6b61;text-align:right;}
+.week-fill{height:28px;border-radius:4px;display:flex;align-items:center;padding:0 0.75rem;font-size:0.75rem;font-weight:500;color:#1f1f1a;}
+.student-row{display:flex;align-items:center;gap:0.5rem;padding:0.375rem 0.5rem;border-radius:6px;margin-bottom:0.25rem;}
+.student-row:nth-child(odd){background:#f6f4ee;}
+.student-rank{width:22px;height:22px;border-radius:5px;display:flex;align-items:center;justify-content:center;font-size:0.65rem;font-weight:600;}
+.student-name{flex:1;font-size:0.8rem;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}
+.student-score{font-size:0.8rem;font-weight:600;width:45px;text-align:right;}
+.student-grade{width:32px;text-align:center;font-size:0.7rem;font-weight:600;border-radius:4px;padding:0.15rem;}
+.mini-bar{width:80px;height:5px;background:#ece9e2;border-radius:3px;overflow:hidden;}
+.mini-fill{height:100%;border-radius:3px;}
+.check-list{list-style:none;padding:0;}
+.check-list li{padding:0.5rem 0;border-bottom:1px solid #e4e0d6;display:flex;align-items:flex-start;gap:0.5rem;font-size:0.85rem;color:#1f1f1a;}
+.check-list li:last-child{border-bottom:none;}
+.check-list .icon{font-size:1rem;flex-shrink:0;}
+.suggestions{background:linear-gradient(135deg,rgba(124,139,248,0.08) 0%,rgba(240,139,160,0.08) 100%);border:1px solid #d7d3c8;border-radius:16px;padding:1.25rem;}
+.suggestions h3{display:flex;align-items:center;gap:0.5rem;margin-bottom:0.75rem;color:#7c8bf8;font-size:0.9rem;}
+.suggestions ul{list-style:none;padding:0;}
+.suggestions li{padding:0.625rem 1rem;background:#f6f4ee;border-radius:8px;margin-bottom:0.375rem;border-left:3px solid #7c8bf8;font-size:0.85rem;color:#1f1f1a;}
+.back-btn{display:inline-flex;align-items:center;gap:0.5rem;padding:0.75rem 1.25rem;background:linear-gradient(135deg,#7c8bf8 0%,#f08ba0 100%);color:white;text-decoration:none;border-radius:10px;font-weight:600;font-size:0.85rem;margin-right:0.75rem;transition:all 0.2s;}
+.back-btn:hover{transform:translateY(-2px);box-shadow:0 6px 20px rgba(124,139,248,0.3);}
+.footer{text-align:center;margin-top:2rem;padding-top:1.5rem;border-top:1px solid #d7d3c8;color:#6b6b61;font-size:0.8rem;}
+"""
+
+# render_pool'un önceden ayrıştırdığı ortak stil sayfaları
+SHARED_REPORT_STYLESHEETS = {
+    "standard": STANDARD_REPORT_CSS,
+    "v2": V2_REPORT_CSS,
+}
+
+
+# Akışla gönderilen raporlarda öğrenci tablosu bu kadar satırda bir gönderilir
+STREAM_CHUNK_ROWS = int(os.environ.get("AKREDIX_STREAM_CHUNK_ROWS", "200"))
+
+
+class _Chunks:
+    """Üreteç renderer'lar için parça tamponu: out.append() ile biriktirilen
+    parçaları drain() ile tek chunk olarak verir. Chunk'lar art arda
+    birleştirildiğinde sep.join(tüm parçalar) ile aynı çıktı oluşur."""
+
+    def __init__(self, sep: str):
+        self.sep = sep
+        self.parts: List[str] = []
+        self.started = False
+
+    def append(self, part: str):
+        self.parts.append(part)
+
+    def drain(self) -> List[str]:
+        if not self.parts:
+            return []
+        chunk = self.sep.join(self.parts)
+        self.parts.clear()
+        if self.started:
+            chunk = self.sep + chunk
+        self.started = True
+        return [chunk]
+
+
+def virtual_table(view: str, table: str, total: int, report_id: int = None, full_url: str = "",
+                  status: str = "", thresholds: Dict[str, Any] = None) -> str:
+    """Büyük tablo yer tutucusu - satırlar virtual_table.js ile /api/report-table'dan çekilir"""
+    source = f"/api/report-table/{table}" + (f"?report_id={report_id}" if report_id else "")
+    thresholds = thresholds or {}
+    return (f"<div class='vt' data-vt-view='{view}' data-vt-source='{source}' data-vt-total='{total}'"
+            f" data-vt-full-url='{esc(full_url)}' data-vt-status='{status}'"
+            f" data-vt-met='{thresholds.get('met', 70)}' data-vt-partially='{thresholds.get('partially', 50)}'>"
+            f"<p class='text-muted'>{total} satır yükleniyor...</p></div>")
+
+
 # =============================================================================
 # RENDER TABLES - DETAYLI STANDART RAPOR
 # =============================================================================
 
-def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: int = None) -> str:
+def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: int = None,
+                  virtual_tables: bool = False) -> str:
+    return "".join(iter_render_tables(result, standalone=standalone, report_id=report_id, virtual_tables=virtual_tables))
+
+
+def iter_render_tables(result: Dict[str, Any], standalone: bool = False, report_id: int = None,
+                       virtual_tables: bool = False) -> Iterator[str]:
+    """Standart raporu bölüm bölüm üret - parçalar birleşince render_tables çıktısının aynısı.
+    virtual_tables: büyük öğrenci/soru tabloları gömülmez, sayfalı JSON'dan çekilir (ekran görünümü)"""
     curriculum = result.get("curriculum", [])
     tyc = result.get("tyc", [])
     stark = result.get("stark", [])
@@ -3923,7 +1673,26 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
         if p >= thresholds.get("partially", 50): return "row-warning"
         return "row-danger"
 
-    out = []
+    full_url = f"/report-history/{report_id}/standard?full=1" if standalone and report_id else "/report-standalone?full=1"
+    virtual_students = virtual_tables and report_tables.should_virtualize(result, "students")
+    virtual_questions = virtual_tables and report_tables.should_virtualize(result, "questions")
+
+    out = _Chunks("" if standalone else "\n")
+    if standalone:
+        course_name = course.get('course_name', 'Rapor')
+        yield f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Standart Rapor - {esc(course_name)}</title>
+<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
+<style>
+{STANDARD_REPORT_CSS}</style>
+</head>
+<body>
+<div class="container">
+"""
+
     overall_pct = overall.get("success_pct", 0)
     pct_cls = "success" if overall_pct >= 70 else ("warning" if overall_pct >= 50 else "danger")
     
@@ -3937,6 +1706,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
     </div>
     """)
 
+    yield from out.drain()
+
     # Müfredat / TYÇ / STAR-K
     if curriculum or tyc or stark:
         out.append("<div class='box'><h2>📚 Müfredat / TYÇ / STAR-K Çıktıları</h2>")
@@ -3950,6 +1721,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr><td><span class='badge badge-danger'>STAR-K</span></td><td><strong>{esc(item.get('id',''))}</strong></td><td>{esc(item.get('text',''))}</td></tr>")
         out.append("</table></div>")
 
+    yield from out.drain()
+
     # İlişki Haritaları - Kapsamlı
     has_any_mapping = doc_tyc_map or poc_tyc_map or pea_stark_map or doc_poc_weights or poc_pea_map or doc_pea_map or doc_stark_map
     if has_any_mapping:
@@ -3994,21 +1767,28 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr><td><strong>{esc(aid)}</strong></td><td>PEA → STARK</td><td>{chips or empty_html}</td></tr>")
         out.append("</table></div>")
 
+    yield from out.drain()
+
     # Soru Haritası
     if input_questions:
         out.append("<div class='box'><h2 class='collapsible'>❓ Soru-Çıktı Eşleme Tablosu</h2><div class='collapsible-content'>")
         out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Her sorunun hangi çıktıları ölçtüğü</p>")
-        out.append("<table><tr><th>Soru</th><th>Hafta</th><th>Bileşen</th><th>DÖÇ</th><th>PÖÇ</th><th>PEA</th><th>Bloom</th><th>TYÇ</th><th>STAR-K</th><th>Müfredat</th><th>Puan</th></tr>")
-        for q in input_questions:
-            poc_txt = ", ".join(q.get("poc_list", []))
-            pea_txt = ", ".join(q.get("pea_list", []))
-            doc_ids = q.get("doc_ids") or [q.get("doc_id", "")]
-            bloom_txt = ", ".join(q.get("bloom_list", []) or [q.get("bloom", "")])
-            tyc_txt = ", ".join(q.get("tyc_list", []))
-            stark_txt = ", ".join(q.get("stark_list", []))
-            curriculum_txt = ", ".join(q.get("curriculum_list", []))
-            out.append(f"<tr><td><strong>{esc(q.get('id',''))}</strong></td><td>{esc(q.get('week',''))}</td><td>{esc(q.get('component_id',''))}</td><td>{esc(', '.join(doc_ids))}</td><td>{esc(poc_txt)}</td><td>{esc(pea_txt)}</td><td>{esc(bloom_txt)}</td><td>{esc(tyc_txt)}</td><td>{esc(stark_txt)}</td><td>{esc(curriculum_txt)}</td><td>{q.get('max_points',0)}</td></tr>")
-        out.append("</table></div></div>")
+        if virtual_questions:
+            out.append(virtual_table("questions-map", "questions", len(input_questions), report_id, full_url) + "</div></div>")
+        else:
+            out.append("<table><tr><th>Soru</th><th>Hafta</th><th>Bileşen</th><th>DÖÇ</th><th>PÖÇ</th><th>PEA</th><th>Bloom</th><th>TYÇ</th><th>STAR-K</th><th>Müfredat</th><th>Puan</th></tr>")
+            for q in input_questions:
+                poc_txt = ", ".join(q.get("poc_list", []))
+                pea_txt = ", ".join(q.get("pea_list", []))
+                doc_ids = q.get("doc_ids") or [q.get("doc_id", "")]
+                bloom_txt = ", ".join(q.get("bloom_list", []) or [q.get("bloom", "")])
+                tyc_txt = ", ".join(q.get("tyc_list", []))
+                stark_txt = ", ".join(q.get("stark_list", []))
+                curriculum_txt = ", ".join(q.get("curriculum_list", []))
+                out.append(f"<tr><td><strong>{esc(q.get('id',''))}</strong></td><td>{esc(q.get('week',''))}</td><td>{esc(q.get('component_id',''))}</td><td>{esc(', '.join(doc_ids))}</td><td>{esc(poc_txt)}</td><td>{esc(pea_txt)}</td><td>{esc(bloom_txt)}</td><td>{esc(tyc_txt)}</td><td>{esc(stark_txt)}</td><td>{esc(curriculum_txt)}</td><td>{q.get('max_points',0)}</td></tr>")
+            out.append("</table></div></div>")
+
+    yield from out.drain()
 
     # Soru Kapsamı
     if coverage:
@@ -4026,20 +1806,26 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                 out.append(f"<tr class='total'><td colspan='2'><strong>TOPLAM {label}</strong></td><td>{sum(it.get('count',0) for it in items)}</td><td>%{total_pct:.1f}</td><td>%100</td></tr>")
         out.append("</table></div></div>")
 
+    yield from out.drain()
+
     # Soru Doğru/Yanlış
     if question_outcomes:
         per_q = question_outcomes.get("per_question", {})
         if per_q:
             out.append("<div class='box'><h2 class='collapsible'>✅ Soru Bazlı Başarı Analizi</h2><div class='collapsible-content'>")
             out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Öğrencilerin her sorudaki performansı</p>")
-            out.append("<table><tr><th>Soru</th><th>Doğru %</th><th>Yanlış %</th><th>Ortalama</th><th>Max</th><th>DÖÇ</th><th>Bloom</th></tr>")
-            for qid, data in sorted(per_q.items()):
-                q = data.get("question", {})
-                doc_ids = q.get("doc_ids") or [q.get("doc_id", "")]
-                bloom_txt = ", ".join(q.get("bloom_list", []) or [q.get("bloom", "")])
-                cls = pct_class(data.get("correct_pct", 0.0))
-                out.append(f"<tr class='{cls}'><td><strong>{esc(qid)}</strong></td><td>%{data.get('correct_pct',0):.1f}</td><td>%{data.get('incorrect_pct',0):.1f}</td><td>{data.get('avg_score',0):.1f}</td><td>{data.get('max_points',0):.0f}</td><td>{esc(', '.join(doc_ids))}</td><td>{esc(bloom_txt)}</td></tr>")
-            out.append("</table></div></div>")
+            if virtual_questions:
+                out.append(virtual_table("questions-outcomes", "questions", len(input_questions), report_id, full_url,
+                                         thresholds=thresholds) + "</div></div>")
+            else:
+                out.append("<table><tr><th>Soru</th><th>Doğru %</th><th>Yanlış %</th><th>Ortalama</th><th>Max</th><th>DÖÇ</th><th>Bloom</th></tr>")
+                for qid, data in sorted(per_q.items()):
+                    q = data.get("question", {})
+                    doc_ids = q.get("doc_ids") or [q.get("doc_id", "")]
+                    bloom_txt = ", ".join(q.get("bloom_list", []) or [q.get("bloom", "")])
+                    cls = pct_class(data.get("correct_pct", 0.0))
+                    out.append(f"<tr class='{cls}'><td><strong>{esc(qid)}</strong></td><td>%{data.get('correct_pct',0):.1f}</td><td>%{data.get('incorrect_pct',0):.1f}</td><td>{data.get('avg_score',0):.1f}</td><td>{data.get('max_points',0):.0f}</td><td>{esc(', '.join(doc_ids))}</td><td>{esc(bloom_txt)}</td></tr>")
+                out.append("</table></div></div>")
 
         # Yanlış yapılan soruların kapsamı
         wrong_cov = question_outcomes.get("wrong_coverage", {})
@@ -4054,6 +1840,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                     out.append(f"<tr class='{cls}'><td>{label}</td><td><strong>{esc(item['id'])}</strong></td><td>{item['count']}</td><td>%{item['pct']:.1f}</td></tr>")
             out.append("</table></div></div>")
 
+    yield from out.drain()
+
     # Eksik İlişkiler - BİLGİLENDİRME (zorunlu değil)
     def _missing(def_ids: List[str], cov_key: str) -> List[str]:
         cov_ids = {c["id"] for c in coverage.get(cov_key, [])}
@@ -4088,6 +1876,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<li><span class='icon'>🔗</span><div><strong>STAR-K ile eşlenmemiş PEA:</strong> {esc(', '.join(pea_no_stark))}</div></li>")
         out.append("</ul></div>")
 
+    yield from out.drain()
+
     # Ölçme Planı
     out.append("<div class='box'><h2>⚖️ Ölçme Planı (Bileşenler)</h2>")
     out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Vize, Final vb. bileşenlerin ağırlıkları ve başarı durumu</p>")
@@ -4097,6 +1887,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
         out.append(f"<tr class='{cls}'><td><strong>{esc(cs.get('name', cid))}</strong></td><td>%{cs.get('weight',0)*100:.0f}</td><td>{cs.get('avg_points',0):.2f}</td><td>{cs.get('max_points',0):.0f}</td><td>%{cs.get('success_pct',0):.1f}</td></tr>")
     out.append("</table></div>")
 
+    yield from out.drain()
+
     # DÖÇ Sonuçları
     out.append("<div class='box'><h2>📘 Ders Öğrenme Çıktıları (DÖÇ) Sonuçları</h2>")
     out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Her DÖÇ için öğrenci başarı durumu</p>")
@@ -4113,6 +1905,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr class='{cls}'><td><strong>{esc(did)}</strong></td><td>{esc(st.get('text',''))}</td><td>%{pct:.1f}</td><td><span class='badge {status_class(status)}'>{esc(status)}</span></td></tr>")
     out.append("</table></div>")
 
+    yield from out.drain()
+
     # PÖÇ Sonuçları
     out.append("<div class='box'><h2>🎓 Program Öğrenme Çıktıları (PÖÇ) Sonuçları</h2>")
     out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Her PÖÇ için hesaplanan başarı ve katkı sağlayan DÖÇler</p>")
@@ -4130,6 +1924,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr class='{cls}'><td><strong>{esc(pid)}</strong></td><td>{esc(st.get('text',''))}</td><td>%{pct:.1f}</td><td><span class='badge {status_class(status)}'>{esc(status)}</span></td><td class='text-muted'>{esc(contrib_txt)}</td></tr>")
     out.append("</table></div>")
 
+    yield from out.drain()
+
     # PEA Sonuçları
     out.append("<div class='box'><h2>🏆 Program Eğitim Amaçları (PEA) Sonuçları</h2>")
     out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Dolaylı olarak hesaplanan eğitim amaçları başarısı</p>")
@@ -4147,6 +1943,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr class='{cls}'><td><strong>{esc(aid)}</strong></td><td>{esc(st.get('text',''))}</td><td>{esc(docs_txt)}</td><td>{esc(pocs_txt)}</td><td>%{pct:.1f}</td><td><span class='badge {status_class(status)}'>{esc(status)}</span></td></tr>")
     out.append("</table></div>")
 
+    yield from out.drain()
+
     # TYÇ Sonuçları (varsa)
     computed_tyc = result.get("computed", {}).get("tyc", {})
     if computed_tyc:
@@ -4168,6 +1966,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                 out.append(f"<tr class='{cls}'><td><strong>{esc(tyc_id)}</strong></td><td>{esc(st.get('text',''))}</td><td>{esc(docs_txt)}</td><td>{esc(pocs_txt)}</td><td>%{pct:.1f}</td><td><span class='badge {status_class(status)}'>{esc(status)}</span></td></tr>")
         out.append("</table></div>")
 
+    yield from out.drain()
+
     # STAR-K Sonuçları (varsa)
     computed_stark = result.get("computed", {}).get("stark", {})
     if computed_stark:
@@ -4189,6 +1989,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                 out.append(f"<tr class='{cls}'><td><strong>{esc(stark_id)}</strong></td><td>{esc(st.get('text',''))}</td><td>{esc(docs_txt)}</td><td>{esc(peas_txt)}</td><td>%{pct:.1f}</td><td><span class='badge {status_class(status)}'>{esc(status)}</span></td></tr>")
         out.append("</table></div>")
 
+    yield from out.drain()
+
     # Bloom Analizi
     out.append("<div class='box'><h2>🧠 Bloom Taksonomisi Analizi</h2>")
     out.append("<p class='text-muted' style='margin-bottom:0.75rem;'>Bilişsel düzeylere göre soru dağılımı ve başarı</p>")
@@ -4211,6 +2013,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
             out.append(f"<tr class='{cls}'><td><strong>{esc(b)}</strong></td><td>{st.get('questions',0)}</td><td>%{st.get('success_pct',0):.1f}</td><td>{esc(st.get('status',''))}</td></tr>")
     out.append("</table></div>")
 
+    yield from out.drain()
+
     # Öneriler - AI destekli
     ai_suggestions = generate_ai_suggestions(result)
     sugg = ai_suggestions if ai_suggestions else narrative.get("suggestions", [])
@@ -4227,6 +2031,8 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
         out.append("<p class='text-muted'>Öneri üretilmedi - başarı oranları yeterli seviyede.</p>")
     out.append("</div>")
 
+    yield from out.drain()
+
     # ÖĞRENCİ BAŞARI LİSTESİ VE BİREYSEL RAPORLAR
     students_data = result.get("students_data", [])
     input_students = result.get("input_students", [])
@@ -4238,33 +2044,36 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
         
         out.append("<div class='box'><h2>👥 ÖĞRENCİ BAŞARI LİSTESİ VE BİREYSEL RAPORLAR</h2>")
         out.append(f"<p class='text-muted' style='margin-bottom:1rem;'>Toplam: {len(students_data)} öğrenci | Katılan: {len(attending)} | Girmeyen (GR): {len(absent)}</p>")
-        out.append("<table><tr><th>#</th><th>Öğrenci No</th><th>Ad Soyad</th><th>Başarı %</th><th>Harf</th><th>Durum</th><th style='text-align:center;'>Bireysel Rapor</th></tr>")
-        
-        for i, s in enumerate(attending, 1):
-            sid = s.get("id", "")
-            student_name = s.get("name", sid)
-            pct = s.get("pct", 0)
-            letter = s.get("grade", "FF")
-            
-            # Durum ve stil
-            if letter in ["AA", "BA", "BB", "CB", "CC"]:
-                cls = "row-success"
-                status = "Başarılı"
-                badge = "badge-success"
-            elif letter in ["DC", "DD"]:
-                cls = "row-warning"
-                status = "Koşullu"
-                badge = "badge-warning"
-            else:
-                cls = "row-danger"
-                status = "Başarısız"
-                badge = "badge-danger"
-            
-            # Escape for JavaScript
-            safe_name = esc(student_name).replace("'", "\\'")
-            safe_id = esc(sid).replace("'", "\\'")
+        if virtual_students:
+            out.append(virtual_table("students", "students", len(students_data), report_id, full_url) + "</div>")
+        else:
+            out.append("<table><tr><th>#</th><th>Öğrenci No</th><th>Ad Soyad</th><th>Başarı %</th><th>Harf</th><th>Durum</th><th style='text-align:center;'>Bireysel Rapor</th></tr>")
             
-            out.append(f"""<tr class='{cls}'>
+            for i, s in enumerate(attending, 1):
+                sid = s.get("id", "")
+                student_name = s.get("name", sid)
+                pct = s.get("pct", 0)
+                letter = s.get("grade", "FF")
+                
+                # Durum ve stil
+                if letter in ["AA", "BA", "BB", "CB", "CC"]:
+                    cls = "row-success"
+                    status = "Başarılı"
+                    badge = "badge-success"
+                elif letter in ["DC", "DD"]:
+                    cls = "row-warning"
+                    status = "Koşullu"
+                    badge = "badge-warning"
+                else:
+                    cls = "row-danger"
+                    status = "Başarısız"
+                    badge = "badge-danger"
+                
+                # Escape for JavaScript
+                safe_name = esc(student_name).replace("'", "\\'")
+                safe_id = esc(sid).replace("'", "\\'")
+                
+                out.append(f"""<tr class='{cls}'>
                 <td>{i}</td>
                 <td><strong>{esc(sid)}</strong></td>
                 <td>{esc(student_name)}</td>
@@ -4273,16 +2082,18 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                 <td><span class='badge {badge}'>{status}</span></td>
                 <td style='text-align:center;'><button type='button' class='btn btn-sm' style='background:#667eea;color:white;padding:0.4rem 0.8rem;font-size:0.75rem;border:none;border-radius:6px;cursor:pointer;' onclick="openStudentReportModal('{safe_id}', '{safe_name}')">📊 Detay</button></td>
             </tr>""")
-        
-        # GR öğrenciler
-        if absent:
-            out.append(f"<tr><td colspan='7' style='background:#f3f4f6;text-align:center;font-weight:600;'>🚫 Sınava Girmeyenler ({len(absent)} kişi)</td></tr>")
-            for i, s in enumerate(absent, len(attending) + 1):
-                sid = s.get("id", "")
-                student_name = s.get("name", sid)
-                safe_name = esc(student_name).replace("'", "\\'")
-                safe_id = esc(sid).replace("'", "\\'")
-                out.append(f"""<tr class='row-muted' style='opacity:0.6;'>
+                if i % STREAM_CHUNK_ROWS == 0:
+                    yield from out.drain()
+            
+            # GR öğrenciler
+            if absent:
+                out.append(f"<tr><td colspan='7' style='background:#f3f4f6;text-align:center;font-weight:600;'>🚫 Sınava Girmeyenler ({len(absent)} kişi)</td></tr>")
+                for i, s in enumerate(absent, len(attending) + 1):
+                    sid = s.get("id", "")
+                    student_name = s.get("name", sid)
+                    safe_name = esc(student_name).replace("'", "\\'")
+                    safe_id = esc(sid).replace("'", "\\'")
+                    out.append(f"""<tr class='row-muted' style='opacity:0.6;'>
                     <td>{i}</td>
                     <td><strong>{esc(sid)}</strong></td>
                     <td>{esc(student_name)}</td>
@@ -4291,7 +2102,9 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
                     <td><span class='badge' style='background:#6b7280;color:white;'>Girmedi</span></td>
                     <td style='text-align:center;'>-</td>
                 </tr>""")
-        out.append("</table></div>")
+            out.append("</table></div>")
+
+    yield from out.drain()
 
     # Butonlar
     out.append("<div class='btn-group no-print'>")
@@ -4309,74 +2122,25 @@ def render_tables(result: Dict[str, Any], standalone: bool = False, report_id: i
         out.append("<a class='btn btn-purple' href='/report-v2' target='_blank'>🚀 V2 Rapor</a>")
     out.append("</div>")
     
-    # Standalone modda tam HTML sayfası döndür
+    yield from out.drain()
     if standalone:
-        course_name = course.get('course_name', 'Rapor')
-        standalone_html = f"""<!DOCTYPE html>
-<html lang="tr">
-<head>
-<meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
-<title>Standart Rapor - {esc(course_name)}</title>
-<link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap" rel="stylesheet">
-<style>
-@page {{ size: A4; margin: 1cm; }}
-@media print {{
-  .no-print {{ display: none !important; }}
-  body {{ background: white !important; padding: 0 !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-  .container {{ max-width: 100% !important; }}
-  .box {{ break-inside: avoid; page-break-inside: avoid; box-shadow: none !important; border: 1px solid #ccc !important; }}
-  .stats-grid {{ display: block !important; }}
-  .stat-card {{ display: inline-block !important; width: 23% !important; margin: 0.5% !important; box-shadow: none !important; }}
-  table {{ font-size: 0.75rem !important; }}
-  th, td {{ padding: 0.5rem !important; }}
-}}
-*{{margin:0;padding:0;box-sizing:border-box;}}
-body{{font-family:'Inter',-apple-system,BlinkMacSystemFont,sans-serif;background:#f1f5f9;padding:2rem;color:#1e293b;}}
-.container{{max-width:1200px;margin:0 auto;}}
-.box{{background:white;border:1px solid #e2e8f0;border-radius:12px;padding:1.5rem;margin-bottom:1.5rem;}}
-h2{{font-size:1.1rem;margin-bottom:1rem;color:#1e293b;}}
-table{{width:100%;border-collapse:collapse;margin:1rem 0;}}
-th,td{{padding:0.75rem;text-align:left;border-bottom:1px solid #e2e8f0;font-size:0.85rem;}}
-th{{background:#f8fafc;font-weight:600;}}
-.badge{{display:inline-block;padding:0.25rem 0.5rem;border-radius:6px;font-size:0.75rem;font-weight:600;}}
-.badge-success{{background:#ecfdf5;color:#059669;}}
-.badge-warning{{background:#fffbeb;color:#d97706;}}
-.badge-danger{{background:#fef2f2;color:#dc2626;}}
-.row-success{{background:#ecfdf5;}}
-.row-warning{{background:#fffbeb;}}
-.row-danger{{background:#fef2f2;}}
-.stats-grid{{display:grid;grid-template-columns:repeat(auto-fit,minmax(150px,1fr));gap:1rem;margin-bottom:1.5rem;}}
-.stat-card{{background:white;border:1px solid #e2e8f0;border-radius:12px;padding:1.25rem;text-align:center;}}
-.stat-value{{font-size:1.5rem;font-weight:700;}}
-.stat-value.success{{color:#059669;}}
-.stat-value.warning{{color:#d97706;}}
-.stat-value.danger{{color:#dc2626;}}
-.stat-label{{font-size:0.75rem;color:#64748b;margin-top:0.25rem;}}
-.btn-group{{display:flex;gap:0.75rem;flex-wrap:wrap;margin-top:1.5rem;}}
-.btn{{padding:0.75rem 1.25rem;border-radius:8px;font-weight:600;text-decoration:none;display:inline-block;font-size:0.85rem;border:none;cursor:pointer;}}
-.btn-success{{background:#059669;color:white;}}
-.btn-purple{{background:#7c3aed;color:white;}}
-.btn-secondary{{background:#64748b;color:white;border:none;cursor:pointer;}}
-.btn-ghost{{background:transparent;color:#64748b;border:1px solid #e2e8f0;}}
-.text-muted{{color:#64748b;font-size:0.85rem;}}
-</style>
-</head>
-<body>
-<div class="container">
-{"".join(out)}
-</div>
-</body>
-</html>"""
-        return standalone_html
-
-    return "\n".join(out)
+        scripts = static_assets.script_tag("virtual_table.js") + "\n" if virtual_students or virtual_questions else ""
+        yield f"\n</div>\n{scripts}</body>\n</html>"
 
 
 # =============================================================================
 # V2 RAPOR - DETAYLI GÖRSEL DASHBOARD
 # =============================================================================
 
-def render_v2_report(result: Dict[str, Any], show_toolbar: bool = False, report_id: int = None) -> str:
+def render_v2_report(result: Dict[str, Any], show_toolbar: bool = False, report_id: int = None,
+                     virtual_tables: bool = False) -> str:
+    return "".join(iter_render_v2_report(result, show_toolbar=show_toolbar, report_id=report_id, virtual_tables=virtual_tables))
+
+
+def iter_render_v2_report(result: Dict[str, Any], show_toolbar: bool = False, report_id: int = None,
+                          virtual_tables: bool = False) -> Iterator[str]:
+    """V2 raporu bölüm bölüm üret - parçalar birleşince render_v2_report çıktısının aynısı.
+    virtual_tables: uzun öğrenci listeleri gömülmez, sayfalı JSON'dan çekilir (ekran görünümü)"""
     overall = result["computed"]["overall"]
     docs = result["computed"]["docs"]
     pocs = result["computed"]["pocs"]
@@ -4402,6 +2166,7 @@ def render_v2_report(result: Dict[str, Any], show_toolbar: bool = False, report_
     overall_pct = overall.get("success_pct", 0)
     student_count = question_outcomes.get("student_count", 0)
     report_date = datetime.now().strftime("%d.%m.%Y %H:%M")
+    virtual_used = False
     
     def get_color(pct):
         if pct is None:
@@ -4456,109 +2221,13 @@ def render_v2_report(result: Dict[str, Any], show_toolbar: bool = False, report_
 <title>V2 Detaylı Rapor - {esc(course.get('course_name', 'Ders'))}</title>
 <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap" rel="stylesheet">
 <style>
-@page {{ size: A4; margin: 1cm; }}
+{V2_REPORT_CSS}</style>
+<style>
 @media print {{
-  body {{ background: white !important; -webkit-print-color-adjust: exact !important; print-color-adjust: exact !important; }}
-  .no-print {{ display: none !important; }}
-  .page-break {{ page-break-before: always; }}
-  .card, .section, .alert, .info-box {{ break-inside: avoid; page-break-inside: avoid; }}
-  .page {{ padding: 0.5cm !important; max-width: 100% !important; }}
-  .hero {{ padding: 1rem !important; background: #f5f5f5 !important; }}
-  .hero h1 {{ background: none !important; -webkit-text-fill-color: #7c8bf8 !important; color: #7c8bf8 !important; }}
   .score-ring {{ border: 10px solid {get_color(overall_pct)} !important; background: white !important; box-shadow: none !important; }}
-  .score-ring::before {{ display: none !important; }}
-  .grid-2, .grid-3 {{ display: block !important; }}
-  .card {{ margin-bottom: 0.75rem !important; box-shadow: none !important; border: 1px solid #ccc !important; }}
-  .stat-box {{ box-shadow: none !important; }}
 }}
-*{{margin:0;padding:0;box-sizing:border-box;}}
-body{{font-family:'Inter',-apple-system,BlinkMacSystemFont,sans-serif;background:#f8f7f3;min-height:100vh;color:#1f1f1a;line-height:1.6;}}
-.page{{max-width:1400px;margin:0 auto;padding:2rem;}}
-.hero{{text-align:center;padding:2rem;background:linear-gradient(135deg,rgba(124,139,248,0.12) 0%,rgba(240,139,160,0.12) 100%);border-radius:20px;border:1px solid #d7d3c8;margin-bottom:2rem;}}
-.hero h1{{font-size:1.75rem;font-weight:800;background:linear-gradient(135deg,#7c8bf8 0%,#f08ba0 100%);-webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;margin-bottom:0.5rem;}}
-.hero .subtitle{{color:#3b3b32;font-size:1rem;}}
-.hero .meta{{display:flex;justify-content:center;gap:2rem;margin-top:1rem;flex-wrap:wrap;font-size:0.85rem;color:#6b6b61;}}
-.hero .meta strong{{color:#1f1f1a;}}
-.info-box{{background:#f6f4ee;border:1px solid #d7d3c8;border-radius:12px;padding:1rem;margin:1rem 0;font-size:0.85rem;color:#3b3b32;}}
-.info-box h4{{margin-bottom:0.5rem;color:#7c8bf8;}}
-.score-section{{display:flex;justify-content:center;align-items:center;gap:2.5rem;margin:2rem 0;flex-wrap:wrap;}}
 .score-ring{{width:160px;height:160px;border-radius:50%;background:conic-gradient({get_color(overall_pct)} {overall_pct*3.6}deg, #e4e0d6 {overall_pct*3.6}deg);display:flex;align-items:center;justify-content:center;position:relative;box-shadow:0 0 30px rgba(124,139,248,0.25);}}
-.score-ring::before{{content:'';position:absolute;inset:10px;border-radius:50%;background:#f8f7f3;border:1px solid #d7d3c8;}}
-.score-inner{{position:relative;text-align:center;}}
 .score-inner .value{{font-size:2.5rem;font-weight:800;color:{get_color(overall_pct)};}}
-.score-inner .label{{font-size:0.7rem;color:#6b6b61;text-transform:uppercase;letter-spacing:1px;}}
-.stats-row{{display:flex;gap:1rem;flex-wrap:wrap;}}
-.stat-box{{background:#ffffff;border:1px solid #d7d3c8;border-radius:12px;padding:1rem 1.25rem;text-align:center;min-width:100px;box-shadow:0 6px 14px rgba(0,0,0,0.06);}}
-.stat-box .num{{font-size:1.5rem;font-weight:700;color:#1f1f1a;}}
-.stat-box .txt{{font-size:0.7rem;color:#6b6b61;text-transform:uppercase;margin-top:0.25rem;}}
-.section{{margin:2rem 0;}}
-.section-title{{font-size:0.85rem;font-weight:700;color:#7c8bf8;text-transform:uppercase;letter-spacing:1px;margin-bottom:1rem;padding-bottom:0.5rem;border-bottom:2px solid #d7d3c8;display:flex;align-items:center;gap:0.5rem;}}
-.grid-2{{display:grid;grid-template-columns:repeat(auto-fit,minmax(380px,1fr));gap:1.25rem;}}
-.grid-3{{display:grid;grid-template-columns:repeat(auto-fit,minmax(280px,1fr));gap:1.25rem;}}
-.card{{background:#ffffff;border:1px solid #d7d3c8;border-radius:16px;padding:1.25rem;box-shadow:0 8px 18px rgba(0,0,0,0.04);}}
-.card-header{{display:flex;align-items:center;gap:0.75rem;margin-bottom:1rem;padding-bottom:0.75rem;border-bottom:1px solid #e4e0d6;}}
-.card-icon{{width:40px;height:40px;border-radius:10px;display:flex;align-items:center;justify-content:center;font-size:1.1rem;}}
-.card-title{{font-size:0.9rem;font-weight:600;color:#1f1f1a;}}
-.card-subtitle{{font-size:0.75rem;color:#6b6b61;}}
-.card-description{{font-size:0.8rem;color:#3b3b32;margin-bottom:1rem;padding:0.75rem;background:#f6f4ee;border-radius:8px;border-left:3px solid #7c8bf8;}}
-.progress-item{{margin-bottom:0.75rem;}}
-.progress-header{{display:flex;justify-content:space-between;margin-bottom:0.25rem;font-size:0.8rem;}}
-.progress-label{{color:#6b6b61;}}
-.progress-label small{{color:#6b6b61;font-size:0.7rem;display:block;}}
-.progress-value{{font-weight:600;}}
-.progress-bar{{height:8px;background:#ece9e2;border-radius:4px;overflow:hidden;}}
-.progress-fill{{height:100%;border-radius:4px;transition:width 0.8s ease;}}
-table{{width:100%;border-collapse:collapse;font-size:0.8rem;margin-top:0.5rem;}}
-th{{padding:0.625rem;text-align:left;font-size:0.7rem;font-weight:600;text-transform:uppercase;letter-spacing:0.5px;color:#6b6b61;background:#f6f4ee;}}
-th:first-child{{border-radius:8px 0 0 0;}}
-th:last-child{{border-radius:0 8px 0 0;}}
-td{{padding:0.625rem;border-bottom:1px solid #e4e0d6;color:#1f1f1a;}}
-tr:hover td{{background:rgba(124,139,248,0.08);}}
-.badge{{display:inline-flex;padding:0.2rem 0.5rem;font-size:0.7rem;font-weight:600;border-radius:4px;margin:0.1rem;}}
-.badge-success{{background:rgba(47,133,90,0.15);color:#2f855a;}}
-.badge-warning{{background:rgba(197,106,0,0.15);color:#c56a00;}}
-.badge-danger{{background:rgba(214,63,63,0.15);color:#d63f3f;}}
-.badge-info{{background:rgba(124,139,248,0.15);color:#7c8bf8;}}
-.alert{{padding:1rem;border-radius:10px;margin:1rem 0;}}
-.alert-warning{{background:rgba(197,106,0,0.12);border:1px solid rgba(197,106,0,0.25);color:#c56a00;}}
-.alert-danger{{background:rgba(214,63,63,0.12);border:1px solid rgba(214,63,63,0.25);color:#d63f3f;}}
-.alert-success{{background:rgba(47,133,90,0.12);border:1px solid rgba(47,133,90,0.25);color:#2f855a;}}
-.alert h4{{margin-bottom:0.5rem;display:flex;align-items:center;gap:0.5rem;}}
-.alert ul{{margin:0.5rem 0 0 1.25rem;}}
-.alert li{{margin-bottom:0.375rem;font-size:0.85rem;}}
-.relation-matrix{{overflow-x:auto;}}
-.relation-table td{{vertical-align:middle;}}
-.relation-arrow{{color:#7c8bf8;font-weight:bold;padding:0 0.5rem;}}
-.bloom-grid{{display:grid;grid-template-columns:repeat(6,1fr);gap:0.5rem;}}
-.bloom-item{{background:#ffffff;border-radius:10px;padding:0.75rem 0.5rem;text-align:center;border:1px solid #e4e0d6;}}
-.bloom-item .level{{font-size:0.6rem;color:#6b6b61;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:0.25rem;}}
-.bloom-item .pct{{font-size:1.25rem;font-weight:700;color:#1f1f1a;}}
-.bloom-item .count{{font-size:0.65rem;color:#6b6b61;}}
-.question-grid{{display:grid;grid-template-columns:repeat(auto-fill,minmax(42px,1fr));gap:0.375rem;}}
-.q-cell{{aspect-ratio:1;border-radius:6px;display:flex;align-items:center;justify-content:center;font-weight:600;font-size:0.7rem;cursor:default;transition:transform 0.2s;background:#f6f4ee;border:1px solid #e4e0d6;color:#1f1f1a;}}
-.q-cell:hover{{transform:scale(1.15);z-index:1;box-shadow:0 6px 14px rgba(0,0,0,0.08);}}
-.week-bar{{display:flex;align-items:center;gap:0.5rem;margin-bottom:0.5rem;}}
-.week-label{{width:60px;font-size:0.75rem;color:#6b6b61;text-align:right;}}
-.week-fill{{height:28px;border-radius:4px;display:flex;align-items:center;padding:0 0.75rem;font-size:0.75rem;font-weight:500;color:#1f1f1a;}}
-.student-row{{display:flex;align-items:center;gap:0.5rem;padding:0.375rem 0.5rem;border-radius:6px;margin-bottom:0.25rem;}}
-.student-row:nth-child(odd){{background:#f6f4ee;}}
-.student-rank{{width:22px;height:22px;border-radius:5px;display:flex;align-items:center;justify-content:center;font-size:0.65rem;font-weight:600;}}
-.student-name{{flex:1;font-size:0.8rem;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}}
-.student-score{{font-size:0.8rem;font-weight:600;width:45px;text-align:right;}}
-.student-grade{{width:32px;text-align:center;font-size:0.7rem;font-weight:600;border-radius:4px;padding:0.15rem;}}
-.mini-bar{{width:80px;height:5px;background:#ece9e2;border-radius:3px;overflow:hidden;}}
-.mini-fill{{height:100%;border-radius:3px;}}
-.check-list{{list-style:none;padding:0;}}
-.check-list li{{padding:0.5rem 0;border-bottom:1px solid #e4e0d6;display:flex;align-items:flex-start;gap:0.5rem;font-size:0.85rem;color:#1f1f1a;}}
-.check-list li:last-child{{border-bottom:none;}}
-.check-list .icon{{font-size:1rem;flex-shrink:0;}}
-.suggestions{{background:linear-gradient(135deg,rgba(124,139,248,0.08) 0%,rgba(240,139,160,0.08) 100%);border:1px solid #d7d3c8;border-radius:16px;padding:1.25rem;}}
-.suggestions h3{{display:flex;align-items:center;gap:0.5rem;margin-bottom:0.75rem;color:#7c8bf8;font-size:0.9rem;}}
-.suggestions ul{{list-style:none;padding:0;}}
-.suggestions li{{padding:0.625rem 1rem;background:#f6f4ee;border-radius:8px;margin-bottom:0.375rem;border-left:3px solid #7c8bf8;font-size:0.85rem;color:#1f1f1a;}}
-.back-btn{{display:inline-flex;align-items:center;gap:0.5rem;padding:0.75rem 1.25rem;background:linear-gradient(135deg,#7c8bf8 0%,#f08ba0 100%);color:white;text-decoration:none;border-radius:10px;font-weight:600;font-size:0.85rem;margin-right:0.75rem;transition:all 0.2s;}}
-.back-btn:hover{{transform:translateY(-2px);box-shadow:0 6px 20px rgba(124,139,248,0.3);}}
-.footer{{text-align:center;margin-top:2rem;padding-top:1.5rem;border-top:1px solid #d7d3c8;color:#6b6b61;font-size:0.8rem;}}
 </style>
 </head>
 <body>
@@ -4595,6 +2264,9 @@ tr:hover td{{background:rgba(124,139,248,0.08);}}
 
 """
 
+    yield html
+    html = ""
+
     # MÜFREDAT / TYÇ / STAR-K
     if curriculum or tyc or stark:
         html += """
@@ -4620,6 +2292,9 @@ Bu standartlar, dersin akreditasyon kriterlerini karşılayıp karşılamadığ
 </div>
 """
 
+    yield html
+    html = ""
+
     # İLİŞKİ MATRİSLERİ - TÜM DETAYLAR
     html += """
 <div class="section page-break">
@@ -4687,6 +2362,9 @@ Her satırda bir çıktı ve onun bağlı olduğu hedefler listelenir. Eşleşme
     
     html += '</div></div>'
 
+    yield html
+    html = ""
+
     # EKSİKLİKLER VE YAPILMASI GEREKENLER
     has_issues = any([missing_docs, missing_pocs, missing_peas, missing_tyc, missing_stark, missing_curriculum, doc_no_tyc, poc_no_tyc, pea_no_stark])
     if has_issues:
@@ -4726,6 +2404,9 @@ Her satırda bir çıktı ve onun bağlı olduğu hedefler listelenir. Eşleşme
 </div>
 """
 
+    yield html
+    html = ""
+
     # DÖÇ ve PÖÇ BAŞARI ANALİZİ
     html += """
 <div class="section page-break">
@@ -4803,6 +2484,9 @@ Her satırda bir çıktı ve onun bağlı olduğu hedefler listelenir. Eşleşme
 </div>
 """
 
+    yield html
+    html = ""
+
     # BLOOM TAKSONOMİSİ
     html += """
 <div class="section">
@@ -4846,6 +2530,9 @@ Bloom Taksonomisi, soruların bilişsel düzeyini gösterir. Üst düzey sorular
 </div>
 """
 
+    yield html
+    html = ""
+
     # SORU BAŞARI HARİTASI
     per_q = question_outcomes.get("per_question", {})
     if per_q:
@@ -4871,6 +2558,9 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
 </div>
 """
 
+    yield html
+    html = ""
+
     # HAFTALIK DAĞILIM
     if weekly_coverage:
         max_points = max(w.get("total_points", 1) for w in weekly_coverage)
@@ -4891,6 +2581,9 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
 </div>'''
         html += '</div></div>'
 
+    yield html
+    html = ""
+
     # ÖĞRENCİ BAŞARI SIRALAMASI
     if students_data:
         # Katılan ve girmeyen öğrencileri ayır
@@ -4983,7 +2676,18 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
 """
         
         # Derse Girmeyen Öğrenciler
-        if absent:
+        if absent and virtual_tables and len(absent) >= report_tables.VIRTUAL_MIN_ROWS:
+            virtual_used = True
+            full_url = f"/report-history/{report_id}?full=1" if report_id else "/report-v2?full=1"
+            html += f'''
+<div class="card" style="margin-top:1rem;">
+<div class="card-header">
+<div class="card-icon" style="background:linear-gradient(135deg,#6b7280,#9ca3af);">🚫</div>
+<div><div class="card-title">Derse Girmeyen Öğrenciler ({len(absent)} kişi)</div></div>
+</div>
+{virtual_table("students", "students", len(absent), report_id, full_url, status=report_tables.STATUS_ABSENT)}
+</div>'''
+        elif absent:
             html += f'''
 <div class="card" style="margin-top:1rem;">
 <div class="card-header">
@@ -5000,6 +2704,9 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
         
         html += "</div>"
 
+    yield html
+    html = ""
+
     # ÖNERİLER - AI destekli
     ai_suggestions = generate_ai_suggestions(result)
     sugg = ai_suggestions if ai_suggestions else narrative.get("suggestions", [])
@@ -5021,6 +2728,9 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
 </div>
 """
 
+    yield html
+    html = ""
+
     # FOOTER
     html += f"""
 <div class="footer">
@@ -5034,10 +2744,10 @@ Kırmızı sorulardaki çıktılar gözden geçirilmelidir.
 </div>
 
 </div>
-</body>
+{static_assets.script_tag("virtual_table.js") + chr(10) if virtual_used else ""}</body>
 </html>
 """
-    return html
+    yield html
 
 
 # =============================================================================
@@ -6060,6 +3770,21 @@ class Handler(BaseHTTPRequestHandler):
             return html.encode('utf-8')
 
     def do_GET(self):
+        # Sayfaların CSS/JS paketleri (bu basit sunucuda sıkıştırmasız) - paketlenemediyse kaynak dosyaları
+        asset = self.path[len("/assets/"):].split("?")[0] if self.path.startswith("/assets/") else ""
+        fingerprinted = static_assets.is_fingerprinted(asset)
+        if fingerprinted or static_assets.is_source(asset):
+            file_path = static_assets.ASSETS_DIR / asset
+            if (file_path.parent == static_assets.DIST_DIR or not fingerprinted) and file_path.is_file():
+                self.send_response(200)
+                self.send_header("Content-Type", static_assets.MIME_TYPES.get(file_path.suffix, "application/octet-stream"))
+                self.send_header("Cache-Control", "public, max-age=31536000, immutable" if fingerprinted else "no-cache")
+                self.end_headers()
+                self.wfile.write(file_path.read_bytes())
+            else:
+                self._send("Not found", 404, "text/plain; charset=utf-8")
+            return
+
         # API endpoint'leri için özel auth kontrolü (JSON döndür)
         if self.path.startswith("/api/"):
             if not self._is_auth():